@@ -15,7 +15,12 @@ import click
 
 from github_runner_manager.configuration import ApplicationConfiguration
 from github_runner_manager.http_server import FlaskArgs, start_http_server
-from github_runner_manager.reconcile_service import start_reconcile_service
+from github_runner_manager.metrics.events import (
+    FsyncPolicy,
+    configure_event_sink,
+    flush_events_on_sigterm,
+)
+from github_runner_manager.reconcile_service import RunnerScalerProvider, start_reconcile_service
 from github_runner_manager.thread_manager import ThreadManager
 
 version = importlib.metadata.version("github-runner-manager")
@@ -79,18 +84,30 @@ def main(
         format="%(asctime)s - %(levelname)s - %(name)s - %(message)s",
     )
     logging.info("Starting GitHub runner manager service version: %s", version)
+    # systemd stops the service with SIGTERM, the buffered metric events are written on exit.
+    flush_events_on_sigterm()
 
     lock = Lock()
     config_str = config_file.read()
     config = ApplicationConfiguration.from_yaml_file(StringIO(config_str))
+    if config.metric_events is not None:
+        configure_event_sink(
+            flush_interval=config.metric_events.flush_interval,
+            flush_size=config.metric_events.flush_size,
+            fsync=FsyncPolicy.FLUSH if config.metric_events.fsync else FsyncPolicy.NEVER,
+        )
     http_server_args = FlaskArgs(host=host, port=port, debug=debug)
+    # The RunnerScaler is shared by the HTTP server and the reconcile service.
+    runner_scaler_provider = RunnerScalerProvider(python_path=python_path_config)
 
     thread_manager = ThreadManager()
     thread_manager.add_thread(
-        target=partial(start_http_server, config, lock, http_server_args), daemon=True
+        target=partial(start_http_server, config, runner_scaler_provider, lock, http_server_args),
+        daemon=True,
     )
     thread_manager.add_thread(
-        target=partial(start_reconcile_service, config, python_path_config, lock), daemon=True
+        target=partial(start_reconcile_service, config, runner_scaler_provider, lock),
+        daemon=True,
     )
     thread_manager.start()
 
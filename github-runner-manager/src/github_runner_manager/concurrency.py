@@ -0,0 +1,206 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Adaptive limits on the concurrent requests to the backends used by the manager."""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from github_runner_manager.github_rate_limit import is_rate_limit_error
+from github_runner_manager.metrics.reconcile import BACKEND_CONCURRENCY_LIMIT
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on the concurrency of any backend, and on the threads used to reach it.
+MAX_CONCURRENCY = 100
+# The fixed concurrency used before the limits were adaptive, so the limits only move away from
+# it on the signals of the backends.
+_INITIAL_CONCURRENCY = 30
+# The HTTP status codes of the responses of an overloaded backend, besides the 5xx codes.
+_OVERLOAD_STATUS_CODES = (413, 429)
+# After a decrease, further failures within this time are caused by the same overload and do not
+# decrease the limit again.
+_DECREASE_COOLDOWN_SECONDS = 1.0
+
+
+def _get_status_code(exc: BaseException) -> int | None:
+    """Get the HTTP status code of the response an exception or its causes were raised for.
+
+    The OpenStack SDK errors have a status_code, the urllib errors raised for the GitHub API a
+    code, and the jobmanager client errors a status.
+
+    Args:
+        exc: The exception.
+
+    Returns:
+        The status code, or None if the exception was not raised for a response.
+    """
+    cause: BaseException | None = exc
+    while cause is not None:
+        for attribute in ("status_code", "code", "status"):
+            code = getattr(cause, attribute, None)
+            if isinstance(code, int) and 100 <= code < 600:
+                return code
+        cause = cause.__cause__
+    return None
+
+
+def is_overload_response(exc: BaseException) -> bool:
+    """Check whether an exception was raised for a response of an overloaded backend.
+
+    Args:
+        exc: The exception raised by a call to the backend.
+
+    Returns:
+        True for a rate limit (429), too large (413) or server error (5xx) response.
+    """
+    code = _get_status_code(exc)
+    return code is not None and (code in _OVERLOAD_STATUS_CODES or code >= 500)
+
+
+def _is_github_overload(exc: BaseException) -> bool:
+    """Check whether an exception was raised for a response of the overloaded GitHub API.
+
+    Besides the overload responses of any backend, GitHub responds to the secondary rate limits
+    with 403.
+
+    Args:
+        exc: The exception raised by a call to the GitHub API.
+
+    Returns:
+        True for an overload or rate limit response.
+    """
+    if is_overload_response(exc):
+        return True
+    cause: BaseException | None = exc
+    while cause is not None:
+        headers = getattr(cause, "headers", None)
+        if getattr(cause, "code", None) == 403 and headers is not None:
+            return is_rate_limit_error(403, headers)
+        cause = cause.__cause__
+    return False
+
+
+def _never_overload(_exc: BaseException) -> bool:
+    """Classify no exception as an overload of the backend.
+
+    Args:
+        _exc: The exception raised by a call to the backend.
+
+    Returns:
+        False.
+    """
+    return False
+
+
+class AdaptiveConcurrencyLimit:  # pylint: disable=too-many-instance-attributes
+    """Additive increase, multiplicative decrease (AIMD) limit on concurrent calls to a backend.
+
+    Each call completed under the latency target increases the limit by 1/limit, so the limit
+    grows by one per limit's worth of successful calls. A call failing with an overload error of
+    the backend, for example a rate limit (429/413) or server error (5xx) response, or a call
+    slower than the latency target, halves the limit. The other errors, such as client errors or
+    unreachable hosts, leave the limit unchanged.
+
+    Attributes:
+        backend: The name of the backend.
+        maximum: The maximum limit.
+        limit: The current number of concurrent calls allowed.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self,
+        backend: str,
+        latency_target: float,
+        initial: int = _INITIAL_CONCURRENCY,
+        minimum: int = 1,
+        maximum: int = MAX_CONCURRENCY,
+        is_overload: Callable[[BaseException], bool] = is_overload_response,
+    ):
+        """Construct the object.
+
+        Args:
+            backend: The name of the backend.
+            latency_target: Calls slower than this number of seconds decrease the limit.
+            initial: The initial limit.
+            minimum: The minimum limit.
+            maximum: The maximum limit.
+            is_overload: Whether an exception raised by a call denotes an overloaded backend.
+        """
+        self.backend = backend
+        self.maximum = maximum
+        self._latency_target = latency_target
+        self._minimum = minimum
+        self._is_overload = is_overload
+        self._limit = float(initial)
+        self._in_flight = 0
+        self._last_decrease = float("-inf")
+        self._condition = threading.Condition()
+        BACKEND_CONCURRENCY_LIMIT.labels(backend).set(initial)
+
+    @property
+    def limit(self) -> int:
+        """The current number of concurrent calls allowed."""
+        return int(self._limit)
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Wait for the limit to allow one more call to the backend.
+
+        Raises:
+            BaseException: Any exception raised by the call to the backend.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        start = time.monotonic()
+        # True if the backend is overloaded, False if it is not, None if the call says nothing
+        # about the load of the backend.
+        overloaded: bool | None = None
+        try:
+            yield
+            overloaded = time.monotonic() - start > self._latency_target
+        except BaseException as exc:
+            if self._is_overload(exc) or time.monotonic() - start > self._latency_target:
+                overloaded = True
+            raise
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                if overloaded:
+                    self._decrease()
+                elif overloaded is not None:
+                    self._increase()
+                self._condition.notify_all()
+
+    def _increase(self) -> None:
+        """Additively increase the limit. Must be called holding the condition."""
+        self._limit = min(float(self.maximum), self._limit + 1 / self._limit)
+        BACKEND_CONCURRENCY_LIMIT.labels(self.backend).set(self.limit)
+
+    def _decrease(self) -> None:
+        """Multiplicatively decrease the limit. Must be called holding the condition."""
+        now = time.monotonic()
+        if now - self._last_decrease < _DECREASE_COOLDOWN_SECONDS:
+            return
+        self._last_decrease = now
+        self._limit = max(float(self._minimum), self._limit / 2)
+        logger.info("Concurrency limit of %s decreased to %s", self.backend, self.limit)
+        BACKEND_CONCURRENCY_LIMIT.labels(self.backend).set(self.limit)
+
+
+# OpenStack compute API.
+NOVA_CONCURRENCY = AdaptiveConcurrencyLimit("nova", latency_target=10)
+# JobManager API.
+JOBMANAGER_CONCURRENCY = AdaptiveConcurrencyLimit("jobmanager", latency_target=5)
+# GitHub API.
+GITHUB_CONCURRENCY = AdaptiveConcurrencyLimit(
+    "github", latency_target=5, is_overload=_is_github_overload
+)
+# SSH connections to the runners. The target is above the SSH connection timeout, so that an
+# unreachable runner does not reduce the concurrency for the rest. The SSH errors are caused by
+# the runners, for example deleted or unreachable VMs, so only the latency denotes an overload.
+SSH_CONCURRENCY = AdaptiveConcurrencyLimit("ssh", latency_target=45, is_overload=_never_overload)
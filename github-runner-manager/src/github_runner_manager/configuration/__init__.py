@@ -7,8 +7,10 @@ from github_runner_manager.configuration.base import (  # noqa: F401
     ApplicationConfiguration,
     Flavor,
     Image,
+    MetricEventsConfig,
     NonReactiveCombination,
     NonReactiveConfiguration,
+    PickUpPollConfig,
     ProxyConfig,
     QueueConfig,
     ReactiveConfiguration,
@@ -47,6 +47,8 @@ class ApplicationConfiguration(BaseModel):
         reactive_configuration: Configuration for reactive mode.
         openstack_configuration: Configuration for authorization to a OpenStack host.
         reconcile_interval: Seconds to wait between reconciliation.
+        metric_events: Configuration of the writes of the metric events to the metrics log. The
+            defaults of the event sink are used if not set.
     """
 
     name: str
@@ -58,6 +60,7 @@ class ApplicationConfiguration(BaseModel):
     reactive_configuration: "ReactiveConfiguration | None"
     openstack_configuration: OpenStackConfiguration
     reconcile_interval: int
+    metric_events: "MetricEventsConfig | None" = None
 
     @staticmethod
     def from_yaml_file(file: TextIO) -> "ApplicationConfiguration":
@@ -87,6 +90,11 @@ class SupportServiceConfig(BaseModel):
         ssh_debug_connections: The information on the ssh debug services.
         repo_policy_compliance: The configuration of the repo policy compliance service.
         custom_pre_job_script: The custom pre-job script to run before the job.
+        runner_metrics_url: The URL of the HTTP server of the manager as reached from the
+            runners, for the runners to push their metrics. If not set, the metrics are only
+            pulled from the runners through SSH. Not usable yet: the charm binds the HTTP server
+            to 127.0.0.1 and does not set this URL. The server must not be exposed to the runners
+            as is, since the flush and check routes are unauthenticated.
     """
 
     manager_proxy_command: str | None = None
@@ -99,6 +107,7 @@ class SupportServiceConfig(BaseModel):
     ssh_debug_connections: "list[SSHDebugConnection]"
     repo_policy_compliance: "RepoPolicyComplianceConfig | None"
     custom_pre_job_script: str | None
+    runner_metrics_url: AnyHttpUrl | None = None
 
     @root_validator(pre=False, skip_on_failure=True)
     @classmethod
@@ -220,11 +229,48 @@ class NonReactiveCombination(BaseModel):
         image: Information about the image to spawn.
         flavor: Information about the flavor to spawn.
         base_virtual_machines: Number of instances to spawn for this combination.
+        max_reactive_spawns: Maximum number of reactive runners of this combination being
+            spawned at once by a reactive process, unlimited if None. Only effective with the
+            reactive daemon, as each reactive process spawns a single runner otherwise.
     """
 
     image: "Image"
     flavor: "Flavor"
     base_virtual_machines: int
+    max_reactive_spawns: int | None = None
+
+
+class PickUpPollConfig(BaseModel):
+    """Schedule of the checks whether a reactive job was picked up by its runner.
+
+    Attributes:
+        initial_interval: Seconds between the first checks, and before processing a job retried
+            for the first time.
+        max_interval: Maximum seconds between two checks.
+        backoff_factor: Factor of the increase of the interval after each check.
+        jitter: Fraction of each interval randomized, to spread the checks of the jobs.
+        timeout: Seconds after spawning a runner before its job is requeued.
+    """
+
+    initial_interval: float = Field(default=10, gt=0)
+    max_interval: float = Field(default=60, gt=0)
+    backoff_factor: float = Field(default=2, ge=1)
+    jitter: float = Field(default=0.2, ge=0, lt=1)
+    timeout: float = Field(default=300, gt=0)
+
+
+class MetricEventsConfig(BaseModel):
+    """Configuration of the writes of the metric events to the metrics log.
+
+    Attributes:
+        flush_interval: Seconds between the writes of the buffered events.
+        flush_size: Number of buffered events that triggers a write before the interval.
+        fsync: Whether the metrics log is synced to disk on each write.
+    """
+
+    flush_interval: float = Field(default=1, gt=0)
+    flush_size: int = Field(default=100, gt=0)
+    fsync: bool = False
 
 
 class ReactiveConfiguration(BaseModel):
@@ -237,12 +283,17 @@ class ReactiveConfiguration(BaseModel):
            (reactive and non-reactive) spawned by the application.
         images: List of valid images to spawn in reactive mode.
         flavors: List of valid flavors to spawn in reactive mode.
+        daemon: Whether to consume the jobs with the threads of a single long-running process,
+            instead of a process per job.
+        pick_up_poll: Schedule of the checks whether a job was picked up by its runner.
     """
 
     queue: "QueueConfig"
     max_total_virtual_machines: int
     images: "list[Image]"
     flavors: "list[Flavor]"
+    daemon: bool = False
+    pick_up_poll: PickUpPollConfig = PickUpPollConfig()
 
 
 class QueueConfig(BaseModel):
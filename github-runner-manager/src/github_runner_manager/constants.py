@@ -3,9 +3,15 @@
 
 """Constants for the library."""
 
+from pathlib import Path
+
 GITHUB_SELF_HOSTED_ARCH_LABELS = {"x64", "arm64"}
 GITHUB_DEFAULT_LABELS = {"self-hosted", "linux"}
 
 # Pending to be removed when the application works in standalone mode.
 RUNNER_MANAGER_USER = "runner-manager"
 RUNNER_MANAGER_GROUP = "runner-manager"
+
+# The state of the service and of its reactive processes, all run as the service user. It is
+# kept in the home of the service user, who cannot write to the system directories.
+STATE_DIR = Path("~").expanduser() / "state"
@@ -5,37 +5,73 @@
 
 Migrate to PyGithub in the future. PyGithub is still lacking some API such as get runner groups.
 """
+import contextvars
 import functools
 import logging
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Callable, ParamSpec, TypeVar
+from http import HTTPStatus
+from http.client import HTTPMessage
+from typing import Any, Callable, Iterator, NamedTuple, ParamSpec, TypeVar
 from urllib.error import HTTPError, URLError
+from urllib.parse import quote
 
 import requests
 
 # These exceptions are not found by pylint
 from fastcore.net import (  # pylint: disable=no-name-in-module
+    ExceptionsHTTP,
     HTTP404NotFoundError,
     HTTP422UnprocessableEntityError,
 )
-from ghapi.all import GhApi, pages
+from fastcore.xtras import dict2obj
+from ghapi.all import GhApi
 from ghapi.page import paged
 from requests import RequestException
+from requests.adapters import HTTPAdapter
 from typing_extensions import assert_never
 
+from github_runner_manager.concurrency import GITHUB_CONCURRENCY, MAX_CONCURRENCY
 from github_runner_manager.configuration.github import GitHubOrg, GitHubPath, GitHubRepo
+from github_runner_manager.constants import STATE_DIR
+from github_runner_manager.github_rate_limit import (
+    GITHUB_RATE_LIMIT,
+    Priority,
+    RateLimitExceededError,
+    is_rate_limit_error,
+    priority,
+)
 from github_runner_manager.manager.models import InstanceID
+from github_runner_manager.metrics.reconcile import (
+    GITHUB_JOB_CACHE_HIT,
+    GITHUB_JOB_CACHE_LOOKUPS,
+    GITHUB_JOB_CACHE_MISS,
+    GITHUB_PAGE_CACHE_HIT,
+    GITHUB_PAGE_CACHE_LOOKUPS,
+    GITHUB_PAGE_CACHE_MISS,
+)
 from github_runner_manager.platform.platform_provider import (
     DeleteRunnerBusyError,
     JobNotFoundError,
     PlatformApiError,
     TokenError,
 )
-from github_runner_manager.types_.github import JITConfig, JobInfo, SelfHostedRunner
+from github_runner_manager.types_.github import JITConfig, JobInfo, JobStatus, SelfHostedRunner
+from github_runner_manager.utilities import FileTTLCache, ProcessLocal, TTLCache
 
 logger = logging.getLogger(__name__)
 
 TIMEOUT_IN_SECS = 60
+# Seconds the jobs of a workflow run are cached.
+WORKFLOW_RUN_JOBS_TTL = 5 * 60
+# Directory of the cache of GitHub metadata shared by the processes of the manager.
+GITHUB_METADATA_CACHE_PATH = STATE_DIR / "github-metadata"
+# Seconds the rarely changing GitHub metadata, such as the runner group IDs, is cached.
+GITHUB_METADATA_TTL = 60 * 60
+# Maximum page size of the GitHub API.
+RUNNERS_PER_PAGE = 100
 
 
 class GithubRunnerNotFoundError(Exception):
@@ -67,6 +103,7 @@ def catch_http_errors(func: Callable[ParamT, ReturnT]) -> Callable[ParamT, Retur
             kwargs: Placeholder for keyword arguments.
 
         Raises:
+            RateLimitExceededError: If the GitHub API rate limit was exceeded.
             TokenError: If there was an error with the provided token.
             PlatformApiError: If there was an unexpected error using the GitHub API.
 
@@ -77,6 +114,8 @@ def catch_http_errors(func: Callable[ParamT, ReturnT]) -> Callable[ParamT, Retur
             return func(*args, **kwargs)
         # The ghapi module uses urllib. The HTTPError and URLError are urllib exceptions.
         except HTTPError as exc:
+            if is_rate_limit_error(exc.code, exc.headers):
+                raise RateLimitExceededError("GitHub API rate limit exceeded.") from exc
             if exc.code in (401, 403):
                 if exc.code == 401:
                     msg = "Invalid token."
@@ -98,6 +137,164 @@ def catch_http_errors(func: Callable[ParamT, ReturnT]) -> Callable[ParamT, Retur
     return wrapper
 
 
+def rate_limit_priority(
+    request_priority: Priority,
+) -> Callable[[Callable[ParamT, ReturnT]], Callable[ParamT, ReturnT]]:
+    """Set the rate limit priority of the requests made by the decorated function.
+
+    Args:
+        request_priority: The priority of the requests.
+
+    Returns:
+        The decorator.
+    """
+
+    def decorator(func: Callable[ParamT, ReturnT]) -> Callable[ParamT, ReturnT]:
+        """Decorate the function.
+
+        Args:
+            func: The function making requests to the GitHub API.
+
+        Returns:
+            The decorated function.
+        """
+
+        @functools.wraps(func)
+        def wrapper(*args: ParamT.args, **kwargs: ParamT.kwargs) -> ReturnT:
+            """Call the function with the priority.
+
+            Args:
+                args: Placeholder for positional arguments.
+                kwargs: Placeholder for keyword arguments.
+
+            Returns:
+                The return value of the function.
+            """
+            with priority(request_priority):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class _RunnersPage(NamedTuple):
+    """The runners with a prefix in a page of the runners on GitHub.
+
+    Attributes:
+        total_count: The total count of runners on GitHub, with any prefix.
+        runners: The runners with the prefix in the page.
+    """
+
+    total_count: int
+    runners: list[SelfHostedRunner]
+
+
+def _create_session() -> requests.Session:
+    """Create an HTTP session for the GitHub API.
+
+    Returns:
+        The session, keeping alive up to one connection per concurrent request.
+    """
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_maxsize=MAX_CONCURRENCY))
+    return session
+
+
+# HTTP session of the process, reusing the TLS connections to the GitHub API between requests.
+_session = ProcessLocal(_create_session)
+
+
+class _PooledGhApi(GhApi):
+    """GhApi client sending its requests through the HTTP session of the process.
+
+    GhApi opens a new connection for each request with urllib. The requests are sent instead
+    through a keep-alive session, within the rate limit of the GitHub API. The errors are raised
+    as the urllib HTTPError that GhApi raises.
+
+    The headers of the last response are kept per thread, so that the client can be shared by
+    concurrent threads.
+
+    Attributes:
+        recv_hdrs: The headers of the last response received by the current thread.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        """Construct the object.
+
+        Args:
+            args: Placeholder for positional arguments.
+            kwargs: Placeholder for keyword arguments.
+        """
+        self._local = threading.local()
+        super().__init__(*args, **kwargs)
+
+    @property
+    def recv_hdrs(self) -> dict[str, str]:
+        """The headers of the last response received by the current thread."""
+        return getattr(self._local, "recv_hdrs", {})
+
+    @recv_hdrs.setter
+    def recv_hdrs(self, headers: dict[str, str]) -> None:
+        """Set the headers of the last response received by the current thread.
+
+        Args:
+            headers: The headers of the response.
+        """
+        self._local.recv_hdrs = headers
+
+    def __call__(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self,
+        path: str,
+        verb: str | None = None,
+        headers: dict | None = None,
+        route: dict | None = None,
+        query: dict | None = None,
+        data: Any = None,
+        timeout: float | None = None,
+        decode: bool = True,
+    ) -> Any:
+        """Send a request to the GitHub API once the rate limit allows it.
+
+        Args:
+            path: The path of the API, or the full URL.
+            verb: The HTTP method. Defaults to POST if there is data, GET otherwise.
+            headers: Additional headers of the request.
+            route: The parameters of the path.
+            query: The query parameters.
+            data: The JSON body of the request.
+            timeout: Seconds to wait for the response.
+            decode: Whether to decode the response.
+
+        Returns:
+            The JSON response as an object, or the decoded response if not JSON.
+        """
+        verb = verb or ("POST" if data else "GET")
+        headers = {**self.headers, **(headers or {})}
+        if not path.startswith(("http://", "https://")):
+            path = self.gh_host + path
+        if route:
+            path = path.format(**{key: quote(str(value)) for key, value in route.items()})
+        GITHUB_RATE_LIMIT.acquire()
+        response = _session.get().request(
+            verb,
+            path,
+            headers=headers,
+            params=query or None,
+            json=data or None,
+            timeout=timeout or TIMEOUT_IN_SECS,
+        )
+        self.recv_hdrs = dict(response.headers)
+        GITHUB_RATE_LIMIT.update(
+            response.headers,
+            rate_limited=is_rate_limit_error(response.status_code, response.headers),
+        )
+        _raise_for_status(response)
+        if "json" in headers["Accept"] and decode is True:
+            return dict2obj(response.json() if response.content else {})
+        return response.text if decode else response.content
+
+
 class GithubClient:
     """GitHub API client."""
 
@@ -108,9 +305,17 @@ class GithubClient:
             token: GitHub personal token for API requests.
         """
         self._token = token
-        self._client = GhApi(token=self._token)
+        self._client = _PooledGhApi(token=self._token)
+        self._metadata_cache = FileTTLCache(GITHUB_METADATA_CACHE_PATH, ttl=GITHUB_METADATA_TTL)
+        self._workflow_run_jobs: TTLCache[tuple[str, str, str], dict[str, JobInfo]] = TTLCache(
+            ttl=WORKFLOW_RUN_JOBS_TTL
+        )
+        # The ETag and the runners with the prefix of the pages of runners, by the listing URL and
+        # the prefix, and the page number.
+        self._runners_pages: dict[tuple[str, str], dict[int, tuple[str, _RunnersPage]]] = {}
 
     @catch_http_errors
+    @rate_limit_priority(Priority.NORMAL)
     def get_runner(self, path: GitHubPath, prefix: str, runner_id: int) -> SelfHostedRunner:
         """Get a specific self-hosted runner information under a repo or org.
 
@@ -141,6 +346,7 @@ class GithubClient:
         return SelfHostedRunner.build_from_github(raw_runner, instance_id)
 
     @catch_http_errors
+    @rate_limit_priority(Priority.NORMAL)
     def list_runners(self, path: GitHubPath, prefix: str) -> list[SelfHostedRunner]:
         """Get all runners information on GitHub under a repo or org.
 
@@ -152,54 +358,135 @@ class GithubClient:
         Returns:
             List of runner information.
         """
-        remote_runners_list: list[SelfHostedRunner] = []
+        return list(self._iter_runners(path, prefix))
 
-        if isinstance(path, GitHubRepo):
-            # The documentation of ghapi for pagination is incorrect and examples will give errors.
-            # This workaround is a temp solution. Will be moving to PyGitHub in the future.
-            self._client.actions.list_self_hosted_runners_for_repo(
-                owner=path.owner, repo=path.repo, per_page=100
-            )
-            num_of_pages = self._client.last_page()
-            remote_runners_list = [
-                item
-                for page in pages(
-                    self._client.actions.list_self_hosted_runners_for_repo,
-                    num_of_pages + 1,
+    def _iter_runners(self, path: GitHubPath, prefix: str) -> Iterator[SelfHostedRunner]:
+        """Iterate over the runners on GitHub with the prefix under a repo or org.
+
+        The pages after the first one are fetched concurrently, as the number of pages is known
+        from the first one.
+
+        Args:
+            path: GitHub repository path in the format '<owner>/<repo>', or the GitHub organization
+                name.
+            prefix: Filter instances related to this prefix and build the InstanceID.
+
+        Yields:
+            The runners with the prefix, in the order listed by GitHub.
+        """
+        first_page = self._get_runners_page(path, prefix, 1)
+        num_of_pages = max(1, math.ceil(first_page.total_count / RUNNERS_PER_PAGE))
+        yield from first_page.runners
+        if num_of_pages > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(num_of_pages - 1, GITHUB_CONCURRENCY.maximum)
+            ) as executor:
+                # The threads do not inherit the context, which holds the rate limit priority.
+                futures = [
+                    executor.submit(
+                        contextvars.copy_context().run, self._get_runners_page, path, prefix, page
+                    )
+                    for page in range(2, num_of_pages + 1)
+                ]
+                for future in futures:
+                    yield from future.result().runners
+        self._prune_runners_pages(path, prefix, num_of_pages)
+
+    def _get_runners_page(self, path: GitHubPath, prefix: str, page: int) -> _RunnersPage:
+        """Get the runners with the prefix in a page of the runners under a repo or org.
+
+        The request is conditional on the ETag of the cached page. GitHub does not count the
+        requests answered with 304 Not Modified against the rate limit, and the cached page is
+        returned then. Only the runners with the prefix are kept from the page, both in the
+        returned and the cached page.
+
+        Args:
+            path: GitHub repository path in the format '<owner>/<repo>', or the GitHub organization
+                name.
+            prefix: Filter instances related to this prefix and build the InstanceID.
+            page: The number of the page, starting at 1.
+
+        Returns:
+            The total count of runners, and the runners with the prefix in the page.
+        """
+        key = (_get_runners_url(path), prefix)
+        cached = self._runners_pages.get(key, {}).get(page)
+        headers = {"If-None-Match": cached[0]} if cached else {}
+        with GITHUB_CONCURRENCY.slot():
+            body = self._list_runners_page(path, page, headers)
+        if body is None and cached is not None:
+            GITHUB_PAGE_CACHE_LOOKUPS.labels(GITHUB_PAGE_CACHE_HIT).inc()
+            return cached[1]
+        GITHUB_PAGE_CACHE_LOOKUPS.labels(GITHUB_PAGE_CACHE_MISS).inc()
+        runners_page = _RunnersPage(
+            total_count=body["total_count"],
+            runners=[
+                SelfHostedRunner.build_from_github(
+                    runner, InstanceID.build_from_name(prefix, runner["name"])
+                )
+                for runner in body["runners"]
+                if InstanceID.name_has_prefix(prefix, runner["name"])
+            ],
+        )
+        etag = _get_header(self._client.recv_hdrs, "ETag")
+        if etag:
+            self._runners_pages.setdefault(key, {})[page] = (etag, runners_page)
+        return runners_page
+
+    def _list_runners_page(self, path: GitHubPath, page: int, headers: dict[str, str]) -> Any:
+        """Request a page of the runners under a repo or org.
+
+        Args:
+            path: GitHub repository path in the format '<owner>/<repo>', or the GitHub organization
+                name.
+            page: The number of the page, starting at 1.
+            headers: Additional headers of the request.
+
+        Raises:
+            HTTPError: If the request failed.
+
+        Returns:
+            The page, with the total count of runners and the runners in the page. None if the
+            page was not modified since the ETag in the headers.
+        """
+        try:
+            if isinstance(path, GitHubRepo):
+                return self._client.actions.list_self_hosted_runners_for_repo(
                     owner=path.owner,
                     repo=path.repo,
-                    per_page=100,
+                    per_page=RUNNERS_PER_PAGE,
+                    page=page,
+                    headers=headers,
                     timeout=TIMEOUT_IN_SECS,
                 )
-                for item in page["runners"]
-            ]
-        if isinstance(path, GitHubOrg):
-            # The documentation of ghapi for pagination is incorrect and examples will give errors.
-            # This workaround is a temp solution. Will be moving to PyGitHub in the future.
-            self._client.actions.list_self_hosted_runners_for_org(org=path.org, per_page=100)
-            num_of_pages = self._client.last_page()
-            remote_runners_list = [
-                item
-                for page in pages(
-                    self._client.actions.list_self_hosted_runners_for_org,
-                    num_of_pages + 1,
-                    org=path.org,
-                    per_page=100,
-                    timeout=TIMEOUT_IN_SECS,
-                )
-                for item in page["runners"]
-            ]
-
-        # Filter by prefix and create the SelfHostedRunner instances.
-        managed_runners_list = []
-        for runner in remote_runners_list:
-            if InstanceID.name_has_prefix(prefix, runner["name"]):
-                instance_id = InstanceID.build_from_name(prefix, runner["name"])
-                managed_runner = SelfHostedRunner.build_from_github(runner, instance_id)
-                managed_runners_list.append(managed_runner)
-        return managed_runners_list
+            return self._client.actions.list_self_hosted_runners_for_org(
+                org=path.org,
+                per_page=RUNNERS_PER_PAGE,
+                page=page,
+                headers=headers,
+                timeout=TIMEOUT_IN_SECS,
+            )
+        except HTTPError as exc:
+            # urllib raises the 304 Not Modified responses as errors.
+            if exc.code == 304 and "If-None-Match" in headers:
+                return None
+            raise
+
+    def _prune_runners_pages(self, path: GitHubPath, prefix: str, num_of_pages: int) -> None:
+        """Remove the cached pages of runners past the last page.
+
+        Args:
+            path: GitHub repository path in the format '<owner>/<repo>', or the GitHub organization
+                name.
+            prefix: The prefix the runners of the pages were filtered by.
+            num_of_pages: The current number of pages.
+        """
+        cached_pages = self._runners_pages.get((_get_runners_url(path), prefix), {})
+        for page in [page for page in cached_pages if page > num_of_pages]:
+            del cached_pages[page]
 
     @catch_http_errors
+    @rate_limit_priority(Priority.CRITICAL)
     def get_runner_registration_jittoken(
         self, path: GitHubPath, instance_id: InstanceID, labels: list[str]
     ) -> tuple[str, SelfHostedRunner]:
@@ -211,6 +498,9 @@ class GithubClient:
             instance_id: Instance ID of the runner.
             labels: Labels for the runner.
 
+        Raises:
+            HTTPError: If the registration token could not be generated.
+
         Returns:
             The registration token.
         """
@@ -227,22 +517,45 @@ class GithubClient:
                 timeout=TIMEOUT_IN_SECS,
             )
         elif isinstance(path, GitHubOrg):
-            # We cannot cache it in here, as we are running in a forked process.
-            # Pending to review.
-            runner_group_id = self._get_runner_group_id(path)
-            token = self._client.actions.generate_runner_jitconfig_for_org(
-                org=path.org,
-                name=instance_id.name,
-                runner_group_id=runner_group_id,
-                labels=labels,
-                timeout=TIMEOUT_IN_SECS,
-            )
+            try:
+                token = self._client.actions.generate_runner_jitconfig_for_org(
+                    org=path.org,
+                    name=instance_id.name,
+                    runner_group_id=self._get_cached_runner_group_id(path),
+                    labels=labels,
+                    timeout=TIMEOUT_IN_SECS,
+                )
+            except HTTPError as exc:
+                # The runner group may have been removed, or recreated with another ID.
+                if exc.code in (404, 422):
+                    self._metadata_cache.invalidate(_get_runner_group_key(path))
+                raise
         else:
             assert_never(token)
 
         runner = SelfHostedRunner.build_from_github(token["runner"], instance_id)
         return token["encoded_jit_config"], runner
 
+    def _get_cached_runner_group_id(self, org: GitHubOrg) -> int:
+        """Get runner_group_id from group name for an org, from the cache if possible.
+
+        The cache is shared with the other processes of the manager, such as the processes
+        spawning runners and the reactive runners.
+
+        Args:
+            org: The GitHub organization and runner group.
+
+        Returns:
+            The ID of the runner group.
+        """
+        key = _get_runner_group_key(org)
+        runner_group_id = self._metadata_cache.get(key)
+        if isinstance(runner_group_id, int):
+            return runner_group_id
+        runner_group_id = self._get_runner_group_id(org)
+        self._metadata_cache.set(key, runner_group_id)
+        return runner_group_id
+
     def _get_runner_group_id(self, org: GitHubOrg) -> int:
         """Get runner_group_id from group name for an org.
 
@@ -258,7 +571,12 @@ class GithubClient:
             "Authorization": f"Bearer {self._token}",
             "X-GitHub-Api-Version": "2022-11-28",
         }
-        response = requests.get(url, headers=headers, timeout=TIMEOUT_IN_SECS)
+        GITHUB_RATE_LIMIT.acquire()
+        response = _session.get().get(url, headers=headers, timeout=TIMEOUT_IN_SECS)
+        GITHUB_RATE_LIMIT.update(
+            response.headers,
+            rate_limited=is_rate_limit_error(response.status_code, response.headers),
+        )
         response.raise_for_status()
         data = response.json()
         try:
@@ -273,6 +591,7 @@ class GithubClient:
         )
 
     @catch_http_errors
+    @rate_limit_priority(Priority.NORMAL)
     def delete_runner(self, path: GitHubPath, runner_id: int) -> None:
         """Delete the self-hosted runner from GitHub.
 
@@ -304,53 +623,94 @@ class GithubClient:
         except HTTP422UnprocessableEntityError as err:
             raise DeleteRunnerBusyError from err
 
+    @rate_limit_priority(Priority.BOOKKEEPING)
     def get_job_info_by_runner_name(
         self, path: GitHubRepo, workflow_run_id: str, runner_name: str
     ) -> JobInfo:
         """Get information about a job for a specific workflow run identified by the runner name.
 
+        The jobs of a workflow run are indexed by runner name and cached, as the runners of a
+        workflow run are usually deleted in the same reconcile. A cached job is only used if it
+        is completed, otherwise the jobs of the workflow run are listed again.
+
         Args:
             path: GitHub repository path in the format '<owner>/<repo>'.
             workflow_run_id: Id of the workflow run.
             runner_name: Name of the runner.
 
         Raises:
-            TokenError: if there was an error with the Github token credential provided.
             JobNotFoundError: If no jobs were found.
 
         Returns:
             Job information.
         """
+        key = (path.owner, path.repo, str(workflow_run_id))
+        jobs = self._workflow_run_jobs.get(key)
+        if jobs is not None and (job := jobs.get(runner_name)) is not None:
+            if job.status == JobStatus.COMPLETED:
+                GITHUB_JOB_CACHE_LOOKUPS.labels(GITHUB_JOB_CACHE_HIT).inc()
+                return job
+        GITHUB_JOB_CACHE_LOOKUPS.labels(GITHUB_JOB_CACHE_MISS).inc()
+
+        jobs = self._list_workflow_run_jobs(path=path, workflow_run_id=workflow_run_id)
+        self._workflow_run_jobs.set(key, jobs)
+        if (job := jobs.get(runner_name)) is None:
+            raise JobNotFoundError(f"Could not find job for runner {runner_name}.")
+        return job
+
+    def _list_workflow_run_jobs(
+        self, path: GitHubRepo, workflow_run_id: str
+    ) -> dict[str, JobInfo]:
+        """List the jobs of a workflow run that were assigned a runner.
+
+        Args:
+            path: GitHub repository path in the format '<owner>/<repo>'.
+            workflow_run_id: Id of the workflow run.
+
+        Raises:
+            RateLimitExceededError: If the GitHub API rate limit was exceeded.
+            TokenError: if there was an error with the Github token credential provided.
+            JobNotFoundError: If the jobs could not be listed.
+
+        Returns:
+            The jobs by runner name.
+        """
         paged_kwargs = {
             "owner": path.owner,
             "repo": path.repo,
             "run_id": workflow_run_id,
             "timeout": 60,
         }
+        jobs: dict[str, JobInfo] = {}
+        num_listed = 0
         try:
             for wf_run_page in paged(
                 self._client.actions.list_jobs_for_workflow_run, **paged_kwargs
             ):
-                jobs = wf_run_page["jobs"]
+                page_jobs = wf_run_page["jobs"]
                 # ghapi performs endless pagination,
                 # so we have to break out of the loop if there are no more jobs
-                if not jobs:
+                if not page_jobs:
+                    break
+                for job in page_jobs:
+                    # Jobs not yet picked up by a runner have no runner name nor start time.
+                    if job.get("runner_name") and job.get("started_at"):
+                        jobs[job["runner_name"]] = self._to_job_info(job)
+                num_listed += len(page_jobs)
+                if num_listed >= wf_run_page.get("total_count", float("inf")):
                     break
-                for job in jobs:
-                    if job["runner_name"] == runner_name:
-                        return self._to_job_info(job)
-
         except HTTPError as exc:
+            if is_rate_limit_error(exc.code, exc.headers):
+                raise RateLimitExceededError("GitHub API rate limit exceeded.") from exc
             if exc.code in (401, 403):
                 raise TokenError from exc
             raise JobNotFoundError(
-                f"Could not find job for runner {runner_name}. "
                 f"Could not list jobs for workflow run {workflow_run_id}"
             ) from exc
-
-        raise JobNotFoundError(f"Could not find job for runner {runner_name}.")
+        return jobs
 
     @catch_http_errors
+    @rate_limit_priority(Priority.CRITICAL)
     def get_job_info(self, path: GitHubRepo, job_id: str) -> JobInfo:
         """Get information about a job identified by the job id.
 
@@ -404,3 +764,67 @@ class GithubClient:
             conclusion=conclusion,
             status=status,
         )
+
+
+def _get_runner_group_key(org: GitHubOrg) -> str:
+    """Get the key of the ID of the runner group of an org in the metadata cache.
+
+    Args:
+        org: The GitHub organization and runner group.
+
+    Returns:
+        The key.
+    """
+    return f"runner-group-id/{org.org}/{org.group}"
+
+
+def _get_runners_url(path: GitHubPath) -> str:
+    """Get the URL listing the runners under a repo or org.
+
+    Args:
+        path: GitHub repository path in the format '<owner>/<repo>', or the GitHub organization
+            name.
+
+    Returns:
+        The URL, without the pagination parameters.
+    """
+    if isinstance(path, GitHubRepo):
+        return f"/repos/{path.owner}/{path.repo}/actions/runners"
+    return f"/orgs/{path.org}/actions/runners"
+
+
+def _get_header(headers: dict[str, str], name: str) -> str | None:
+    """Get a response header, ignoring the case of its name.
+
+    Args:
+        headers: The response headers.
+        name: The name of the header.
+
+    Returns:
+        The value of the header, or None if missing.
+    """
+    name = name.lower()
+    return next((value for key, value in headers.items() if key.lower() == name), None)
+
+
+def _raise_for_status(response: requests.Response) -> None:
+    """Raise the urllib HTTPError that GhApi raises for an error response.
+
+    As with urllib, the 304 Not Modified responses to conditional requests are raised too.
+
+    Args:
+        response: The response.
+
+    Raises:
+        HTTPError: If the response is an error or not modified, of the fastcore subclass for the
+            client errors.
+    """
+    if response.ok and response.status_code != HTTPStatus.NOT_MODIFIED:
+        return
+    msg = f"{response.reason}\n====Error Body====\n{response.text}"
+    headers = HTTPMessage()
+    for name, value in response.headers.items():
+        headers[name] = value
+    if response.status_code in ExceptionsHTTP:
+        raise ExceptionsHTTP[response.status_code](response.url, headers, None, msg=msg)
+    raise HTTPError(response.url, response.status_code, msg, headers, None)
@@ -0,0 +1,205 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Scheduling of the requests to the GitHub API within its rate limit."""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Iterator, Mapping
+
+from github_runner_manager.metrics.reconcile import (
+    GITHUB_RATE_LIMIT_LIMIT,
+    GITHUB_RATE_LIMIT_REMAINING,
+    GITHUB_RATE_LIMIT_RESET_TIMESTAMP,
+    GITHUB_RATE_LIMIT_SHED_REQUESTS,
+)
+from github_runner_manager.platform.platform_provider import PlatformApiError
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait after a secondary rate limit response without the Retry-After header.
+SECONDARY_RATE_LIMIT_WAIT = 60
+
+
+class Priority(IntEnum):
+    """Priority of a request to the GitHub API.
+
+    Attributes:
+        BOOKKEEPING: Optional requests that can be retried in a later reconcile, such as
+            collecting the job metrics.
+        NORMAL: Requests without a specific priority, such as listing the runners to reconcile.
+        CRITICAL: Requests needed to run the jobs, such as generating the JIT configuration of a
+            runner or checking if a job was picked up.
+    """
+
+    BOOKKEEPING = 0
+    NORMAL = 1
+    CRITICAL = 2
+
+
+# Fraction of the rate limit reserved for the requests of higher priority.
+_RESERVED_BUDGET = {Priority.BOOKKEEPING: 0.2, Priority.NORMAL: 0.05, Priority.CRITICAL: 0.0}
+# Maximum seconds a request waits for the rate limit to allow it, instead of being shed.
+_MAX_DELAY = {Priority.BOOKKEEPING: 0.0, Priority.NORMAL: 10.0, Priority.CRITICAL: 60.0}
+
+_priority: ContextVar[Priority] = ContextVar("github_request_priority", default=Priority.NORMAL)
+
+
+class RateLimitExceededError(PlatformApiError):
+    """Represents a request not sent, or rejected, due to the GitHub API rate limit."""
+
+
+@contextmanager
+def priority(request_priority: Priority) -> Iterator[None]:
+    """Set the priority of the requests to the GitHub API made in the context.
+
+    Args:
+        request_priority: The priority of the requests.
+    """
+    token = _priority.set(request_priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def is_rate_limit_error(code: int, headers: Mapping[str, str]) -> bool:
+    """Check if an error response of the GitHub API is due to the rate limit.
+
+    Args:
+        code: The HTTP status code of the response.
+        headers: The headers of the response.
+
+    Returns:
+        Whether the response is due to the rate limit.
+    """
+    lower_headers = _lower_keys(headers)
+    return code in (403, 429) and (
+        lower_headers.get("x-ratelimit-remaining") == "0" or "retry-after" in lower_headers
+    )
+
+
+class RateLimitScheduler:
+    """Admission of the requests to the GitHub API based on the remaining rate limit.
+
+    The budget is tracked from the rate limit headers of the responses. The requests of lower
+    priority are delayed or shed once the budget falls under the share reserved for the requests
+    of higher priority, so that these can still be made until the rate limit resets.
+    """
+
+    def __init__(self) -> None:
+        """Construct the object."""
+        self._lock = threading.Lock()
+        self._remaining: int | None = None
+        self._limit: int | None = None
+        self._reset_at = 0.0
+        self._blocked_until = 0.0
+
+    def acquire(self, request_priority: Priority | None = None) -> None:
+        """Wait for the rate limit to allow a request.
+
+        Args:
+            request_priority: The priority of the request. Defaults to the priority of the
+                context.
+
+        Raises:
+            RateLimitExceededError: The request would have to wait too long for its priority.
+        """
+        if request_priority is None:
+            request_priority = _priority.get()
+        while True:
+            with self._lock:
+                delay = self._get_delay(request_priority, time.time())
+                if delay <= 0:
+                    if self._remaining is not None:
+                        self._remaining -= 1
+                    return
+            if delay > _MAX_DELAY[request_priority]:
+                GITHUB_RATE_LIMIT_SHED_REQUESTS.labels(request_priority.name.lower()).inc()
+                raise RateLimitExceededError(
+                    f"GitHub API rate limit too low for {request_priority.name.lower()} requests,"
+                    f" retry in {delay:.0f} seconds."
+                )
+            logger.info("Delaying GitHub API request %.1f seconds for the rate limit", delay)
+            time.sleep(delay)
+
+    def update(self, headers: Mapping[str, str], rate_limited: bool = False) -> None:
+        """Update the budget from the headers of a response.
+
+        Args:
+            headers: The headers of the response.
+            rate_limited: Whether the response rejected the request due to the rate limit.
+        """
+        lower_headers = _lower_keys(headers)
+        remaining = _parse_int(lower_headers.get("x-ratelimit-remaining"))
+        limit = _parse_int(lower_headers.get("x-ratelimit-limit"))
+        reset_at = _parse_int(lower_headers.get("x-ratelimit-reset"))
+        retry_after = _parse_int(lower_headers.get("retry-after"))
+        now = time.time()
+        with self._lock:
+            if remaining is not None and limit is not None and reset_at is not None:
+                self._remaining, self._limit, self._reset_at = remaining, limit, float(reset_at)
+                GITHUB_RATE_LIMIT_REMAINING.set(remaining)
+                GITHUB_RATE_LIMIT_LIMIT.set(limit)
+                GITHUB_RATE_LIMIT_RESET_TIMESTAMP.set(reset_at)
+            if retry_after is not None:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+            elif rate_limited and remaining != 0:
+                # Secondary rate limit without a hint on when to retry.
+                self._blocked_until = max(self._blocked_until, now + SECONDARY_RATE_LIMIT_WAIT)
+        if rate_limited:
+            logger.warning("GitHub API rate limit exceeded, remaining requests: %s", remaining)
+
+    def _get_delay(self, request_priority: Priority, now: float) -> float:
+        """Get the seconds a request has to wait for the rate limit. Must hold the lock.
+
+        Args:
+            request_priority: The priority of the request.
+            now: The current time.
+
+        Returns:
+            The seconds to wait, zero or negative if the request is allowed.
+        """
+        if self._blocked_until > now:
+            return self._blocked_until - now
+        if self._remaining is None or self._limit is None or now >= self._reset_at:
+            return 0.0
+        reserved = self._limit * _RESERVED_BUDGET[request_priority]
+        if self._remaining <= reserved:
+            return self._reset_at - now
+        return 0.0
+
+
+def _lower_keys(headers: Mapping[str, str]) -> dict[str, str]:
+    """Get the headers with the names in lower case.
+
+    Args:
+        headers: The headers.
+
+    Returns:
+        The headers by lower case name.
+    """
+    return {key.lower(): value for key, value in headers.items()}
+
+
+def _parse_int(value: str | None) -> int | None:
+    """Parse an integer header value.
+
+    Args:
+        value: The value of the header.
+
+    Returns:
+        The integer, or None if missing or invalid.
+    """
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+# Shared by all the clients of the GitHub API in the process.
+GITHUB_RATE_LIMIT = RateLimitScheduler()
@@ -17,10 +17,14 @@ from prometheus_client import generate_latest
 from github_runner_manager.configuration import ApplicationConfiguration
 from github_runner_manager.errors import CloudError, LockError
 from github_runner_manager.manager.runner_manager import FlushMode
-from github_runner_manager.reconcile_service import get_runner_scaler
+from github_runner_manager.metrics.runner import MAX_METRICS_FILE_SIZE
+from github_runner_manager.metrics.spool import RunnerMetricsSpool, SpoolError
+from github_runner_manager.reconcile_service import RunnerScalerProvider
 
 APP_CONFIG_NAME = "app_config"
 OPENSTACK_CONFIG_NAME = "openstack_config"
+RUNNER_SCALER_PROVIDER_NAME = "runner_scaler_provider"
+RUNNER_METRICS_SPOOL_NAME = "runner_metrics_spool"
 
 app = Flask(__name__)
 
@@ -47,7 +51,7 @@ def check_runner() -> tuple[str, int]:
     """
     app_config: ApplicationConfiguration = app.config[APP_CONFIG_NAME]
     app.logger.info("Checking runners...")
-    runner_scaler = get_runner_scaler(app_config)
+    runner_scaler = _get_runner_scaler_provider().get(app_config)
     try:
         runner_info = runner_scaler.get_runner_info()
     except CloudError as err:
@@ -76,7 +80,7 @@ def flush_runner() -> tuple[str, int]:
     lock = _get_lock()
     with lock:
         app.logger.info("Flushing runners...")
-        runner_scaler = get_runner_scaler(app_config)
+        runner_scaler = _get_runner_scaler_provider().get(app_config)
         app.logger.info("Flushing busy: %s", flush_busy)
         flush_mode = FlushMode.FLUSH_BUSY if flush_busy else FlushMode.FLUSH_IDLE
         try:
@@ -88,6 +92,57 @@ def flush_runner() -> tuple[str, int]:
     return ("", 204)
 
 
+@app.route("/runner/<runner_name>/metrics/<kind>", methods=["POST"])
+def push_runner_metrics(runner_name: str, kind: str) -> tuple[str, int]:
+    """Store a metric file pushed by a runner.
+
+    The runner authenticates with its token in the bearer authorization header. The route is
+    disabled unless runner_metrics_url is configured, which the charm does not do yet: the
+    server only listens on 127.0.0.1, out of reach of the runners.
+
+    Args:
+        runner_name: The name of the runner.
+        kind: The kind of metric file: runner-installed, pre-job or post-job.
+
+    Returns:
+        A empty response.
+    """
+    app_config: ApplicationConfiguration = app.config[APP_CONFIG_NAME]
+    if not app_config.service_config.runner_metrics_url:
+        return ("Runner metrics push not enabled", 404)
+    spool: RunnerMetricsSpool = app.config[RUNNER_METRICS_SPOOL_NAME]
+
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    try:
+        authorized = scheme == "Bearer" and spool.verify_token(runner_name, token)
+    except SpoolError:
+        authorized = False
+    if not authorized:
+        return ("", 401)
+    # Read no more than the size limit, whatever the size declared by the request.
+    content = request.stream.read(MAX_METRICS_FILE_SIZE + 1)
+    if len(content) > MAX_METRICS_FILE_SIZE:
+        return ("Metric file too large", 413)
+
+    try:
+        spool.write(runner_name, kind, content)
+    except SpoolError as err:
+        return (str(err), 404)
+    except OSError:
+        app.logger.exception("Failed to spool metrics of %s", runner_name)
+        return ("Failed to store the metric file", 500)
+    return ("", 204)
+
+
+def _get_runner_scaler_provider() -> RunnerScalerProvider:
+    """Get the provider of the RunnerScaler shared with the reconcile service.
+
+    Returns:
+        The RunnerScaler provider.
+    """
+    return app.config[RUNNER_SCALER_PROVIDER_NAME]
+
+
 def _get_lock() -> Lock:
     """Get the lock representing modification access to the set of runners.
 
@@ -131,6 +186,7 @@ class FlaskArgs:
 
 def start_http_server(
     app_config: ApplicationConfiguration,
+    runner_scaler_provider: RunnerScalerProvider,
     lock: Lock,
     flask_args: FlaskArgs,
 ) -> None:
@@ -138,6 +194,7 @@ def start_http_server(
 
     Args:
         app_config: The application configuration.
+        runner_scaler_provider: Provider of the RunnerScaler shared with the reconcile service.
         lock: The lock representing modification access to the managed set of runners.
         flask_args: The arguments for the flask HTTP server.
     """
@@ -146,6 +203,8 @@ def start_http_server(
     global _lock  # pylint: disable=global-statement
     _lock = lock
     app.config[APP_CONFIG_NAME] = app_config
+    app.config[RUNNER_SCALER_PROVIDER_NAME] = runner_scaler_provider
+    app.config[RUNNER_METRICS_SPOOL_NAME] = RunnerMetricsSpool()
     app.run(
         host=flask_args.host,
         port=flask_args.port,
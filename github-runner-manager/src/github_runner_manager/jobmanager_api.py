@@ -9,6 +9,12 @@ from jobmanager_client.exceptions import ApiException, NotFoundException
 from pydantic import BaseModel
 from urllib3.exceptions import RequestError
 
+from github_runner_manager.concurrency import MAX_CONCURRENCY
+from github_runner_manager.utilities import ProcessLocal
+
+# Seconds to wait for the health of the runners.
+HEALTH_REQUEST_TIMEOUT = 10
+
 
 class JobManagerAPIError(Exception):
     """Base exception for JobManager API errors."""
@@ -18,6 +24,10 @@ class JobManagerAPINotFoundError(JobManagerAPIError):
     """Exception raised when a runner is not found in the JobManager API."""
 
 
+class JobManagerAPIUnsupportedError(JobManagerAPIError):
+    """Exception raised when the JobManager API server does not support a request."""
+
+
 class JobStatus(str, Enum):
     """Status of a job on the JobManager.
 
@@ -81,8 +91,8 @@ class JobManagerAPI:
 
     # The job manager api uses an autogenerated api client that uses urllib3 connection pools
     # that are not multiprocessing safe: https://github.com/urllib3/urllib3/issues/850
-    # Therefore, we create a new ApiClient for each request and close resources
-    # to avoid issues with multiprocessing in the application.
+    # Therefore, each process creates its own ApiClient on first use, and reuses its keep-alive
+    # connections for the following requests.
 
     def __init__(self, token: str, url: str):
         """Initialize the JobManagerAPI with a token and URL.
@@ -93,6 +103,9 @@ class JobManagerAPI:
         """
         self._token = token
         self.url = url
+        self._api_client = ProcessLocal(self._create_api_client)
+        # Unknown until the bulk health request is sent to the server.
+        self._bulk_health_supported: bool | None = None
 
     def get_runner_health(self, runner_id: int) -> RunnerHealth:
         """Fetch the health status of a runner by its ID from the JobManager API.
@@ -107,19 +120,63 @@ class JobManagerAPI:
         Returns:
             RunnerHealth: The health status of the runner.
         """
-        with self._create_api_client() as api_client:
-            runners_api = jobmanager_client.RunnersApi(api_client=api_client)
-            try:
-                response = runners_api.get_runner_health_v1_runners_runner_id_health_get(runner_id)
-            except NotFoundException as err:
-                raise JobManagerAPINotFoundError(
-                    f"Health for runner with ID {runner_id} not found in JobManager API."
-                ) from err
-            except (ApiException, RequestError, ValueError) as exc:
-                raise JobManagerAPIError(
-                    f"Error fetching runner health for ID {runner_id}: {exc}"
-                ) from exc
-            return RunnerHealth(status=response.status, deletable=response.deletable)
+        runners_api = jobmanager_client.RunnersApi(api_client=self._api_client.get())
+        try:
+            response = runners_api.get_runner_health_v1_runners_runner_id_health_get(
+                runner_id, _request_timeout=HEALTH_REQUEST_TIMEOUT
+            )
+        except NotFoundException as err:
+            raise JobManagerAPINotFoundError(
+                f"Health for runner with ID {runner_id} not found in JobManager API."
+            ) from err
+        except (ApiException, RequestError, ValueError) as exc:
+            raise JobManagerAPIError(
+                f"Error fetching runner health for ID {runner_id}: {exc}"
+            ) from exc
+        return RunnerHealth(status=response.status, deletable=response.deletable)
+
+    def get_runners_health(self, runner_ids: list[int]) -> dict[int, RunnerHealth]:
+        """Fetch the health status of several runners in a single request.
+
+        Args:
+            runner_ids: The IDs of the runners to fetch health status for.
+
+        Raises:
+            JobManagerAPIUnsupportedError: If the server does not support the bulk health request.
+            JobManagerAPIError: If there is an error fetching the runners health.
+
+        Returns:
+            The health status of the runners found in the JobManager API, by runner ID.
+        """
+        if self._bulk_health_supported is False:
+            raise JobManagerAPIUnsupportedError("Bulk runner health not supported.")
+        try:
+            response = self._api_client.get().call_api(
+                "/v1/runners/health",
+                "POST",
+                header_params={"Accept": "application/json", "Content-Type": "application/json"},
+                body={"runner_ids": runner_ids},
+                response_types_map={"200": "object"},
+                _return_http_data_only=True,
+                _request_timeout=HEALTH_REQUEST_TIMEOUT,
+            )
+        except ApiException as exc:
+            if exc.status in (404, 405):
+                self._bulk_health_supported = False
+                raise JobManagerAPIUnsupportedError("Bulk runner health not supported.") from exc
+            raise JobManagerAPIError(f"Error fetching runners health: {exc}") from exc
+        except (RequestError, ValueError) as exc:
+            raise JobManagerAPIError(f"Error fetching runners health: {exc}") from exc
+        self._bulk_health_supported = True
+        try:
+            return {
+                int(runner["id"]): RunnerHealth(
+                    status=runner["status"], deletable=runner["deletable"]
+                )
+                for runner in response["runners"]
+            }
+        except (KeyError, TypeError, ValueError) as exc:
+            raise JobManagerAPIError(f"Invalid runners health response: {exc}") from exc
 
     def register_runner(self, name: str, labels: list[str]) -> RunnerRegistration:
         """Register a new runner with the JobManager API.
@@ -134,17 +191,16 @@ class JobManagerAPI:
         Raises:
             JobManagerAPIError: If there is an error registering the runner.
         """
-        with self._create_api_client() as api_client:
-            runners_api = jobmanager_client.RunnersApi(api_client=api_client)
-            runner_register_request = jobmanager_client.RunnerCreate(name=name, labels=labels)
+        runners_api = jobmanager_client.RunnersApi(api_client=self._api_client.get())
+        runner_register_request = jobmanager_client.RunnerCreate(name=name, labels=labels)
 
-            try:
-                response = runners_api.register_runner_v1_runners_register_post(
-                    runner_register_request
-                )
-            except (ApiException, RequestError, ValueError) as exc:
-                raise JobManagerAPIError(f"Error registering runner: {exc}") from exc
-            return RunnerRegistration(id=response.id, token=response.token)
+        try:
+            response = runners_api.register_runner_v1_runners_register_post(
+                runner_register_request
+            )
+        except (ApiException, RequestError, ValueError) as exc:
+            raise JobManagerAPIError(f"Error registering runner: {exc}") from exc
+        return RunnerRegistration(id=response.id, token=response.token)
 
     def get_job(self, job_id: int) -> Job:
         """Fetch a job by its ID from the JobManager API.
@@ -159,26 +215,27 @@ class JobManagerAPI:
             JobManagerAPINotFoundError: If the job with the given ID is not found.
             JobManagerAPIError: If there is an error fetching the job.
         """
-        with self._create_api_client() as api_client:
-            jobs_api = jobmanager_client.JobsApi(api_client=api_client)
-            try:
-                response = jobs_api.get_job_v1_jobs_job_id_get(job_id)
-            except NotFoundException as err:
-                raise JobManagerAPINotFoundError(
-                    f"Job with ID {job_id} not found in JobManager API."
-                ) from err
-            except (ApiException, RequestError, ValueError) as exc:
-                raise JobManagerAPIError(f"Error fetching job with ID {job_id}: {exc}") from exc
-            return Job(status=response.status)
+        jobs_api = jobmanager_client.JobsApi(api_client=self._api_client.get())
+        try:
+            response = jobs_api.get_job_v1_jobs_job_id_get(job_id)
+        except NotFoundException as err:
+            raise JobManagerAPINotFoundError(
+                f"Job with ID {job_id} not found in JobManager API."
+            ) from err
+        except (ApiException, RequestError, ValueError) as exc:
+            raise JobManagerAPIError(f"Error fetching job with ID {job_id}: {exc}") from exc
+        return Job(status=response.status)
 
     def _create_api_client(self) -> jobmanager_client.ApiClient:
-        """Create a new API client for the JobManager API.
+        """Create a new API client for the JobManager API, used by the current process.
 
         Returns:
             jobmanager_client.ApiClient: A new API client configured with the JobManager
             API URL and token.
         """
         config = jobmanager_client.Configuration(host=self.url)
+        # Keep alive a connection per concurrent request.
+        config.connection_pool_maxsize = MAX_CONCURRENCY
         api_client = jobmanager_client.ApiClient(configuration=config)
         api_client.set_default_header("Authorization", f"Bearer {self._token}")
         return api_client
@@ -3,16 +3,21 @@
 
 """Module for managing the GitHub self-hosted runners hosted on cloud instances."""
 
+import concurrent.futures
 import copy
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum, auto
 from functools import partial
-from multiprocessing import Pool
 from typing import Iterable, Iterator, Sequence, Type, cast
 
 from github_runner_manager import constants
-from github_runner_manager.errors import GithubMetricsError, RunnerError
+from github_runner_manager.concurrency import MAX_CONCURRENCY
+from github_runner_manager.errors import (
+    GithubMetricsError,
+    IssueMetricEventError,
+    RunnerError,
+)
 from github_runner_manager.manager.models import InstanceID, RunnerIdentity, RunnerMetadata
 from github_runner_manager.manager.vm_manager import VM, CloudRunnerManager, HealthState, VMState
 from github_runner_manager.metrics import events as metric_events
@@ -116,6 +121,83 @@ class RunnerInstance:
         )
 
 
+@dataclass
+class RunnerInventory:
+    """Snapshot of the runners in the cloud and in the platform for one reconcile cycle.
+
+    The snapshot is taken once per cycle and updated in place as runners are created and
+    deleted, so that the cleanup, the scaling decisions and the metrics of a cycle do not
+    need to query the cloud and the platform provider again.
+
+    Attributes:
+        cloud_runners: The VMs in the cloud, by instance ID.
+        health: The health of the runners in the platform, by instance ID.
+        non_requested_runners: Runners in the platform without a VM in the cloud.
+    """
+
+    cloud_runners: dict[InstanceID, VM] = field(default_factory=dict)
+    health: dict[InstanceID, PlatformRunnerHealth] = field(default_factory=dict)
+    non_requested_runners: list[RunnerIdentity] = field(default_factory=list)
+
+    def get_runners(self) -> tuple[RunnerInstance, ...]:
+        """Get the runners in the snapshot with health information.
+
+        Returns:
+            Information on the runners.
+        """
+        return tuple(
+            RunnerInstance.from_cloud_and_platform_health(
+                cloud_instance=cloud_runner,
+                platform_health_state=self.health.get(instance_id),
+            )
+            for instance_id, cloud_runner in self.cloud_runners.items()
+        )
+
+    def add_runners(self, cloud_runners: Iterable[VM]) -> None:
+        """Add newly created runners to the snapshot.
+
+        The new runners have no health information, as the platform has not been queried
+        for them.
+
+        Args:
+            cloud_runners: The VMs created.
+        """
+        for cloud_runner in cloud_runners:
+            self.cloud_runners[cloud_runner.instance_id] = cloud_runner
+
+    def remove_runners(self, instance_ids: Iterable[InstanceID]) -> None:
+        """Remove deleted runners from the snapshot.
+
+        Args:
+            instance_ids: The instance IDs of the deleted VMs.
+        """
+        for instance_id in instance_ids:
+            self.cloud_runners.pop(instance_id, None)
+            self.health.pop(instance_id, None)
+
+    def remove_platform_runners(self, runner_ids: Iterable[str]) -> None:
+        """Mark runners deleted from the platform in the snapshot.
+
+        Args:
+            runner_ids: The platform IDs of the deleted runners.
+        """
+        deleted_runner_ids = set(runner_ids)
+        self.non_requested_runners = [
+            runner
+            for runner in self.non_requested_runners
+            if runner.metadata.runner_id not in deleted_runner_ids
+        ]
+        for instance_id, health in list(self.health.items()):
+            if health.identity.metadata.runner_id in deleted_runner_ids:
+                self.health[instance_id] = PlatformRunnerHealth(
+                    identity=health.identity,
+                    online=False,
+                    busy=False,
+                    deletable=True,
+                    runner_in_platform=False,
+                )
+
+
 class RunnerManager:
     """Manage the runners.
 
@@ -145,8 +227,12 @@ class RunnerManager:
         self._platform: PlatformProvider = platform_provider
         self._labels = labels
 
-    def create_runners(
-        self, num: int, metadata: RunnerMetadata, reactive: bool = False
+    def create_runners(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self,
+        num: int,
+        metadata: RunnerMetadata,
+        reactive: bool = False,
+        inventory: RunnerInventory | None = None,
     ) -> tuple[InstanceID, ...]:
         """Create runners.
 
@@ -154,6 +240,7 @@ class RunnerManager:
             num: Number of runners to create.
             metadata: Metadata information for the runner.
             reactive: If the runner is reactive.
+            inventory: Snapshot of the runners to update with the created runners.
 
         Returns:
             List of instance ID of the runners.
@@ -176,51 +263,80 @@ class RunnerManager:
             )
             for _ in range(num)
         ]
-        return RunnerManager._spawn_runners(create_runner_args)
+        instance_ids = []
+        for cloud_runner in RunnerManager._spawn_runners(create_runner_args):
+            if inventory is not None:
+                inventory.add_runners((cloud_runner,))
+            instance_ids.append(cloud_runner.instance_id)
+        return tuple(instance_ids)
 
-    def get_runners(self) -> tuple[RunnerInstance, ...]:
-        """Get runners with health information.
+    def get_inventory(self) -> RunnerInventory:
+        """Take a snapshot of the runners in the cloud and in the platform.
+
+        The cloud and the platform provider are queried once.
 
         Returns:
-            Information on the runners.
+            The snapshot of the runners.
         """
-        logger.debug("runner_manager::get_runners")
         cloud_runners = self._cloud.get_runners()
-        runners_health_response = self._platform.get_runners_health(cloud_runners)
         logger.info("clouds runners response %s", cloud_runners)
+        runners_health_response = self._platform.get_runners_health(
+            requested_runners=cloud_runners
+        )
         logger.info("runner health response %s", runners_health_response)
-        runners_health = runners_health_response.requested_runners
-        health_runners_map = {runner.identity.instance_id: runner for runner in runners_health}
-        return tuple(
-            RunnerInstance.from_cloud_and_platform_health(
-                cloud_instance=cloud_runner,
-                platform_health_state=health_runners_map.get(cloud_runner.instance_id, None),
-            )
-            for cloud_runner in cloud_runners
+        return RunnerInventory(
+            cloud_runners={
+                cloud_runner.instance_id: cloud_runner for cloud_runner in cloud_runners
+            },
+            health={
+                health.identity.instance_id: health
+                for health in runners_health_response.requested_runners
+            },
+            non_requested_runners=list(runners_health_response.non_requested_runners),
         )
 
-    def delete_runners(self, num: int) -> IssuedMetricEventsStats:
+    def get_runners(self, inventory: RunnerInventory | None = None) -> tuple[RunnerInstance, ...]:
+        """Get runners with health information.
+
+        Args:
+            inventory: Snapshot of the runners to use. If not provided, a new one is taken.
+
+        Returns:
+            Information on the runners.
+        """
+        logger.debug("runner_manager::get_runners")
+        if inventory is None:
+            inventory = self.get_inventory()
+        return inventory.get_runners()
+
+    def delete_runners(
+        self, num: int, inventory: RunnerInventory | None = None
+    ) -> IssuedMetricEventsStats:
         """Delete runners.
 
         Args:
             num: The number of runner to delete.
+            inventory: Snapshot of the runners to use. If not provided, a new one is taken.
 
         Returns:
             Stats on metrics events issued during the deletion of runners.
         """
         logger.info("runner_manager::delete_runners Deleting %s runners", num)
         extracted_runner_metrics = self._cleanup_resources(
-            force_delete=True, maximum_runners_to_delete=num
+            force_delete=True, maximum_runners_to_delete=num, inventory=inventory
         )
         return self._issue_runner_metrics(metrics=iter(extracted_runner_metrics))
 
     def flush_runners(
-        self, flush_mode: FlushMode = FlushMode.FLUSH_IDLE
+        self,
+        flush_mode: FlushMode = FlushMode.FLUSH_IDLE,
+        inventory: RunnerInventory | None = None,
     ) -> IssuedMetricEventsStats:
         """Delete runners according to state.
 
         Args:
             flush_mode: The type of runners affect by the deletion.
+            inventory: Snapshot of the runners to use. If not provided, a new one is taken.
 
         Returns:
             Stats on metrics events issued during the deletion of runners.
@@ -241,18 +357,21 @@ class RunnerManager:
             flush_busy = True
 
         extracted_runner_metrics = self._cleanup_resources(
-            clean_idle=True, force_delete=flush_busy
+            clean_idle=True, force_delete=flush_busy, inventory=inventory
         )
         return self._issue_runner_metrics(metrics=iter(extracted_runner_metrics))
 
-    def cleanup(self) -> IssuedMetricEventsStats:
+    def cleanup(self, inventory: RunnerInventory | None = None) -> IssuedMetricEventsStats:
         """Run cleanup of the runners and other resources.
 
+        Args:
+            inventory: Snapshot of the runners to use. If not provided, a new one is taken.
+
         Returns:
             Stats on metrics events issued during the cleanup of runners.
         """
         logger.info("runner_manager::cleanup")
-        deleted_runner_metrics = self._cleanup_resources()
+        deleted_runner_metrics = self._cleanup_resources(inventory=inventory)
         return self._issue_runner_metrics(metrics=iter(deleted_runner_metrics))
 
     def _cleanup_resources(
@@ -260,6 +379,7 @@ class RunnerManager:
         clean_idle: bool = False,
         force_delete: bool = False,
         maximum_runners_to_delete: int | None = None,
+        inventory: RunnerInventory | None = None,
     ) -> Iterable[runner_metrics.RunnerMetrics]:
         """Cleanup the indicated runners in the platform and in the cloud."""
         logger.info(
@@ -267,25 +387,16 @@ class RunnerManager:
             clean_idle,
             force_delete,
         )
-        cloud_runners = self._cloud.get_runners()
-        logger.info("cleanup cloud_runners %s", cloud_runners)
-        runners_health_response = self._platform.get_runners_health(
-            requested_runners=cloud_runners
-        )
-        logger.info("cleanup health_response %s", runners_health_response)
+        if inventory is None:
+            inventory = self.get_inventory()
 
         # Clean dangling resources in the cloud
         self._cloud.cleanup()
 
         # Always clean all runners in the platform that are not in the cloud
-        self._clean_platform_runners(runners_health_response.non_requested_runners)
-
-        cloud_runners_to_delete = list(cloud_runners)
-        health_runners_map = {
-            health.identity.instance_id: health
-            for health in runners_health_response.requested_runners
-        }
+        self._clean_platform_runners(inventory)
 
+        health_runners_map = inventory.health
         cloud_runners_to_delete = list(
             filter(
                 lambda cloud_runner: _filter_runner_to_delete(
@@ -294,7 +405,7 @@ class RunnerManager:
                     clean_idle=clean_idle,
                     force_delete=force_delete,
                 ),
-                cloud_runners_to_delete,
+                inventory.cloud_runners.values(),
             )
         )
 
@@ -306,14 +417,14 @@ class RunnerManager:
 
         return self._delete_cloud_runners(
             cloud_runners_to_delete,
-            runners_health_response.requested_runners,
+            inventory,
             delete_busy_runners=force_delete,
         )
 
     def _delete_cloud_runners(
         self,
         cloud_runners: Sequence[VM],
-        runners_health: Sequence[PlatformRunnerHealth],
+        inventory: RunnerInventory,
         delete_busy_runners: bool = False,
     ) -> Iterable[runner_metrics.RunnerMetrics]:
         """Delete runners in the platform and the cloud.
@@ -322,13 +433,15 @@ class RunnerManager:
         runner because it can be busy, will mean that that runner should not be deleted.
 
         Runners without health information should not be deleted.
+
+        The inventory is updated with the runners deleted.
         """
         if not cloud_runners:
             return []
 
         runner_identity_map = {
-            health_info.identity.instance_id: health_info.identity
-            for health_info in runners_health
+            instance_id: health_info.identity
+            for instance_id, health_info in inventory.health.items()
         }
         platform_runner_ids_to_delete = [
             # The runner_id cannot be None due to the if condition. the type system
@@ -347,6 +460,7 @@ class RunnerManager:
             deleted_runner_ids,
             set(platform_runner_ids_to_delete) - set(deleted_runner_ids),
         )
+        inventory.remove_platform_runners(deleted_runner_ids)
 
         logger.info("Cloud runners: %s", cloud_runners)
         cloud_vm_ids_to_delete = [
@@ -369,27 +483,32 @@ class RunnerManager:
             deleted_vm_ids,
             set(cloud_vm_ids_to_delete) - set(deleted_vm_ids),
         )
+        inventory.remove_runners(deleted_vm_ids)
         return tuple(extracted_metrics)
 
-    def _clean_platform_runners(self, runners: list[RunnerIdentity]) -> None:
-        """Clean the specified runners in the platform."""
-        if not runners:
+    def _clean_platform_runners(self, inventory: RunnerInventory) -> None:
+        """Clean the runners in the platform that are not in the cloud."""
+        if not inventory.non_requested_runners:
             return
 
         runner_ids_to_delete = [
-            runner.metadata.runner_id for runner in runners if runner.metadata.runner_id
+            runner.metadata.runner_id
+            for runner in inventory.non_requested_runners
+            if runner.metadata.runner_id
         ]
-        self._platform.delete_runners(runner_ids=runner_ids_to_delete)
+        deleted_runner_ids = self._platform.delete_runners(runner_ids=runner_ids_to_delete)
+        inventory.remove_platform_runners(deleted_runner_ids)
 
     @staticmethod
     def _spawn_runners(
         create_runner_args_sequence: Sequence["RunnerManager._CreateRunnerArgs"],
-    ) -> tuple[InstanceID, ...]:
-        """Spawn runners in parallel using multiprocessing.
+    ) -> Iterator[VM]:
+        """Spawn runners in parallel using threads.
 
-        Multiprocessing is only used if there are more than one runner to spawn. Otherwise,
-        the runner is created in the current process, which is required for reactive,
-        where we don't assume to spawn another process inside the reactive process.
+        The creation of a runner is mostly waiting on the platform and cloud APIs, so threads
+        are used, sharing the API connections and caches of this process. The calls to each API
+        are limited by its adaptive concurrency limit. A thread is only used if there are more
+        than one runner to spawn.
 
         The length of the create_runner_args is number _create_runner invocation, and therefore the
         number of runner spawned.
@@ -397,51 +516,35 @@ class RunnerManager:
         Args:
             create_runner_args_sequence: Sequence of args for invoking _create_runner method.
 
-        Returns:
-            A tuple of instance ID's of runners spawned.
+        Yields:
+            The VM of each runner spawned, as soon as it is created.
         """
         num = len(create_runner_args_sequence)
 
         if num == 1:
             try:
-                return (RunnerManager._create_runner(create_runner_args_sequence[0]),)
+                yield RunnerManager._create_runner(create_runner_args_sequence[0])
             except (RunnerError, PlatformApiError):
                 logger.exception("Failed to spawn a runner.")
-                return tuple()
-
-        return RunnerManager._spawn_runners_using_multiprocessing(create_runner_args_sequence, num)
-
-    @staticmethod
-    def _spawn_runners_using_multiprocessing(
-        create_runner_args_sequence: Sequence["RunnerManager._CreateRunnerArgs"], num: int
-    ) -> tuple[InstanceID, ...]:
-        """Parallel spawn of runners.
-
-        The length of the create_runner_args is number _create_runner invocation, and therefore the
-        number of runner spawned.
-
-        Args:
-            create_runner_args_sequence: Sequence of args for invoking _create_runner method.
-            num: The number of runners to spawn.
+            return
 
-        Returns:
-            A tuple of instance ID's of runners spawned.
-        """
-        instance_id_list = []
-        with Pool(processes=min(num, 30)) as pool:
-            jobs = pool.imap_unordered(
-                func=RunnerManager._create_runner, iterable=create_runner_args_sequence
-            )
-            for _ in range(num):
-                try:
-                    instance_id = next(jobs)
-                except (RunnerError, PlatformApiError):
-                    logger.exception("Failed to spawn a runner.")
-                except StopIteration:
-                    break
-                else:
-                    instance_id_list.append(instance_id)
-        return tuple(instance_id_list)
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(num, MAX_CONCURRENCY), thread_name_prefix="spawn-runner"
+        ) as executor:
+            futures = [
+                executor.submit(RunnerManager._create_runner, create_runner_args)
+                for create_runner_args in create_runner_args_sequence
+            ]
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    try:
+                        yield future.result()
+                    except (RunnerError, PlatformApiError):
+                        logger.exception("Failed to spawn a runner.")
+            finally:
+                # If the caller stops early, do not start the runners still waiting for a thread.
+                for future in futures:
+                    future.cancel()
 
     def _issue_runner_metrics(self, metrics: Iterator[RunnerMetrics]) -> IssuedMetricEventsStats:
         """Issue runner metrics.
@@ -450,7 +553,7 @@ class RunnerManager:
             metrics: Runner metrics to issue.
 
         Returns:
-            Stats on runner metrics issued.
+            Stats on runner metrics issued and written to the metrics log.
         """
         total_stats: IssuedMetricEventsStats = {}
 
@@ -486,13 +589,20 @@ class RunnerManager:
             for event_type in issued_events:
                 total_stats[event_type] = total_stats.get(event_type, 0) + 1
 
+        # The buffered events are only counted as issued once written to the metrics log.
+        if total_stats:
+            try:
+                metric_events.flush_events()
+            except IssueMetricEventError:
+                logger.exception("Failed to write the metric events, they are not counted")
+                return {}
         return total_stats
 
     @dataclass
     class _CreateRunnerArgs:
         """Arguments for the _create_runner function.
 
-        These arguments are used in the forked processes and should be reviewed.
+        These arguments are shared by the spawn threads and should be reviewed.
 
         Attrs:
             cloud_runner_manager: For managing the cloud instance of the runner.
@@ -509,16 +619,16 @@ class RunnerManager:
         reactive: bool
 
     @staticmethod
-    def _create_runner(args: _CreateRunnerArgs) -> InstanceID:
+    def _create_runner(args: _CreateRunnerArgs) -> VM:
         """Create a single runner.
 
-        This is a staticmethod for usage with multiprocess.Pool.
+        This is a staticmethod for usage with the spawn threads.
 
         Args:
             args: The arguments.
 
         Returns:
-            The instance ID of the runner created.
+            The VM of the runner created.
 
         Raises:
             RunnerError: On error creating OpenStack runner.
@@ -534,7 +644,7 @@ class RunnerManager:
 
         runner_identity = RunnerIdentity(instance_id=instance_id, metadata=args.metadata)
         try:
-            args.cloud_runner_manager.create_runner(
+            return args.cloud_runner_manager.create_runner(
                 runner_identity=runner_identity,
                 runner_context=runner_context,
             )
@@ -542,7 +652,6 @@ class RunnerManager:
             logger.warning("Deleting runner %s from platform after creation failed", instance_id)
             args.platform_provider.delete_runners(runner_ids=[args.metadata.runner_id])
             raise
-        return instance_id
 
 
 def _filter_runner_to_delete(
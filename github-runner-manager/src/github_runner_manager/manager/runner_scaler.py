@@ -16,10 +16,12 @@ from github_runner_manager.errors import (
     MissingServerConfigError,
     ReconcileError,
 )
+from github_runner_manager.github_rate_limit import RateLimitExceededError
 from github_runner_manager.manager.runner_manager import (
     FlushMode,
     IssuedMetricEventsStats,
     RunnerInstance,
+    RunnerInventory,
     RunnerManager,
     RunnerMetadata,
 )
@@ -38,7 +40,8 @@ from github_runner_manager.openstack_cloud.openstack_runner_manager import (
 )
 from github_runner_manager.platform.factory import platform_factory
 from github_runner_manager.platform.platform_provider import Platform, PlatformRunnerState
-from github_runner_manager.reactive.types_ import ReactiveProcessConfig
+from github_runner_manager.reactive.scaling import ReactiveScalingPolicy
+from github_runner_manager.reactive.types_ import ReactiveProcessConfig, ReactiveRouteConfig
 
 logger = logging.getLogger(__name__)
 
@@ -99,7 +102,7 @@ class _ReconcileMetricData:
     expected_runner_quantity: int
 
 
-class RunnerScaler:
+class RunnerScaler:  # pylint: disable=too-many-instance-attributes
     """Manage the reconcile of runners."""
 
     # Disable too many locals due to this function is collecting and processing configurations.
@@ -171,6 +174,14 @@ class RunnerScaler:
                 cloud_runner_manager=openstack_runner_manager_config,
                 supported_labels=supported_labels,
                 labels=labels,
+                daemon=reactive_config.daemon,
+                pick_up_poll=reactive_config.pick_up_poll,
+                routes=(
+                    _build_reactive_routes(application_configuration)
+                    if len(combinations) > 1
+                    else []
+                ),
+                metric_events=application_configuration.metric_events,
             )
             max_quantity = reactive_config.max_total_virtual_machines
         return cls(
@@ -218,6 +229,13 @@ class RunnerScaler:
         self._max_quantity = max_quantity
         self._platform_name = platform_name
         self._python_path = python_path
+        # Only the reactive daemon takes new jobs as soon as they arrive with few consumers. A
+        # reactive process handles a single job, so one waits for each job that may arrive.
+        self._scaling_policy = (
+            ReactiveScalingPolicy()
+            if reactive_process_config is not None and reactive_process_config.daemon
+            else None
+        )
 
         EXPECTED_RUNNERS_COUNT.labels(self._manager.manager_name).set(self._base_quantity)
 
@@ -266,10 +284,15 @@ class RunnerScaler:
         Returns:
             Number of runners flushed.
         """
-        metric_stats = self._manager.cleanup()
+        # The reactive processes are killed before the inventory is taken, so that the runners
+        # they spawned are flushed too.
         if self._reactive_config is not None:
             reactive_runner_manager.flush_reactive_processes()
-        delete_metric_stats = self._manager.flush_runners(flush_mode=flush_mode)
+        inventory = self._manager.get_inventory()
+        metric_stats = self._manager.cleanup(inventory=inventory)
+        delete_metric_stats = self._manager.flush_runners(
+            flush_mode=flush_mode, inventory=inventory
+        )
         events = set(delete_metric_stats.keys()) | set(metric_stats.keys())
         metric_stats = {
             event_name: delete_metric_stats.get(event_name, 0) + metric_stats.get(event_name, 0)
@@ -297,7 +320,12 @@ class RunnerScaler:
 
         expected_runner_quantity = self._base_quantity
 
+        # The snapshot is shared by all the steps of the reconcile, and updated as runners are
+        # created and deleted.
+        inventory = None
+        rate_limited = False
         try:
+            inventory = self._manager.get_inventory()
             if self._reactive_config is not None:
                 logger.info("Reactive configuration detected, spawning runners in reactive mode.")
                 reconcile_result = reactive_runner_manager.reconcile(
@@ -306,55 +334,71 @@ class RunnerScaler:
                     reactive_process_config=self._reactive_config,
                     user=self._user,
                     python_path=self._python_path,
+                    inventory=inventory,
+                    scaling_policy=self._scaling_policy,
                 )
                 reconcile_diff = reconcile_result.processes_diff
                 metric_stats = reconcile_result.metric_stats
             else:
-                reconcile_result = self._reconcile_non_reactive(self._base_quantity)
+                reconcile_result = self._reconcile_non_reactive(self._base_quantity, inventory)
                 reconcile_diff = reconcile_result.runner_diff
                 metric_stats = reconcile_result.metric_stats
+        except RateLimitExceededError:
+            # The runners are reconciled again by the next reconciliation.
+            logger.warning("GitHub API rate limit too low, skipping the reconciliation.")
+            rate_limited = True
+            reconcile_diff = 0
         except CloudError as exc:
             logger.error("Failed to reconcile runners.")
             raise ReconcileError("Failed to reconcile runners.") from exc
         finally:
-            runner_list = self._manager.get_runners()
-            self._log_runners(runner_list)
-            end_timestamp = time.time()
-            reconcile_metric_data = _ReconcileMetricData(
-                start_timestamp=start_timestamp,
-                end_timestamp=end_timestamp,
-                metric_stats=metric_stats,
-                runner_list=runner_list,
-                flavor=self._manager.manager_name,
-                expected_runner_quantity=expected_runner_quantity,
-            )
-            RECONCILE_DURATION_SECONDS.labels(self._manager.manager_name).observe(
-                end_timestamp - start_timestamp
-            )
-            _issue_reconciliation_metric(reconcile_metric_data, self._manager.manager_name)
+            # The runners cannot be listed again if the rate limit prevented listing them.
+            if inventory is not None or not rate_limited:
+                runner_list = self._manager.get_runners(inventory=inventory)
+                self._log_runners(runner_list)
+                end_timestamp = time.time()
+                reconcile_metric_data = _ReconcileMetricData(
+                    start_timestamp=start_timestamp,
+                    end_timestamp=end_timestamp,
+                    metric_stats=metric_stats,
+                    runner_list=runner_list,
+                    flavor=self._manager.manager_name,
+                    expected_runner_quantity=expected_runner_quantity,
+                )
+                RECONCILE_DURATION_SECONDS.labels(self._manager.manager_name).observe(
+                    end_timestamp - start_timestamp
+                )
+                _issue_reconciliation_metric(reconcile_metric_data, self._manager.manager_name)
 
         logger.info("Finished reconciliation.")
 
         return reconcile_diff
 
-    def _reconcile_non_reactive(self, expected_quantity: int) -> _ReconcileResult:
+    def _reconcile_non_reactive(
+        self, expected_quantity: int, inventory: RunnerInventory | None = None
+    ) -> _ReconcileResult:
         """Reconcile the quantity of runners in non-reactive mode.
 
         Args:
             expected_quantity: The number of intended runners.
+            inventory: Snapshot of the runners. If not provided, a new one is taken.
 
         Returns:
             The reconcile result.
         """
+        if inventory is None:
+            inventory = self._manager.get_inventory()
         delete_metric_stats = None
-        metric_stats = self._manager.cleanup()
-        runners = self._manager.get_runners()
+        metric_stats = self._manager.cleanup(inventory=inventory)
+        runners = self._manager.get_runners(inventory=inventory)
         logger.info("Reconcile runners from %s to %s", len(runners), expected_quantity)
         runner_diff = expected_quantity - len(runners)
         if runner_diff > 0:
             try:
                 self._manager.create_runners(
-                    num=runner_diff, metadata=RunnerMetadata(platform_name=self._platform_name)
+                    num=runner_diff,
+                    metadata=RunnerMetadata(platform_name=self._platform_name),
+                    inventory=inventory,
                 )
             except MissingServerConfigError:
                 logging.exception(
@@ -362,7 +406,7 @@ class RunnerScaler:
                     "such as, image."
                 )
         elif runner_diff < 0:
-            delete_metric_stats = self._manager.delete_runners(-runner_diff)
+            delete_metric_stats = self._manager.delete_runners(-runner_diff, inventory=inventory)
         else:
             logger.info("No changes to the number of runners.")
         # Merge the two metric stats.
@@ -412,6 +456,51 @@ class RunnerScaler:
         logger.info("Found %s unhealthy runners: %s", len(unhealthy_runners), unhealthy_runners)
 
 
+def _build_reactive_routes(
+    application_configuration: ApplicationConfiguration,
+) -> list[ReactiveRouteConfig]:
+    """Build a reactive route for each image and flavor combination.
+
+    The route of the first combination uses the name of the application, as the runner manager
+    of the non-reactive runners. The other routes are named after their index, as several
+    combinations may share a flavor.
+
+    Args:
+        application_configuration: Main configuration for the application.
+
+    Returns:
+        The routes, in the order of the combinations.
+    """
+    routes = []
+    combinations = application_configuration.non_reactive_configuration.combinations
+    for index, combination in enumerate(combinations):
+        labels = [
+            *application_configuration.extra_labels,
+            *combination.image.labels,
+            *combination.flavor.labels,
+        ]
+        routes.append(
+            ReactiveRouteConfig(
+                manager_name=(
+                    application_configuration.name
+                    if index == 0
+                    else f"{application_configuration.name}-{index}"
+                ),
+                server_config=OpenStackServerConfig(
+                    image=combination.image.name,
+                    flavor=combination.flavor.name,
+                    network=application_configuration.openstack_configuration.network,
+                ),
+                # The charm is not able to determine which architecture the runner is running
+                # on, so we add all architectures to the supported labels.
+                supported_labels=set(labels) | GITHUB_SELF_HOSTED_ARCH_LABELS,
+                labels=labels,
+                max_spawns=combination.max_reactive_spawns,
+            )
+        )
+    return routes
+
+
 def _issue_reconciliation_metric(
     reconcile_metric_data: _ReconcileMetricData, manager_name: str
 ) -> None:
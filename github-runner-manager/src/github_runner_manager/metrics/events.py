@@ -2,8 +2,16 @@
 #  See LICENSE file for licensing details.
 
 """Models and functions for the metric events."""
+import atexit
+import fcntl
 import logging
+import os
+import signal
+import sys
+import threading
+from enum import Enum
 from pathlib import Path
+from types import FrameType
 from typing import Any, Optional
 
 from pydantic import BaseModel, NonNegativeFloat
@@ -12,7 +20,12 @@ from github_runner_manager.errors import IssueMetricEventError
 from github_runner_manager.manager.vm_manager import CodeInformation
 
 METRICS_LOG_PATH = Path("/var/log/github-runner-metrics.log")
-
+# Seconds between the writes of the buffered events to the metrics log.
+EVENTS_FLUSH_INTERVAL = 1.0
+# Number of buffered events that triggers a write to the metrics log before the interval.
+EVENTS_FLUSH_SIZE = 100
+# Events kept in the buffer while the metrics log cannot be written. Further events are dropped.
+MAX_BUFFERED_EVENTS = 10000
 
 logger = logging.getLogger(__name__)
 
@@ -143,10 +156,157 @@ class Reconciliation(Event):
     duration: NonNegativeFloat
 
 
+class FsyncPolicy(str, Enum):
+    """When the metrics log is synced to disk.
+
+    Attributes:
+        NEVER: Leave it to the operating system.
+        FLUSH: On each write of the buffered events.
+    """
+
+    NEVER = "never"
+    FLUSH = "flush"
+
+
+class EventSink:  # pylint: disable=too-many-instance-attributes
+    """Buffer of metric events written to the metrics log in batches.
+
+    A background thread writes the buffered events every flush interval, or as soon as the
+    buffer reaches the flush size. Each batch is appended with a single write under an exclusive
+    lock of the metrics log, so the lines of other processes writing to it are never interleaved.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = EVENTS_FLUSH_INTERVAL,
+        flush_size: int = EVENTS_FLUSH_SIZE,
+        fsync: FsyncPolicy = FsyncPolicy.NEVER,
+    ):
+        """Construct the object.
+
+        Args:
+            flush_interval: Seconds between the writes of the buffered events.
+            flush_size: Number of buffered events that triggers a write.
+            fsync: When the metrics log is synced to disk.
+        """
+        self._flush_interval = flush_interval
+        self._flush_size = flush_size
+        self._fsync = fsync
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._buffer: list[str] = []
+        self._flusher: threading.Thread | None = None
+
+    def put(self, line: str) -> None:
+        """Buffer a line to write to the metrics log.
+
+        Args:
+            line: The line, ending with a newline.
+
+        Raises:
+            IssueMetricEventError: The buffer is full as the metrics log cannot be written.
+        """
+        with self._lock:
+            if len(self._buffer) >= MAX_BUFFERED_EVENTS:
+                raise IssueMetricEventError(
+                    f"Too many events pending to be written to {METRICS_LOG_PATH}"
+                )
+            self._buffer.append(line)
+            full = len(self._buffer) >= self._flush_size
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._run_flusher, name="metric-events-flusher", daemon=True
+                )
+                self._flusher.start()
+        if full:
+            self._wakeup.set()
+
+    def flush(self) -> None:
+        """Write the buffered events to the metrics log.
+
+        Raises:
+            IssueMetricEventError: If the events cannot be written. They are kept in the buffer.
+        """
+        with self._write_lock:
+            with self._lock:
+                lines, self._buffer = self._buffer, []
+            if not lines:
+                return
+            try:
+                self._write("".join(lines).encode("utf-8"))
+            except OSError as exc:
+                with self._lock:
+                    self._buffer[:0] = lines
+                raise IssueMetricEventError(f"Cannot write to {METRICS_LOG_PATH}") from exc
+
+    def _write(self, data: bytes) -> None:
+        """Append data to the metrics log.
+
+        Args:
+            data: The data to append.
+        """
+        fd = os.open(METRICS_LOG_PATH, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            # The reactive processes write to the same metrics log.
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+            if self._fsync == FsyncPolicy.FLUSH:
+                os.fsync(fd)
+        finally:
+            # Closing the file releases the lock.
+            os.close(fd)
+
+    def _run_flusher(self) -> None:
+        """Write the buffered events periodically."""
+        while True:
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except IssueMetricEventError:
+                logger.exception("Failed to write the metric events")
+
+    def _reset(self) -> None:
+        """Reset the buffer and the locks in a forked child process.
+
+        The buffered events belong to the parent process and the flusher thread does not exist in
+        the child.
+        """
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._buffer = []
+        self._flusher = None
+
+
+_event_sink = EventSink()
+
+
+def configure_event_sink(
+    flush_interval: float = EVENTS_FLUSH_INTERVAL,
+    flush_size: int = EVENTS_FLUSH_SIZE,
+    fsync: FsyncPolicy = FsyncPolicy.NEVER,
+) -> None:
+    """Replace the sink of the metric events, writing the events buffered in the current one.
+
+    Args:
+        flush_interval: Seconds between the writes of the buffered events.
+        flush_size: Number of buffered events that triggers a write.
+        fsync: When the metrics log is synced to disk.
+    """
+    global _event_sink  # pylint: disable=global-statement
+    previous_sink = _event_sink
+    _event_sink = EventSink(flush_interval=flush_interval, flush_size=flush_size, fsync=fsync)
+    _flush_quietly(previous_sink)
+
+
 def issue_event(event: Event) -> None:
     """Issue a metric event.
 
-    The metric event is logged to the metrics log.
+    The metric event is buffered to be logged to the metrics log.
 
     Args:
         event: The metric event to log.
@@ -155,7 +315,56 @@ def issue_event(event: Event) -> None:
         IssueMetricEventError: If the event cannot be logged.
     """
     try:
-        with METRICS_LOG_PATH.open(mode="a", encoding="utf-8") as metrics_file:
-            metrics_file.write(f"{event.json(exclude_none=True)}\n")
-    except OSError as exc:
-        raise IssueMetricEventError(f"Cannot write to {METRICS_LOG_PATH}") from exc
+        _event_sink.put(f"{event.json(exclude_none=True)}\n")
+    except IssueMetricEventError:
+        logger.error("Dropping metric event %s", event.event)
+        raise
+
+
+def flush_events() -> None:
+    """Write the buffered metric events to the metrics log.
+
+    An IssueMetricEventError is raised if the events cannot be written.
+    """
+    _event_sink.flush()
+
+
+def flush_events_on_sigterm() -> None:
+    """Exit the process on SIGTERM through the exit handlers, writing the buffered events.
+
+    The default action of SIGTERM ends the process without running the exit handlers. Must be
+    called from the main thread.
+    """
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+
+
+def _exit_on_sigterm(signal_code: int, _frame: FrameType | None) -> None:
+    """Exit the process, running the exit handlers.
+
+    Args:
+        signal_code: The signal code.
+        _frame: The current stack frame.
+    """
+    logger.info("Received SIGTERM, exiting")
+    sys.exit(128 + signal_code)
+
+
+def _flush_quietly(sink: EventSink | None = None) -> None:
+    """Write the buffered metric events, logging any error.
+
+    Args:
+        sink: The sink to flush. Defaults to the current sink.
+    """
+    try:
+        (sink or _event_sink).flush()
+    except IssueMetricEventError:
+        logger.exception("Failed to write the metric events")
+
+
+def _reset_event_sink_in_child() -> None:
+    """Reset the sink of the metric events in a forked child process."""
+    _event_sink._reset()  # pylint: disable=protected-access
+
+
+atexit.register(_flush_quietly)
+os.register_at_fork(before=_flush_quietly, after_in_child=_reset_event_sink_in_child)
@@ -3,7 +3,7 @@
 
 """Module for collecting metrics related to the reconciliation process."""
 
-from prometheus_client import Gauge, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 LABEL_FLAVOR = "flavor"
 
@@ -33,3 +33,56 @@ CLEANED_RUNNERS_TOTAL = Gauge(
     documentation="Total number of runners cleaned up",
     labelnames=[LABEL_FLAVOR],
 )
+REACTIVE_QUEUE_SIZE = Gauge(
+    name="reactive_queue_size",
+    documentation="Number of jobs in the reactive job queue",
+    labelnames=[LABEL_FLAVOR],
+)
+REACTIVE_CONSUMERS_COUNT = Gauge(
+    name="reactive_consumers_count",
+    documentation="Number of reactive consumers requested",
+    labelnames=[LABEL_FLAVOR],
+)
+REACTIVE_DEQUEUE_TO_SPAWN_SECONDS = Histogram(
+    name="reactive_dequeue_to_spawn_seconds",
+    documentation="Time from receiving a reactive job to requesting its runner (seconds)",
+    labelnames=[LABEL_FLAVOR],
+    buckets=[0.1, 0.5, 1, 2, 5, 10, 30, 60, 2 * 60, float("inf")],
+)
+BACKEND_CONCURRENCY_LIMIT = Gauge(
+    name="backend_concurrency_limit",
+    documentation="Current limit of concurrent requests to a backend",
+    labelnames=["backend"],
+)
+GITHUB_JOB_CACHE_HIT = "hit"
+GITHUB_JOB_CACHE_MISS = "miss"
+GITHUB_JOB_CACHE_LOOKUPS = Counter(
+    name="github_job_cache_lookups",
+    documentation="Lookups of the job of a runner in the cache of the workflow run jobs",
+    labelnames=["result"],
+)
+GITHUB_PAGE_CACHE_HIT = "hit"
+GITHUB_PAGE_CACHE_MISS = "miss"
+GITHUB_PAGE_CACHE_LOOKUPS = Counter(
+    name="github_page_cache_lookups",
+    documentation="Conditional requests of pages from the GitHub API, by whether the cached page "
+    "was still valid",
+    labelnames=["result"],
+)
+GITHUB_RATE_LIMIT_REMAINING = Gauge(
+    name="github_rate_limit_remaining",
+    documentation="Remaining requests to the GitHub API in the current rate limit window",
+)
+GITHUB_RATE_LIMIT_LIMIT = Gauge(
+    name="github_rate_limit_limit",
+    documentation="Requests to the GitHub API allowed in a rate limit window",
+)
+GITHUB_RATE_LIMIT_RESET_TIMESTAMP = Gauge(
+    name="github_rate_limit_reset_timestamp_seconds",
+    documentation="Time at which the current GitHub API rate limit window resets (epoch seconds)",
+)
+GITHUB_RATE_LIMIT_SHED_REQUESTS = Counter(
+    name="github_rate_limit_shed_requests",
+    documentation="Requests to the GitHub API not sent to save the rate limit, by priority",
+    labelnames=["priority"],
+)
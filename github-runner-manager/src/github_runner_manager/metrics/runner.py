@@ -3,10 +3,13 @@
 
 """Classes and function to extract the metrics from storage and issue runner metrics events."""
 
+import base64
+import binascii
 import concurrent.futures
 import io
 import json
 import logging
+import shlex
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -17,6 +20,7 @@ import paramiko.ssh_exception
 from fabric import Connection as SSHConnection
 from pydantic import NonNegativeFloat, ValidationError
 
+from github_runner_manager.concurrency import SSH_CONCURRENCY
 from github_runner_manager.errors import IssueMetricEventError, RunnerMetricsError, SSHError
 from github_runner_manager.manager.models import InstanceID
 from github_runner_manager.manager.vm_manager import (
@@ -26,6 +30,7 @@ from github_runner_manager.manager.vm_manager import (
     RunnerMetrics,
 )
 from github_runner_manager.metrics import events as metric_events
+from github_runner_manager.metrics.spool import RunnerMetricsSpool
 from github_runner_manager.metrics.type import GithubJobMetrics
 from github_runner_manager.openstack_cloud.constants import (
     POST_JOB_METRICS_FILE_PATH,
@@ -50,22 +55,29 @@ class _PullRunnerMetricsConfig:
     Attributes:
         cloud_service: The OpenStack cloud service.
         instance_id: The instance ID to fetch the runner metric from.
+        spool: The spool with the metrics pushed by the runners.
     """
 
     cloud_service: OpenstackCloud
     instance_id: InstanceID
+    spool: RunnerMetricsSpool | None = None
 
 
 def pull_runner_metrics(
-    cloud_service: OpenstackCloud, instance_ids: Sequence[InstanceID]
+    cloud_service: OpenstackCloud,
+    instance_ids: Sequence[InstanceID],
+    spool: RunnerMetricsSpool | None = None,
 ) -> "list[PulledMetrics]":
     """Pull metrics from runner.
 
-    This function uses multiprocessing to fetch metrics in parallel.
+    This function uses threads to fetch metrics in parallel, as many as the SSH concurrency
+    limit allows. Only the metric files the runners did not push to the spool are pulled
+    through SSH.
 
     Args:
         cloud_service: The OpenStack cloud service.
         instance_ids: The instance IDs to fetch the metrics from.
+        spool: The spool with the metrics pushed by the runners.
 
     Returns:
         Metrics pulled from the instance.
@@ -73,11 +85,13 @@ def pull_runner_metrics(
     if not instance_ids:
         return []
     pull_metrics_configs = [
-        _PullRunnerMetricsConfig(cloud_service=cloud_service, instance_id=instance_id)
+        _PullRunnerMetricsConfig(cloud_service=cloud_service, instance_id=instance_id, spool=spool)
         for instance_id in instance_ids
     ]
     pulled_metrics: list[PulledMetrics] = []
-    with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(instance_ids), 30)) as executor:
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(len(instance_ids), SSH_CONCURRENCY.maximum)
+    ) as executor:
         future_to_pull_metrics_config = {
             executor.submit(_pull_runner_metrics, config): config
             for config in pull_metrics_configs
@@ -96,6 +110,8 @@ def pull_runner_metrics(
 def _pull_runner_metrics(pull_config: _PullRunnerMetricsConfig) -> "PulledMetrics | None":
     """Pull metrics from a single runner via SSH file pull.
 
+    The metric files the runner pushed to the spool are used instead of pulling them.
+
     Args:
         pull_config: Configurations for pulling the runner metrics.
 
@@ -109,15 +125,29 @@ def _pull_runner_metrics(pull_config: _PullRunnerMetricsConfig) -> "PulledMetric
         )
         return None
 
-    pulled_file_contents = _pull_file_contents(
-        cloud_service=pull_config.cloud_service,
-        instance=instance,
-        metrics_paths=(
+    spooled_file_contents = (
+        pull_config.spool.read(instance.instance_id.name) if pull_config.spool else {}
+    )
+    # A push of the runner may have failed, or not landed before the runner went offline, so the
+    # files missing from the spool are pulled from the runner.
+    missing_paths = tuple(
+        path
+        for path in (
             RUNNER_INSTALLED_TS_FILE_PATH,
             PRE_JOB_METRICS_FILE_PATH,
             POST_JOB_METRICS_FILE_PATH,
-        ),
+        )
+        if path not in spooled_file_contents
     )
+    pulled_file_contents: dict[Path, str | None] = {}
+    if missing_paths:
+        with SSH_CONCURRENCY.slot():
+            pulled_file_contents = _pull_file_contents(
+                cloud_service=pull_config.cloud_service,
+                instance=instance,
+                metrics_paths=missing_paths,
+            )
+    pulled_file_contents = {**pulled_file_contents, **spooled_file_contents}
     parsed_metrics = _parse_metrics_contents(metrics_contents_map=pulled_file_contents)
 
     return (
@@ -139,10 +169,35 @@ def _pull_runner_metrics(pull_config: _PullRunnerMetricsConfig) -> "PulledMetric
 def _pull_file_contents(
     cloud_service: OpenstackCloud, instance: OpenstackInstance, metrics_paths: Sequence[Path]
 ) -> dict[Path, str | None]:
-    """Pull the metric files from the runner."""
+    """Pull the metric files from the runner.
+
+    The files are pulled with a single remote command. If the command is not supported by the
+    runner, the files are pulled one by one.
+
+    Args:
+        cloud_service: The OpenStack cloud service.
+        instance: The instance to pull the files from.
+        metrics_paths: The paths of the metric files on the instance.
+
+    Returns:
+        The contents of the files pulled, by path.
+    """
     metric_files_contents: dict[Path, str | None] = {}
     try:
-        with cloud_service.get_ssh_connection(instance=instance) as ssh_conn:
+        with cloud_service.get_ssh_connection(
+            instance=instance, test_connection=False
+        ) as ssh_conn:
+            try:
+                return _ssh_pull_files(
+                    ssh_conn=ssh_conn, remote_paths=metrics_paths, max_size=MAX_METRICS_FILE_SIZE
+                )
+            except PullFileError as exc:
+                logger.warning(
+                    "Failed to pull metric files in one command for %s, pulling them one by "
+                    "one: %s",
+                    instance.instance_id,
+                    exc,
+                )
             for remote_path in metrics_paths:
                 try:
                     metric_files_contents[remote_path] = _ssh_pull_file(
@@ -277,6 +332,109 @@ def _ssh_pull_file(ssh_conn: SSHConnection, remote_path: str, max_size: int) ->
     return value
 
 
+def _ssh_pull_files_command(remote_paths: Sequence[Path], max_size: int) -> str:
+    """Build the remote command printing the contents of the files.
+
+    The command prints a line per file: the path, the status of the file (ok, missing or
+    too-large) and, for the files within the size limit, the base64 encoded content. Files larger
+    than the limit are not read, and no more than the limit is read from the other files.
+
+    Args:
+        remote_paths: The file paths on the runner instance.
+        max_size: Files larger than this are not pulled.
+
+    Returns:
+        The shell command.
+    """
+    paths = " ".join(shlex.quote(str(path)) for path in remote_paths)
+    return (
+        f"for f in {paths}; do "
+        'if [ ! -f "$f" ]; then echo "$f missing"; continue; fi; '
+        'size=$(stat -c %s "$f") || exit 1; '
+        f'if [ "$size" -gt {max_size} ]; then echo "$f too-large $size"; continue; fi; '
+        f'echo "$f ok $(head -c {max_size} "$f" | base64 -w 0)"; '
+        "done"
+    )
+
+
+def _ssh_pull_files(
+    ssh_conn: SSHConnection, remote_paths: Sequence[Path], max_size: int
+) -> dict[Path, str | None]:
+    """Pull files from the runner instance with a single remote command.
+
+    Args:
+        ssh_conn: The SSH connection instance.
+        remote_paths: The file paths on the runner instance.
+        max_size: If a file is larger than this, it will not be pulled.
+
+    Returns:
+        The content of the pulled files by path. Missing or too large files are not included.
+
+    Raises:
+        PullFileError: Unable to pull the files from the runner instance.
+        SSHError: Issue with SSH connection.
+    """
+    try:
+        result = ssh_conn.run(
+            _ssh_pull_files_command(remote_paths=remote_paths, max_size=max_size),
+            warn=True,
+            timeout=60,
+            hide=True,
+        )
+    except (
+        TimeoutError,
+        paramiko.ssh_exception.NoValidConnectionsError,
+        paramiko.ssh_exception.SSHException,
+    ) as exc:
+        raise SSHError(f"Unable to SSH into {ssh_conn.host}") from exc
+    if not result.ok:
+        raise PullFileError(
+            f"Unable to pull files, exit code: {result.return_code}, stderr: {result.stderr}"
+        )
+
+    return _parse_pulled_files(
+        output=result.stdout, remote_paths=remote_paths, max_size=max_size, host=ssh_conn.host
+    )
+
+
+def _parse_pulled_files(
+    output: str, remote_paths: Sequence[Path], max_size: int, host: str
+) -> dict[Path, str | None]:
+    """Parse the output of the command pulling the files.
+
+    Args:
+        output: The output of the command.
+        remote_paths: The file paths on the runner instance.
+        max_size: The size limit of the files.
+        host: The runner instance the files are pulled from.
+
+    Returns:
+        The content of the pulled files by path.
+
+    Raises:
+        PullFileError: The output is not in the expected format.
+    """
+    paths_by_name = {str(path): path for path in remote_paths}
+    contents: dict[Path, str | None] = {}
+    for line in output.splitlines():
+        name, _, rest = line.partition(" ")
+        status, _, value = rest.partition(" ")
+        if (path := paths_by_name.get(name)) is None:
+            raise PullFileError(f"Unexpected output pulling files: {line}")
+        if status == "missing":
+            logger.warning("File %s not found on instance %s", name, host)
+        elif status == "too-large":
+            logger.warning("File size of %s too large %s > %s", name, value, max_size)
+        elif status == "ok":
+            try:
+                contents[path] = base64.b64decode(value, validate=True).decode("utf-8")
+            except (binascii.Error, UnicodeDecodeError) as exc:
+                raise PullFileError(f"Error decoding file {name}. Error: {exc}") from exc
+        else:
+            raise PullFileError(f"Unexpected output pulling files: {line}")
+    return contents
+
+
 @dataclass(frozen=True)
 class PulledMetrics:
     """Metrics pulled from a runner.
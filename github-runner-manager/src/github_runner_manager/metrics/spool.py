@@ -0,0 +1,225 @@
+#  Copyright 2025 Canonical Ltd.
+#  See LICENSE file for licensing details.
+
+"""Spool of the metrics pushed by the runners to the manager."""
+
+import hashlib
+import hmac
+import logging
+import os
+import re
+import secrets
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from github_runner_manager.constants import STATE_DIR
+from github_runner_manager.openstack_cloud.constants import (
+    POST_JOB_METRICS_FILE_PATH,
+    PRE_JOB_METRICS_FILE_PATH,
+    RUNNER_INSTALLED_TS_FILE_PATH,
+)
+
+logger = logging.getLogger(__name__)
+
+RUNNER_METRICS_SPOOL_PATH = STATE_DIR / "runner-metrics"
+# Seconds after which the metrics of a runner never extracted are removed from the spool.
+SPOOL_ENTRY_TTL = 24 * 60 * 60
+# Seconds after which the entry of a runner whose metrics were extracted is removed from the
+# spool. The entry rejects the pushes landing after the extraction until then.
+EXTRACTED_ENTRY_TTL = 60 * 60
+
+# The metric files a runner can push, by the kind used in the push URL.
+METRIC_FILES = {
+    "runner-installed": RUNNER_INSTALLED_TS_FILE_PATH,
+    "pre-job": PRE_JOB_METRICS_FILE_PATH,
+    "post-job": POST_JOB_METRICS_FILE_PATH,
+}
+
+_KEY_FILE_NAME = ".token-key"
+# Marks the entry of a runner whose metrics were extracted.
+_EXTRACTED_FILE_NAME = ".extracted"
+_RUNNER_NAME_REGEX = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+
+
+class SpoolError(Exception):
+    """Represents an error with the runner metrics spool."""
+
+
+class RunnerMetricsSpool:
+    """Durable local storage of the metric files pushed by the runners.
+
+    Each runner authenticates with a token derived from its name and a key stored in the spool,
+    so the tokens remain valid across restarts of the manager. Once the metrics of a runner are
+    extracted, its entry is kept for a while without the metric files, so that a late push does
+    not create an entry which is never extracted.
+    """
+
+    def __init__(self, path: Path = RUNNER_METRICS_SPOOL_PATH):
+        """Construct the object.
+
+        Args:
+            path: The directory of the spool.
+        """
+        self._path = path
+
+    def get_token(self, runner_name: str) -> str:
+        """Get the token for a runner to push its metrics.
+
+        Args:
+            runner_name: The name of the runner.
+
+        Returns:
+            The token.
+        """
+        return hmac.new(self._get_key(), runner_name.encode(), hashlib.sha256).hexdigest()
+
+    def verify_token(self, runner_name: str, token: str) -> bool:
+        """Check the token a runner pushed its metrics with.
+
+        Args:
+            runner_name: The name of the runner.
+            token: The token to check.
+
+        Returns:
+            Whether the token is valid for the runner.
+        """
+        return hmac.compare_digest(self.get_token(runner_name), token)
+
+    def write(self, runner_name: str, kind: str, content: bytes) -> None:
+        """Store a metric file pushed by a runner, unless its metrics were already extracted.
+
+        Args:
+            runner_name: The name of the runner.
+            kind: The kind of metric file, one of METRIC_FILES.
+            content: The content of the file.
+
+        Raises:
+            SpoolError: Invalid runner name or kind of metric file.
+        """
+        if kind not in METRIC_FILES:
+            raise SpoolError(f"Unknown kind of metric file: {kind}")
+        runner_path = self._get_runner_path(runner_name)
+        if (runner_path / _EXTRACTED_FILE_NAME).exists():
+            logger.info("Ignoring metrics %s of %s pushed after the extraction", kind, runner_name)
+            return
+        runner_path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=runner_path, prefix=".")
+        tmp_path = Path(tmp_name)
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(content)
+                tmp_file.flush()
+                os.fsync(tmp_file.fileno())
+            tmp_path.replace(runner_path / METRIC_FILES[kind].name)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def read(self, runner_name: str) -> dict[Path, str | None]:
+        """Get the metric files pushed by a runner.
+
+        Args:
+            runner_name: The name of the runner.
+
+        Returns:
+            The contents of the metric files, by their path on the runner.
+        """
+        runner_path = self._get_runner_path(runner_name)
+        contents: dict[Path, str | None] = {}
+        for remote_path in METRIC_FILES.values():
+            try:
+                contents[remote_path] = (runner_path / remote_path.name).read_text(
+                    encoding="utf-8"
+                )
+            except FileNotFoundError:
+                continue
+            except (OSError, UnicodeDecodeError):
+                logger.warning("Unable to read spooled metrics %s of %s", remote_path, runner_name)
+        return contents
+
+    def remove(self, runner_name: str) -> None:
+        """Remove the metric files of a runner whose metrics were extracted.
+
+        Args:
+            runner_name: The name of the runner.
+        """
+        runner_path = self._get_runner_path(runner_name)
+        try:
+            runner_path.mkdir(mode=0o700, parents=True, exist_ok=True)
+            (runner_path / _EXTRACTED_FILE_NAME).touch()
+        except OSError:
+            logger.warning("Unable to mark the spooled metrics of %s as extracted", runner_name)
+        for remote_path in METRIC_FILES.values():
+            (runner_path / remote_path.name).unlink(missing_ok=True)
+
+    def remove_expired(
+        self, ttl: float = SPOOL_ENTRY_TTL, extracted_ttl: float = EXTRACTED_ENTRY_TTL
+    ) -> None:
+        """Remove the entries of the runners not updated for a while.
+
+        These are runners that no longer exist, whose metrics were either extracted, or never
+        extracted.
+
+        Args:
+            ttl: Seconds since the last update after which the entries never extracted are
+                removed.
+            extracted_ttl: Seconds since the extraction after which the entries are removed.
+        """
+        if not self._path.exists():
+            return
+        now = time.time()
+        for runner_path in self._path.iterdir():
+            if not runner_path.is_dir():
+                continue
+            try:
+                extracted_path = runner_path / _EXTRACTED_FILE_NAME
+                if extracted_path.exists():
+                    expired = now - extracted_path.stat().st_mtime > extracted_ttl
+                else:
+                    expired = now - runner_path.stat().st_mtime > ttl
+            except FileNotFoundError:
+                continue
+            if expired:
+                logger.info("Removing expired spooled metrics of %s", runner_path.name)
+                shutil.rmtree(runner_path, ignore_errors=True)
+
+    def _get_runner_path(self, runner_name: str) -> Path:
+        """Get the directory with the metric files of a runner.
+
+        Args:
+            runner_name: The name of the runner.
+
+        Raises:
+            SpoolError: The runner name is not valid.
+
+        Returns:
+            The directory of the runner.
+        """
+        if not _RUNNER_NAME_REGEX.match(runner_name):
+            raise SpoolError(f"Invalid runner name: {runner_name}")
+        return self._path / runner_name
+
+    def _get_key(self) -> bytes:
+        """Get the key to derive the tokens from, creating it if needed.
+
+        Returns:
+            The key.
+        """
+        key_path = self._path / _KEY_FILE_NAME
+        try:
+            return key_path.read_bytes()
+        except FileNotFoundError:
+            pass
+        self._path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self._path, prefix=".")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(secrets.token_bytes(32))
+            # Linking fails if the key was created concurrently, the existing key is used then.
+            os.link(tmp_name, key_path)
+        except FileExistsError:
+            pass
+        finally:
+            Path(tmp_name).unlink(missing_ok=True)
+        return key_path.read_bytes()
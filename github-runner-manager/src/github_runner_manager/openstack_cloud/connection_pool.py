@@ -0,0 +1,171 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Pool of authenticated connections to the OpenStack API."""
+
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+import keystoneauth1.exceptions
+import openstack
+import openstack.exceptions
+from openstack.connection import Connection as OpenstackConnection
+
+from github_runner_manager.openstack_cloud.configuration import OpenStackCredentials
+
+logger = logging.getLogger(__name__)
+
+_ConnectionKey = tuple[str, str, str, str, str, str, str, str | None]
+
+
+class OpenstackConnectionPool:
+    """Pool of authenticated OpenStack connections, keyed on the credentials.
+
+    The keystoneauth session of a connection reuses its token until it is close to expiry and
+    re-authenticates once on a 401 response, so sharing the connection avoids issuing a new
+    Keystone token for every OpenStack call. The connections are shared between threads, for
+    example by the workers deleting VMs, but not with forked processes. The users of each
+    connection are counted, so an evicted connection is only closed once no thread uses it.
+    """
+
+    def __init__(self) -> None:
+        """Construct the object."""
+        self._lock = threading.Lock()
+        self._connections: dict[_ConnectionKey, OpenstackConnection] = {}
+        # The number of users of the connections in use, by id of the connection.
+        self._users: dict[int, int] = {}
+        # The ids of the evicted connections still in use.
+        self._evicted: set[int] = set()
+
+    @contextmanager
+    def connection(
+        self, credentials: OpenStackCredentials, compute_api_version: str | None = None
+    ) -> Iterator[OpenstackConnection]:
+        """Use an authenticated connection for the credentials.
+
+        Args:
+            credentials: The OpenStack credentials.
+            compute_api_version: The compute API version of the connection.
+
+        Yields:
+            The OpenStack connection.
+        """
+        conn = self.get(credentials, compute_api_version)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def get(
+        self, credentials: OpenStackCredentials, compute_api_version: str | None = None
+    ) -> OpenstackConnection:
+        """Get an authenticated connection for the credentials, to be released after use.
+
+        Args:
+            credentials: The OpenStack credentials.
+            compute_api_version: The compute API version of the connection.
+
+        Returns:
+            The OpenStack connection.
+        """
+        key = (
+            credentials.auth_url,
+            credentials.project_name,
+            credentials.username,
+            credentials.password,
+            credentials.region_name,
+            credentials.user_domain_name,
+            credentials.project_domain_name,
+            compute_api_version,
+        )
+        with self._lock:
+            conn = self._connections.get(key)
+            if conn is None:
+                logger.info("Opening OpenStack connection to %s", credentials.auth_url)
+                connect_kwargs: dict[str, Any] = {}
+                if compute_api_version is not None:
+                    connect_kwargs["compute_api_version"] = compute_api_version
+                conn = openstack.connect(
+                    auth_url=credentials.auth_url,
+                    project_name=credentials.project_name,
+                    username=credentials.username,
+                    password=credentials.password,
+                    region_name=credentials.region_name,
+                    user_domain_name=credentials.user_domain_name,
+                    project_domain_name=credentials.project_domain_name,
+                    **connect_kwargs,
+                )
+                self._connections[key] = conn
+            self._users[id(conn)] = self._users.get(id(conn), 0) + 1
+        authorized = False
+        try:
+            # Keystone is only requested if there is no token or the token is about to expire.
+            conn.authorize()
+            authorized = True
+        finally:
+            if not authorized:
+                self.release(conn)
+        return conn
+
+    def release(self, conn: OpenstackConnection) -> None:
+        """Stop using a connection, closing it if it was evicted and this was its last user.
+
+        Args:
+            conn: The connection returned by get.
+        """
+        with self._lock:
+            users = self._users.get(id(conn), 0) - 1
+            if users > 0:
+                self._users[id(conn)] = users
+                return
+            self._users.pop(id(conn), None)
+            if id(conn) not in self._evicted:
+                return
+            self._evicted.discard(id(conn))
+        conn.close()
+
+    def evict(self, conn: OpenstackConnection) -> None:
+        """Remove a connection from the pool, and close it once no thread uses it.
+
+        Args:
+            conn: The connection to remove.
+        """
+        with self._lock:
+            keys = [key for key, pooled_conn in self._connections.items() if pooled_conn is conn]
+            for key in keys:
+                del self._connections[key]
+            if id(conn) in self._users:
+                self._evicted.add(id(conn))
+                return
+        conn.close()
+
+    def reset(self) -> None:
+        """Forget all the connections without closing them.
+
+        Used in forked processes, where the connections belong to the parent process.
+        """
+        self._lock = threading.Lock()
+        self._connections = {}
+        self._users = {}
+        self._evicted = set()
+
+
+connection_pool = OpenstackConnectionPool()
+os.register_at_fork(after_in_child=connection_pool.reset)
+
+
+def is_unauthorized(exc: Exception) -> bool:
+    """Check whether an OpenStack exception is a 401 Unauthorized response.
+
+    Args:
+        exc: The exception to check.
+
+    Returns:
+        True if the exception is a 401 Unauthorized response.
+    """
+    if isinstance(exc, keystoneauth1.exceptions.Unauthorized):
+        return True
+    return isinstance(exc, openstack.exceptions.HttpException) and exc.status_code == 401
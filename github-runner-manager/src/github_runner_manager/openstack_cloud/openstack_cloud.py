@@ -7,13 +7,12 @@ import contextlib
 import copy
 import functools
 import logging
-import shutil
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from functools import reduce
 from pathlib import Path
-from typing import Any, Callable, Iterable, Iterator, ParamSpec, Sequence, TypeVar, cast
+from typing import Any, Callable, Iterable, Iterator, ParamSpec, Sequence, TypeVar
 
 import keystoneauth1.exceptions
 import openstack
@@ -27,17 +26,29 @@ from openstack.network.v2.security_group import SecurityGroup as OpenstackSecuri
 from openstack.network.v2.security_group_rule import SecurityGroupRule
 from paramiko.ssh_exception import NoValidConnectionsError
 
+from github_runner_manager.concurrency import NOVA_CONCURRENCY
 from github_runner_manager.errors import KeyfileError, OpenStackError, SSHError
 from github_runner_manager.manager.models import InstanceID, RunnerIdentity, RunnerMetadata
 from github_runner_manager.openstack_cloud.configuration import OpenStackCredentials
+from github_runner_manager.openstack_cloud.connection_pool import (
+    connection_pool,
+    is_unauthorized,
+)
 from github_runner_manager.openstack_cloud.constants import CREATE_SERVER_TIMEOUT
 from github_runner_manager.openstack_cloud.models import OpenStackServerConfig
+from github_runner_manager.openstack_cloud.server_config_resolver import server_config_resolver
+from github_runner_manager.openstack_cloud.server_inventory import ServerInventory
+from github_runner_manager.openstack_cloud.ssh_keys import generate_ssh_keypair, write_private_key
+from github_runner_manager.utilities import TTLCache
 
 logger = logging.getLogger(__name__)
 
 # Update the version when the security group rules are not backward compatible.
 _SECURITY_GROUP_NAME = "github-runner-v1"
 
+# Seconds an ensured security group is reused before checking it again in OpenStack.
+_SECURITY_GROUP_CACHE_TTL = 10 * 60
+
 _SSH_TIMEOUT = 30
 _TEST_STRING = "test_string"
 # Max nova compute we support is 2.91, because
@@ -48,6 +59,12 @@ _MAX_NOVA_COMPUTE_API_VERSION = "2.91"
 
 SecurityRuleDict = dict[str, Any]
 
+# Security groups ensured in this process, keyed on the cloud, project, region and extra ingress
+# ports. Shared by all OpenstackCloud instances and inherited by forked spawn workers.
+_security_group_cache: TTLCache[tuple[str, str, str, tuple[int, ...]], OpenstackSecurityGroup] = (
+    TTLCache(ttl=_SECURITY_GROUP_CACHE_TTL)
+)
+
 DEFAULT_SECURITY_RULES: dict[str, SecurityRuleDict] = {
     "icmp": {
         "protocol": "icmp",
@@ -253,6 +270,7 @@ class OpenstackCloud:
         self._system_user = system_user
         self._ssh_key_dir = Path(f"~{system_user}").expanduser() / ".ssh"
         self._proxy_command = proxy_command
+        self._server_inventory = ServerInventory(prefix)
 
     @_catch_openstack_errors
     def launch_instance(
@@ -282,28 +300,33 @@ class OpenstackCloud:
         metadata = runner_identity.metadata
 
         with self._get_openstack_connection() as conn:
-            security_group = OpenstackCloud._ensure_security_group(conn, ingress_tcp_ports)
+            security_group = self._get_security_group(conn, ingress_tcp_ports)
+            resolved_config = server_config_resolver.resolve(
+                conn, self._credentials, server_config
+            )
             keypair = self._setup_keypair(conn, runner_identity.instance_id)
             meta = metadata.as_dict()
             meta["prefix"] = self.prefix
             try:
-                server = conn.create_server(
-                    name=instance_id.name,
-                    image=server_config.image,
-                    key_name=keypair.name,
-                    flavor=server_config.flavor,
-                    network=server_config.network,
-                    security_groups=[security_group.id],
-                    userdata=cloud_init,
-                    auto_ip=False,
-                    timeout=CREATE_SERVER_TIMEOUT,
-                    wait=False,
-                    meta=meta,
-                    # 2025/07/24 - This option is set to mitigate CVE-2024-6174
-                    config_drive=True,
-                )
+                with NOVA_CONCURRENCY.slot():
+                    server = conn.create_server(
+                        name=instance_id.name,
+                        image=resolved_config.image,
+                        key_name=keypair.name,
+                        flavor=resolved_config.flavor,
+                        network=resolved_config.network,
+                        security_groups=[security_group.id],
+                        userdata=cloud_init,
+                        auto_ip=False,
+                        timeout=CREATE_SERVER_TIMEOUT,
+                        wait=False,
+                        meta=meta,
+                        # 2025/07/24 - This option is set to mitigate CVE-2024-6174
+                        config_drive=True,
+                    )
             except openstack.exceptions.ResourceTimeout as err:
                 logger.exception("Timeout creating openstack server %s", instance_id)
+                self._invalidate_security_group(ingress_tcp_ports)
                 logger.info(
                     "Attempting clean up of openstack server %s that timeout during creation",
                     instance_id,
@@ -319,6 +342,10 @@ class OpenstackCloud:
                 raise OpenStackError(f"Timeout creating openstack server {instance_id}") from err
             except openstack.exceptions.SDKException as err:
                 logger.exception("Failed to create openstack server %s", instance_id)
+                # The security group, image, flavor or network may have been deleted or
+                # replaced, look them up again on the next launch.
+                self._invalidate_security_group(ingress_tcp_ports)
+                server_config_resolver.invalidate(self._credentials, server_config)
                 OpenstackCloud._delete_keypair(
                     _DeleteKeypairConfig(
                         keys_dir=self._ssh_key_dir, instance_id=instance_id, conn=conn
@@ -356,23 +383,17 @@ class OpenstackCloud:
         Raises:
             DeleteVMError: If there was an error deleting the VM instance.
         """
-        with openstack.connect(
-            auth_url=delete_config.credentials.auth_url,
-            project_name=delete_config.credentials.project_name,
-            username=delete_config.credentials.username,
-            password=delete_config.credentials.password,
-            region_name=delete_config.credentials.region_name,
-            user_domain_name=delete_config.credentials.user_domain_name,
-            project_domain_name=delete_config.credentials.project_domain_name,
-            compute_api_version=delete_config.max_api_version,
+        with connection_pool.connection(
+            delete_config.credentials, delete_config.max_api_version
         ) as conn:
             try:
                 logger.info("Deleting server %s", delete_config.instance_id.name)
-                deleted = conn.delete_server(
-                    name_or_id=delete_config.instance_id.name,
-                    wait=delete_config.wait,
-                    timeout=delete_config.timeout,
-                )
+                with NOVA_CONCURRENCY.slot():
+                    deleted = conn.delete_server(
+                        name_or_id=delete_config.instance_id.name,
+                        wait=delete_config.wait,
+                        timeout=delete_config.timeout,
+                    )
                 logger.info(
                     "Deleted server %s (true delete: %s)", delete_config.instance_id.name, deleted
                 )
@@ -380,6 +401,8 @@ class OpenstackCloud:
                 openstack.exceptions.SDKException,
                 openstack.exceptions.ResourceTimeout,
             ) as exc:
+                if is_unauthorized(exc):
+                    connection_pool.evict(conn)
                 raise DeleteVMError(
                     instance_id=delete_config.instance_id,
                     message=f"Failed to delete server {delete_config.instance_id.name}",
@@ -411,7 +434,7 @@ class OpenstackCloud:
         """
         deleted_instance_ids: list[InstanceID] = []
 
-        # Guard no instance IDs since multiprocessing Pool may raise an exception.
+        # Guard no instance IDs since ThreadPoolExecutor raises an exception with 0 threads.
         if not instance_ids:
             return deleted_instance_ids
 
@@ -427,7 +450,7 @@ class OpenstackCloud:
             for instance_id in instance_ids
         ]
         with concurrent.futures.ThreadPoolExecutor(
-            max_workers=min(len(instance_ids), 30)
+            max_workers=min(len(instance_ids), NOVA_CONCURRENCY.maximum)
         ) as executor:
             future_to_delete_instance_config = {
                 executor.submit(OpenstackCloud._delete_instance, config): config
@@ -446,11 +469,15 @@ class OpenstackCloud:
 
     @_catch_openstack_errors
     @contextlib.contextmanager
-    def get_ssh_connection(self, instance: OpenstackInstance) -> Iterator[SSHConnection]:
+    def get_ssh_connection(
+        self, instance: OpenstackInstance, test_connection: bool = True
+    ) -> Iterator[SSHConnection]:
         """Get SSH connection to an OpenStack instance.
 
         Args:
             instance: The OpenStack instance to connect to.
+            test_connection: Whether to run a test command on the connection. Otherwise, the
+                connection is only opened, saving a round trip to the instance.
 
         Raises:
             SSHError: Unable to get a working SSH connection to the instance.
@@ -477,6 +504,10 @@ class OpenstackCloud:
                     connect_timeout=_SSH_TIMEOUT,
                     gateway=self._proxy_command,
                 )
+                if not test_connection:
+                    connection.open()
+                    yield connection
+                    break
                 result = connection.run(
                     f"echo {_TEST_STRING}", warn=True, timeout=_SSH_TIMEOUT, hide=True
                 )
@@ -627,14 +658,13 @@ class OpenstackCloud:
         Args:
             conn: The connection object to access OpenStack cloud.
 
+        Only the changes since the previous call are requested to OpenStack, see
+        ServerInventory.
+
         Returns:
             List of OpenStack instances.
         """
-        return tuple(
-            server
-            for server in cast(list[OpenstackServer], conn.list_servers())
-            if InstanceID.name_has_prefix(self.prefix, server.name)
-        )
+        return self._server_inventory.list_servers(conn)
 
     @staticmethod
     def _get_and_ensure_unique_server(
@@ -701,6 +731,8 @@ class OpenstackCloud:
     ) -> OpenstackKeypair:
         """Create OpenStack keypair.
 
+        The ed25519 key is generated locally and only the public key is imported to OpenStack.
+
         Args:
             conn: The connection object to access OpenStack cloud.
             instance_id: The name of the keypair.
@@ -711,14 +743,11 @@ class OpenstackCloud:
         key_path = self._get_key_path(instance_id)
 
         if key_path.exists():
-            logger.warning("Existing private key file for %s found, removing it.", instance_id)
-            key_path.unlink(missing_ok=True)
-
-        keypair = conn.create_keypair(name=str(instance_id))
-        key_path.write_text(keypair.private_key)
-        # the charm executes this as root, so we need to change the ownership of the key file
-        shutil.chown(key_path, user=self._system_user)
-        key_path.chmod(0o400)
+            logger.warning("Existing private key file for %s found, replacing it.", instance_id)
+
+        ssh_keypair = generate_ssh_keypair()
+        keypair = conn.create_keypair(name=str(instance_id), public_key=ssh_keypair.public_key)
+        write_private_key(key_path, ssh_keypair.private_key, user=self._system_user)
         return keypair
 
     @staticmethod
@@ -748,6 +777,51 @@ class OpenstackCloud:
         key_path.unlink(missing_ok=True)
         logger.info("Deleted key: %s", delete_keypair_config.instance_id)
 
+    def _get_security_group(
+        self, conn: OpenstackConnection, ingress_tcp_ports: list[int] | None
+    ) -> OpenstackSecurityGroup:
+        """Get the runner security group, ensuring it if not done recently.
+
+        Args:
+            conn: The connection object to access OpenStack cloud.
+            ingress_tcp_ports: Ports to create an ingress rule for.
+
+        Returns:
+            The security group with the rules for runners.
+        """
+        key = self._security_group_cache_key(ingress_tcp_ports)
+        security_group = _security_group_cache.get(key)
+        if security_group is None:
+            security_group = OpenstackCloud._ensure_security_group(conn, ingress_tcp_ports)
+            _security_group_cache.set(key, security_group)
+        return security_group
+
+    def _invalidate_security_group(self, ingress_tcp_ports: list[int] | None) -> None:
+        """Ensure the runner security group again on the next launch.
+
+        Args:
+            ingress_tcp_ports: Ports to create an ingress rule for.
+        """
+        _security_group_cache.invalidate(self._security_group_cache_key(ingress_tcp_ports))
+
+    def _security_group_cache_key(
+        self, ingress_tcp_ports: list[int] | None
+    ) -> tuple[str, str, str, tuple[int, ...]]:
+        """Get the key of the runner security group in the cache.
+
+        Args:
+            ingress_tcp_ports: Ports to create an ingress rule for.
+
+        Returns:
+            The key in the security group cache.
+        """
+        return (
+            self._credentials.auth_url,
+            self._credentials.project_name,
+            self._credentials.region_name,
+            tuple(sorted(ingress_tcp_ports or ())),
+        )
+
     @staticmethod
     def _ensure_security_group(
         conn: OpenstackConnection, ingress_tcp_ports: list[int] | None
@@ -790,28 +864,32 @@ class OpenstackCloud:
 
     @contextmanager
     def _get_openstack_connection(self) -> Iterator[OpenstackConnection]:
-        """Create a connection context managed object, to be used within with statements.
+        """Get a pooled connection context managed object, to be used within with statements.
 
-        Using the context manager ensures that the connection is properly closed after use.
+        The connection is shared and stays open after use. If the OpenStack API still rejects
+        the token after keystoneauth re-authenticated, the connection is dropped from the pool
+        so the next call starts with a new one.
 
         Yields:
             An openstack.connection.Connection object.
+
+        Raises:
+            SDKException: If an OpenStack call made with the connection failed.
+            ClientException: If a Keystone call made with the connection failed.
         """
         # api documents that keystoneauth1.exceptions.MissingRequiredOptions can be raised but
         # I could not reproduce it. Therefore, no catch here for such exception.
-
-        with openstack.connect(
-            auth_url=self._credentials.auth_url,
-            project_name=self._credentials.project_name,
-            username=self._credentials.username,
-            password=self._credentials.password,
-            region_name=self._credentials.region_name,
-            user_domain_name=self._credentials.user_domain_name,
-            project_domain_name=self._credentials.project_domain_name,
-            compute_api_version=self._max_compute_api_version,
-        ) as conn:
-            conn.authorize()
-            yield conn
+        with connection_pool.connection(self._credentials, self._max_compute_api_version) as conn:
+            try:
+                yield conn
+            except (
+                openstack.exceptions.SDKException,
+                keystoneauth1.exceptions.ClientException,
+            ) as exc:
+                if is_unauthorized(exc):
+                    logger.warning("OpenStack token rejected, dropping the pooled connection")
+                    connection_pool.evict(conn)
+                raise
 
     @functools.cached_property
     def _max_compute_api_version(self) -> str:
@@ -841,18 +919,10 @@ class OpenstackCloud:
         Returns:
             The maximum compute API version as a string.
         """
-        with openstack.connect(
-            auth_url=self._credentials.auth_url,
-            project_name=self._credentials.project_name,
-            username=self._credentials.username,
-            password=self._credentials.password,
-            region_name=self._credentials.region_name,
-            user_domain_name=self._credentials.user_domain_name,
-            project_domain_name=self._credentials.project_domain_name,
-        ) as conn:
+        with connection_pool.connection(self._credentials) as conn:
             version_endpoint = conn.compute.get_endpoint()
             resp = conn.session.get(version_endpoint)
-            return resp.json()["version"]["version"]
+        return resp.json()["version"]["version"]
 
     def _version_greater_than(self, version1: str, version2: str) -> bool:
         """Compare two OpenStack API versions.
@@ -19,6 +19,7 @@ from github_runner_manager.errors import (
 from github_runner_manager.manager.models import InstanceID, RunnerContext, RunnerIdentity
 from github_runner_manager.manager.vm_manager import VM, CloudRunnerManager, RunnerMetrics, VMState
 from github_runner_manager.metrics import runner as runner_metrics
+from github_runner_manager.metrics.spool import RunnerMetricsSpool
 from github_runner_manager.openstack_cloud.constants import (
     CREATE_SERVER_TIMEOUT,
     METRICS_EXCHANGE_PATH,
@@ -66,6 +67,9 @@ class OpenStackRunnerManager(CloudRunnerManager):
             system_user=user.user,
             proxy_command=config.service_config.manager_proxy_command,
         )
+        self._metrics_spool = (
+            RunnerMetricsSpool() if config.service_config.runner_metrics_url else None
+        )
         # Setting the env var to this process and any child process spawned.
         proxies = config.service_config.proxy_config
         if proxies and (no_proxy := proxies.no_proxy):
@@ -105,7 +109,9 @@ class OpenStackRunnerManager(CloudRunnerManager):
         if (server_config := self._config.server_config) is None:
             raise MissingServerConfigError("Missing server configuration to create runners")
 
-        cloud_init = self._generate_cloud_init(runner_context=runner_context)
+        cloud_init = self._generate_cloud_init(
+            instance_id=runner_identity.instance_id, runner_context=runner_context
+        )
         try:
             instance = self._openstack_cloud.launch_instance(
                 runner_identity=runner_identity,
@@ -133,6 +139,8 @@ class OpenStackRunnerManager(CloudRunnerManager):
     def cleanup(self) -> None:
         """Cleanup runner and resource on the cloud."""
         self._openstack_cloud.delete_expired_keys()
+        if self._metrics_spool is not None:
+            self._metrics_spool.remove_expired()
 
     def _build_cloud_runner_instance(self, instance: OpenstackInstance) -> VM:
         """Build a new cloud runner instance from an openstack instance."""
@@ -144,12 +152,13 @@ class OpenStackRunnerManager(CloudRunnerManager):
             created_at=instance.created_at,
         )
 
-    def _generate_cloud_init(self, runner_context: RunnerContext) -> str:
+    def _generate_cloud_init(self, instance_id: InstanceID, runner_context: RunnerContext) -> str:
         """Generate cloud init userdata.
 
         This is the script the openstack server runs on startup.
 
         Args:
+            instance_id: The instance ID of the runner.
             runner_context: Context for the runner.
 
         Returns:
@@ -177,9 +186,11 @@ class OpenStackRunnerManager(CloudRunnerManager):
             ssh_debug_info=ssh_debug_info,
             tmate_server_proxy=runner_http_proxy,
         )
+        metrics_push = self._get_metrics_push(instance_id)
         pre_job_contents_dict = {
             "issue_metrics": True,
             "metrics_exchange_path": str(METRICS_EXCHANGE_PATH),
+            **metrics_push,
             "do_repo_policy_check": False,
             "custom_pre_job_script": service_config.custom_pre_job_script,
         }
@@ -209,6 +220,7 @@ class OpenStackRunnerManager(CloudRunnerManager):
             env_contents=env_contents,
             pre_job_contents=pre_job_contents,
             metrics_exchange_path=str(METRICS_EXCHANGE_PATH),
+            **metrics_push,
             use_aproxy=use_aproxy,
             aproxy_address=service_config.runner_proxy_config.proxy_address,
             aproxy_exclude_ipv4_addresses=", ".join(aproxy_exclude_ipv4_addresses),
@@ -218,6 +230,26 @@ class OpenStackRunnerManager(CloudRunnerManager):
             runner_proxy_config=service_config.runner_proxy_config,
         )
 
+    def _get_metrics_push(self, instance_id: InstanceID) -> dict[str, str | None]:
+        """Get the template variables for a runner to push its metrics to the manager.
+
+        Args:
+            instance_id: The instance ID of the runner.
+
+        Returns:
+            The URL and the token to push the metrics with, None if the runners do not push
+            their metrics.
+        """
+        runner_metrics_url = self._config.service_config.runner_metrics_url
+        if self._metrics_spool is None or not runner_metrics_url:
+            return {"metrics_push_url": None, "metrics_push_token": None}
+        return {
+            "metrics_push_url": (
+                f"{str(runner_metrics_url).rstrip('/')}/runner/{instance_id.name}/metrics"
+            ),
+            "metrics_push_token": self._metrics_spool.get_token(instance_id.name),
+        }
+
     def _get_repo_policy_compliance_client(self) -> RepoPolicyComplianceClient | None:
         """Get repo policy compliance client.
 
@@ -251,12 +283,21 @@ class OpenStackRunnerManager(CloudRunnerManager):
     def extract_metrics(self, instance_ids: Sequence[InstanceID]) -> Sequence[RunnerMetrics]:
         """Extract metrics from cloud VMs.
 
+        The metrics pushed by the runners are taken from the spool, the rest are pulled from the
+        VMs through SSH. The extracted runners are removed from the spool.
+
         Args:
             instance_ids: The ID of the VMs to fetch metrics from.
 
         Returns:
             Metrics from VMs.
         """
-        return runner_metrics.pull_runner_metrics(
-            cloud_service=self._openstack_cloud, instance_ids=instance_ids
+        metrics = runner_metrics.pull_runner_metrics(
+            cloud_service=self._openstack_cloud,
+            instance_ids=instance_ids,
+            spool=self._metrics_spool,
         )
+        if self._metrics_spool is not None:
+            for instance_id in instance_ids:
+                self._metrics_spool.remove(instance_id.name)
+        return metrics
@@ -0,0 +1,121 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Resolution of the image, flavor and network of the runner servers."""
+
+import logging
+from dataclasses import dataclass
+
+from openstack.compute.v2.flavor import Flavor as OpenstackFlavor
+from openstack.connection import Connection as OpenstackConnection
+from openstack.image.v2.image import Image as OpenstackImage
+from openstack.network.v2.network import Network as OpenstackNetwork
+
+from github_runner_manager.openstack_cloud.configuration import OpenStackCredentials
+from github_runner_manager.openstack_cloud.models import OpenStackServerConfig
+from github_runner_manager.utilities import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Seconds a resolved server configuration is reused before resolving the names again.
+RESOLVED_SERVER_CONFIG_TTL = 10 * 60
+
+_ResolverKey = tuple[str, str, str, str, str, str]
+
+
+@dataclass(frozen=True)
+class ResolvedServerConfig:
+    """OpenStack resources of a server configuration.
+
+    Passing the resources instead of the names to create_server avoids the lookups done by
+    openstacksdk to resolve each of the names.
+
+    Attributes:
+        image: The image for runners to use.
+        flavor: The flavor for runners to use.
+        network: The network for runners to use.
+    """
+
+    image: OpenstackImage
+    flavor: OpenstackFlavor
+    network: OpenstackNetwork
+
+
+class ServerConfigResolver:
+    """Resolve the names in the server configurations to OpenStack resources, with a cache."""
+
+    def __init__(self, ttl: float = RESOLVED_SERVER_CONFIG_TTL):
+        """Construct the object.
+
+        Args:
+            ttl: Seconds a resolved server configuration is cached.
+        """
+        self._cache: TTLCache[_ResolverKey, ResolvedServerConfig] = TTLCache(ttl=ttl)
+
+    def resolve(
+        self,
+        conn: OpenstackConnection,
+        credentials: OpenStackCredentials,
+        server_config: OpenStackServerConfig,
+    ) -> ResolvedServerConfig:
+        """Get the OpenStack resources of a server configuration.
+
+        Args:
+            conn: The connection object to access OpenStack cloud.
+            credentials: The OpenStack credentials of the connection.
+            server_config: The server configuration to resolve.
+
+        Returns:
+            The resources of the server configuration.
+        """
+        key = self._key(credentials, server_config)
+        resolved = self._cache.get(key)
+        if resolved is None:
+            logger.info("Resolving server configuration %s", server_config)
+            resolved = ResolvedServerConfig(
+                image=conn.image.find_image(server_config.image, ignore_missing=False),
+                flavor=conn.compute.find_flavor(server_config.flavor, ignore_missing=False),
+                network=conn.network.find_network(server_config.network, ignore_missing=False),
+            )
+            self._cache.set(key, resolved)
+        return resolved
+
+    def invalidate(
+        self, credentials: OpenStackCredentials, server_config: OpenStackServerConfig
+    ) -> None:
+        """Resolve the server configuration again on the next use.
+
+        Args:
+            credentials: The OpenStack credentials.
+            server_config: The server configuration.
+        """
+        self._cache.invalidate(self._key(credentials, server_config))
+
+    def clear(self) -> None:
+        """Forget all the resolved server configurations."""
+        self._cache.invalidate()
+
+    @staticmethod
+    def _key(
+        credentials: OpenStackCredentials, server_config: OpenStackServerConfig
+    ) -> _ResolverKey:
+        """Get the cache key of a server configuration.
+
+        Args:
+            credentials: The OpenStack credentials.
+            server_config: The server configuration.
+
+        Returns:
+            The key in the cache.
+        """
+        return (
+            credentials.auth_url,
+            credentials.project_name,
+            credentials.region_name,
+            server_config.image,
+            server_config.flavor,
+            server_config.network,
+        )
+
+
+server_config_resolver = ServerConfigResolver()
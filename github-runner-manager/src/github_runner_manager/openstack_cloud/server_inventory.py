@@ -0,0 +1,113 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Incremental inventory of the OpenStack servers of a runner manager."""
+
+import logging
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import cast
+
+import keystoneauth1.exceptions
+import openstack.exceptions
+from openstack.compute.v2.server import Server as OpenstackServer
+from openstack.connection import Connection as OpenstackConnection
+
+from github_runner_manager.manager.models import InstanceID
+
+logger = logging.getLogger(__name__)
+
+# A full listing of the servers is done at least this often, so that a change missed by the
+# incremental listing does not stay in the inventory forever.
+FULL_RESYNC_INTERVAL_SECONDS = 10 * 60
+# The changes-since filter is compared against the clock of Nova, the margin covers the clock
+# skew between this host and Nova.
+_CHANGES_SINCE_MARGIN = timedelta(seconds=60)
+# Servers with these states are returned by the changes-since filter once deleted.
+_DELETED_SERVER_STATUSES = ("DELETED", "SOFT_DELETED")
+
+
+class ServerInventory:
+    """Last known set of servers with a prefix, updated with the changes reported by Nova.
+
+    The first listing, and a listing every FULL_RESYNC_INTERVAL_SECONDS, request all the
+    servers with the prefix. Other listings use the changes-since filter of Nova to request
+    only the servers created, updated or deleted since the previous listing.
+    """
+
+    def __init__(
+        self, prefix: str, full_resync_interval: float = FULL_RESYNC_INTERVAL_SECONDS
+    ) -> None:
+        """Construct the object.
+
+        Args:
+            prefix: The name prefix of the servers.
+            full_resync_interval: Seconds between full listings of the servers.
+        """
+        self._prefix = prefix
+        self._full_resync_interval = full_resync_interval
+        self._lock = threading.Lock()
+        self._servers: dict[str, OpenstackServer] = {}
+        self._last_sync: datetime | None = None
+        self._last_full_sync = 0.0
+
+    def list_servers(self, conn: OpenstackConnection) -> tuple[OpenstackServer, ...]:
+        """Get the servers with the prefix.
+
+        Args:
+            conn: The connection object to access OpenStack cloud.
+
+        Raises:
+            SDKException: If the servers could not be listed.
+            ClientException: If the Keystone authentication failed.
+
+        Returns:
+            The servers with the prefix.
+        """
+        with self._lock:
+            sync_time = datetime.now(timezone.utc)
+            # Nova matches the name filter as a regular expression.
+            filters: dict[str, str] = {"name": f"^{re.escape(self._prefix)}-"}
+            full_resync = (
+                self._last_sync is None
+                or time.monotonic() - self._last_full_sync >= self._full_resync_interval
+            )
+            if not full_resync:
+                filters["changes_since"] = (
+                    cast(datetime, self._last_sync) - _CHANGES_SINCE_MARGIN
+                ).isoformat()
+
+            try:
+                servers = cast(list[OpenstackServer], conn.list_servers(filters=filters))
+            except (
+                openstack.exceptions.SDKException,
+                keystoneauth1.exceptions.ClientException,
+            ):
+                # Start again from a full listing, the inventory may be partially updated.
+                self.invalidate()
+                raise
+
+            if full_resync:
+                logger.debug("Full listing of servers with prefix %s", self._prefix)
+                self._servers = {}
+                self._last_full_sync = time.monotonic()
+            for server in servers:
+                if server.status in _DELETED_SERVER_STATUSES or not InstanceID.name_has_prefix(
+                    self._prefix, server.name
+                ):
+                    self._servers.pop(server.id, None)
+                else:
+                    self._servers[server.id] = server
+            logger.debug(
+                "Listed %s changed servers, %s servers in the inventory",
+                len(servers),
+                len(self._servers),
+            )
+            self._last_sync = sync_time
+            return tuple(self._servers.values())
+
+    def invalidate(self) -> None:
+        """Force a full listing of the servers on the next call."""
+        self._last_sync = None
@@ -0,0 +1,70 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""SSH keys of the runner servers."""
+
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+
+@dataclass(frozen=True)
+class SSHKeyPair:
+    """SSH keypair in OpenSSH format.
+
+    Attributes:
+        private_key: The private key.
+        public_key: The public key.
+    """
+
+    private_key: str
+    public_key: str
+
+
+def generate_ssh_keypair() -> SSHKeyPair:
+    """Generate an ed25519 SSH keypair locally.
+
+    Returns:
+        The generated keypair.
+    """
+    key = Ed25519PrivateKey.generate()
+    private_key = key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.OpenSSH,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    public_key = key.public_key().public_bytes(
+        encoding=serialization.Encoding.OpenSSH,
+        format=serialization.PublicFormat.OpenSSH,
+    )
+    return SSHKeyPair(private_key=private_key.decode(), public_key=public_key.decode())
+
+
+def write_private_key(key_path: Path, private_key: str, user: str) -> None:
+    """Write a private key file atomically, readable only by the user.
+
+    The key is written to a temporary file in the same directory, which is renamed to the key
+    path once complete, so the key path never holds a partial key.
+
+    Args:
+        key_path: The path of the key file.
+        private_key: The private key.
+        user: The user to own the key file.
+    """
+    # The temporary file starts with a dot, so it is never taken for a key file of a runner.
+    fd, tmp_name = tempfile.mkstemp(dir=key_path.parent, prefix=f".{key_path.name}.")
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "w") as tmp_file:
+            tmp_file.write(private_key)
+        # the charm executes this as root, so we need to change the ownership of the key file
+        shutil.chown(tmp_path, user=user)
+        tmp_path.chmod(0o400)
+        tmp_path.replace(key_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
@@ -10,6 +10,7 @@ from enum import Enum
 
 from pydantic import HttpUrl
 
+from github_runner_manager.concurrency import GITHUB_CONCURRENCY
 from github_runner_manager.configuration.github import GitHubConfiguration, GitHubPath, GitHubRepo
 from github_runner_manager.github_client import (
     DeleteRunnerBusyError,
@@ -176,7 +177,7 @@ class GitHubRunnerPlatform(PlatformProvider):
             The runner IDs that were deleted successfully.
         """
         logger.info("Delete runners from GitHub provider: %s", runner_ids)
-        # Guard multiprocessing.Pool from having 0 processes which will raise an error.
+        # Guard ThreadPoolExecutor from having 0 threads which will raise an error.
         if not runner_ids:
             return []
 
@@ -186,7 +187,7 @@ class GitHubRunnerPlatform(PlatformProvider):
         ]
         deleted_runner_ids: list[str] = []
         with concurrent.futures.ThreadPoolExecutor(
-            max_workers=min(len(runner_ids), 30)
+            max_workers=min(len(runner_ids), GITHUB_CONCURRENCY.maximum)
         ) as executor:
             future_to_delete_runner_config = {
                 executor.submit(GitHubRunnerPlatform._delete_runner, config): config
@@ -209,14 +210,15 @@ class GitHubRunnerPlatform(PlatformProvider):
     def _delete_runner(delete_runner_config: _DeleteRunnerConfig) -> None:
         """Delete a single runner from GitHub.
 
-        This method is a wrapper to be called via multiprocessing pool for parallel deletion.
+        This method is a wrapper to be called via a thread pool for parallel deletion.
 
         Args:
             delete_runner_config: The configuration to use for deleting the runner.
         """
-        delete_runner_config.github_client.delete_runner(
-            path=delete_runner_config.path, runner_id=int(delete_runner_config.runner_id)
-        )
+        with GITHUB_CONCURRENCY.slot():
+            delete_runner_config.github_client.delete_runner(
+                path=delete_runner_config.path, runner_id=int(delete_runner_config.runner_id)
+            )
 
     def get_runner_context(
         self, metadata: RunnerMetadata, instance_id: InstanceID, labels: list[str]
@@ -233,9 +235,10 @@ class GitHubRunnerPlatform(PlatformProvider):
         Returns:
             The registration token and the runner.
         """
-        token, runner = self._client.get_runner_registration_jittoken(
-            self._path, instance_id, labels
-        )
+        with GITHUB_CONCURRENCY.slot():
+            token, runner = self._client.get_runner_registration_jittoken(
+                self._path, instance_id, labels
+            )
         command_to_run = (
             "su - ubuntu -c "
             f'"cd ~/actions-runner && /home/ubuntu/actions-runner/run.sh --jitconfig {token}"'
@@ -3,16 +3,20 @@
 
 """JobManager platform provider."""
 
+import concurrent.futures
 import logging
 
 from pydantic import HttpUrl
 
+from github_runner_manager.concurrency import JOBMANAGER_CONCURRENCY
 from github_runner_manager.configuration.jobmanager import JobManagerConfiguration
 from github_runner_manager.jobmanager_api import (
     JobManagerAPI,
     JobManagerAPIError,
     JobManagerAPINotFoundError,
+    JobManagerAPIUnsupportedError,
     JobStatus,
+    RunnerHealth,
     RunnerStatus,
 )
 from github_runner_manager.manager.models import (
@@ -92,47 +96,125 @@ class JobManagerPlatform(PlatformProvider):
             )
             raise PlatformApiError("API error") from exc
 
-        online = response.status != RunnerStatus.PENDING
-        # busy is complex in the jobmanager, as a completed job that is not deletable is really
-        # busy. As so, every job that is not deletable is considered busy.
-        busy = not response.deletable
-        deletable = response.deletable
-
-        return PlatformRunnerHealth(
-            identity=runner_identity,
-            online=online,
-            deletable=deletable,
-            busy=busy,
-        )
+        return self._to_platform_health(runner_identity, response)
 
     def get_runners_health(self, requested_runners: list[RunnerIdentity]) -> RunnersHealthResponse:
         """Get the health of a list of requested runners.
 
+        The health of all the runners is requested in a single request if the jobmanager
+        supports it, or with a request per runner in parallel otherwise.
+
         Args:
             requested_runners: List of requested runners.
 
         Returns:
             Health information on the runners.
         """
+        if not requested_runners:
+            return RunnersHealthResponse()
+        try:
+            return self._get_runners_health_bulk(requested_runners)
+        except JobManagerAPIUnsupportedError:
+            logger.debug("Bulk runner health not supported by the jobmanager")
         runners_health = []
         failed_runners = []
-        for identity in requested_runners:
-            try:
-                health = self.get_runner_health(identity)
-            except PlatformApiError as exc:
-                logger.warning(
-                    "Failed to get information for the runner %s in the jobmanager. %s",
-                    identity,
-                    exc,
-                )
-                failed_runners.append(identity)
-                continue
-            runners_health.append(health)
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(len(requested_runners), JOBMANAGER_CONCURRENCY.maximum)
+        ) as executor:
+            futures = [
+                executor.submit(self._get_runner_health_in_slot, identity)
+                for identity in requested_runners
+            ]
+            for identity, future in zip(requested_runners, futures):
+                try:
+                    runners_health.append(future.result())
+                except PlatformApiError as exc:
+                    logger.warning(
+                        "Failed to get information for the runner %s in the jobmanager. %s",
+                        identity,
+                        exc,
+                    )
+                    failed_runners.append(identity)
         return RunnersHealthResponse(
             requested_runners=runners_health,
             failed_requested_runners=failed_runners,
         )
 
+    def _get_runners_health_bulk(
+        self, requested_runners: list[RunnerIdentity]
+    ) -> RunnersHealthResponse:
+        """Get the health of a list of requested runners in a single request.
+
+        Args:
+            requested_runners: List of requested runners.
+
+        Raises:
+            JobManagerAPIUnsupportedError: If the jobmanager does not support the bulk request.
+
+        Returns:
+            Health information on the runners. All the runners are failed if the request failed.
+        """
+        runner_ids = [int(identity.metadata.runner_id) for identity in requested_runners]
+        try:
+            with JOBMANAGER_CONCURRENCY.slot():
+                responses = self._jobmanager_api.get_runners_health(runner_ids)
+        except JobManagerAPIUnsupportedError:
+            raise
+        except JobManagerAPIError as exc:
+            logger.warning("Failed to get information for the runners in the jobmanager. %s", exc)
+            return RunnersHealthResponse(failed_requested_runners=list(requested_runners))
+        runners_health = []
+        for identity, runner_id in zip(requested_runners, runner_ids):
+            if runner_id in responses:
+                runners_health.append(self._to_platform_health(identity, responses[runner_id]))
+            else:
+                runners_health.append(
+                    PlatformRunnerHealth(
+                        identity=identity, online=False, deletable=False, busy=False
+                    )
+                )
+        return RunnersHealthResponse(requested_runners=runners_health)
+
+    def _get_runner_health_in_slot(self, runner_identity: RunnerIdentity) -> PlatformRunnerHealth:
+        """Get health information on jobmanager runner, within the jobmanager concurrency.
+
+        This method is a wrapper to be called via a thread pool for parallel requests.
+
+        Args:
+            runner_identity: Identity of the runner.
+
+        Returns:
+           The health of the runner in the jobmanager.
+        """
+        with JOBMANAGER_CONCURRENCY.slot():
+            return self.get_runner_health(runner_identity)
+
+    @staticmethod
+    def _to_platform_health(
+        runner_identity: RunnerIdentity, response: RunnerHealth
+    ) -> PlatformRunnerHealth:
+        """Convert the health of a runner in the jobmanager to the platform health.
+
+        Args:
+            runner_identity: Identity of the runner.
+            response: The health of the runner in the jobmanager.
+
+        Returns:
+           The health of the runner in the jobmanager.
+        """
+        online = response.status != RunnerStatus.PENDING
+        # busy is complex in the jobmanager, as a completed job that is not deletable is really
+        # busy. As so, every job that is not deletable is considered busy.
+        busy = not response.deletable
+        deletable = response.deletable
+
+        return PlatformRunnerHealth(
+            identity=runner_identity,
+            online=online,
+            deletable=deletable,
+            busy=busy,
+        )
+
     def delete_runners(self, runner_ids: list[str]) -> list[str]:
         """Delete a runner from jobmanager.
 
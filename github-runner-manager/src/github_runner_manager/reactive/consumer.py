@@ -8,7 +8,8 @@ import re
 import signal
 import sys
 from contextlib import closing
-from time import sleep
+from dataclasses import dataclass
+from time import monotonic, sleep
 from types import FrameType
 from typing import Generator, cast
 from urllib.parse import urlparse
@@ -18,21 +19,30 @@ from kombu.exceptions import KombuError
 from kombu.simple import SimpleQueue
 from pydantic import BaseModel, HttpUrl, ValidationError, validator
 
-from github_runner_manager.manager.models import RunnerMetadata
+from github_runner_manager.configuration.base import PickUpPollConfig
+from github_runner_manager.manager.models import InstanceID, RunnerIdentity, RunnerMetadata
 from github_runner_manager.manager.runner_manager import RunnerManager
-from github_runner_manager.platform.platform_provider import JobNotFoundError, PlatformProvider
+from github_runner_manager.platform.platform_provider import (
+    JobNotFoundError,
+    PlatformError,
+    PlatformProvider,
+)
+from github_runner_manager.reactive.pick_up import BootTimes, get_poll_delays, get_retry_delay
+from github_runner_manager.reactive.registry import ReactiveWorkerRegistry
+from github_runner_manager.reactive.router import LabelRouter, Labels, Route
 from github_runner_manager.reactive.types_ import QueueConfig
 
 logger = logging.getLogger(__name__)
 
-Labels = set[str]
-
 PROCESS_COUNT_HEADER_NAME = "X-Process-Count"
-WAIT_TIME_IN_SEC = 60
 RETRY_LIMIT = 5
 # This control message is for testing. The reactive process will stop consuming messages
 # when the message is sent. This message does not come from the router.
 END_PROCESSING_PAYLOAD = "__END__"
+# Records the jobs handled by the current reactive process, if registered.
+WORKER_REGISTRY = ReactiveWorkerRegistry()
+# The boot times of the runners by flavor, shared by the reactive processes.
+BOOT_TIMES = BootTimes()
 
 
 class JobDetails(BaseModel):
@@ -65,6 +75,27 @@ class JobDetails(BaseModel):
         return v
 
 
+@dataclass
+class _Job:
+    """A job to spawn a runner for.
+
+    Attributes:
+        msg: The message of the job.
+        details: The details of the job.
+        metadata: The metadata of the runner to spawn for the job.
+        route: The runner manager and labels of the runner to spawn for the job.
+        runner: The runner spawned for the job.
+        spawned_at: The monotonic time the runner was requested at.
+    """
+
+    msg: Message
+    details: JobDetails
+    metadata: RunnerMetadata
+    route: Route
+    runner: RunnerIdentity | None = None
+    spawned_at: float = 0.0
+
+
 class JobError(Exception):
     """Raised when a job error occurs."""
 
@@ -93,12 +124,13 @@ def get_queue_size(queue_config: QueueConfig) -> int:
         raise QueueError("Error when communicating with the queue") from exc
 
 
-# Ignore `consume` too complex as it is pending re-design.
-def consume(  # noqa: C901
+def consume(  # pylint: disable=too-many-arguments, too-many-positional-arguments
     queue_config: QueueConfig,
     runner_manager: RunnerManager,
     platform_provider: PlatformProvider,
     supported_labels: Labels,
+    pick_up_poll: PickUpPollConfig | None = None,
+    router: LabelRouter | None = None,
 ) -> None:
     """Consume a job from the message queue.
 
@@ -111,6 +143,9 @@ def consume(  # noqa: C901
         platform_provider: Platform provider.
         supported_labels: The supported labels for the runner. If the job has unsupported labels,
             the message is requeued.
+        pick_up_poll: The schedule of the checks whether the job was picked up.
+        router: The router of the jobs to the runner managers of several images and flavors. If
+            None, the runners are created by the runner manager for the supported labels.
 
     Raises:
         QueueError: If an error when communicating with the queue occurs.
@@ -128,74 +163,234 @@ def consume(  # noqa: C901
                 if msg.payload == END_PROCESSING_PAYLOAD:
                     msg.ack()
                     break
-
-                msg.headers[PROCESS_COUNT_HEADER_NAME] = (
-                    msg.headers.get(PROCESS_COUNT_HEADER_NAME, 0) + 1
-                )
-                msg_process_count = msg.headers[PROCESS_COUNT_HEADER_NAME]
-
-                job_details = _parse_job_details(msg)
-                logger.info("Received reactive job: %s", job_details)
-
-                if msg_process_count > RETRY_LIMIT:
-                    logger.warning(
-                        "Retry limit reach for job %s with labels: %s",
-                        job_details.url,
-                        job_details.labels,
-                    )
-                    msg.reject(requeue=False)
-                    continue
-
-                if msg_process_count > 1:
-                    logger.info(
-                        "Pause job %s with retry count %s", job_details.url, msg_process_count
-                    )
-                    # Avoid rapid retrying to prevent overloading services, e.g., OpenStack API.
-                    sleep(WAIT_TIME_IN_SEC)
-
-                if not _validate_labels(
-                    labels=job_details.labels, supported_labels=supported_labels
-                ):
-                    logger.error(
-                        "Found unsupported job labels in %s. "
-                        "Will not spawn a runner and reject the message.",
-                        job_details.labels,
-                    )
-                    # We currently do not expect this to happen, but we should handle it.
-                    # We do not want to requeue the message as it will be rejected again.
-                    # This may change in the future when messages for multiple
-                    # flavours are sent to the same queue.
-                    msg.reject(requeue=False)
-                    continue
-                try:
-                    metadata = _build_runner_metadata(job_details.url)
-                except ValueError:
-                    msg.reject(requeue=False)
-                    break
-                try:
-                    if platform_provider.check_job_been_picked_up(
-                        metadata=metadata, job_url=job_details.url
-                    ):
-                        logger.info("reactive job: %s already picked up.", job_details)
-                        msg.ack()
-                        continue
-                except JobNotFoundError:
-                    logger.warning(
-                        "Unable to find the job %s. Not retrying this job.", job_details.url
-                    )
-                    msg.reject(requeue=False)
-                _spawn_runner(
+                if process_messages(
+                    msgs=[msg],
                     runner_manager=runner_manager,
-                    job_url=job_details.url,
-                    msg=msg,
                     platform_provider=platform_provider,
-                    metadata=metadata,
-                )
-                break
+                    supported_labels=supported_labels,
+                    pick_up_poll=pick_up_poll,
+                    router=router,
+                ):
+                    break
     except KombuError as exc:
         raise QueueError("Error when communicating with the queue") from exc
 
 
+def process_messages(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+    msgs: list[Message],
+    runner_manager: RunnerManager,
+    platform_provider: PlatformProvider,
+    supported_labels: Labels,
+    pick_up_poll: PickUpPollConfig | None = None,
+    router: LabelRouter | None = None,
+) -> int:
+    """Process job messages from the queue, spawning the runners for the jobs in a batch.
+
+    Each message is acknowledged or rejected, unless the process is interrupted.
+
+    Args:
+        msgs: The messages of the jobs.
+        runner_manager: The runner manager used to create the runners.
+        platform_provider: Platform provider.
+        supported_labels: The supported labels for the runners.
+        pick_up_poll: The schedule of the checks whether the jobs were picked up.
+        router: The router of the jobs to the runner managers of several images and flavors. If
+            None, the runners are created by the runner manager for the supported labels.
+
+    Raises:
+        JobError: If the details of a job are invalid, once the other jobs are processed.
+
+    Returns:
+        The number of jobs runners were spawned for.
+    """
+    received_at = monotonic()
+    pick_up_poll = pick_up_poll or PickUpPollConfig()
+    if router is None:
+        router = LabelRouter(
+            [Route(runner_manager=runner_manager, supported_labels=supported_labels)]
+        )
+    jobs = []
+    at_capacity: list[Message] = []
+    job_error = None
+    for msg in msgs:
+        try:
+            job = _prepare_job(msg, router, at_capacity)
+        except JobError as exc:
+            job_error = job_error or exc
+            continue
+        if job is not None:
+            jobs.append(job)
+    try:
+        spawned = _spawn_runners_for_jobs(jobs, platform_provider, pick_up_poll, received_at)
+    finally:
+        for job in jobs:
+            router.release(job.route)
+    _requeue_at_capacity(at_capacity, pick_up_poll, received_at)
+    if job_error is not None:
+        raise JobError(str(job_error)) from job_error
+    return spawned
+
+
+def _spawn_runners_for_jobs(
+    jobs: list[_Job],
+    platform_provider: PlatformProvider,
+    pick_up_poll: PickUpPollConfig,
+    received_at: float,
+) -> int:
+    """Spawn the runners for the jobs not picked up yet, and wait for the jobs to be picked up.
+
+    The runners of the new jobs are spawned at once. The runners of the retried jobs are spawned
+    after the retry delay, while the runners of the new jobs boot.
+
+    Args:
+        jobs: The jobs.
+        platform_provider: Platform provider.
+        pick_up_poll: The schedule of the checks whether the jobs were picked up.
+        received_at: The monotonic time the messages of the jobs were received at.
+
+    Returns:
+        The number of jobs runners were spawned for.
+    """
+    new_jobs = [job for job in jobs if job.msg.headers[PROCESS_COUNT_HEADER_NAME] <= 1]
+    retried_jobs = [job for job in jobs if job.msg.headers[PROCESS_COUNT_HEADER_NAME] > 1]
+    with contextlib.ExitStack() as stack:
+        pending = _get_pending_jobs(new_jobs, platform_provider, stack)
+        spawned = _spawn_runners(jobs=pending, received_at=received_at)
+        if retried_jobs:
+            retries = max(job.msg.headers[PROCESS_COUNT_HEADER_NAME] - 1 for job in retried_jobs)
+            logger.info("Pause retried jobs %s", [job.details.url for job in retried_jobs])
+            # Avoid rapid retrying to prevent overloading services, e.g., OpenStack API.
+            sleep(max(get_retry_delay(pick_up_poll, retries) - (monotonic() - received_at), 0))
+            retried_pending = _get_pending_jobs(retried_jobs, platform_provider, stack)
+            spawned += _spawn_runners(jobs=retried_pending, received_at=received_at)
+            pending += retried_pending
+        if spawned:
+            _wait_for_jobs_picked_up(
+                platform_provider=platform_provider, jobs=spawned, pick_up_poll=pick_up_poll
+            )
+    return len(pending)
+
+
+def _get_pending_jobs(
+    jobs: list[_Job], platform_provider: PlatformProvider, stack: contextlib.ExitStack
+) -> list[_Job]:
+    """Get the jobs not picked up yet, recording them as handled until the stack is closed.
+
+    Args:
+        jobs: The jobs.
+        platform_provider: Platform provider.
+        stack: The stack of the records of the jobs handled.
+
+    Returns:
+        The jobs not picked up yet.
+    """
+    pending = [job for job in jobs if not _is_picked_up(job, platform_provider)]
+    for job in pending:
+        stack.enter_context(WORKER_REGISTRY.handling_job(str(job.details.url)))
+    return pending
+
+
+def _prepare_job(msg: Message, router: LabelRouter, at_capacity: list[Message]) -> _Job | None:
+    """Check a job message and route the job, or reject the message.
+
+    The route of the job is acquired, and must be released once the job is handled.
+
+    Args:
+        msg: The message of the job.
+        router: The router of the jobs to the runner managers.
+        at_capacity: The messages of the jobs whose routes are at capacity, to be requeued.
+
+    Returns:
+        The job, or None if the message was rejected or is to be requeued.
+    """
+    msg.headers[PROCESS_COUNT_HEADER_NAME] = msg.headers.get(PROCESS_COUNT_HEADER_NAME, 0) + 1
+    msg_process_count = msg.headers[PROCESS_COUNT_HEADER_NAME]
+
+    job_details = _parse_job_details(msg)
+    logger.info("Received reactive job: %s", job_details)
+
+    if msg_process_count > RETRY_LIMIT:
+        logger.warning(
+            "Retry limit reach for job %s with labels: %s",
+            job_details.url,
+            job_details.labels,
+        )
+        msg.reject(requeue=False)
+        return None
+
+    if not router.get_routes(job_details.labels):
+        logger.error(
+            "Found unsupported job labels in %s. "
+            "Will not spawn a runner and reject the message.",
+            job_details.labels,
+        )
+        # We do not want to requeue the message as it will be rejected again.
+        msg.reject(requeue=False)
+        return None
+    try:
+        metadata = _build_runner_metadata(job_details.url)
+    except ValueError:
+        msg.reject(requeue=False)
+        return None
+    route = router.acquire(job_details.labels)
+    if route is None:
+        logger.warning(
+            "All the runners for labels %s are at capacity. Will requeue the message.",
+            job_details.labels,
+        )
+        # Waiting for capacity is not a failed attempt to process the job.
+        msg.headers[PROCESS_COUNT_HEADER_NAME] -= 1
+        at_capacity.append(msg)
+        return None
+    return _Job(msg=msg, details=job_details, metadata=metadata, route=route)
+
+
+def _requeue_at_capacity(
+    msgs: list[Message], pick_up_poll: PickUpPollConfig, received_at: float
+) -> None:
+    """Requeue the messages of the jobs whose routes were at capacity.
+
+    The messages are held for the initial interval of the checks since they were received, so
+    the consumers do not take them again before the runners being spawned free some capacity.
+
+    Args:
+        msgs: The messages of the jobs.
+        pick_up_poll: The schedule of the checks whether the jobs were picked up.
+        received_at: The monotonic time the messages were received at.
+    """
+    if not msgs:
+        return
+    delay = get_retry_delay(pick_up_poll, 1) - (monotonic() - received_at)
+    if delay > 0:
+        sleep(delay)
+    for msg in msgs:
+        msg.reject(requeue=True)
+
+
+def _is_picked_up(job: _Job, platform_provider: PlatformProvider) -> bool:
+    """Check whether a job no longer needs a runner, acknowledging or rejecting its message.
+
+    Args:
+        job: The job.
+        platform_provider: Platform provider.
+
+    Returns:
+        Whether the job has been picked up or was not found.
+    """
+    try:
+        if platform_provider.check_job_been_picked_up(
+            metadata=job.metadata, job_url=job.details.url
+        ):
+            logger.info("reactive job: %s already picked up.", job.details)
+            job.msg.ack()
+            return True
+    except JobNotFoundError:
+        logger.warning("Unable to find the job %s. Not retrying this job.", job.details.url)
+        job.msg.reject(requeue=False)
+        return True
+    return False
+
+
 def _build_runner_metadata(job_url: str) -> RunnerMetadata:
     """Build runner metadata from the job url."""
     parsed_url = urlparse(job_url)
@@ -230,66 +425,158 @@ def _parse_job_details(msg: Message) -> JobDetails:
     return job_details
 
 
-def _validate_labels(labels: Labels, supported_labels: Labels) -> bool:
-    """Validate the labels of the job.
+def _spawn_runners(jobs: list[_Job], received_at: float) -> list[_Job]:
+    """Spawn a runner for each job, the runners of the jobs of a route and platform in one batch.
+
+    The messages of the jobs whose runner failed to spawn are rejected and requeued.
 
     Args:
-        labels: The labels of the job.
-        supported_labels: The supported labels for the runner.
+        jobs: The jobs to spawn the runners for.
+        received_at: The monotonic time the messages of the jobs were received at.
 
     Returns:
-        True if the labels are valid, False otherwise.
+        The jobs a runner was spawned for.
     """
-    return {label.lower() for label in labels} <= {label.lower() for label in supported_labels}
-
-
-def _spawn_runner(
-    runner_manager: RunnerManager,
-    job_url: HttpUrl,
-    msg: Message,
+    spawned = []
+    for route, metadata, group in _group_jobs(jobs):
+        job_urls = [job.details.url for job in group]
+        logger.info(
+            "Spawning %s new reactive runners of %s for jobs %s", len(group), route.name, job_urls
+        )
+        spawned_at = monotonic()
+        for _ in group:
+            WORKER_REGISTRY.record_spawn_latency(spawned_at - received_at)
+        instance_ids = route.runner_manager.create_runners(
+            len(group), metadata=metadata, reactive=True
+        )
+        for job in group[len(instance_ids) :]:
+            logger.error(
+                "Failed to spawn a runner for job %s. Will reject the message.", job.details.url
+            )
+            job.msg.reject(requeue=True)
+        if instance_ids:
+            logger.info("Reactive runners spawned %s", instance_ids)
+        for job, instance_id in zip(group, instance_ids):
+            job.runner = RunnerIdentity(instance_id=instance_id, metadata=metadata)
+            job.spawned_at = spawned_at
+            spawned.append(job)
+    return spawned
+
+
+def _wait_for_jobs_picked_up(
     platform_provider: PlatformProvider,
-    metadata: RunnerMetadata,
+    jobs: list[_Job],
+    pick_up_poll: PickUpPollConfig,
 ) -> None:
-    """Spawn a runner.
+    """Check if the jobs have been picked up, until the timeout of the schedule.
 
-    A runner is only spawned if the job has not yet been picked up by a runner.
-    After spawning a runner, it is checked if the job has been picked up.
-
-    If the job has been picked up, the message is acknowledged.
-    If the job has not been picked up after 5 minutes, the message is rejected and requeued.
+    The first check is done after the shortest boot time observed for the flavors of the
+    runners. If a job has been picked up, or its runner is busy, its message is acknowledged.
+    Otherwise, its message is rejected and requeued.
 
     Args:
-        runner_manager: The runner manager to use.
-        job_url: The URL of the job.
-        msg: The message to acknowledge or reject.
         platform_provider: Platform provider.
-        metadata: RunnerMetadata for the runner to spawn..
+        jobs: The jobs runners were spawned for.
+        pick_up_poll: The schedule of the checks.
     """
-    logger.info("Spawning new reactive runner for job %s", job_url)
-    instance_ids = runner_manager.create_runners(1, metadata=metadata, reactive=True)
-    if not instance_ids:
-        logger.error("Failed to spawn a runner for job %s. Will reject the message.", job_url)
-        msg.reject(requeue=True)
-        return
-    logger.info("Reactive runner spawned %s", instance_ids)
+    flavors = {job.route.flavor or job.route.name for job in jobs}
+    boot_times = [BOOT_TIMES.get(flavor) for flavor in flavors]
+    boot_time = min(boot_times) if boot_times and None not in boot_times else None
+    pending = jobs
+    for attempt, delay in enumerate(get_poll_delays(pick_up_poll, boot_time)):
+        if not pending:
+            break
+        sleep(delay)
+        logger.info(
+            "Checking if jobs picked up %s (%s)", [job.details.url for job in pending], attempt
+        )
+        pending = _check_jobs_picked_up(platform_provider, pending)
+    for job in pending:
+        logger.info(
+            "Job %s not picked by reactive runner. Probably picked up by another job",
+            job.details.url,
+        )
+        job.msg.reject(requeue=True)
+
+
+def _check_jobs_picked_up(platform_provider: PlatformProvider, jobs: list[_Job]) -> list[_Job]:
+    """Acknowledge the messages of the jobs picked up or whose runner is busy.
+
+    A busy runner spawned for a job took a job with the same labels, so the job is picked up by
+    that runner or will be by the runner spawned for the other job.
+
+    Args:
+        platform_provider: Platform provider.
+        jobs: The jobs runners were spawned for. The boot time of the flavor of the busy
+            runners is recorded.
 
-    for attempt in range(5):
-        sleep(WAIT_TIME_IN_SEC)
-        logger.info("Checking if job picked up for reactive runner %s", instance_ids)
+    Returns:
+        The jobs not picked up.
+    """
+    busy_instance_ids = _get_busy_instance_ids(platform_provider, jobs)
+    not_picked_up = []
+    for job in jobs:
+        if job.runner is not None and job.runner.instance_id in busy_instance_ids:
+            logger.info("Runner of job %s busy. reactive runner ok", job.details.url)
+            BOOT_TIMES.record(job.route.flavor or job.route.name, monotonic() - job.spawned_at)
+            job.msg.ack()
+            continue
         try:
-            if platform_provider.check_job_been_picked_up(metadata=metadata, job_url=job_url):
-                logger.info("Job picked %s. reactive runner ok %s", job_url, instance_ids)
-                msg.ack()
-                break
+            picked_up = platform_provider.check_job_been_picked_up(
+                metadata=job.metadata, job_url=job.details.url
+            )
         except JobNotFoundError:
-            logger.warning("Job not found after spawning runner. Retry (%s)/5", attempt)
-    else:
-        logger.info(
-            "Job %s not picked by reactive runner %s. Probably picked up by another job",
-            job_url,
-            instance_ids,
-        )
-        msg.reject(requeue=True)
+            logger.warning("Job %s not found after spawning runner.", job.details.url)
+            picked_up = False
+        if picked_up:
+            logger.info("Job picked %s. reactive runner ok", job.details.url)
+            job.msg.ack()
+        else:
+            not_picked_up.append(job)
+    return not_picked_up
+
+
+def _get_busy_instance_ids(
+    platform_provider: PlatformProvider, jobs: list[_Job]
+) -> set[InstanceID]:
+    """Get the runners spawned for the jobs reported busy by the platform.
+
+    Args:
+        platform_provider: Platform provider.
+        jobs: The jobs runners were spawned for.
+
+    Returns:
+        The instance IDs of the busy runners.
+    """
+    runners = [job.runner for job in jobs if job.runner is not None]
+    try:
+        health_response = platform_provider.get_runners_health(runners)
+    except PlatformError:
+        logger.warning("Unable to get the health of the reactive runners %s", runners)
+        return set()
+    return {
+        health.identity.instance_id for health in health_response.requested_runners if health.busy
+    }
+
+
+def _group_jobs(jobs: list[_Job]) -> list[tuple[Route, RunnerMetadata, list[_Job]]]:
+    """Group the jobs by the route and the metadata of their runners.
+
+    Args:
+        jobs: The jobs.
+
+    Returns:
+        The route, the metadata and their jobs, in the order of the jobs.
+    """
+    groups: list[tuple[Route, RunnerMetadata, list[_Job]]] = []
+    for job in jobs:
+        for route, metadata, group in groups:
+            if route is job.route and metadata == job.metadata:
+                group.append(job)
+                break
+        else:
+            groups.append((job.route, job.metadata, [job]))
+    return groups
 
 
 @contextlib.contextmanager
@@ -0,0 +1,467 @@
+#  Copyright 2025 Canonical Ltd.
+#  See LICENSE file for licensing details.
+
+"""Module for consuming jobs concurrently in a single long-running reactive process.
+
+The reactive daemon runs a number of job handler threads, each consuming jobs from the message
+queue. The handlers share the runner manager and the platform provider, and so their connection
+pools and caches. The reconcile loop sets the number of handlers and the number of runners the
+daemon may spawn until the next reconciliation by writing them to files and sending SIGHUP to the
+daemon.
+
+When the queue has a backlog, a handler takes several jobs at once and creates their runners in
+one batch, within the runners the daemon may still spawn.
+"""
+import json
+import logging
+import os
+import signal
+import tempfile
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from queue import Empty
+from types import FrameType
+
+from kombu import Connection, Message
+from kombu.exceptions import KombuError
+from kombu.simple import SimpleQueue
+
+from github_runner_manager.configuration.base import PickUpPollConfig
+from github_runner_manager.constants import STATE_DIR
+from github_runner_manager.manager.runner_manager import RunnerManager
+from github_runner_manager.platform.platform_provider import PlatformProvider
+from github_runner_manager.reactive.consumer import (
+    END_PROCESSING_PAYLOAD,
+    JobError,
+    Labels,
+    process_messages,
+    signal_handler,
+)
+from github_runner_manager.reactive.router import LabelRouter
+from github_runner_manager.reactive.types_ import QueueConfig
+
+logger = logging.getLogger(__name__)
+
+REACTIVE_DAEMON_DIR = STATE_DIR / "reactive-daemon"
+CONCURRENCY_FILE_NAME = "concurrency"
+SPAWN_BUDGET_FILE_NAME = "spawn-budget"
+# Seconds between reads of the concurrency file, in case a SIGHUP is missed.
+CONCURRENCY_POLL_INTERVAL = 30
+# Seconds an idle handler waits for a message before checking whether it should stop.
+QUEUE_GET_TIMEOUT = 5
+# Maximum number of jobs taken from the queue at once by a handler.
+MAX_SPAWN_BATCH = 10
+
+
+def read_concurrency(path: Path = REACTIVE_DAEMON_DIR) -> int:
+    """Read the number of job handlers requested to the daemon.
+
+    Args:
+        path: The directory of the daemon state.
+
+    Returns:
+        The number of job handlers, 0 if not set.
+    """
+    try:
+        return max(int((path / CONCURRENCY_FILE_NAME).read_text(encoding="utf-8")), 0)
+    except FileNotFoundError:
+        return 0
+    except (OSError, ValueError):
+        logger.warning("Unable to read the concurrency of the reactive daemon in %s", path)
+        return 0
+
+
+def write_concurrency(concurrency: int, path: Path = REACTIVE_DAEMON_DIR) -> None:
+    """Request a number of job handlers to the daemon.
+
+    The file is replaced atomically, so the daemon never reads a partial value.
+
+    Args:
+        concurrency: The number of job handlers.
+        path: The directory of the daemon state.
+    """
+    _write_file(path, CONCURRENCY_FILE_NAME, str(concurrency))
+
+
+def read_spawn_budget(path: Path = REACTIVE_DAEMON_DIR) -> tuple[int, int] | None:
+    """Read the number of runners the daemon may spawn until the next reconciliation.
+
+    Args:
+        path: The directory of the daemon state.
+
+    Returns:
+        The generation of the budget and the number of runners, or None if not set.
+    """
+    try:
+        budget = json.loads((path / SPAWN_BUDGET_FILE_NAME).read_text(encoding="utf-8"))
+        return int(budget["generation"]), max(int(budget["budget"]), 0)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError):
+        logger.warning("Unable to read the spawn budget of the reactive daemon in %s", path)
+        return None
+
+
+def write_spawn_budget(budget: int, path: Path = REACTIVE_DAEMON_DIR) -> None:
+    """Set the number of runners the daemon may spawn until the next reconciliation.
+
+    Each write is a new generation, replacing what is left of the previous budget.
+
+    Args:
+        budget: The number of runners.
+        path: The directory of the daemon state.
+    """
+    _write_file(
+        path,
+        SPAWN_BUDGET_FILE_NAME,
+        json.dumps({"generation": time.time_ns(), "budget": budget}),
+    )
+
+
+def _write_file(path: Path, name: str, content: str) -> None:
+    """Replace a file of the daemon state atomically.
+
+    Args:
+        path: The directory of the daemon state.
+        name: The name of the file.
+        content: The content of the file.
+    """
+    path.mkdir(mode=0o755, parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path, prefix=".")
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+            tmp_file.write(content)
+        tmp_path.chmod(0o644)
+        tmp_path.replace(path / name)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+class _SpawnBudget:
+    """Number of runners the job handlers may still spawn, unlimited until first set."""
+
+    def __init__(self) -> None:
+        """Construct the object."""
+        self._lock = threading.Lock()
+        self._generation: int | None = None
+        self._remaining: int | None = None
+
+    def reset(self, generation: int, budget: int) -> None:
+        """Set the budget, unless it is the generation already set.
+
+        Args:
+            generation: The generation of the budget.
+            budget: The number of runners.
+        """
+        with self._lock:
+            if generation != self._generation:
+                self._generation = generation
+                self._remaining = budget
+
+    def acquire(self, count: int) -> int:
+        """Take up to a number of runners from the budget.
+
+        Args:
+            count: The number of runners wanted.
+
+        Returns:
+            The number of runners granted.
+        """
+        with self._lock:
+            if self._remaining is None:
+                return count
+            granted = min(count, self._remaining)
+            self._remaining -= granted
+            return granted
+
+    def release(self, count: int) -> None:
+        """Give back runners not spawned.
+
+        Args:
+            count: The number of runners.
+        """
+        with self._lock:
+            if self._remaining is not None:
+                self._remaining += count
+
+
+class ReactiveDaemon:  # pylint: disable=too-many-instance-attributes
+    """Consumer of the reactive jobs with a variable number of concurrent job handlers.
+
+    Each handler has its own connection to the message queue, and processes a batch of jobs at a
+    time. When the number of handlers is decreased, the surplus handlers stop after their current
+    batch.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self,
+        queue_config: QueueConfig,
+        runner_manager: RunnerManager,
+        platform_provider: PlatformProvider,
+        supported_labels: Labels,
+        pick_up_poll: PickUpPollConfig | None = None,
+        router: LabelRouter | None = None,
+    ):
+        """Construct the object.
+
+        Args:
+            queue_config: The configuration for the message queue.
+            runner_manager: The runner manager used to create the runners.
+            platform_provider: Platform provider.
+            supported_labels: The supported labels for the runners.
+            pick_up_poll: The schedule of the checks whether the jobs were picked up.
+            router: The router of the jobs to the runner managers of several images and flavors,
+                shared by the handlers. If None, the runners are created by the runner manager
+                for the supported labels.
+        """
+        self._queue_config = queue_config
+        self._runner_manager = runner_manager
+        self._platform_provider = platform_provider
+        self._supported_labels = supported_labels
+        self._pick_up_poll = pick_up_poll
+        self._router = router
+        self._lock = threading.Lock()
+        self._concurrency = 0
+        self._handlers: dict[int, threading.Thread] = {}
+        self._connections: dict[int, Connection] = {}
+        self._stopped = threading.Event()
+        self._closed = threading.Event()
+        self._reload = threading.Event()
+        self._spawn_budget = _SpawnBudget()
+
+    def run(self, path: Path = REACTIVE_DAEMON_DIR) -> None:
+        """Run the job handlers until stopped, following the requested concurrency.
+
+        Args:
+            path: The directory of the daemon state.
+        """
+        while not self._stopped.is_set():
+            if (spawn_budget := read_spawn_budget(path)) is not None:
+                self._spawn_budget.reset(*spawn_budget)
+            self.set_concurrency(read_concurrency(path))
+            self._reload.wait(CONCURRENCY_POLL_INTERVAL)
+            self._reload.clear()
+        self.set_concurrency(0)
+
+    def reload(self) -> None:
+        """Read the requested concurrency and spawn budget again."""
+        self._reload.set()
+
+    def stop(self) -> None:
+        """Stop the daemon, the handlers stop after their current job."""
+        self._stopped.set()
+        self._reload.set()
+
+    def close(self) -> None:
+        """Stop the daemon and close the connections of the handlers without waiting for them.
+
+        Closing a connection requeues the messages not acknowledged yet, as the MongoDB transport
+        removes the messages from the queue once fetched.
+        """
+        self.stop()
+        self._closed.set()
+        with self._lock:
+            connections = list(self._connections.values())
+        for conn in connections:
+            # A failure to close one connection must not prevent closing the others.
+            try:
+                conn.release()
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Failed to close the connection of a reactive handler")
+
+    def set_concurrency(self, concurrency: int) -> None:
+        """Set the number of job handlers, starting the missing ones.
+
+        Args:
+            concurrency: The number of job handlers.
+        """
+        with self._lock:
+            if concurrency != self._concurrency:
+                logger.info(
+                    "Reactive daemon concurrency: current %s, expected %s",
+                    self._concurrency,
+                    concurrency,
+                )
+            self._concurrency = concurrency
+            for index in range(concurrency):
+                handler = self._handlers.get(index)
+                if handler is not None and handler.is_alive():
+                    continue
+                handler = threading.Thread(
+                    target=self._handle_jobs,
+                    args=(index,),
+                    name=f"reactive-handler-{index}",
+                    daemon=True,
+                )
+                self._handlers[index] = handler
+                handler.start()
+
+    def join(self, timeout: float | None = None) -> None:
+        """Wait for the job handlers to stop.
+
+        Args:
+            timeout: Seconds to wait for each handler.
+        """
+        with self._lock:
+            handlers = list(self._handlers.values())
+        for handler in handlers:
+            handler.join(timeout)
+
+    def _is_active(self, index: int) -> bool:
+        """Check whether a job handler should keep consuming jobs.
+
+        Args:
+            index: The index of the job handler.
+
+        Returns:
+            Whether the handler is within the concurrency and the daemon is not stopped.
+        """
+        return not self._stopped.is_set() and index < self._concurrency
+
+    def _handle_jobs(self, index: int) -> None:
+        """Consume jobs from the message queue while the handler is active.
+
+        Args:
+            index: The index of the job handler.
+        """
+        try:
+            with (
+                Connection(self._queue_config.mongodb_uri) as conn,
+                closing(SimpleQueue(conn, self._queue_config.queue_name)) as simple_queue,
+            ):
+                with self._lock:
+                    self._connections[index] = conn
+                while self._is_active(index):
+                    if not self._spawn_budget.acquire(1):
+                        # Wait for the budget of the next reconciliation.
+                        self._stopped.wait(QUEUE_GET_TIMEOUT)
+                        continue
+                    if msgs := self._get_batch(simple_queue):
+                        self._handle_batch(msgs)
+                    else:
+                        self._spawn_budget.release(1)
+        except KombuError:
+            # The handler is started again on the next reload.
+            logger.exception("Reactive handler %s lost the connection to the queue", index)
+        finally:
+            with self._lock:
+                self._connections.pop(index, None)
+
+    def _get_batch(self, simple_queue: SimpleQueue) -> list[Message]:
+        """Get a job message, and the ones following it up to the batch size and the budget.
+
+        One runner of the budget is expected to be acquired for the first message. The runners of
+        the budget for the following messages are acquired.
+
+        Args:
+            simple_queue: The queue of the jobs.
+
+        Returns:
+            The job messages, empty if there is none or the daemon is stopped.
+        """
+        try:
+            msg = simple_queue.get(block=True, timeout=QUEUE_GET_TIMEOUT)
+        except Empty:
+            return []
+        msgs = []
+        extra = self._spawn_budget.acquire(MAX_SPAWN_BATCH - 1)
+        try:
+            while msg is not None:
+                if msg.payload == END_PROCESSING_PAYLOAD:
+                    msg.ack()
+                    self.stop()
+                    break
+                msgs.append(msg)
+                msg = simple_queue.get(block=False) if len(msgs) <= extra else None
+        except Empty:
+            pass
+        self._spawn_budget.release(extra - max(len(msgs) - 1, 0))
+        return msgs
+
+    def _handle_batch(self, msgs: list[Message]) -> None:
+        """Process job messages, requeueing them on unexpected errors.
+
+        The runners of the budget not spawned are given back. On errors, the runners spawned
+        before the error are unknown, so none is given back.
+
+        Args:
+            msgs: The messages of the jobs.
+        """
+        try:
+            spawned = process_messages(
+                msgs=msgs,
+                runner_manager=self._runner_manager,
+                platform_provider=self._platform_provider,
+                supported_labels=self._supported_labels,
+                pick_up_poll=self._pick_up_poll,
+                router=self._router,
+            )
+            self._spawn_budget.release(len(msgs) - spawned)
+        except JobError:
+            logger.exception("Invalid reactive job")
+        # A failure of one batch must not stop the handler.
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception("Failed to process the reactive jobs %s", [m.payload for m in msgs])
+            # The messages were requeued by closing the connection.
+            if self._closed.is_set():
+                return
+            for msg in msgs:
+                if not msg.acknowledged:
+                    msg.reject(requeue=True)
+
+
+def run(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+    queue_config: QueueConfig,
+    runner_manager: RunnerManager,
+    platform_provider: PlatformProvider,
+    supported_labels: Labels,
+    pick_up_poll: PickUpPollConfig | None = None,
+    router: LabelRouter | None = None,
+    path: Path = REACTIVE_DAEMON_DIR,
+) -> None:
+    """Run the reactive daemon in the current process.
+
+    SIGHUP makes the daemon read the requested concurrency and spawn budget again. SIGTERM exits
+    the process, requeueing the unacknowledged messages.
+
+    Args:
+        queue_config: The configuration for the message queue.
+        runner_manager: The runner manager used to create the runners.
+        platform_provider: Platform provider.
+        supported_labels: The supported labels for the runners.
+        pick_up_poll: The schedule of the checks whether the jobs were picked up.
+        router: The router of the jobs to the runner managers of several images and flavors.
+        path: The directory of the daemon state.
+    """
+    daemon = ReactiveDaemon(
+        queue_config=queue_config,
+        runner_manager=runner_manager,
+        platform_provider=platform_provider,
+        supported_labels=supported_labels,
+        router=router,
+        pick_up_poll=pick_up_poll,
+    )
+
+    def sighup_handler(_signal_code: int, _frame: FrameType | None) -> None:
+        """Read the requested concurrency again.
+
+        Args:
+            _signal_code: The signal code.
+            _frame: The current stack frame.
+        """
+        daemon.reload()
+
+    signal.signal(signal.SIGHUP, sighup_handler)
+    with signal_handler(signal.SIGTERM):
+        stopped = False
+        try:
+            daemon.run(path)
+            stopped = True
+        finally:
+            # On SIGTERM, the jobs being handled are requeued instead of waited for.
+            if not stopped:
+                daemon.close()
+    daemon.join()
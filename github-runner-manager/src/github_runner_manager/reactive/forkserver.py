@@ -0,0 +1,200 @@
+#  Copyright 2025 Canonical Ltd.
+#  See LICENSE file for licensing details.
+
+"""Server forking reactive runner processes from a process with the modules already imported.
+
+Starting a reactive runner process with a new interpreter imports the whole dependency tree,
+which takes seconds. The fork server imports the modules once, and forks a reactive runner
+process for each request received on its UNIX socket. The server does not open connections, and
+the pools of connections of the modules are re-initialized after fork.
+
+The server outlives the manager, as the reactive runner processes do. A server started from a
+different version of the code exits on the first request, so the code of a newer version is
+used once the server is started again.
+"""
+import atexit
+import importlib
+import json
+import logging
+import os
+import signal
+import socket
+import sys
+import traceback
+from pathlib import Path
+
+import github_runner_manager
+from github_runner_manager.constants import STATE_DIR
+from github_runner_manager.reactive.types_ import ReactiveProcessConfig
+
+logger = logging.getLogger(__name__)
+
+REACTIVE_FORKSERVER_DIR = STATE_DIR / "reactive-forkserver"
+SOCKET_FILE_NAME = "forkserver.sock"
+FORKSERVER_SCRIPT_MODULE = "github_runner_manager.reactive.forkserver"
+PRELOAD_MODULES = ("github_runner_manager.reactive.runner",)
+# Seconds to wait for the reply of the server to a request.
+REQUEST_TIMEOUT = 10
+_LISTEN_BACKLOG = 128
+
+
+class ForkServerError(Exception):
+    """Raised when the fork server fails to fork a reactive runner process."""
+
+
+def get_code_stamp() -> str:
+    """Get an identifier of the code of the package.
+
+    The modification time of the package directory changes when the package is reinstalled.
+
+    Returns:
+        The identifier of the code.
+    """
+    package_dir = Path(github_runner_manager.__file__).parent
+    return f"{package_dir}:{package_dir.stat().st_mtime_ns}"
+
+
+def spawn_worker(runner_config: str, log_dir: Path, path: Path = REACTIVE_FORKSERVER_DIR) -> int:
+    """Request the fork server to fork a reactive runner process.
+
+    Args:
+        runner_config: The JSON of the reactive runner configuration.
+        log_dir: The directory of the log file of the process, named after its PID.
+        path: The directory of the socket of the fork server.
+
+    Raises:
+        ForkServerError: If the server is not running, or failed to fork the process.
+
+    Returns:
+        The PID of the reactive runner process.
+    """
+    request = {"stamp": get_code_stamp(), "config": runner_config, "log_dir": str(log_dir)}
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(REQUEST_TIMEOUT)
+            client.connect(str(path / SOCKET_FILE_NAME))
+            with client.makefile("rwb") as stream:
+                stream.write(json.dumps(request).encode() + b"\n")
+                stream.flush()
+                reply = json.loads(stream.readline())
+    except (OSError, ValueError) as exc:
+        raise ForkServerError("Failed to communicate with the fork server") from exc
+    if not isinstance(reply, dict) or not isinstance(reply.get("pid"), int):
+        raise ForkServerError(f"Fork server failed to fork: {reply}")
+    return reply["pid"]
+
+
+def serve(path: Path = REACTIVE_FORKSERVER_DIR) -> None:
+    """Fork a reactive runner process for each request, until a request from other code.
+
+    Args:
+        path: The directory of the socket of the fork server.
+    """
+    stamp = get_code_stamp()
+    for module in PRELOAD_MODULES:
+        importlib.import_module(module)
+    socket_path = path / SOCKET_FILE_NAME
+    socket_path.unlink(missing_ok=True)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(str(socket_path))
+        socket_path.chmod(0o600)
+        listener.listen(_LISTEN_BACKLOG)
+        logger.info("Reactive fork server listening on %s", socket_path)
+        while True:
+            conn, _ = listener.accept()
+            with conn, conn.makefile("rwb") as stream:
+                try:
+                    request = json.loads(stream.readline())
+                    stale = request["stamp"] != stamp
+                    reply = (
+                        {"error": "stale fork server"}
+                        if stale
+                        else {"pid": _fork_worker(listener, request["config"], request["log_dir"])}
+                    )
+                except (OSError, ValueError, KeyError, TypeError) as exc:
+                    logger.exception("Invalid request to the reactive fork server")
+                    stale, reply = False, {"error": str(exc)}
+                try:
+                    stream.write(json.dumps(reply).encode() + b"\n")
+                    stream.flush()
+                except OSError:
+                    logger.warning("Unable to reply to the request %s", reply)
+            if stale:
+                logger.info("Reactive fork server stopping, the code was updated")
+                socket_path.unlink(missing_ok=True)
+                return
+
+
+def _fork_worker(listener: socket.socket, runner_config: str, log_dir: str) -> int:
+    """Fork a reactive runner process.
+
+    Args:
+        listener: The socket of the server, closed in the forked process.
+        runner_config: The JSON of the reactive runner configuration.
+        log_dir: The directory of the log file of the process.
+
+    Returns:
+        The PID of the forked process.
+    """
+    pid = os.fork()
+    if pid == 0:
+        listener.close()
+        _run_worker(runner_config, log_dir)
+    logger.info("Forked reactive runner process %s", pid)
+    return pid
+
+
+def _run_worker(runner_config: str, log_dir: str) -> None:
+    """Run the reactive runner in the forked process, then exit.
+
+    Args:
+        runner_config: The JSON of the reactive runner configuration.
+        log_dir: The directory of the log file of the process.
+    """
+    # The module is imported by the server before forking. It is not imported by this module, as
+    # it imports the manager of the reactive processes, which imports this module.
+    runner = importlib.import_module("github_runner_manager.reactive.runner")
+    exit_code = 1
+    try:
+        os.setsid()
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        log_fd = os.open(
+            Path(log_dir) / f"{os.getpid()}.log", os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644
+        )
+        null_fd = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(null_fd, 0)
+        os.dup2(log_fd, 1)
+        os.dup2(log_fd, 2)
+        os.close(null_fd)
+        os.close(log_fd)
+        runner.setup_root_logging()
+        runner.run(ReactiveProcessConfig.parse_raw(runner_config))
+        exit_code = 0
+    except SystemExit as exc:
+        exit_code = exc.code if isinstance(exc.code, int) else 1
+    # Any error must end the forked process, which must not return to the server loop.
+    except BaseException:  # pylint: disable=broad-exception-caught
+        traceback.print_exc()
+    finally:
+        # The exit handlers, e.g. the requeueing of the unacknowledged messages by kombu, are not
+        # run by os._exit.
+        atexit._run_exitfuncs()  # pylint: disable=protected-access
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(exit_code)  # pylint: disable=protected-access
+
+
+def main() -> None:
+    """Run the reactive fork server."""
+    logging.basicConfig(
+        stream=sys.stdout,
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    # The forked processes are reaped automatically.
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    serve(Path(sys.argv[1]) if len(sys.argv) > 1 else REACTIVE_FORKSERVER_DIR)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#  Copyright 2025 Canonical Ltd.
+#  See LICENSE file for licensing details.
+
+"""Schedule of the checks whether the jobs of the reactive runners were picked up.
+
+The first check after spawning a runner is done once the runner is expected to be online, after
+the boot time observed for its flavor. The following checks start fast and back off, with jitter
+to spread the checks of the jobs spawned together.
+"""
+import json
+import logging
+import os
+import secrets
+import tempfile
+from pathlib import Path
+from typing import Iterator
+
+from github_runner_manager.configuration.base import PickUpPollConfig
+from github_runner_manager.constants import STATE_DIR
+
+logger = logging.getLogger(__name__)
+
+BOOT_TIMES_DIR = STATE_DIR / "reactive-boot-times"
+# Weight of the last observation in the moving average of the boot time.
+_BOOT_TIME_SMOOTHING = 0.3
+# The boot times are observed at the checks, so they are overestimated by up to an interval.
+_BOOT_TIME_MARGIN = 0.8
+_random = secrets.SystemRandom()
+
+
+def get_poll_delays(config: PickUpPollConfig, boot_time: float | None = None) -> Iterator[float]:
+    """Get the seconds to wait before each check, until the timeout.
+
+    Args:
+        config: The schedule of the checks.
+        boot_time: The boot time observed for the flavor of the runner, if any.
+
+    Yields:
+        The seconds to wait before the next check.
+    """
+    interval = config.initial_interval
+    if boot_time is None:
+        delay = interval
+        interval = min(interval * config.backoff_factor, config.max_interval)
+    else:
+        delay = max(boot_time * _BOOT_TIME_MARGIN, interval)
+    elapsed = 0.0
+    while elapsed < config.timeout:
+        delay = min(_add_jitter(delay, config.jitter), config.timeout - elapsed)
+        yield delay
+        elapsed += delay
+        delay = interval
+        interval = min(interval * config.backoff_factor, config.max_interval)
+
+
+def get_retry_delay(config: PickUpPollConfig, retries: int) -> float:
+    """Get the seconds to wait before processing a retried job.
+
+    Args:
+        config: The schedule of the checks.
+        retries: The number of times the job was processed before.
+
+    Returns:
+        The seconds to wait.
+    """
+    delay = config.initial_interval * config.backoff_factor ** max(retries - 1, 0)
+    return _add_jitter(min(delay, config.max_interval), config.jitter)
+
+
+def _add_jitter(delay: float, jitter: float) -> float:
+    """Randomize a delay.
+
+    Args:
+        delay: The seconds to wait.
+        jitter: The fraction of the delay randomized.
+
+    Returns:
+        The randomized delay.
+    """
+    return delay * _random.uniform(1 - jitter, 1 + jitter)
+
+
+class BootTimes:
+    """Moving averages of the boot times of the runners by flavor, stored in a directory.
+
+    The boot time of a runner is the time from requesting the runner to its runner being busy.
+    """
+
+    def __init__(self, path: Path = BOOT_TIMES_DIR):
+        """Construct the object.
+
+        Args:
+            path: The directory of the boot times.
+        """
+        self._path = path
+
+    def get(self, flavor: str) -> float | None:
+        """Get the boot time of a flavor.
+
+        Args:
+            flavor: The flavor of the runners.
+
+        Returns:
+            The seconds, or None if not observed yet.
+        """
+        try:
+            with open(self._path / f"{flavor}.json", "rb") as boot_time_file:
+                return float(json.load(boot_time_file)["boot_time"])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.warning("Ignoring invalid boot time of flavor %s", flavor)
+            return None
+
+    def record(self, flavor: str, boot_time: float) -> None:
+        """Add an observed boot time to the moving average of a flavor.
+
+        Failures to record the boot time are logged.
+
+        Args:
+            flavor: The flavor of the runner.
+            boot_time: The seconds from requesting the runner to its runner being busy.
+        """
+        previous = self.get(flavor)
+        if previous is not None:
+            boot_time = previous + _BOOT_TIME_SMOOTHING * (boot_time - previous)
+        try:
+            self._path.mkdir(mode=0o755, parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self._path, prefix=".")
+            tmp_path = Path(tmp_name)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                    json.dump({"boot_time": boot_time}, tmp_file)
+                tmp_path.chmod(0o644)
+                tmp_path.replace(self._path / f"{flavor}.json")
+            finally:
+                tmp_path.unlink(missing_ok=True)
+        except OSError:
+            logger.warning("Unable to record the boot time of flavor %s", flavor)
@@ -13,8 +13,9 @@ from pathlib import Path
 
 from github_runner_manager import constants
 from github_runner_manager.configuration import UserInfo
+from github_runner_manager.reactive import daemon, forkserver, pick_up, registry
+from github_runner_manager.reactive.registry import ReactiveWorker, ReactiveWorkerRegistry
 from github_runner_manager.reactive.types_ import ReactiveProcessConfig
-from github_runner_manager.utilities import secure_run_subprocess
 
 logger = logging.getLogger(__name__)
 
@@ -22,17 +23,18 @@ REACTIVE_RUNNER_LOG_DIR = Path("/var/log/reactive_runner")
 
 PYTHON_BIN = "/usr/bin/python3"
 REACTIVE_RUNNER_SCRIPT_MODULE = "github_runner_manager.reactive.runner"
-REACTIVE_RUNNER_CMD_LINE_PREFIX = f"{PYTHON_BIN} -m {REACTIVE_RUNNER_SCRIPT_MODULE}"
-PID_CMD_COLUMN_WIDTH = len(REACTIVE_RUNNER_CMD_LINE_PREFIX)
-PIDS_COMMAND_LINE = [
-    "ps",
-    "axo",
-    f"cmd:{PID_CMD_COLUMN_WIDTH},pid",
-    "--no-headers",
-    "--sort=-start_time",
-]
+# The command line of the reactive runner processes started with a new interpreter, the only
+# ones started by the versions of the manager before the registry.
+REACTIVE_RUNNER_CMD_LINE = [PYTHON_BIN, "-m", REACTIVE_RUNNER_SCRIPT_MODULE]
+PROC_DIR = Path("/proc")
 UBUNTU_USER = "ubuntu"
 RUNNER_CONFIG_ENV_VAR = "RUNNER_CONFIG"
+FORKSERVER_LOG_FILE_NAME = "forkserver.log"
+
+# The fork server started by this process, if any.
+_forkserver_process: subprocess.Popen | None = None  # pylint: disable=invalid-name
+# Whether the reactive runner processes started before the registry were registered.
+_legacy_workers_adopted = False  # pylint: disable=invalid-name
 
 
 class ReactiveRunnerError(Exception):
@@ -44,6 +46,7 @@ def reconcile(
     reactive_process_config: ReactiveProcessConfig,
     user: UserInfo,
     python_path: str | None = None,
+    spawn_budget: int | None = None,
 ) -> int:
     """Reconcile the number of reactive runner processes.
 
@@ -52,14 +55,49 @@ def reconcile(
         reactive_process_config: The reactive runner configuration.
         user: The user to run the reactive process.
         python_path: The PYTHONPATH to access the github-runner-manager library.
+        spawn_budget: The number of runners the reactive daemon may spawn until the next
+            reconciliation, unlimited if None. A reactive runner process spawns one runner.
 
     Raises a ReactiveRunnerError if the runner fails to spawn.
 
+    Returns:
+        The number of reactive runner processes spawned/killed, or the change of the number of
+        job handlers of the reactive daemon.
+    """
+    try:
+        if reactive_process_config.daemon:
+            return _reconcile_daemon(
+                quantity, reactive_process_config, user, python_path, spawn_budget
+            )
+        return _reconcile_workers(quantity, reactive_process_config, user, python_path)
+    except OSError:
+        # The runners are reconciled again at the next reconciliation.
+        logger.exception(
+            "Failed to reconcile the reactive processes, state dir: %s", constants.STATE_DIR
+        )
+        return 0
+
+
+def _reconcile_workers(
+    quantity: int,
+    reactive_process_config: ReactiveProcessConfig,
+    user: UserInfo,
+    python_path: str | None,
+) -> int:
+    """Reconcile the number of reactive runner processes, each spawning one runner.
+
+    Args:
+        quantity: The number of processes to spawn.
+        reactive_process_config: The reactive runner configuration.
+        user: The user to run the reactive process.
+        python_path: The PYTHONPATH to access the github-runner-manager library.
+
     Returns:
         The number of reactive runner processes spawned/killed.
     """
-    pids = _get_pids()
-    current_quantity = len(pids)
+    worker_registry = _get_registry()
+    workers = [worker for worker in worker_registry.get_workers() if not worker.daemon]
+    current_quantity = len(workers)
     logger.info(
         "Reactive runner processes: current quantity %s, expected quantity %s",
         current_quantity,
@@ -68,95 +106,262 @@ def reconcile(
     delta = quantity - current_quantity
     if delta > 0:
         logger.info("Will spawn %d new reactive runner process(es)", delta)
-        _setup_logging_for_processes(user.user, user.group)
+        _setup_dirs_for_processes(user.user, user.group)
         for _ in range(delta):
-            _spawn_runner(reactive_process_config, python_path)
+            _spawn_runner(reactive_process_config, python_path, worker_registry)
     elif delta < 0:
         logger.info("Will kill %d process(es).", -delta)
-        for pid in pids[:-delta]:
-            logger.info("Killing reactive runner process with pid %s", pid)
-            try:
-                os.kill(pid, signal.SIGTERM)
-            except ProcessLookupError:
-                # There can be a race condition that the process has already terminated.
-                # We just ignore and log the fact.
-                logger.info(
-                    "Failed to kill process with pid %s. Process might have terminated it self.",
-                    pid,
-                )
+        for worker in _select_workers_to_kill(workers, -delta):
+            worker_registry.kill(worker)
     else:
         logger.info("No changes to number of reactive runner processes needed.")
 
     return delta
 
 
-def kill_reactive_processes() -> None:
-    """Kill all reactive processes."""
-    pids = _get_pids()
-    if pids:
-        for pid in pids:
-            try:
-                logger.info("Killing reactive runner process with pid %s", pid)
-                os.kill(pid, signal.SIGTERM)
-            except ProcessLookupError:
-                logger.info(
-                    "Failed to kill process with pid %s. Process might have terminated it self.",
-                    pid,
-                )
-    else:
-        logger.info("No reactive processes to flush")
+def _reconcile_daemon(
+    quantity: int,
+    reactive_process_config: ReactiveProcessConfig,
+    user: UserInfo,
+    python_path: str | None,
+    spawn_budget: int | None,
+) -> int:
+    """Reconcile the number of job handlers of the reactive daemon.
 
+    The daemon is spawned if not running, and is otherwise signalled to read the new number of
+    job handlers and spawn budget.
 
-def _get_pids() -> list[int]:
-    """Get the PIDs of the reactive runners processes.
+    Args:
+        quantity: The number of job handlers.
+        reactive_process_config: The reactive runner configuration.
+        user: The user to run the reactive daemon.
+        python_path: The PYTHONPATH to access the github-runner-manager library.
+        spawn_budget: The number of runners the daemon may spawn until the next reconciliation.
 
     Returns:
-        The PIDs of the reactive runner processes sorted by start time in descending order.
+        The change of the number of job handlers.
+    """
+    worker_registry = _get_registry()
+    daemon_workers = [worker for worker in worker_registry.get_workers() if worker.daemon]
+    # Only the newest daemon is kept, in case several were spawned.
+    for worker in daemon_workers[:-1]:
+        worker_registry.kill(worker)
+    daemon_worker = daemon_workers[-1] if daemon_workers else None
+    current_quantity = (
+        daemon.read_concurrency(daemon.REACTIVE_DAEMON_DIR) if daemon_worker is not None else 0
+    )
+    logger.info(
+        "Reactive daemon job handlers: current quantity %s, expected quantity %s",
+        current_quantity,
+        quantity,
+    )
+    daemon.write_concurrency(quantity, daemon.REACTIVE_DAEMON_DIR)
+    if spawn_budget is not None:
+        daemon.write_spawn_budget(spawn_budget, daemon.REACTIVE_DAEMON_DIR)
+    if daemon_worker is None:
+        if quantity > 0:
+            logger.info("Will spawn the reactive daemon")
+            _setup_dirs_for_processes(user.user, user.group)
+            _spawn_runner(reactive_process_config, python_path, worker_registry)
+    elif quantity != current_quantity or spawn_budget is not None:
+        try:
+            os.kill(daemon_worker.pid, signal.SIGHUP)
+        except ProcessLookupError:
+            logger.info(
+                "Failed to signal reactive daemon with pid %s. Will be respawned.",
+                daemon_worker.pid,
+            )
+    return quantity - current_quantity
+
+
+def _select_workers_to_kill(workers: list[ReactiveWorker], count: int) -> list[ReactiveWorker]:
+    """Select the reactive workers to kill.
+
+    The idle workers are killed before the ones handling a job, whose job would be requeued, and
+    the newest workers before the oldest ones.
+
+    Args:
+        workers: The reactive workers.
+        count: The number of workers to kill.
 
-    Raises:
-        ReactiveRunnerError: If the command to get the PIDs fails
+    Returns:
+        The workers to kill.
     """
-    result = secure_run_subprocess(cmd=PIDS_COMMAND_LINE)
-    if result.returncode != 0:
-        raise ReactiveRunnerError("Failed to get list of processes")
+    return sorted(
+        workers, key=lambda worker: (bool(worker.jobs), -worker.start_time, -worker.pid)
+    )[:count]
 
-    # stdout will look like
-    #
-    # ps axo cmd:57,pid --no-headers --sort=-start_time         2302635
-    # -bash                                                     2302498
-    # /bin/sh -c /usr/bin/python3 -m github_runner_manager.reac 1757306
-    # /usr/bin/python3 -m github_runner_manager.reactive.runner 1757308
 
-    # we filter for the command line of the reactive runner processes and extract the PID
+def get_busy_count() -> int:
+    """Get the number of jobs being handled by the reactive processes.
 
-    return [
-        int(line.rstrip().rsplit(maxsplit=1)[-1])
-        for line in result.stdout.decode().split("\n")
-        if line.startswith(REACTIVE_RUNNER_CMD_LINE_PREFIX)
-    ]
+    Returns:
+        The number of jobs.
+    """
+    return sum(len(worker.jobs) for worker in _get_registry().get_workers())
 
 
-def _setup_logging_for_processes(user: str, group: str) -> None:
-    """Set up the log dir.
+def collect_spawn_latencies() -> list[float]:
+    """Collect the spawn latencies recorded by the reactive processes since the last collection.
+
+    Returns:
+        The seconds from receiving a job to requesting its runner.
+    """
+    return _get_registry().collect_spawn_latencies()
+
+
+def _get_registry() -> ReactiveWorkerRegistry:
+    """Get the registry of the reactive workers.
+
+    Returns:
+        The registry.
+    """
+    global _legacy_workers_adopted  # pylint: disable=global-statement
+    worker_registry = ReactiveWorkerRegistry(registry.REACTIVE_REGISTRY_DIR)
+    if not _legacy_workers_adopted:
+        _legacy_workers_adopted = _adopt_legacy_workers(worker_registry)
+    return worker_registry
+
+
+def _adopt_legacy_workers(worker_registry: ReactiveWorkerRegistry) -> bool:
+    """Register the reactive runner processes started before the registry.
+
+    The versions of the manager before the registry found their processes by command line. Once
+    registered, these processes are counted and killed like the others.
+
+    Args:
+        worker_registry: The registry of the reactive workers.
+
+    Returns:
+        Whether the processes were registered, False to try again later.
+    """
+    registered = {worker.pid for worker in worker_registry.get_workers()}
+    try:
+        for proc_dir in PROC_DIR.iterdir():
+            if not proc_dir.name.isdigit() or int(proc_dir.name) in registered:
+                continue
+            try:
+                cmd_line = (proc_dir / "cmdline").read_bytes().decode(errors="replace")
+            except OSError:
+                continue
+            if cmd_line.split("\0")[: len(REACTIVE_RUNNER_CMD_LINE)] == REACTIVE_RUNNER_CMD_LINE:
+                logger.info("Registering reactive runner process %s", proc_dir.name)
+                worker_registry.register(int(proc_dir.name))
+    except OSError:
+        logger.warning("Failed to register the reactive runner processes started before")
+        return False
+    return True
+
+
+def kill_reactive_processes() -> None:
+    """Kill all reactive processes.
+
+    The reactive daemon is a reactive runner process, and is killed as well.
+    """
+    worker_registry = _get_registry()
+    workers = worker_registry.get_workers()
+    if not workers:
+        logger.info("No reactive processes to flush")
+    for worker in workers:
+        worker_registry.kill(worker)
+
+
+def _setup_dirs_for_processes(user: str, group: str) -> None:
+    """Set up the log dir and the registry dir.
+
+    The reactive processes record the jobs they handle in the registry and the boot times of the
+    runners, and the fork server creates its socket, so they own these dirs.
 
     Args:
         user: The user for logging.
         group: The group owning the logs.
     """
-    REACTIVE_RUNNER_LOG_DIR.mkdir(exist_ok=True)
-    shutil.chown(
+    for directory in (
         REACTIVE_RUNNER_LOG_DIR,
-        user=user,
-        group=group,
-    )
+        registry.REACTIVE_REGISTRY_DIR,
+        forkserver.REACTIVE_FORKSERVER_DIR,
+        pick_up.BOOT_TIMES_DIR,
+    ):
+        directory.mkdir(parents=True, exist_ok=True)
+        shutil.chown(
+            directory,
+            user=user,
+            group=group,
+        )
 
 
-def _spawn_runner(reactive_process_config: ReactiveProcessConfig, python_path: str | None) -> None:
-    """Spawn a runner.
+def _spawn_runner(
+    reactive_process_config: ReactiveProcessConfig,
+    python_path: str | None,
+    worker_registry: ReactiveWorkerRegistry,
+) -> None:
+    """Spawn a runner and register its process.
+
+    The process is forked by the fork server. If the fork server is not running, it is started
+    for the next runners, and the process is started with a new interpreter.
 
     Args:
         reactive_process_config: The runner configuration to pass to the spawned runner process.
         python_path: The PYTHONPATH to access the github-runner-manager library.
+        worker_registry: The registry of the reactive workers.
+    """
+    try:
+        pid = forkserver.spawn_worker(
+            reactive_process_config.json(),
+            REACTIVE_RUNNER_LOG_DIR,
+            forkserver.REACTIVE_FORKSERVER_DIR,
+        )
+        logger.info("Forked a new reactive runner process with pid %s", pid)
+    except forkserver.ForkServerError:
+        logger.info("Reactive fork server not available, spawning the process instead")
+        _start_forkserver(python_path)
+        pid = _start_runner_process(reactive_process_config, python_path)
+    worker_registry.register(pid, daemon=reactive_process_config.daemon)
+
+
+def _start_forkserver(python_path: str | None) -> None:
+    """Start the fork server, unless the one started before is still running.
+
+    Args:
+        python_path: The PYTHONPATH to access the github-runner-manager library.
+    """
+    global _forkserver_process  # pylint: disable=global-statement
+    # The fork server might still be importing the modules.
+    if _forkserver_process is not None and _forkserver_process.poll() is None:
+        return
+    env = {"PYTHONPATH": str(python_path)} if python_path is not None else {}
+    with open(
+        REACTIVE_RUNNER_LOG_DIR / FORKSERVER_LOG_FILE_NAME, "ab"
+    ) as log_file:  # pylint: disable=unspecified-encoding
+        # We do not want to wait for the process to finish, so we do not use with statement.
+        _forkserver_process = subprocess.Popen(  # pylint: disable=consider-using-with  # nosec
+            [
+                PYTHON_BIN,
+                "-m",
+                forkserver.FORKSERVER_SCRIPT_MODULE,
+                str(forkserver.REACTIVE_FORKSERVER_DIR),
+            ],
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=log_file,
+            stderr=log_file,
+            user=constants.RUNNER_MANAGER_USER,
+            group=constants.RUNNER_MANAGER_GROUP,
+        )
+    logger.info("Started the reactive fork server with pid %s", _forkserver_process.pid)
+
+
+def _start_runner_process(
+    reactive_process_config: ReactiveProcessConfig, python_path: str | None
+) -> int:
+    """Start a runner process with a new interpreter.
+
+    Args:
+        reactive_process_config: The runner configuration to pass to the spawned runner process.
+        python_path: The PYTHONPATH to access the github-runner-manager library.
+
+    Returns:
+        The PID of the runner process.
     """
     env = {
         RUNNER_CONFIG_ENV_VAR: reactive_process_config.json(),
@@ -165,8 +370,10 @@ def _spawn_runner(reactive_process_config: ReactiveProcessConfig, python_path: s
         env["PYTHONPATH"] = str(python_path)
     # We do not want to wait for the process to finish, so we do not use with statement.
     # We trust the command.
+    # The shell is replaced by the runner process, so the PID of the process is registered.
     command = " ".join(
         [
+            "exec",
             PYTHON_BIN,
             "-m",
             REACTIVE_RUNNER_SCRIPT_MODULE,
@@ -188,3 +395,4 @@ def _spawn_runner(reactive_process_config: ReactiveProcessConfig, python_path: s
     )
 
     logger.info("Spawned a new reactive runner process with pid %s", process.pid)
+    return process.pid
@@ -0,0 +1,306 @@
+#  Copyright 2025 Canonical Ltd.
+#  See LICENSE file for licensing details.
+
+"""Registry of the reactive worker processes.
+
+Each worker has an entry file named after its PID, written when the worker is spawned. The entry
+records the start time of the process from /proc/<pid>/stat, so an entry whose PID was reused by
+another process is detected and removed.
+
+The workers also record the seconds from receiving a job to requesting its runner, one file per
+runner, collected by the manager for the metrics.
+"""
+import json
+import logging
+import os
+import signal
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator
+
+from github_runner_manager.constants import STATE_DIR
+
+logger = logging.getLogger(__name__)
+
+REACTIVE_REGISTRY_DIR = STATE_DIR / "reactive-workers"
+_ENTRY_SUFFIX = ".json"
+SPAWN_LATENCIES_DIR_NAME = "spawn-latencies"
+# Index of the start time in the fields of /proc/<pid>/stat following the command name.
+_STAT_START_TIME_INDEX = 19
+
+
+@dataclass
+class ReactiveWorker:
+    """A reactive worker process.
+
+    Attributes:
+        pid: The PID of the process.
+        start_time: The start time of the process, in clock ticks since boot.
+        started_at: The timestamp of the registration of the worker.
+        daemon: Whether the worker is the reactive daemon.
+        jobs: The URLs of the jobs the worker is handling.
+        age: Seconds since the registration of the worker.
+    """
+
+    pid: int
+    start_time: int
+    started_at: float
+    daemon: bool = False
+    jobs: list[str] = field(default_factory=list)
+
+    @property
+    def age(self) -> float:
+        """Seconds since the registration of the worker.
+
+        Returns:
+            The age of the worker.
+        """
+        return time.time() - self.started_at
+
+
+def get_process_start_time(pid: int) -> int | None:
+    """Get the start time of a process.
+
+    Args:
+        pid: The PID of the process.
+
+    Returns:
+        The start time in clock ticks since boot, or None if the process does not exist.
+    """
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as stat_file:
+            stat = stat_file.read()
+    except OSError:
+        return None
+    # The command name is in parentheses and may contain spaces and parentheses.
+    fields = stat[stat.rfind(b")") + 2 :].split()
+    try:
+        return int(fields[_STAT_START_TIME_INDEX])
+    except (IndexError, ValueError):
+        logger.warning("Unexpected format of the stat of process %s", pid)
+        return None
+
+
+class ReactiveWorkerRegistry:
+    """Registry of the reactive worker processes, stored in a directory."""
+
+    def __init__(self, path: Path = REACTIVE_REGISTRY_DIR):
+        """Construct the object.
+
+        Args:
+            path: The directory of the registry.
+        """
+        self._path = path
+        # Serializes the updates of the entry of the current process by its threads.
+        self._lock = threading.Lock()
+
+    def register(self, pid: int, daemon: bool = False) -> ReactiveWorker | None:
+        """Register a worker process.
+
+        Args:
+            pid: The PID of the process.
+            daemon: Whether the worker is the reactive daemon.
+
+        Returns:
+            The worker, or None if the process no longer exists.
+        """
+        start_time = get_process_start_time(pid)
+        if start_time is None:
+            logger.warning("Reactive worker %s exited before being registered", pid)
+            return None
+        worker = ReactiveWorker(
+            pid=pid, start_time=start_time, started_at=time.time(), daemon=daemon
+        )
+        self._path.mkdir(mode=0o755, parents=True, exist_ok=True)
+        self._write_entry(worker)
+        return worker
+
+    def get_workers(self) -> list[ReactiveWorker]:
+        """Get the running workers, removing the entries of the processes that exited.
+
+        Returns:
+            The workers sorted by start time in ascending order.
+        """
+        try:
+            entry_paths = [
+                entry.path
+                for entry in os.scandir(self._path)
+                if entry.name.endswith(_ENTRY_SUFFIX)
+            ]
+        except FileNotFoundError:
+            return []
+        workers = []
+        for entry_path in entry_paths:
+            worker = self._read_entry(entry_path)
+            if worker is None:
+                continue
+            if get_process_start_time(worker.pid) != worker.start_time:
+                logger.info("Removing the entry of exited reactive worker %s", worker.pid)
+                self.unregister(worker.pid)
+                continue
+            workers.append(worker)
+        return sorted(workers, key=lambda worker: (worker.start_time, worker.pid))
+
+    def unregister(self, pid: int) -> None:
+        """Remove the entry of a worker.
+
+        Args:
+            pid: The PID of the process.
+        """
+        self._get_entry_path(pid).unlink(missing_ok=True)
+
+    def kill(self, worker: ReactiveWorker) -> bool:
+        """Terminate a worker and remove its entry.
+
+        The process is only signalled if its start time matches the entry, so a process reusing
+        the PID is never signalled.
+
+        Args:
+            worker: The worker to kill.
+
+        Returns:
+            Whether the worker was signalled.
+        """
+        self.unregister(worker.pid)
+        if get_process_start_time(worker.pid) != worker.start_time:
+            logger.info("Reactive worker %s has already exited", worker.pid)
+            return False
+        logger.info("Killing reactive worker %s, handling jobs %s", worker.pid, worker.jobs)
+        try:
+            os.kill(worker.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            logger.info("Reactive worker %s has already exited", worker.pid)
+            return False
+        return True
+
+    @contextmanager
+    def handling_job(self, job_url: str) -> Iterator[None]:
+        """Record a job as handled by the current process during the context.
+
+        Nothing is recorded if the current process is not registered. Failures to record the job
+        are logged, and do not interrupt the handling of the job.
+
+        Args:
+            job_url: The URL of the job.
+        """
+        self._update_jobs(lambda jobs: [*jobs, job_url])
+        try:
+            yield
+        finally:
+            self._update_jobs(lambda jobs: [job for job in jobs if job != job_url])
+
+    def record_spawn_latency(self, seconds: float) -> None:
+        """Record the seconds from receiving a job to requesting its runner.
+
+        Nothing is recorded if the current process is not registered. Failures to record the
+        latency are logged.
+
+        Args:
+            seconds: The seconds from receiving the job to requesting the runner.
+        """
+        if not self._get_entry_path(os.getpid()).exists():
+            return
+        latencies_dir = self._path / SPAWN_LATENCIES_DIR_NAME
+        try:
+            latencies_dir.mkdir(mode=0o755, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=latencies_dir, prefix=".")
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                tmp_file.write(str(seconds))
+            tmp_path = Path(tmp_name)
+            # The files are collected once complete, without the dot prefix.
+            tmp_path.rename(tmp_path.with_name(tmp_path.name[1:]))
+        except OSError:
+            logger.warning("Unable to record the spawn latency of reactive worker %s", os.getpid())
+
+    def collect_spawn_latencies(self) -> list[float]:
+        """Collect the spawn latencies recorded by the workers since the last collection.
+
+        Returns:
+            The seconds from receiving a job to requesting its runner.
+        """
+        try:
+            latency_paths = [
+                entry.path
+                for entry in os.scandir(self._path / SPAWN_LATENCIES_DIR_NAME)
+                if not entry.name.startswith(".")
+            ]
+        except FileNotFoundError:
+            return []
+        latencies = []
+        for latency_path in latency_paths:
+            try:
+                with open(latency_path, "rb") as latency_file:
+                    latencies.append(float(latency_file.read()))
+            except (OSError, ValueError):
+                logger.warning("Ignoring invalid spawn latency %s", latency_path)
+            Path(latency_path).unlink(missing_ok=True)
+        return latencies
+
+    def _update_jobs(self, update: Callable[[list[str]], list[str]]) -> None:
+        """Update the jobs of the entry of the current process.
+
+        Args:
+            update: The function computing the new jobs from the current ones.
+        """
+        entry_path = self._get_entry_path(os.getpid())
+        with self._lock:
+            if not entry_path.exists():
+                return
+            worker = self._read_entry(entry_path)
+            if worker is None:
+                return
+            worker.jobs = update(worker.jobs)
+            try:
+                self._write_entry(worker)
+            except OSError:
+                logger.warning("Unable to record the jobs of reactive worker %s", worker.pid)
+
+    def _read_entry(self, entry_path: str | Path) -> ReactiveWorker | None:
+        """Read the entry of a worker.
+
+        Args:
+            entry_path: The path of the entry.
+
+        Returns:
+            The worker, or None if the entry does not exist or is invalid.
+        """
+        try:
+            with open(entry_path, "rb") as entry_file:
+                return ReactiveWorker(**json.load(entry_file))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError):
+            logger.warning("Removing invalid reactive worker entry %s", entry_path)
+            Path(entry_path).unlink(missing_ok=True)
+            return None
+
+    def _write_entry(self, worker: ReactiveWorker) -> None:
+        """Replace the entry of a worker atomically.
+
+        Args:
+            worker: The worker.
+        """
+        fd, tmp_name = tempfile.mkstemp(dir=self._path, prefix=".")
+        tmp_path = Path(tmp_name)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                json.dump(asdict(worker), tmp_file)
+            tmp_path.chmod(0o644)
+            tmp_path.replace(self._get_entry_path(worker.pid))
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def _get_entry_path(self, pid: int) -> Path:
+        """Get the path of the entry of a worker.
+
+        Args:
+            pid: The PID of the process.
+
+        Returns:
+            The path of the entry.
+        """
+        return self._path / f"{pid}{_ENTRY_SUFFIX}"
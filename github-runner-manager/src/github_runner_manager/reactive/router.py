@@ -0,0 +1,130 @@
+#  Copyright 2025 Canonical Ltd.
+#  See LICENSE file for licensing details.
+
+"""Routing of the reactive jobs to the runner managers of the images and flavors by labels.
+
+The routes supporting each label are indexed when the router is built, so the routes supporting
+the labels of a job are the intersection of the routes of its labels. The route chosen is the
+best fit, the one with the fewest labels not requested by the job, among the routes below their
+capacity.
+"""
+import logging
+import threading
+from dataclasses import dataclass
+
+from github_runner_manager.manager.runner_manager import RunnerManager
+
+logger = logging.getLogger(__name__)
+
+Labels = set[str]
+
+
+@dataclass
+class Route:
+    """Runner manager of an image and flavor, and the labels of its runners.
+
+    Attributes:
+        runner_manager: The runner manager spawning the runners of the route.
+        supported_labels: The labels of the jobs the runners can pick up.
+        max_spawns: The maximum number of runners of the route being spawned at once by the
+            process, unlimited if None.
+        flavor: The flavor of the runners, keying their boot times. The name of the route is
+            used if None.
+        name: The name of the route.
+    """
+
+    runner_manager: RunnerManager
+    supported_labels: Labels
+    max_spawns: int | None = None
+    flavor: str | None = None
+
+    @property
+    def name(self) -> str:
+        """The name of the route.
+
+        Returns:
+            The name of the runner manager.
+        """
+        return self.runner_manager.manager_name
+
+
+class LabelRouter:
+    """Router of the jobs to the routes supporting their labels."""
+
+    def __init__(self, routes: list[Route]):
+        """Construct the object.
+
+        Args:
+            routes: The routes, the first ones preferred among the routes fitting as well.
+        """
+        self._routes = routes
+        self._index: dict[str, set[int]] = {}
+        for position, route in enumerate(routes):
+            for label in route.supported_labels:
+                self._index.setdefault(label.lower(), set()).add(position)
+        # The positions of the routes fitting the labels of the jobs seen, the best fit first.
+        self._fits: dict[frozenset[str], list[int]] = {}
+        self._spawning = [0] * len(routes)
+        self._lock = threading.Lock()
+
+    def get_routes(self, labels: Labels) -> list[Route]:
+        """Get the routes supporting labels.
+
+        Args:
+            labels: The labels of a job.
+
+        Returns:
+            The routes supporting the labels, the best fit first.
+        """
+        with self._lock:
+            return [self._routes[position] for position in self._get_fits(labels)]
+
+    def acquire(self, labels: Labels) -> Route | None:
+        """Choose the route of a job, counting a runner being spawned for the route.
+
+        Args:
+            labels: The labels of the job.
+
+        Returns:
+            The best fit route below its capacity, or None if all the routes supporting the
+            labels are at capacity or there is none.
+        """
+        with self._lock:
+            for position in self._get_fits(labels):
+                route = self._routes[position]
+                if route.max_spawns is None or self._spawning[position] < route.max_spawns:
+                    self._spawning[position] += 1
+                    return route
+        return None
+
+    def release(self, route: Route) -> None:
+        """Count a runner of a route no longer being spawned.
+
+        Args:
+            route: The route returned by acquire.
+        """
+        with self._lock:
+            for position, other in enumerate(self._routes):
+                if other is route:
+                    self._spawning[position] = max(self._spawning[position] - 1, 0)
+
+    def _get_fits(self, labels: Labels) -> list[int]:
+        """Get the positions of the routes supporting labels, with the lock held.
+
+        Args:
+            labels: The labels of a job.
+
+        Returns:
+            The positions of the routes, the best fit first.
+        """
+        key = frozenset(label.lower() for label in labels)
+        if (fits := self._fits.get(key)) is None:
+            positions = set(range(len(self._routes)))
+            for label in key:
+                positions &= self._index.get(label, set())
+            fits = sorted(
+                positions,
+                key=lambda position: (len(self._routes[position].supported_labels), position),
+            )
+            self._fits[key] = fits
+        return fits
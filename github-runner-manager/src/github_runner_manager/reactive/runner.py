@@ -8,13 +8,18 @@ import grp
 import logging
 import os
 import sys
+from dataclasses import replace
 
 from github_runner_manager.configuration import UserInfo
 from github_runner_manager.manager.runner_manager import RunnerManager
+from github_runner_manager.metrics.events import FsyncPolicy, configure_event_sink
 from github_runner_manager.openstack_cloud.openstack_runner_manager import OpenStackRunnerManager
 from github_runner_manager.platform.factory import platform_factory
+from github_runner_manager.platform.platform_provider import PlatformProvider
+from github_runner_manager.reactive import daemon
 from github_runner_manager.reactive.consumer import consume
 from github_runner_manager.reactive.process_manager import RUNNER_CONFIG_ENV_VAR
+from github_runner_manager.reactive.router import LabelRouter, Route
 from github_runner_manager.reactive.types_ import ReactiveProcessConfig
 
 
@@ -29,7 +34,7 @@ def setup_root_logging() -> None:
 
 
 def main() -> None:
-    """Spawn a process that consumes a message from the queue to create a runner.
+    """Spawn a process that consumes messages from the queue to create runners.
 
     Raises:
         ValueError: If the required environment variables are not set
@@ -45,7 +50,24 @@ def main() -> None:
     runner_config = ReactiveProcessConfig.parse_raw(runner_config_str)
 
     setup_root_logging()
+    run(runner_config)
+
+
+def run(runner_config: ReactiveProcessConfig) -> None:
+    """Consume messages from the queue to create runners.
+
+    The process consumes a single job, or runs the reactive daemon if configured.
+
+    Args:
+        runner_config: The reactive runner configuration.
+    """
     queue_config = runner_config.queue
+    if runner_config.metric_events is not None:
+        configure_event_sink(
+            flush_interval=runner_config.metric_events.flush_interval,
+            flush_size=runner_config.metric_events.flush_size,
+            fsync=FsyncPolicy.FLUSH if runner_config.metric_events.fsync else FsyncPolicy.NEVER,
+        )
 
     user = UserInfo(getpass.getuser(), grp.getgrgid(os.getgid()).gr_name)
     openstack_runner_manager = OpenStackRunnerManager(
@@ -62,13 +84,77 @@ def main() -> None:
         cloud_runner_manager=openstack_runner_manager,
         labels=runner_config.labels,
     )
+    server_config = runner_config.cloud_runner_manager.server_config
+    router = (
+        _build_router(runner_config, platform_provider, user)
+        if runner_config.routes
+        else LabelRouter(
+            [
+                Route(
+                    runner_manager=runner_manager,
+                    supported_labels=runner_config.supported_labels,
+                    flavor=server_config.flavor if server_config is not None else None,
+                )
+            ]
+        )
+    )
+    if runner_config.daemon:
+        daemon.run(
+            queue_config=queue_config,
+            runner_manager=runner_manager,
+            platform_provider=platform_provider,
+            supported_labels=runner_config.supported_labels,
+            pick_up_poll=runner_config.pick_up_poll,
+            router=router,
+        )
+        return
     consume(
         queue_config=queue_config,
         runner_manager=runner_manager,
         platform_provider=platform_provider,
         supported_labels=runner_config.supported_labels,
+        pick_up_poll=runner_config.pick_up_poll,
+        router=router,
     )
 
 
+def _build_router(
+    runner_config: ReactiveProcessConfig, platform_provider: PlatformProvider, user: UserInfo
+) -> LabelRouter:
+    """Build the router of the jobs to a runner manager for each route of the configuration.
+
+    Args:
+        runner_config: The reactive runner configuration.
+        platform_provider: The platform provider shared by the runner managers.
+        user: The user to run the runner managers as.
+
+    Returns:
+        The router.
+    """
+    routes = []
+    for route_config in runner_config.routes:
+        cloud_runner_manager = OpenStackRunnerManager(
+            config=replace(
+                runner_config.cloud_runner_manager, server_config=route_config.server_config
+            ),
+            user=user,
+        )
+        runner_manager = RunnerManager(
+            manager_name=route_config.manager_name,
+            platform_provider=platform_provider,
+            cloud_runner_manager=cloud_runner_manager,
+            labels=route_config.labels,
+        )
+        routes.append(
+            Route(
+                runner_manager=runner_manager,
+                supported_labels=route_config.supported_labels,
+                max_spawns=route_config.max_spawns,
+                flavor=route_config.server_config.flavor,
+            )
+        )
+    return LabelRouter(routes)
+
+
 if __name__ == "__main__":
     main()
@@ -9,11 +9,18 @@ from github_runner_manager.configuration import UserInfo
 from github_runner_manager.manager.runner_manager import (
     FlushMode,
     IssuedMetricEventsStats,
+    RunnerInventory,
     RunnerManager,
 )
+from github_runner_manager.metrics.reconcile import (
+    REACTIVE_CONSUMERS_COUNT,
+    REACTIVE_DEQUEUE_TO_SPAWN_SECONDS,
+    REACTIVE_QUEUE_SIZE,
+)
 from github_runner_manager.platform.github_provider import PlatformRunnerState
 from github_runner_manager.reactive import process_manager
 from github_runner_manager.reactive.consumer import get_queue_size
+from github_runner_manager.reactive.scaling import ReactiveScalingPolicy
 from github_runner_manager.reactive.types_ import ReactiveProcessConfig
 
 logger = logging.getLogger(__name__)
@@ -32,12 +39,14 @@ class ReconcileResult:
     metric_stats: IssuedMetricEventsStats
 
 
-def reconcile(
+def reconcile(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
     expected_quantity: int,
     runner_manager: RunnerManager,
     reactive_process_config: ReactiveProcessConfig,
     user: UserInfo,
     python_path: str | None = None,
+    inventory: RunnerInventory | None = None,
+    scaling_policy: ReactiveScalingPolicy | None = None,
 ) -> ReconcileResult:
     """Reconcile runners reactively.
 
@@ -76,28 +85,42 @@ def reconcile(
     removes all idle runners if the queue is empty, to ensure that
     no idle runners are left behind if there are no new jobs.
 
+    With a scaling policy, the number of reactive processes follows the backlog of the queue
+    instead, within the quantity above. The reactive daemon may then only spawn the runners
+    for the quantity above minus the jobs already being handled until the next reconciliation.
+
     Args:
         expected_quantity: Number of intended amount of runners + reactive processes.
         runner_manager: The runner manager to interact with current running runners.
         reactive_process_config: The reactive runner config.
         user: The user to run the reactive process.
         python_path: The PYTHONPATH to access the github-runner-manager library.
+        inventory: Snapshot of the runners. If not provided, a new one is taken.
+        scaling_policy: The policy sizing the reactive processes after the queue.
 
     Returns:
         The number of reactive processes created. If negative, its absolute value is equal
         to the number of processes killed.
     """
-    cleanup_metric_stats = runner_manager.cleanup()
+    if inventory is None:
+        inventory = runner_manager.get_inventory()
+    cleanup_metric_stats = runner_manager.cleanup(inventory=inventory)
     flush_metric_stats = {}
     delete_metric_stats = {}
 
-    if get_queue_size(reactive_process_config.queue) == 0:
+    queue_size = get_queue_size(reactive_process_config.queue)
+    REACTIVE_QUEUE_SIZE.labels(runner_manager.manager_name).set(queue_size)
+    for latency in process_manager.collect_spawn_latencies():
+        REACTIVE_DEQUEUE_TO_SPAWN_SECONDS.labels(runner_manager.manager_name).observe(latency)
+    if queue_size == 0:
         logger.info("Reactive reconcile. Flushing on empty queue")
-        flush_metric_stats = runner_manager.flush_runners(FlushMode.FLUSH_IDLE)
+        flush_metric_stats = runner_manager.flush_runners(
+            FlushMode.FLUSH_IDLE, inventory=inventory
+        )
 
     # Only count runners which are online on GitHub to prevent machines to be just in
     # construction to be counted and then killed immediately by the process manager.
-    all_runners = runner_manager.get_runners()
+    all_runners = runner_manager.get_runners(inventory=inventory)
     runners = [
         runner
         for runner in all_runners
@@ -108,7 +131,7 @@ def reconcile(
     if runner_diff >= 0:
         process_quantity = runner_diff
     else:
-        delete_metric_stats = runner_manager.delete_runners(-runner_diff)
+        delete_metric_stats = runner_manager.delete_runners(-runner_diff, inventory=inventory)
         process_quantity = 0
 
     metric_stats = {
@@ -120,11 +143,21 @@ def reconcile(
         | set(flush_metric_stats)
     }
 
+    spawn_budget = None
+    if scaling_policy is not None:
+        busy = process_manager.get_busy_count()
+        spawn_budget = max(process_quantity - busy, 0)
+        process_quantity = scaling_policy.get_consumers(
+            queue_size=queue_size, busy=busy, capacity=process_quantity
+        )
+    REACTIVE_CONSUMERS_COUNT.labels(runner_manager.manager_name).set(process_quantity)
+
     processes_created = process_manager.reconcile(
         quantity=process_quantity,
         reactive_process_config=reactive_process_config,
         user=user,
         python_path=python_path,
+        spawn_budget=spawn_budget,
     )
 
     return ReconcileResult(processes_diff=processes_created, metric_stats=metric_stats)
@@ -0,0 +1,78 @@
+#  Copyright 2025 Canonical Ltd.
+#  See LICENSE file for licensing details.
+
+"""Policy sizing the reactive consumers after the depth and the growth of the job queue."""
+import logging
+import math
+import time
+
+logger = logging.getLogger(__name__)
+
+# Weight of the last observation in the moving average of the arrival rate.
+_RATE_SMOOTHING = 0.5
+
+
+class ReactiveScalingPolicy:
+    """Number of reactive consumers following the backlog of the job queue.
+
+    Consumers are only needed for the jobs in the queue, the jobs being handled, and the jobs
+    expected to arrive before the next reconciliation. The arrival rate is estimated with an
+    exponential moving average of the growth of the queue between two reconciliations.
+
+    Attributes:
+        arrival_rate: The estimated number of jobs entering the queue per second.
+    """
+
+    def __init__(self, min_consumers: int = 1, smoothing: float = _RATE_SMOOTHING):
+        """Construct the object.
+
+        Args:
+            min_consumers: The number of consumers kept when the queue is empty.
+            smoothing: The weight of the last observation in the average of the arrival rate.
+        """
+        self._min_consumers = min_consumers
+        self._smoothing = smoothing
+        self._arrival_rate = 0.0
+        self._last_queue_size: int | None = None
+        self._last_time = 0.0
+        self._interval = 0.0
+
+    @property
+    def arrival_rate(self) -> float:
+        """The estimated number of jobs entering the queue per second.
+
+        Returns:
+            The arrival rate.
+        """
+        return self._arrival_rate
+
+    def get_consumers(self, queue_size: int, busy: int, capacity: int) -> int:
+        """Get the number of consumers for the current backlog.
+
+        Args:
+            queue_size: The number of jobs in the queue.
+            busy: The number of jobs being handled by the consumers.
+            capacity: The maximum number of consumers, i.e. the runners that can be added.
+
+        Returns:
+            The number of consumers.
+        """
+        now = time.monotonic()
+        if self._last_queue_size is not None:
+            self._interval = now - self._last_time
+            if self._interval > 0:
+                growth = max(queue_size - self._last_queue_size, 0) / self._interval
+                self._arrival_rate += self._smoothing * (growth - self._arrival_rate)
+        self._last_queue_size = queue_size
+        self._last_time = now
+        headroom = math.ceil(self._arrival_rate * self._interval)
+        consumers = max(busy + queue_size + headroom, self._min_consumers)
+        logger.info(
+            "Reactive scaling: queue size %s, busy consumers %s, arrival rate %.3f/s, "
+            "capacity %s",
+            queue_size,
+            busy,
+            self._arrival_rate,
+            capacity,
+        )
+        return max(min(consumers, capacity), 0)
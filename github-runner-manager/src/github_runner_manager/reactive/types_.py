@@ -5,14 +5,38 @@
 
 from pydantic import BaseModel
 
-from github_runner_manager.configuration.base import QueueConfig
+from github_runner_manager.configuration.base import (
+    MetricEventsConfig,
+    PickUpPollConfig,
+    QueueConfig,
+)
 from github_runner_manager.configuration.github import GitHubConfiguration
 from github_runner_manager.configuration.jobmanager import JobManagerConfiguration
+from github_runner_manager.openstack_cloud.models import OpenStackServerConfig
 from github_runner_manager.openstack_cloud.openstack_runner_manager import (
     OpenStackRunnerManagerConfig,
 )
 
 
+class ReactiveRouteConfig(BaseModel):
+    """The configuration of the runners of an image and flavor spawned for the jobs of the queue.
+
+    Attributes:
+        manager_name: Name of the manager of the runners.
+        server_config: The image and flavor of the runners.
+        supported_labels: The supported labels for the runners.
+        labels: Labels to use for the runners.
+        max_spawns: Maximum number of runners being spawned at once by a reactive process,
+            unlimited if None.
+    """
+
+    manager_name: str
+    server_config: OpenStackServerConfig
+    supported_labels: set[str]
+    labels: list[str]
+    max_spawns: int | None = None
+
+
 class ReactiveProcessConfig(BaseModel):
     """The configuration for the reactive runner to spawn.
 
@@ -24,6 +48,11 @@ class ReactiveProcessConfig(BaseModel):
         cloud_runner_manager: The OpenStack runner manager configuration.
         supported_labels: The supported labels for the runner.
         labels: Labels to use for the runners.
+        daemon: Whether to consume the jobs with the threads of a single long-running process.
+        pick_up_poll: Schedule of the checks whether a job was picked up by its runner.
+        routes: The image and flavor combinations the jobs are routed to by their labels. If
+            empty, the runners are spawned with the cloud runner manager configuration.
+        metric_events: Configuration of the writes of the metric events to the metrics log.
     """
 
     queue: QueueConfig
@@ -33,3 +62,7 @@ class ReactiveProcessConfig(BaseModel):
     cloud_runner_manager: OpenStackRunnerManagerConfig
     supported_labels: set[str]
     labels: list[str]
+    daemon: bool = False
+    pick_up_poll: PickUpPollConfig = PickUpPollConfig()
+    routes: list[ReactiveRouteConfig] = []
+    metric_events: MetricEventsConfig | None = None
@@ -40,14 +40,52 @@ def get_runner_scaler(
     return RunnerScaler.build(app_config, user, python_path)
 
 
+class RunnerScalerProvider:  # pylint: disable=too-few-public-methods
+    """Provide a long-lived RunnerScaler shared by the reconcile service and the HTTP server.
+
+    Building a RunnerScaler creates the cloud and platform clients, which discard cached state
+    (e.g. the OpenStack compute API version) when thrown away. The RunnerScaler is built once
+    and reused until a different configuration is requested.
+    """
+
+    def __init__(self, python_path: str | None = None):
+        """Construct the object.
+
+        Args:
+            python_path: The PYTHONPATH to access the github-runner-manager library.
+        """
+        self._python_path = python_path
+        self._lock = Lock()
+        self._app_config: ApplicationConfiguration | None = None
+        self._runner_scaler: RunnerScaler | None = None
+
+    def get(self, app_config: ApplicationConfiguration) -> RunnerScaler:
+        """Get the RunnerScaler for the configuration, building it only if needed.
+
+        Args:
+            app_config: The configuration of github-runner-manager.
+
+        Returns:
+            The RunnerScaler object.
+        """
+        with self._lock:
+            if self._runner_scaler is None or self._app_config != app_config:
+                logger.info("Building runner scaler from configuration")
+                self._runner_scaler = get_runner_scaler(app_config, python_path=self._python_path)
+                self._app_config = app_config
+            return self._runner_scaler
+
+
 def start_reconcile_service(
-    app_config: ApplicationConfiguration, python_path: str | None, lock: Lock
+    app_config: ApplicationConfiguration,
+    runner_scaler_provider: RunnerScalerProvider,
+    lock: Lock,
 ) -> None:
     """Start the reconcile server.
 
     Args:
         app_config: The configuration of the application.
-        python_path: The PYTHONPATH to access the github-runner-manager library.
+        runner_scaler_provider: Provider of the RunnerScaler shared with the HTTP server.
         lock: The lock representing modification access to the managed set of runners.
     """
     logger.info(RECONCILE_SERVICE_START_MSG)
@@ -60,7 +98,7 @@ def start_reconcile_service(
         with lock:
             logger.info(RECONCILE_START_MSG)
             logger.info("Reconcile ID: %s", reconcile_id)
-            runner_scaler = get_runner_scaler(app_config, python_path=python_path)
+            runner_scaler = runner_scaler_provider.get(app_config)
             delta = runner_scaler.reconcile()
             logger.info("Change in number of runner after reconcile: %s", delta)
         logger.info(RECONCILE_END_MSG)
@@ -4,11 +4,16 @@
 """Utilities used by the charm."""
 
 import functools
+import hashlib
+import json
 import logging
 import os
 import subprocess  # nosec B404
+import tempfile
+import threading
 import time
-from typing import Any, Callable, Optional, Sequence, Type, TypeVar
+from pathlib import Path
+from typing import Any, Callable, Generic, Hashable, Optional, Sequence, Type, TypeVar
 
 from typing_extensions import ParamSpec
 
@@ -19,6 +24,9 @@ logger = logging.getLogger(__name__)
 ParamT = ParamSpec("ParamT")
 # Return type of the function decorated with retry
 ReturnT = TypeVar("ReturnT")
+# Key and value types of the TTLCache
+KeyT = TypeVar("KeyT", bound=Hashable)
+ValueT = TypeVar("ValueT")
 
 
 # This decorator has default arguments, one extra argument is not a problem.
@@ -156,3 +164,180 @@ def set_env_var(env_var: str, value: str) -> None:
     """
     os.environ[env_var.upper()] = value
     os.environ[env_var.lower()] = value
+
+
+class TTLCache(Generic[KeyT, ValueT]):
+    """Thread-safe in-memory cache whose entries expire after a time to live."""
+
+    def __init__(self, ttl: float):
+        """Construct the object.
+
+        Args:
+            ttl: Seconds an entry is kept in the cache.
+        """
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: dict[KeyT, tuple[float, ValueT]] = {}
+
+    def get(self, key: KeyT) -> ValueT | None:
+        """Get an entry that has not expired.
+
+        Args:
+            key: The key of the entry.
+
+        Returns:
+            The value of the entry, or None if not cached or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expiry, value = entry
+            if time.monotonic() >= expiry:
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: KeyT, value: ValueT) -> None:
+        """Add or replace an entry, removing the expired entries.
+
+        Args:
+            key: The key of the entry.
+            value: The value of the entry.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._entries = {
+                entry_key: entry for entry_key, entry in self._entries.items() if entry[0] > now
+            }
+            self._entries[key] = (now + self._ttl, value)
+
+    def invalidate(self, key: KeyT | None = None) -> None:
+        """Remove an entry, or all the entries if no key is given.
+
+        Args:
+            key: The key of the entry to remove.
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+class FileTTLCache:
+    """Cache whose entries expire after a time to live, stored in files shared by processes.
+
+    Each entry is a file with the JSON of its value and expiry time, replaced atomically, so the
+    cache can be read and written by concurrent processes without locks. The cache is a best
+    effort: the entries that cannot be read or written are missing from the cache.
+    """
+
+    def __init__(self, path: Path, ttl: float):
+        """Construct the object.
+
+        Args:
+            path: The directory of the cache.
+            ttl: Seconds an entry is kept in the cache.
+        """
+        self._path = path
+        self._ttl = ttl
+
+    def get(self, key: str) -> Any:
+        """Get an entry that has not expired.
+
+        Args:
+            key: The key of the entry.
+
+        Returns:
+            The value of the entry, or None if not cached or expired.
+        """
+        try:
+            entry = json.loads(self._get_entry_path(key).read_text(encoding="utf-8"))
+            expiry, value = entry["expiry"], entry["value"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.warning("Unable to read the cache entry %s in %s", key, self._path)
+            return None
+        if time.time() >= expiry:
+            return None
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Add or replace an entry.
+
+        Args:
+            key: The key of the entry.
+            value: The value of the entry, serializable to JSON.
+        """
+        entry = {"key": key, "expiry": time.time() + self._ttl, "value": value}
+        try:
+            self._path.mkdir(mode=0o700, parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self._path, prefix=".")
+        except OSError:
+            logger.warning("Unable to write the cache entry %s in %s", key, self._path)
+            return
+        tmp_path = Path(tmp_name)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                json.dump(entry, tmp_file)
+            tmp_path.replace(self._get_entry_path(key))
+        except OSError:
+            logger.warning("Unable to write the cache entry %s in %s", key, self._path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def invalidate(self, key: str) -> None:
+        """Remove an entry.
+
+        Args:
+            key: The key of the entry to remove.
+        """
+        try:
+            self._get_entry_path(key).unlink(missing_ok=True)
+        except OSError:
+            logger.warning("Unable to remove the cache entry %s in %s", key, self._path)
+
+    def _get_entry_path(self, key: str) -> Path:
+        """Get the file of an entry.
+
+        Args:
+            key: The key of the entry.
+
+        Returns:
+            The path of the file, named after the hash of the key.
+        """
+        return self._path / hashlib.sha256(key.encode()).hexdigest()
+
+
+class ProcessLocal(Generic[ValueT]):  # pylint: disable=too-few-public-methods
+    """Value created lazily, once per process.
+
+    Used for values such as connection pools, whose connections cannot be shared with forked
+    processes. A forked process creates its own value on first use, and leaves the value of the
+    parent process untouched. There is no lock, which could be forked while held: concurrent
+    threads may create the value more than once, and all but one of the values are discarded.
+    """
+
+    def __init__(self, factory: Callable[[], ValueT]):
+        """Construct the object.
+
+        Args:
+            factory: Function creating the value.
+        """
+        self._factory = factory
+        self._entry: tuple[int, ValueT] | None = None
+
+    def get(self) -> ValueT:
+        """Get the value of the current process, creating it if needed.
+
+        Returns:
+            The value.
+        """
+        pid = os.getpid()
+        entry = self._entry
+        if entry is None or entry[0] != pid:
+            entry = (pid, self._factory())
+            self._entry = entry
+        return entry[1]
@@ -0,0 +1,57 @@
+#  Copyright 2025 Canonical Ltd.
+#  See LICENSE file for licensing details.
+
+"""Micro-benchmark of the issue of metric events."""
+
+import time
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from github_runner_manager.metrics import events
+
+NUM_EVENTS = 20000
+
+
+def _issue_event_unbuffered(event: events.Event) -> None:
+    """Issue a metric event opening the metrics log for each event, as before the event sink.
+
+    Args:
+        event: The metric event to log.
+    """
+    with events.METRICS_LOG_PATH.open(mode="a", encoding="utf-8") as metrics_file:
+        metrics_file.write(f"{event.json(exclude_none=True)}\n")
+
+
+def _events_per_second(issue: Callable[[events.Event], None]) -> float:
+    """Measure the rate of issue of metric events.
+
+    Args:
+        issue: The function issuing an event.
+
+    Returns:
+        The number of events issued per second, including writing them to the metrics log.
+    """
+    start = time.perf_counter()
+    for index in range(NUM_EVENTS):
+        issue(events.RunnerInstalled(timestamp=index, flavor="small", duration=1))
+    events.flush_events()
+    return NUM_EVENTS / (time.perf_counter() - start)
+
+
+def test_event_sink_throughput(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    """
+    arrange: Given a metrics log in a temporary directory.
+    act: Issue the same events unbuffered and with the event sink.
+    assert: The event sink issues more events per second, and all events are logged.
+    """
+    monkeypatch.setattr(events, "METRICS_LOG_PATH", tmp_path / "metrics.log")
+    events.configure_event_sink()
+
+    unbuffered = _events_per_second(_issue_event_unbuffered)
+    buffered = _events_per_second(events.issue_event)
+
+    print(f"\nunbuffered: {unbuffered:.0f} events/s, event sink: {buffered:.0f} events/s")
+    assert len(events.METRICS_LOG_PATH.read_text().splitlines()) == 2 * NUM_EVENTS
+    assert buffered > unbuffered
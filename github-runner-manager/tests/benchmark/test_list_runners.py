@@ -0,0 +1,140 @@
+#  Copyright 2025 Canonical Ltd.
+#  See LICENSE file for licensing details.
+
+"""Benchmark of the listing of the runners of a large organization on GitHub."""
+
+import math
+import time
+import tracemalloc
+from typing import Callable
+from unittest.mock import MagicMock
+
+import pytest
+
+from github_runner_manager.configuration.github import GitHubOrg
+from github_runner_manager.github_client import RUNNERS_PER_PAGE, GithubClient
+from github_runner_manager.manager.models import InstanceID
+from github_runner_manager.types_.github import SelfHostedRunner
+
+NUM_RUNNERS = 5000
+# One in this number of runners of the organization is managed by the benchmarked manager.
+MANAGED_RUNNERS_RATIO = 20
+PREFIX = "bench-0"
+# Latency of a request of a page of runners to the GitHub API.
+PAGE_LATENCY = 0.02
+
+
+@pytest.fixture(name="org_runners", scope="module")
+def org_runners_fixture() -> list[dict]:
+    """Runners of an organization, as listed by the GitHub API."""
+    runners = []
+    for index in range(NUM_RUNNERS):
+        prefix = PREFIX if index % MANAGED_RUNNERS_RATIO == 0 else f"unit-{index % 7}"
+        runners.append(
+            {
+                "id": 100000 + index,
+                "name": f"{prefix}-n-{index:012x}",
+                "os": "linux",
+                "status": "online" if index % 3 else "offline",
+                "busy": bool(index % 2),
+                "labels": [
+                    {"id": 1, "name": "self-hosted", "type": "read-only"},
+                    {"id": 2, "name": "linux", "type": "read-only"},
+                    {"id": 3, "name": "x64", "type": "read-only"},
+                    {"id": 0, "name": prefix, "type": "custom"},
+                ],
+            }
+        )
+    return runners
+
+
+@pytest.fixture(name="github_client")
+def github_client_fixture(org_runners: list[dict]) -> GithubClient:
+    """Client listing the runners of the organization with a constant latency."""
+
+    def list_runners(per_page: int, page: int, **_) -> dict:
+        """Reply with a page of the runners of the organization.
+
+        Args:
+            per_page: The size of the pages.
+            page: The number of the page.
+
+        Returns:
+            The page of runners.
+        """
+        time.sleep(PAGE_LATENCY)
+        return {
+            "total_count": len(org_runners),
+            "runners": [
+                dict(runner) for runner in org_runners[(page - 1) * per_page :][:per_page]
+            ],
+        }
+
+    client = GithubClient("token")
+    client._client = MagicMock()
+    client._client.actions.list_self_hosted_runners_for_org.side_effect = list_runners
+    return client
+
+
+def _list_runners_sequentially(client: GithubClient, path: GitHubOrg) -> list[SelfHostedRunner]:
+    """List the runners fetching all pages in sequence, and filter them once fetched.
+
+    This is how the runners were listed before the concurrent pagination.
+
+    Args:
+        client: The GitHub client.
+        path: The GitHub organization.
+
+    Returns:
+        The runners with the prefix.
+    """
+    list_page = client._client.actions.list_self_hosted_runners_for_org
+    first_page = list_page(org=path.org, per_page=RUNNERS_PER_PAGE, page=1)
+    raw_runners = list(first_page["runners"])
+    for page in range(2, math.ceil(first_page["total_count"] / RUNNERS_PER_PAGE) + 1):
+        raw_runners.extend(
+            list_page(org=path.org, per_page=RUNNERS_PER_PAGE, page=page)["runners"]
+        )
+    return [
+        SelfHostedRunner.build_from_github(
+            runner, InstanceID.build_from_name(PREFIX, runner["name"])
+        )
+        for runner in raw_runners
+        if InstanceID.name_has_prefix(PREFIX, runner["name"])
+    ]
+
+
+def _measure(list_runners: Callable[[], list[SelfHostedRunner]]) -> tuple[float, int, int]:
+    """Measure the listing of the runners.
+
+    Args:
+        list_runners: The function listing the runners.
+
+    Returns:
+        The seconds taken, the peak of memory allocated in bytes and the number of runners.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    runners = list_runners()
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duration, peak, len(runners)
+
+
+def test_list_runners_large_org(github_client: GithubClient):
+    """
+    arrange: Given an organization with 5000 runners, 250 of them with the prefix.
+    act: List the runners sequentially, then with concurrent and streaming pagination.
+    assert: Both list the same runners, the concurrent pagination takes less time and memory.
+    """
+    path = GitHubOrg(org="bench", group="default")
+
+    sequential = _measure(lambda: _list_runners_sequentially(github_client, path))
+    concurrent = _measure(lambda: github_client.list_runners(path, PREFIX))
+
+    for name, (duration, peak, count) in (("sequential", sequential), ("concurrent", concurrent)):
+        print(f"\n{name}: {count} runners in {duration:.3f}s, peak memory {peak / 2**20:.1f} MiB")
+    assert sequential[2] == concurrent[2] == NUM_RUNNERS // MANAGED_RUNNERS_RATIO
+    assert concurrent[0] < sequential[0]
+    assert concurrent[1] < sequential[1]
@@ -0,0 +1,103 @@
+#  Copyright 2025 Canonical Ltd.
+#  See LICENSE file for licensing details.
+
+"""Benchmark of the listing of the reactive worker processes."""
+
+import shutil
+import subprocess
+import time
+from pathlib import Path
+from typing import Callable, Iterator
+
+import pytest
+
+from github_runner_manager.reactive.process_manager import (
+    PYTHON_BIN,
+    REACTIVE_RUNNER_SCRIPT_MODULE,
+)
+from github_runner_manager.reactive.registry import ReactiveWorkerRegistry
+from github_runner_manager.utilities import secure_run_subprocess
+
+NUM_PROCESSES = 500
+ROUNDS = 5
+REACTIVE_RUNNER_CMD_LINE_PREFIX = f"{PYTHON_BIN} -m {REACTIVE_RUNNER_SCRIPT_MODULE}"
+PIDS_COMMAND_LINE = [
+    "ps",
+    "axo",
+    f"cmd:{len(REACTIVE_RUNNER_CMD_LINE_PREFIX)},pid",
+    "--no-headers",
+    "--sort=-start_time",
+]
+
+
+@pytest.fixture(name="worker_pids", scope="module")
+def worker_pids_fixture() -> Iterator[list[int]]:
+    """Processes with the command line of the reactive runners."""
+    bash = shutil.which("bash")
+    if bash is None:
+        pytest.skip("bash is required to set the command line of the processes")
+    processes = [
+        # The processes are killed at the end of the benchmark.
+        subprocess.Popen(  # pylint: disable=consider-using-with
+            [bash, "-c", f'exec -a "{REACTIVE_RUNNER_CMD_LINE_PREFIX}" sleep 600'],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        for _ in range(NUM_PROCESSES)
+    ]
+    # Wait for the processes to exec sleep.
+    time.sleep(1)
+    yield [process.pid for process in processes]
+    for process in processes:
+        process.kill()
+        process.wait()
+
+
+def _get_pids_with_ps() -> list[int]:
+    """Get the PIDs of the reactive runner processes from the output of ps.
+
+    This is how the reactive processes were listed before the registry.
+
+    Returns:
+        The PIDs of the reactive runner processes.
+    """
+    result = secure_run_subprocess(cmd=PIDS_COMMAND_LINE)
+    return [
+        int(line.rstrip().rsplit(maxsplit=1)[-1])
+        for line in result.stdout.decode().split("\n")
+        if line.startswith(REACTIVE_RUNNER_CMD_LINE_PREFIX)
+    ]
+
+
+def _measure(list_pids: Callable[[], list[int]]) -> tuple[float, int]:
+    """Measure the listing of the reactive processes.
+
+    Args:
+        list_pids: The function listing the PIDs of the reactive processes.
+
+    Returns:
+        The mean seconds taken and the number of processes.
+    """
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        pids = list_pids()
+    return (time.perf_counter() - start) / ROUNDS, len(pids)
+
+
+def test_list_reactive_processes(worker_pids: list[int], tmp_path: Path):
+    """
+    arrange: Given 500 processes with the command line of the reactive runners, registered.
+    act: List the processes with ps, then with the registry.
+    assert: Both find all the processes, the registry takes less time.
+    """
+    worker_registry = ReactiveWorkerRegistry(tmp_path)
+    for pid in worker_pids:
+        worker_registry.register(pid)
+
+    with_ps = _measure(_get_pids_with_ps)
+    with_registry = _measure(lambda: [worker.pid for worker in worker_registry.get_workers()])
+
+    for name, (duration, count) in (("ps", with_ps), ("registry", with_registry)):
+        print(f"\n{name}: {count} processes in {duration * 1000:.1f}ms")
+    assert with_ps[1] == with_registry[1] == NUM_PROCESSES
+    assert with_registry[0] < with_ps[0]
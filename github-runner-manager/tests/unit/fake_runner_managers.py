@@ -56,6 +56,10 @@ class FakeOpenstackCloud:
         """Fake OpenStack lib's connect function."""
         return self
 
+    def authorize(self) -> str:
+        """Fake authorize method of the connection."""
+        return "token"
+
     @property
     def compute(self) -> "FakeOpenstackCloud":
         """Fake the compute API attribute."""
@@ -7,9 +7,17 @@ from unittest.mock import MagicMock
 
 import pytest
 
+from github_runner_manager.errors import IssueMetricEventError
+from github_runner_manager.manager import runner_manager as runner_manager_module
 from github_runner_manager.manager.models import RunnerMetadata
-from github_runner_manager.manager.runner_manager import FlushMode, RunnerInstance, RunnerManager
+from github_runner_manager.manager.runner_manager import (
+    FlushMode,
+    RunnerInstance,
+    RunnerInventory,
+    RunnerManager,
+)
 from github_runner_manager.manager.vm_manager import VM, CloudRunnerManager
+from github_runner_manager.metrics.events import RunnerStart
 from github_runner_manager.platform.platform_provider import PlatformProvider
 from github_runner_manager.types_.github import SelfHostedRunner
 from tests.unit.factories.runner_instance_factory import (
@@ -358,3 +366,126 @@ def test_runner_manager_non_deterministic_delete_runners(
 
     assert len(mock_platform._runners.values()) == expected_runners_count
     assert len(mock_platform._runners.values()) == expected_cloud_runners_count
+
+
+def test_runner_manager_inventory_lists_once(monkeypatch: pytest.MonkeyPatch):
+    """
+    arrange: Given a platform runner with a cloud runner and a platform runner without one.
+    act: Take an inventory and use it for cleanup, flush and get_runners.
+    assert: The cloud and the platform are listed once and the inventory follows the deletions.
+    """
+    idle_runner = SelfHostedRunnerFactory(busy=False, status="online")
+    mock_platform = FakeGitHubRunnerPlatform(
+        initial_runners=[idle_runner, SelfHostedRunnerFactory()]
+    )
+    mock_cloud = FakeCloudRunnerManager(
+        initial_cloud_runners=[
+            CloudRunnerInstanceFactory.from_self_hosted_runner(self_hosted_runner=idle_runner)
+        ]
+    )
+    get_runners_health_mock = MagicMock(wraps=mock_platform.get_runners_health)
+    monkeypatch.setattr(mock_platform, "get_runners_health", get_runners_health_mock)
+    get_runners_mock = MagicMock(wraps=mock_cloud.get_runners)
+    monkeypatch.setattr(mock_cloud, "get_runners", get_runners_mock)
+    manager = RunnerManager(
+        "test-manager", platform_provider=mock_platform, cloud_runner_manager=mock_cloud, labels=[]
+    )
+
+    inventory = manager.get_inventory()
+    manager.cleanup(inventory=inventory)
+    assert not inventory.non_requested_runners
+    assert len(manager.get_runners(inventory=inventory)) == 1
+    manager.flush_runners(flush_mode=FlushMode.FLUSH_IDLE, inventory=inventory)
+
+    assert manager.get_runners(inventory=inventory) == ()
+    assert not mock_cloud._cloud_runners
+    assert not mock_platform._runners
+    get_runners_mock.assert_called_once()
+    get_runners_health_mock.assert_called_once()
+
+
+def test_runner_manager_create_runners_updates_inventory(monkeypatch: pytest.MonkeyPatch):
+    """
+    arrange: Given an empty inventory.
+    act: Create runners with the inventory.
+    assert: The created runners are in the inventory without health information.
+    """
+    mock_platform = FakeGitHubRunnerPlatform(initial_runners=[])
+    monkeypatch.setattr(
+        mock_platform,
+        "get_runner_context",
+        MagicMock(return_value=(MagicMock(), SelfHostedRunnerFactory())),
+    )
+    mock_cloud = FakeCloudRunnerManager(initial_cloud_runners=[])
+    manager = RunnerManager(
+        "test-manager", platform_provider=mock_platform, cloud_runner_manager=mock_cloud, labels=[]
+    )
+    inventory = manager.get_inventory()
+
+    (instance_id,) = manager.create_runners(1, RunnerMetadata(), inventory=inventory)
+
+    (runner,) = manager.get_runners(inventory=inventory)
+    assert runner.instance_id == instance_id
+    assert runner.platform_health is None
+
+
+def test_runner_manager_create_runners_in_threads() -> None:
+    """
+    arrange: Given a cloud runner manager creating a VM per runner.
+    act: Create several runners.
+    assert: All the runners are created and added to the inventory.
+    """
+    cloud_runner_manager = MagicMock(spec=CloudRunnerManager)
+    cloud_runner_manager.name_prefix = "unit-0"
+    cloud_runner_manager.create_runner.side_effect = lambda runner_identity, runner_context: (
+        CloudRunnerInstanceFactory(instance_id=runner_identity.instance_id)
+    )
+    platform_provider = MagicMock(spec=PlatformProvider)
+    platform_provider.get_runner_context.return_value = (MagicMock(), MagicMock())
+    runner_manager = RunnerManager(
+        "managername",
+        platform_provider=platform_provider,
+        cloud_runner_manager=cloud_runner_manager,
+        labels=[],
+    )
+    inventory = RunnerInventory()
+
+    instance_ids = runner_manager.create_runners(5, RunnerMetadata(), inventory=inventory)
+
+    assert len(set(instance_ids)) == 5
+    assert set(inventory.cloud_runners) == set(instance_ids)
+    assert cloud_runner_manager.create_runner.call_count == 5
+
+
+@pytest.mark.parametrize(
+    "write_error, expected_stats",
+    [
+        pytest.param(False, {RunnerStart: 1}, id="events written"),
+        pytest.param(True, {}, id="events not written"),
+    ],
+)
+def test_runner_manager_issue_runner_metrics_counts_written_events(
+    monkeypatch: pytest.MonkeyPatch, write_error: bool, expected_stats: dict
+):
+    """
+    arrange: Given runner metrics issuing a RunnerStart event, and a writable metrics log or not.
+    act: Issue the runner metrics.
+    assert: The event is only counted once written to the metrics log.
+    """
+    monkeypatch.setattr(
+        runner_manager_module.runner_metrics, "issue_events", MagicMock(return_value={RunnerStart})
+    )
+    flush_events_mock = MagicMock(
+        side_effect=IssueMetricEventError("error") if write_error else None
+    )
+    monkeypatch.setattr(runner_manager_module.metric_events, "flush_events", flush_events_mock)
+    runner_manager = RunnerManager(
+        "managername",
+        platform_provider=MagicMock(spec=PlatformProvider),
+        cloud_runner_manager=MagicMock(spec=CloudRunnerManager),
+        labels=[],
+    )
+    metrics = MagicMock(pre_job=None)
+
+    assert runner_manager._issue_runner_metrics(iter([metrics])) == expected_stats
+    flush_events_mock.assert_called_once()
@@ -1,10 +1,17 @@
 #  Copyright 2025 Canonical Ltd.
 #  See LICENSE file for licensing details.
 import json
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import time
 from pathlib import Path
 
 import pytest
 
+from github_runner_manager.errors import IssueMetricEventError
 from github_runner_manager.metrics import events
 
 TEST_LOKI_PUSH_API_URL = "http://loki:3100/api/prom/push"
@@ -27,6 +34,7 @@ def test_issue_events_logs_events(tmp_path: Path):
     event = events.RunnerInstalled(timestamp=123, flavor="small", duration=456)
 
     events.issue_event(event)
+    events.flush_events()
 
     assert json.loads(events.METRICS_LOG_PATH.read_text()) == {
         "event": "runner_installed",
@@ -54,6 +62,7 @@ def test_issue_events_exclude_none_values(tmp_path: Path):
     )
 
     events.issue_event(event)
+    events.flush_events()
 
     assert json.loads(events.METRICS_LOG_PATH.read_text()) == {
         "event": "runner_stop",
@@ -65,3 +74,111 @@ def test_issue_events_exclude_none_values(tmp_path: Path):
         "status": "status",
         "job_duration": 456,
     }
+
+
+def test_event_sink_writes_when_flush_size_reached():
+    """
+    arrange: Given a sink with a long flush interval and a flush size of 3.
+    act: Put 3 lines.
+    assert: The lines are written by the flusher without waiting for the interval.
+    """
+    sink = events.EventSink(flush_interval=60, flush_size=3, fsync=events.FsyncPolicy.FLUSH)
+
+    for index in range(3):
+        sink.put(f'{{"index": {index}}}\n')
+
+    for _ in range(100):
+        if events.METRICS_LOG_PATH.exists() and len(events.METRICS_LOG_PATH.read_text()) > 30:
+            break
+        time.sleep(0.01)
+    assert [json.loads(line) for line in events.METRICS_LOG_PATH.read_text().splitlines()] == [
+        {"index": 0},
+        {"index": 1},
+        {"index": 2},
+    ]
+
+
+def test_event_sink_keeps_events_on_write_error(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    """
+    arrange: Given a sink with a metrics log that cannot be written.
+    act: Put a line and flush, then make the metrics log writable and flush again.
+    assert: The first flush fails, and the line is written by the second.
+    """
+    sink = events.EventSink(flush_interval=60)
+    monkeypatch.setattr(events, "METRICS_LOG_PATH", tmp_path / "missing" / "metrics.log")
+    sink.put("{}\n")
+
+    with pytest.raises(IssueMetricEventError):
+        sink.flush()
+    monkeypatch.setattr(events, "METRICS_LOG_PATH", tmp_path / "metrics.log")
+    sink.flush()
+
+    assert events.METRICS_LOG_PATH.read_text() == "{}\n"
+
+
+def _issue_events_in_process(metrics_log_path: Path, process_index: int) -> None:
+    """Issue events from a process.
+
+    Args:
+        metrics_log_path: The path of the metrics log.
+        process_index: The index of the process.
+    """
+    events.METRICS_LOG_PATH = metrics_log_path
+    events.configure_event_sink(flush_size=7)
+    for index in range(500):
+        events.issue_event(
+            events.RunnerInstalled(timestamp=index, flavor=f"flavor-{process_index}", duration=1)
+        )
+    events.flush_events()
+
+
+def test_issue_event_from_multiple_processes():
+    """
+    arrange: Given 4 processes issuing events to the same metrics log.
+    act: Issue 500 events in each process.
+    assert: All the events are logged, each on its own line.
+    """
+    processes = [
+        multiprocessing.get_context("fork").Process(
+            target=_issue_events_in_process, args=(events.METRICS_LOG_PATH, index)
+        )
+        for index in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    lines = events.METRICS_LOG_PATH.read_text().splitlines()
+    assert len(lines) == 2000
+    assert {json.loads(line)["flavor"] for line in lines} == {f"flavor-{i}" for i in range(4)}
+
+
+def test_sigterm_writes_buffered_events():
+    """
+    arrange: Given a process writing the buffered events on SIGTERM, with an event buffered.
+    act: Terminate the process.
+    assert: The event is written to the metrics log.
+    """
+    script = """
+import sys, time
+from pathlib import Path
+from github_runner_manager.metrics import events
+events.METRICS_LOG_PATH = Path(sys.argv[1])
+events.flush_events_on_sigterm()
+events.configure_event_sink(flush_interval=3600)
+events.issue_event(events.RunnerInstalled(timestamp=123, flavor="small", duration=456))
+print("ready", flush=True)
+time.sleep(60)
+"""
+    with subprocess.Popen(
+        [sys.executable, "-c", script, str(events.METRICS_LOG_PATH)],
+        stdout=subprocess.PIPE,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+    ) as process:
+        assert process.stdout and process.stdout.readline() == b"ready\n"
+        process.terminate()
+        exit_code = process.wait(10)
+
+    assert exit_code == 128 + signal.SIGTERM
+    assert json.loads(events.METRICS_LOG_PATH.read_text())["event"] == "runner_installed"
@@ -1,10 +1,12 @@
 # Copyright 2025 Canonical Ltd.
 #  See LICENSE file for licensing details.
+import base64
 import secrets
+import subprocess
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
-from unittest.mock import MagicMock, call
+from unittest.mock import ANY, MagicMock, call
 
 import pytest
 from fabric import Connection as SSHConnection
@@ -20,9 +22,13 @@ from github_runner_manager.metrics.runner import (
     PulledMetrics,
     PullFileError,
     SSHError,
+    _pull_file_contents,
     _ssh_pull_file,
+    _ssh_pull_files,
+    _ssh_pull_files_command,
     pull_runner_metrics,
 )
+from github_runner_manager.metrics.spool import RunnerMetricsSpool
 from github_runner_manager.openstack_cloud.constants import (
     POST_JOB_METRICS_FILE_PATH,
     PRE_JOB_METRICS_FILE_PATH,
@@ -156,17 +162,26 @@ class FakeOpenStackCloud(OpenstackCloud):
         """
         return self.instances.get(instance_id, None)
 
-    def get_ssh_connection(self, instance: OpenstackInstance) -> MagicMock:
+    def get_ssh_connection(
+        self, instance: OpenstackInstance, test_connection: bool = True
+    ) -> MagicMock:
         """Return a fake SSH connection.
 
         Args:
             instance: The instance to get a fake connection for.
+            test_connection: Unused.
 
         Returns:
             A mocked connection instance.
         """
         fake_ssh_connection = MagicMock()
         fake_ssh_connection.__enter__.return_value = fake_ssh_connection
+        fake_ssh_connection.run.return_value = Result(
+            stdout="".join(
+                f"{path} ok {base64.b64encode(content.encode()).decode()}\n"
+                for path, content in self.file_contents.get(instance.instance_id, {}).items()
+            )
+        )
         fake_ssh_connection.get = lambda remote, local: local.write(
             bytes(
                 self.file_contents.get(instance.instance_id, {}).get(remote, ""), encoding="utf-8"
@@ -626,3 +641,125 @@ def test_ssh_pull_file_invalid_size_reported():
     with pytest.raises(PullFileError) as exc:
         _ = _ssh_pull_file(ssh_conn, remote_path, max_size)
     assert "too large" in str(exc)
+
+
+def test_ssh_pull_files_command(tmp_path: Path):
+    """
+    arrange: Given a file within the size limit, a file over the limit and a missing file.
+    act: Run the command pulling the files locally and parse its output.
+    assert: Only the content of the file within the limit is returned.
+    """
+    small = tmp_path / "small"
+    small.write_text('{"key": "value"}\n')
+    large = tmp_path / "large"
+    large.write_text("x" * 100)
+    missing = tmp_path / "missing"
+    paths = (small, large, missing)
+    command = _ssh_pull_files_command(remote_paths=paths, max_size=50)
+    completed = subprocess.run(["bash", "-c", command], capture_output=True, text=True, check=True)
+    ssh_conn = MagicMock(spec=SSHConnection)
+    ssh_conn.run.return_value = Result(stdout=completed.stdout)
+
+    contents = _ssh_pull_files(ssh_conn, paths, max_size=50)
+
+    assert contents == {small: '{"key": "value"}\n'}
+    assert ssh_conn.run.call_count == 1
+
+
+def test_ssh_pull_files_unexpected_output():
+    """
+    arrange: Mock an ssh connection returning output not in the expected format.
+    act: Call ssh_pull_files.
+    assert: A PullFileError is raised.
+    """
+    ssh_conn = MagicMock(spec=SSHConnection)
+    ssh_conn.run.return_value = Result(stdout="base64: command not found")
+
+    with pytest.raises(PullFileError):
+        _ssh_pull_files(ssh_conn, (Path("/var/whatever"),), max_size=10)
+
+
+def test_pull_file_contents_falls_back_to_single_files():
+    """
+    arrange: Mock an ssh connection failing to run the command pulling all the files.
+    act: Pull the file contents.
+    assert: The files are pulled one by one.
+    """
+    remote_path = Path("/var/whatever")
+    ssh_conn = MagicMock()
+    ssh_conn.__enter__.return_value = ssh_conn
+    ssh_conn.run.side_effect = [Result(exited=1), Result(stdout="4")]
+    ssh_conn.get.side_effect = lambda remote, local: local.write(b"1234")
+    cloud_service = MagicMock()
+    cloud_service.get_ssh_connection.return_value = ssh_conn
+
+    contents = _pull_file_contents(cloud_service, MagicMock(), (remote_path,))
+
+    assert contents == {remote_path: "1234"}
+    cloud_service.get_ssh_connection.assert_called_once_with(instance=ANY, test_connection=False)
+
+
+def test_pull_runner_metrics_from_spool(tmp_path: Path):
+    """
+    arrange: Given a runner that pushed all its metrics to the spool.
+    act: Pull the runner metrics.
+    assert: The spooled metrics are returned without connecting to the runner.
+    """
+    instance = OpenstackInstanceFactory()
+    spool = RunnerMetricsSpool(tmp_path)
+    pre_job_metrics = PreJobMetricsFactory()
+    post_job_metrics = PostJobMetricsFactory()
+    spool.write(instance.instance_id.name, "runner-installed", b"1700000000")
+    spool.write(instance.instance_id.name, "pre-job", pre_job_metrics.json().encode())
+    spool.write(instance.instance_id.name, "post-job", post_job_metrics.json().encode())
+    cloud_service = MagicMock()
+    cloud_service.get_instance.return_value = instance
+
+    pulled_metrics = pull_runner_metrics(
+        cloud_service=cloud_service, instance_ids=[instance.instance_id], spool=spool
+    )
+
+    assert pulled_metrics == [
+        PulledMetrics(
+            instance=instance,
+            runner_installed_timestamp=1700000000,
+            pre_job=pre_job_metrics,
+            post_job=post_job_metrics,
+        )
+    ]
+    cloud_service.get_ssh_connection.assert_not_called()
+
+
+def test_pull_runner_metrics_missing_from_spool(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    arrange: Given a runner that pushed its runner installed timestamp to the spool only.
+    act: Pull the runner metrics.
+    assert: The other metric files are pulled through SSH and merged with the spooled ones.
+    """
+    instance = OpenstackInstanceFactory()
+    spool = RunnerMetricsSpool(tmp_path)
+    spool.write(instance.instance_id.name, "runner-installed", b"1700000000")
+    post_job_metrics = PostJobMetricsFactory()
+    pull_file_contents_mock = MagicMock(
+        return_value={POST_JOB_METRICS_FILE_PATH: post_job_metrics.json()}
+    )
+    monkeypatch.setattr(runner_metrics, "_pull_file_contents", pull_file_contents_mock)
+    cloud_service = MagicMock()
+    cloud_service.get_instance.return_value = instance
+
+    pulled_metrics = pull_runner_metrics(
+        cloud_service=cloud_service, instance_ids=[instance.instance_id], spool=spool
+    )
+
+    assert pulled_metrics == [
+        PulledMetrics(
+            instance=instance,
+            runner_installed_timestamp=1700000000,
+            post_job=post_job_metrics,
+        )
+    ]
+    pull_file_contents_mock.assert_called_once_with(
+        cloud_service=cloud_service,
+        instance=instance,
+        metrics_paths=(PRE_JOB_METRICS_FILE_PATH, POST_JOB_METRICS_FILE_PATH),
+    )
@@ -0,0 +1,104 @@
+#  Copyright 2025 Canonical Ltd.
+#  See LICENSE file for licensing details.
+
+"""Unit tests for the spool of the metrics pushed by the runners."""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from github_runner_manager.metrics.spool import RunnerMetricsSpool, SpoolError
+from github_runner_manager.openstack_cloud.constants import (
+    PRE_JOB_METRICS_FILE_PATH,
+    RUNNER_INSTALLED_TS_FILE_PATH,
+)
+
+
+def test_token_survives_restart(tmp_path: Path):
+    """
+    arrange: Given a spool.
+    act: Get the token of a runner, then verify it with a new spool on the same path.
+    assert: The token is valid for the runner only.
+    """
+    token = RunnerMetricsSpool(tmp_path).get_token("runner-1")
+
+    spool = RunnerMetricsSpool(tmp_path)
+
+    assert spool.verify_token("runner-1", token)
+    assert not spool.verify_token("runner-2", token)
+
+
+def test_write_read_remove(tmp_path: Path):
+    """
+    arrange: Given a spool.
+    act: Write two metric files of a runner, read them, remove them and read again.
+    assert: The files are read by their path on the runner, and nothing is read once removed.
+    """
+    spool = RunnerMetricsSpool(tmp_path)
+
+    spool.write("runner-1", "runner-installed", b"1700000000")
+    spool.write("runner-1", "pre-job", b'{"timestamp": 1700000001}')
+    contents = spool.read("runner-1")
+    spool.remove("runner-1")
+
+    assert contents == {
+        RUNNER_INSTALLED_TS_FILE_PATH: "1700000000",
+        PRE_JOB_METRICS_FILE_PATH: '{"timestamp": 1700000001}',
+    }
+    assert not spool.read("runner-1")
+
+
+@pytest.mark.parametrize(
+    "runner_name, kind",
+    [
+        pytest.param("../runner-1", "pre-job", id="path traversal"),
+        pytest.param("runner-1", "unknown", id="unknown kind"),
+    ],
+)
+def test_write_invalid(tmp_path: Path, runner_name: str, kind: str):
+    """
+    arrange: Given a spool.
+    act: Write a metric file with an invalid runner name or kind.
+    assert: A SpoolError is raised.
+    """
+    with pytest.raises(SpoolError):
+        RunnerMetricsSpool(tmp_path).write(runner_name, kind, b"content")
+
+
+def test_remove_expired(tmp_path: Path):
+    """
+    arrange: Given a spool with an old runner entry and a recent one.
+    act: Remove the expired entries.
+    assert: Only the old entry is removed.
+    """
+    spool = RunnerMetricsSpool(tmp_path)
+    spool.write("runner-old", "runner-installed", b"1")
+    spool.write("runner-new", "runner-installed", b"2")
+    old = time.time() - 3600
+    os.utime(tmp_path / "runner-old", (old, old))
+
+    spool.remove_expired(ttl=60)
+
+    assert not spool.read("runner-old")
+    assert spool.read("runner-new")
+
+
+def test_push_after_extraction_expires(tmp_path: Path):
+    """
+    arrange: Given a spool with the metrics of a runner extracted.
+    act: Write a metric file of the runner, then remove the expired entries an hour later.
+    assert: The late metric file is ignored, and the entry of the runner is removed.
+    """
+    spool = RunnerMetricsSpool(tmp_path)
+    spool.write("runner-1", "pre-job", b'{"timestamp": 1700000001}')
+    spool.remove("runner-1")
+
+    spool.write("runner-1", "post-job", b'{"timestamp": 1700000002}')
+
+    assert not spool.read("runner-1")
+    old = time.time() - 3600
+    os.utime(tmp_path / "runner-1" / ".extracted", (old, old))
+    spool.remove_expired(extracted_ttl=60)
+    assert not (tmp_path / "runner-1").exists()
@@ -21,6 +21,8 @@ from pytest import LogCaptureFixture
 
 import github_runner_manager.openstack_cloud.openstack_cloud
 from github_runner_manager.errors import OpenStackError, SSHError
+from github_runner_manager.openstack_cloud.connection_pool import connection_pool
+from github_runner_manager.openstack_cloud.models import OpenStackServerConfig
 from github_runner_manager.openstack_cloud.openstack_cloud import (
     _MAX_NOVA_COMPUTE_API_VERSION,
     _MIN_KEYPAIR_AGE_IN_SECONDS_BEFORE_DELETION,
@@ -32,6 +34,7 @@ from github_runner_manager.openstack_cloud.openstack_cloud import (
     _DeleteKeypairConfig,
     get_missing_security_rules,
 )
+from github_runner_manager.openstack_cloud.server_config_resolver import server_config_resolver
 from tests.unit.fake_runner_managers import FakeOpenstackCloud
 
 FAKE_ARG = "fake"
@@ -40,6 +43,18 @@ FAKE_PREFIX = "fake_prefix"
 logger = logging.getLogger(__name__)
 
 
+@pytest.fixture(autouse=True)
+def reset_connection_pool_fixture():
+    """Do not share pooled OpenStack connections or cached resources between tests."""
+    connection_pool.reset()
+    github_runner_manager.openstack_cloud.openstack_cloud._security_group_cache.invalidate()
+    server_config_resolver.clear()
+    yield
+    connection_pool.reset()
+    github_runner_manager.openstack_cloud.openstack_cloud._security_group_cache.invalidate()
+    server_config_resolver.clear()
+
+
 @pytest.fixture(name="openstack_cloud", scope="function")
 def openstack_cloud_fixture(monkeypatch):
     # Mock expanduser as this is used in OpenstackCloud constructor
@@ -509,3 +524,129 @@ def test_determine_max_api_version(
 
     max_version = openstack_cloud._determine_max_compute_api_version_by_cloud()
     assert max_version == "2.96"
+
+
+def test_openstack_connection_is_pooled(
+    openstack_cloud: OpenstackCloud, mock_openstack_conn: MagicMock
+):
+    """
+    arrange: given a mocked openstack connection.
+    act: when several OpenStack calls are made, including concurrent VM deletions.
+    assert: a single connection is opened per compute API version and authorized per use.
+    """
+    mock_openstack_conn.compute.get_endpoint.return_value = "endpoint"
+    mock_openstack_conn.session.get.return_value.json.return_value = {
+        "version": {"version": "2.91"}
+    }
+    mock_openstack_conn.delete_server.return_value = True
+    mock_openstack_conn.list_servers.return_value = []
+
+    openstack_cloud.get_instances()
+    openstack_cloud.delete_instances(
+        instance_ids=[InstanceID.build(FAKE_PREFIX) for _ in range(5)]
+    )
+    openstack_cloud.get_instances()
+
+    connect_mock = github_runner_manager.openstack_cloud.openstack_cloud.openstack.connect
+    # One connection to discover the compute API version and one with that version.
+    assert connect_mock.call_count == 2
+    mock_openstack_conn.close.assert_not_called()
+
+
+def test_openstack_connection_evicted_on_unauthorized(
+    openstack_cloud: OpenstackCloud, mock_openstack_conn: MagicMock
+):
+    """
+    arrange: given a mocked openstack connection that rejects the token.
+    act: when an OpenStack call is made twice.
+    assert: the rejected connection is closed and a new one is opened for the next call.
+    """
+    openstack_cloud.__dict__["_max_compute_api_version"] = _MAX_NOVA_COMPUTE_API_VERSION
+    mock_openstack_conn.list_servers.side_effect = keystoneauth1.exceptions.Unauthorized()
+
+    for _ in range(2):
+        with pytest.raises(OpenStackError):
+            openstack_cloud.get_instances()
+
+    connect_mock = github_runner_manager.openstack_cloud.openstack_cloud.openstack.connect
+    assert connect_mock.call_count == 2
+    assert mock_openstack_conn.close.call_count == 2
+
+
+def test_openstack_connection_evicted_closed_after_last_user(
+    openstack_cloud: OpenstackCloud, mock_openstack_conn: MagicMock
+):
+    """
+    arrange: given a pooled connection used by two threads.
+    act: when one thread evicts the connection, then both threads release it.
+    assert: the connection is only closed once the last thread released it, and the next call
+        opens a new connection.
+    """
+    credentials = openstack_cloud._credentials
+    first = connection_pool.get(credentials)
+    second = connection_pool.get(credentials)
+    assert first is second
+
+    connection_pool.evict(first)
+    connection_pool.release(first)
+    mock_openstack_conn.close.assert_not_called()
+    connection_pool.release(second)
+    mock_openstack_conn.close.assert_called_once()
+
+    with connection_pool.connection(credentials):
+        pass
+    connect_mock = github_runner_manager.openstack_cloud.openstack_cloud.openstack.connect
+    assert connect_mock.call_count == 2
+
+
+def test_launch_instance_caches_security_group_and_server_config(
+    openstack_cloud: OpenstackCloud,
+    mock_openstack_conn: MagicMock,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """
+    arrange: given a mocked openstack connection with the runner security group.
+    act: when launching instances, one of them failing.
+    assert: the security group and the server config are only looked up again after the
+        failed launch, and the resolved resources are passed to create_server.
+    """
+    openstack_cloud.__dict__["_max_compute_api_version"] = _MAX_NOVA_COMPUTE_API_VERSION
+    monkeypatch.setattr(openstack_cloud, "_setup_keypair", MagicMock())
+    monkeypatch.setattr(
+        github_runner_manager.openstack_cloud.openstack_cloud.OpenstackInstance,
+        "from_openstack_server",
+        MagicMock(),
+    )
+    security_group = OpenstackSecurityGroup(id="sg-id")
+    security_group.security_group_rules = [
+        SecurityGroupRule(**value) for value in DEFAULT_SECURITY_RULES.values()
+    ]
+    mock_openstack_conn.list_security_groups.return_value = [security_group]
+    mock_openstack_conn.create_server.side_effect = [
+        MagicMock(),
+        MagicMock(),
+        openstack.exceptions.SDKException("error"),
+        MagicMock(),
+    ]
+
+    def launch():
+        """Launch an instance."""
+        openstack_cloud.launch_instance(
+            runner_identity=MagicMock(),
+            server_config=OpenStackServerConfig(image="image", flavor="flavor", network="net"),
+            cloud_init=FAKE_ARG,
+        )
+
+    launch()
+    launch()
+    assert mock_openstack_conn.list_security_groups.call_count == 1
+    mock_openstack_conn.image.find_image.assert_called_once_with("image", ignore_missing=False)
+    mock_openstack_conn.compute.find_flavor.assert_called_once()
+    mock_openstack_conn.network.find_network.assert_called_once()
+    create_server_kwargs = mock_openstack_conn.create_server.call_args.kwargs
+    assert create_server_kwargs["image"] == mock_openstack_conn.image.find_image.return_value
+    with pytest.raises(OpenStackError):
+        launch()
+    launch()
+    assert mock_openstack_conn.list_security_groups.call_count == 2
+    assert mock_openstack_conn.image.find_image.call_count == 2
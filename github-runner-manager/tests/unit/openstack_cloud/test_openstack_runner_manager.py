@@ -4,6 +4,7 @@
 """Module for unit-testing OpenStack runner manager."""
 import logging
 import textwrap
+from pathlib import Path
 from unittest.mock import MagicMock
 
 import pytest
@@ -16,6 +17,7 @@ from github_runner_manager.manager.models import (
     RunnerMetadata,
 )
 from github_runner_manager.metrics import runner
+from github_runner_manager.metrics.spool import RunnerMetricsSpool
 from github_runner_manager.openstack_cloud.openstack_cloud import OpenstackCloud
 from github_runner_manager.openstack_cloud.openstack_runner_manager import (
     OpenStackRunnerManager,
@@ -44,6 +46,7 @@ def openstack_runner_manager_fixture(
     service_config_mock.use_aproxy = False
     service_config_mock.ssh_debug_connections = []
     service_config_mock.repo_policy_compliance = None
+    service_config_mock.runner_metrics_url = None
     config = OpenStackRunnerManagerConfig(
         prefix="test",
         credentials=MagicMock(),
@@ -231,3 +234,36 @@ def test_extract_metrics(runner_manager: OpenStackRunnerManager, monkeypatch: py
 
     metrics = runner_manager.extract_metrics(instance_ids=MagicMock())
     assert metrics == [test_metric_one, test_metric_two]
+
+
+def test_runner_metrics_push(
+    runner_manager: OpenStackRunnerManager, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+):
+    """
+    arrange: Prepare service config with a runner metrics URL and a spool.
+    act: Create a runner, then extract its metrics.
+    assert: The cloud init pushes the metrics with the token of the runner, and the spool entry
+        of the runner is removed once extracted.
+    """
+    service_config = runner_manager._config.service_config
+    service_config.runner_proxy_config = ProxyConfig(http="http://proxy.example.com:3128")
+    service_config.runner_metrics_url = "http://10.0.0.1:8080/"
+    spool = RunnerMetricsSpool(tmp_path)
+    monkeypatch.setattr(runner_manager, "_metrics_spool", spool)
+    openstack_cloud = MagicMock(spec=OpenstackCloud)
+    monkeypatch.setattr(runner_manager, "_openstack_cloud", openstack_cloud)
+    pull_metrics_mock = MagicMock(return_value=[])
+    monkeypatch.setattr(runner_metrics, "pull_runner_metrics", pull_metrics_mock)
+    instance_id = InstanceID.build(prefix="test")
+    identity = RunnerIdentity(instance_id=instance_id, metadata=RunnerMetadata())
+
+    runner_manager.create_runner(identity, RunnerContext(shell_run_script="agent"))
+    spool.write(instance_id.name, "runner-installed", b"1700000000")
+    runner_manager.extract_metrics(instance_ids=[instance_id])
+
+    cloud_init = openstack_cloud.launch_instance.call_args.kwargs["cloud_init"]
+    assert f"http://10.0.0.1:8080/runner/{instance_id.name}/metrics/$1" in cloud_init
+    assert f"Authorization: Bearer {spool.get_token(instance_id.name)}" in cloud_init
+    assert "push_metrics pre-job" in cloud_init
+    assert pull_metrics_mock.call_args.kwargs["spool"] is spool
+    assert not spool.read(instance_id.name)
@@ -0,0 +1,118 @@
+#  Copyright 2025 Canonical Ltd.
+#  See LICENSE file for licensing details.
+
+"""Unit tests for the incremental server inventory."""
+
+import re
+from unittest.mock import MagicMock
+
+import openstack.exceptions
+import pytest
+
+from github_runner_manager.openstack_cloud.server_inventory import ServerInventory
+
+PREFIX = "unit-0"
+
+
+def _server(server_id: str, name: str, status: str = "ACTIVE") -> MagicMock:
+    """Create a mocked OpenStack server."""
+    server = MagicMock()
+    server.id = server_id
+    server.name = name
+    server.status = status
+    return server
+
+
+def test_list_servers_applies_changes_since_previous_listing():
+    """
+    arrange: Given a connection returning two servers, then the changes on those servers.
+    act: List the servers twice.
+    assert: The second listing uses changes-since and applies the creations and deletions.
+    """
+    conn = MagicMock()
+    conn.list_servers.side_effect = [
+        [_server("1", f"{PREFIX}-a"), _server("2", f"{PREFIX}-b")],
+        [_server("2", f"{PREFIX}-b", status="DELETED"), _server("3", f"{PREFIX}-c")],
+    ]
+    inventory = ServerInventory(PREFIX)
+
+    first = inventory.list_servers(conn)
+    second = inventory.list_servers(conn)
+
+    assert {server.id for server in first} == {"1", "2"}
+    assert {server.id for server in second} == {"1", "3"}
+    first_filters = conn.list_servers.call_args_list[0].kwargs["filters"]
+    second_filters = conn.list_servers.call_args_list[1].kwargs["filters"]
+    assert first_filters == {"name": f"^{re.escape(PREFIX)}-"}
+    assert second_filters["name"] == f"^{re.escape(PREFIX)}-"
+    assert "changes_since" in second_filters
+
+
+def test_list_servers_ignores_servers_of_other_prefix():
+    """
+    arrange: Given a connection returning servers matching the regex but not the prefix.
+    act: List the servers.
+    assert: Only the servers with the prefix are returned.
+    """
+    conn = MagicMock()
+    conn.list_servers.return_value = [_server("1", f"{PREFIX}-a"), _server("2", f"{PREFIX}0-b")]
+    inventory = ServerInventory(PREFIX)
+
+    servers = inventory.list_servers(conn)
+
+    assert [server.id for server in servers] == ["1"]
+
+
+def test_list_servers_escapes_prefix():
+    """
+    arrange: Given an inventory with a prefix containing a regular expression metacharacter.
+    act: List the servers.
+    assert: The name filter matches the prefix literally.
+    """
+    conn = MagicMock()
+    conn.list_servers.return_value = []
+    inventory = ServerInventory("unit.0")
+
+    inventory.list_servers(conn)
+
+    assert conn.list_servers.call_args.kwargs["filters"]["name"] == r"^unit\.0-"
+
+
+def test_list_servers_full_resync():
+    """
+    arrange: Given an inventory with a zero full resync interval.
+    act: List the servers twice.
+    assert: Both listings are full listings.
+    """
+    conn = MagicMock()
+    conn.list_servers.side_effect = [[_server("1", f"{PREFIX}-a")], []]
+    inventory = ServerInventory(PREFIX, full_resync_interval=0)
+
+    inventory.list_servers(conn)
+    servers = inventory.list_servers(conn)
+
+    assert servers == ()
+    assert "changes_since" not in conn.list_servers.call_args.kwargs["filters"]
+
+
+def test_list_servers_full_listing_after_error():
+    """
+    arrange: Given a connection failing on the incremental listing.
+    act: List the servers three times.
+    assert: The listing after the failure is a full listing.
+    """
+    conn = MagicMock()
+    conn.list_servers.side_effect = [
+        [_server("1", f"{PREFIX}-a")],
+        openstack.exceptions.SDKException("error"),
+        [_server("2", f"{PREFIX}-b")],
+    ]
+    inventory = ServerInventory(PREFIX)
+
+    inventory.list_servers(conn)
+    with pytest.raises(openstack.exceptions.SDKException):
+        inventory.list_servers(conn)
+    servers = inventory.list_servers(conn)
+
+    assert [server.id for server in servers] == ["2"]
+    assert "changes_since" not in conn.list_servers.call_args.kwargs["filters"]
@@ -0,0 +1,41 @@
+#  Copyright 2025 Canonical Ltd.
+#  See LICENSE file for licensing details.
+
+"""Unit tests for the SSH keys of the runner servers."""
+
+import getpass
+import io
+import stat
+from pathlib import Path
+
+import paramiko
+
+from github_runner_manager.openstack_cloud.ssh_keys import generate_ssh_keypair, write_private_key
+
+
+def test_generate_ssh_keypair():
+    """
+    act: Generate an SSH keypair.
+    assert: The private key is an ed25519 key usable by paramiko matching the public key.
+    """
+    ssh_keypair = generate_ssh_keypair()
+
+    key = paramiko.Ed25519Key.from_private_key(io.StringIO(ssh_keypair.private_key))
+    assert ssh_keypair.public_key == f"ssh-ed25519 {key.get_base64()}"
+
+
+def test_write_private_key(tmp_path: Path):
+    """
+    arrange: Given an existing key file.
+    act: Write a private key to the key file.
+    assert: The key file is replaced, only readable by the owner and no temporary file is left.
+    """
+    key_path = tmp_path / "runner.key"
+    key_path.write_text("old")
+    key_path.chmod(0o400)
+
+    write_private_key(key_path, "new", user=getpass.getuser())
+
+    assert key_path.read_text() == "new"
+    assert stat.S_IMODE(key_path.stat().st_mode) == 0o400
+    assert list(tmp_path.iterdir()) == [key_path]
@@ -12,10 +12,10 @@ from github_runner_manager.jobmanager_api import (
     Job,
     JobManagerAPIError,
     JobManagerAPINotFoundError,
+    JobManagerAPIUnsupportedError,
     JobStatus,
     RunnerHealth,
     RunnerRegistration,
-    RunnerStatus,
 )
 from github_runner_manager.manager.models import InstanceID, RunnerIdentity, RunnerMetadata
 from github_runner_manager.platform.jobmanager_provider import JobManagerPlatform
@@ -42,12 +42,8 @@ class JobManagerAPIStub:
             id=random.randint(1, 1000), token=token
         )
         self._job_response = Job(status=JobStatus.PENDING.value)
-        self._runner_health_responses = [
-            RunnerHealth(
-                status=RunnerStatus.PENDING.value,
-                deletable=False,
-            )
-        ]
+        self._runner_health_responses: dict[int, RunnerHealth | Exception] = {}
+        self.bulk_health_supported = False
 
     def set_register_runner_response(self, response: RunnerRegistration | Exception):
         """Set the response for the register_runner method."""
@@ -69,20 +65,30 @@ class JobManagerAPIStub:
             raise self._job_response
         return self._job_response
 
-    def set_get_runner_health_responses(self, responses: list[RunnerHealth | Exception]):
-        """Set the responses for the get_runner_health method."""
+    def set_get_runner_health_responses(self, responses: dict[int, RunnerHealth | Exception]):
+        """Set the responses for the get_runner_health method, by runner ID."""
         self._runner_health_responses = responses
 
-    def get_runner_health(self, *args, **kwargs) -> RunnerHealth:
+    def get_runner_health(self, runner_id: int) -> RunnerHealth:
         """Stub get_runner_health method."""
         try:
-            response = self._runner_health_responses.pop(0)
-        except IndexError:
-            assert False, "No more responses available for get_runner_health"
+            response = self._runner_health_responses.pop(runner_id)
+        except KeyError:
+            assert False, f"No response available for get_runner_health of {runner_id}"
         if isinstance(response, Exception):
             raise response
         return response
 
+    def get_runners_health(self, runner_ids: list[int]) -> dict[int, RunnerHealth]:
+        """Stub get_runners_health method."""
+        if not self.bulk_health_supported:
+            raise JobManagerAPIUnsupportedError()
+        return {
+            runner_id: response
+            for runner_id, response in self._runner_health_responses.items()
+            if runner_id in runner_ids and isinstance(response, RunnerHealth)
+        }
+
 
 def test_get_runner_context_succeeds(monkeypatch: pytest.MonkeyPatch):
     """
@@ -303,7 +309,7 @@ def test_get_runner_health(
     )
 
     jobmanager_api = JobManagerAPIStub(TEST_JOB_MANAGER_URL, TEST_JOB_MANAGER_TOKEN)
-    jobmanager_api.set_get_runner_health_responses([api_return_value])
+    jobmanager_api.set_get_runner_health_responses({3: api_return_value})
     platform = JobManagerPlatform(jobmanager_api=jobmanager_api)
 
     instance_id = InstanceID.build(prefix="unit-0")
@@ -428,10 +434,49 @@ def test_get_runners_health(
         runners with failed requests.
     """
     jobmanager_api = JobManagerAPIStub(TEST_JOB_MANAGER_URL, TEST_JOB_MANAGER_TOKEN)
-    jobmanager_api.set_get_runner_health_responses(jobmanager_side_effects)
+    jobmanager_api.set_get_runner_health_responses(
+        {
+            int(identity.metadata.runner_id): side_effect
+            for identity, side_effect in zip(requested_runners, jobmanager_side_effects)
+        }
+    )
     platform = JobManagerPlatform(jobmanager_api=jobmanager_api)
 
     runners_health_response = platform.get_runners_health(requested_runners)
 
     expected_health_response = expected_health_response
     assert runners_health_response == expected_health_response
+
+
+def test_get_runners_health_bulk():
+    """
+    arrange: Given two runners, and a jobmanager with bulk health that only knows the first one.
+    act: Call get_runners_health.
+    assert: The health of the first runner is reported, the second runner is not found.
+    """
+    identities = [
+        RunnerIdentity(
+            instance_id=InstanceID.build(prefix="unit-0"),
+            metadata=RunnerMetadata(
+                platform_name="jobmanager", runner_id=str(runner_id), url=TEST_JOB_MANAGER_URL
+            ),
+        )
+        for runner_id in (1, 2)
+    ]
+    jobmanager_api = JobManagerAPIStub(TEST_JOB_MANAGER_URL, TEST_JOB_MANAGER_TOKEN)
+    jobmanager_api.bulk_health_supported = True
+    jobmanager_api.set_get_runner_health_responses(
+        {1: RunnerHealth(status="IN_PROGRESS", deletable=False)}
+    )
+    platform = JobManagerPlatform(jobmanager_api=jobmanager_api)
+
+    runners_health_response = platform.get_runners_health(identities)
+
+    assert runners_health_response == RunnersHealthResponse(
+        requested_runners=[
+            PlatformRunnerHealth(identity=identities[0], online=True, busy=True, deletable=False),
+            PlatformRunnerHealth(
+                identity=identities[1], online=False, busy=False, deletable=False
+            ),
+        ]
+    )
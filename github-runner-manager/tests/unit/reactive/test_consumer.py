@@ -3,6 +3,7 @@
 
 import secrets
 from contextlib import closing
+from pathlib import Path
 from random import randint
 from unittest import mock
 from unittest.mock import ANY, MagicMock
@@ -12,21 +13,28 @@ from kombu import Connection, Message
 from kombu.exceptions import KombuError
 from pydantic import HttpUrl
 
-from github_runner_manager.manager.models import RunnerMetadata
+from github_runner_manager.configuration import PickUpPollConfig
+from github_runner_manager.manager.models import InstanceID, RunnerIdentity, RunnerMetadata
 from github_runner_manager.platform.github_provider import GitHubRunnerPlatform
-from github_runner_manager.platform.platform_provider import PlatformProvider
+from github_runner_manager.platform.platform_provider import (
+    PlatformProvider,
+    PlatformRunnerHealth,
+    RunnersHealthResponse,
+)
 from github_runner_manager.reactive import consumer
 from github_runner_manager.reactive.consumer import (
     PROCESS_COUNT_HEADER_NAME,
     RETRY_LIMIT,
-    WAIT_TIME_IN_SEC,
     JobError,
     Labels,
     get_queue_size,
 )
+from github_runner_manager.reactive.pick_up import BootTimes
+from github_runner_manager.reactive.router import LabelRouter, Route
 from github_runner_manager.reactive.types_ import QueueConfig
 
 IN_MEMORY_URI = "memory://"
+FLAVOR = "flavor"
 FAKE_JOB_ID = "8200803099"
 FAKE_JOB_URL = f"https://api.github.com/repos/fakeuser/gh-runner-test/actions/runs/{FAKE_JOB_ID}"
 
@@ -47,6 +55,13 @@ def mock_sleep_fixture(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
     return mock_sleep
 
 
+@pytest.fixture(name="boot_times", autouse=True)
+def boot_times_fixture(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> BootTimes:
+    """Store the boot times of the runners in a temporary directory."""
+    monkeypatch.setattr(consumer, "BOOT_TIMES", boot_times := BootTimes(tmp_path / "boot-times"))
+    return boot_times
+
+
 @pytest.mark.parametrize(
     "labels,supported_labels",
     [
@@ -68,7 +83,8 @@ def test_consume(labels: Labels, supported_labels: Labels, queue_config: QueueCo
     )
     _put_in_queue(job_details.json(), queue_config.queue_name)
 
-    runner_manager_mock = MagicMock(spec=consumer.RunnerManager)
+    runner_manager_mock = _runner_manager_mock()
+    runner_manager_mock.create_runners.return_value = ("instance",)
     github_platform_mock = MagicMock(spec=GitHubRunnerPlatform)
     github_platform_mock.check_job_been_picked_up.side_effect = [False, True]
 
@@ -83,7 +99,7 @@ def test_consume(labels: Labels, supported_labels: Labels, queue_config: QueueCo
 
     _assert_queue_is_empty(queue_config.queue_name)
 
-    mock_sleep.assert_called_once_with(WAIT_TIME_IN_SEC)
+    mock_sleep.assert_called_once()
 
 
 def test_consume_job_manager(queue_config: QueueConfig):
@@ -103,7 +119,8 @@ def test_consume_job_manager(queue_config: QueueConfig):
     )
     _put_in_queue(job_details.json(), queue_config.queue_name)
 
-    runner_manager_mock = MagicMock(spec=consumer.RunnerManager)
+    runner_manager_mock = _runner_manager_mock()
+    runner_manager_mock.create_runners.return_value = ("instance",)
     platform_mock = MagicMock(spec=PlatformProvider)
     platform_mock.check_job_been_picked_up.side_effect = [False, True]
 
@@ -145,7 +162,8 @@ def test_consume_after_in_progress(queue_config: QueueConfig):
     _put_in_queue(job_details_in_progress.json(), queue_config.queue_name)
     _put_in_queue(job_details_queued.json(), queue_config.queue_name)
 
-    runner_manager_mock = MagicMock(spec=consumer.RunnerManager)
+    runner_manager_mock = _runner_manager_mock()
+    runner_manager_mock.create_runners.return_value = ("instance",)
     platform_provider_mock = MagicMock(spec=PlatformProvider)
 
     job_picked_up_for_queued_iter = iter([False, True])
@@ -185,7 +203,7 @@ def test_consume_reject_if_job_gets_not_picked_up(queue_config: QueueConfig):
     )
     _put_in_queue(job_details.json(), queue_config.queue_name)
 
-    runner_manager_mock = MagicMock(spec=consumer.RunnerManager)
+    runner_manager_mock = _runner_manager_mock()
     github_platform_mock = MagicMock(spec=GitHubRunnerPlatform)
     github_platform_mock.check_job_been_picked_up.return_value = False
 
@@ -214,7 +232,7 @@ def test_consume_reject_if_spawning_failed(queue_config: QueueConfig):
     )
     _put_in_queue(job_details.json(), queue_config.queue_name)
 
-    runner_manager_mock = MagicMock(spec=consumer.RunnerManager)
+    runner_manager_mock = _runner_manager_mock()
     runner_manager_mock.create_runners.return_value = tuple()
 
     github_platform_mock = MagicMock(spec=GitHubRunnerPlatform)
@@ -308,7 +326,7 @@ def test_job_details_validation_error(job_str: str, queue_config: QueueConfig):
     queue_name = queue_config.queue_name
     _put_in_queue(job_str, queue_name)
 
-    runner_manager_mock = MagicMock(spec=consumer.RunnerManager)
+    runner_manager_mock = _runner_manager_mock()
     github_platform_mock = MagicMock(spec=GitHubRunnerPlatform)
     github_platform_mock.check_job_been_picked_up.return_value = True
 
@@ -349,7 +367,7 @@ def test_consume_reject_if_labels_not_supported(
     _put_in_queue(job_details.json(), queue_config.queue_name)
     _put_in_queue(consumer.END_PROCESSING_PAYLOAD, queue_config.queue_name)
 
-    runner_manager_mock = MagicMock(spec=consumer.RunnerManager)
+    runner_manager_mock = _runner_manager_mock()
     github_platform_mock = MagicMock(spec=GitHubRunnerPlatform)
     github_platform_mock.check_job_been_picked_up.side_effect = [False, True]
 
@@ -380,7 +398,8 @@ def test_consume_retried_job_success(queue_config: QueueConfig, mock_sleep: Magi
         job_details.json(), queue_config.queue_name, headers={PROCESS_COUNT_HEADER_NAME: 1}
     )
 
-    runner_manager_mock = MagicMock(spec=consumer.RunnerManager)
+    runner_manager_mock = _runner_manager_mock()
+    runner_manager_mock.create_runners.return_value = ("instance",)
     platform_mock = MagicMock(spec=PlatformProvider)
     platform_mock.check_job_been_picked_up.side_effect = [False, True]
 
@@ -395,7 +414,7 @@ def test_consume_retried_job_success(queue_config: QueueConfig, mock_sleep: Magi
 
     _assert_queue_is_empty(queue_config.queue_name)
 
-    mock_sleep.assert_has_calls([mock.call(WAIT_TIME_IN_SEC), mock.call(WAIT_TIME_IN_SEC)])
+    assert mock_sleep.call_count == 2
 
 
 def test_consume_retried_job_failure(queue_config: QueueConfig, mock_sleep: MagicMock):
@@ -413,7 +432,7 @@ def test_consume_retried_job_failure(queue_config: QueueConfig, mock_sleep: Magi
         job_details.json(), queue_config.queue_name, headers={PROCESS_COUNT_HEADER_NAME: 1}
     )
 
-    runner_manager_mock = MagicMock(spec=consumer.RunnerManager)
+    runner_manager_mock = _runner_manager_mock()
     runner_manager_mock.create_runners.return_value = tuple()
 
     platform_mock = MagicMock(spec=GitHubRunnerPlatform)
@@ -430,7 +449,7 @@ def test_consume_retried_job_failure(queue_config: QueueConfig, mock_sleep: Magi
         queue_config.queue_name, job_details.json(), headers={PROCESS_COUNT_HEADER_NAME: 2}
     )
 
-    mock_sleep.assert_called_once_with(WAIT_TIME_IN_SEC)
+    mock_sleep.assert_called_once()
 
 
 def test_consume_retried_job_failure_past_limit(queue_config: QueueConfig, mock_sleep: MagicMock):
@@ -451,7 +470,7 @@ def test_consume_retried_job_failure_past_limit(queue_config: QueueConfig, mock_
     )
     _put_in_queue(consumer.END_PROCESSING_PAYLOAD, queue_config.queue_name)
 
-    runner_manager_mock = MagicMock(spec=consumer.RunnerManager)
+    runner_manager_mock = _runner_manager_mock()
     platform_mock = MagicMock(spec=GitHubRunnerPlatform)
 
     consumer.consume(
@@ -466,6 +485,236 @@ def test_consume_retried_job_failure_past_limit(queue_config: QueueConfig, mock_
     _assert_queue_is_empty(queue_config.queue_name)
 
 
+def test_consume_runner_busy(queue_config: QueueConfig, boot_times: BootTimes):
+    """
+    arrange: A job placed in the message queue which has not yet been picked up.
+    act: Call consume, the spawned runner is busy at the first check.
+    assert: The message is removed from the queue without checking the job again, and the boot
+        time of the flavor is recorded.
+    """
+    job_details = consumer.JobDetails(labels={"label"}, url=FAKE_JOB_URL)
+    _put_in_queue(job_details.json(), queue_config.queue_name)
+    runner_manager_mock = _runner_manager_mock()
+    runner_manager_mock.create_runners.return_value = (instance_id := InstanceID.build("test"),)
+    platform_mock = MagicMock(spec=PlatformProvider)
+    platform_mock.check_job_been_picked_up.return_value = False
+    platform_mock.get_runners_health.return_value = RunnersHealthResponse(
+        requested_runners=[
+            PlatformRunnerHealth(
+                identity=RunnerIdentity(instance_id=instance_id, metadata=RunnerMetadata()),
+                online=True,
+                busy=True,
+                deletable=False,
+            )
+        ]
+    )
+
+    consumer.consume(
+        queue_config=queue_config,
+        runner_manager=runner_manager_mock,
+        platform_provider=platform_mock,
+        supported_labels={"label"},
+    )
+
+    platform_mock.check_job_been_picked_up.assert_called_once()
+    _assert_queue_is_empty(queue_config.queue_name)
+    assert boot_times.get(FLAVOR) is not None
+
+
+def test_consume_waits_for_boot_time(
+    queue_config: QueueConfig, boot_times: BootTimes, mock_sleep: MagicMock
+):
+    """
+    arrange: A job placed in the message queue, and a boot time of 100 seconds for the flavor.
+    act: Call consume, with a schedule without jitter.
+    assert: The first check is done after most of the boot time, then the checks back off.
+    """
+    job_details = consumer.JobDetails(labels={"label"}, url=FAKE_JOB_URL)
+    _put_in_queue(job_details.json(), queue_config.queue_name)
+    boot_times.record(FLAVOR, 100)
+    runner_manager_mock = _runner_manager_mock()
+    runner_manager_mock.create_runners.return_value = ("instance",)
+    platform_mock = MagicMock(spec=PlatformProvider)
+    platform_mock.check_job_been_picked_up.side_effect = [False, False, False, True]
+
+    consumer.consume(
+        queue_config=queue_config,
+        runner_manager=runner_manager_mock,
+        platform_provider=platform_mock,
+        supported_labels={"label"},
+        pick_up_poll=PickUpPollConfig(initial_interval=10, backoff_factor=2, jitter=0),
+    )
+
+    assert mock_sleep.call_args_list == [mock.call(80), mock.call(10), mock.call(20)]
+    _assert_queue_is_empty(queue_config.queue_name)
+
+
+def test_consume_waits_for_boot_time_of_route_flavor(
+    queue_config: QueueConfig, boot_times: BootTimes, mock_sleep: MagicMock
+):
+    """
+    arrange: A job placed in the message queue, routed to a route named apart from its flavor.
+    act: Call consume, with a schedule without jitter.
+    assert: The first check is done after most of the boot time of the flavor of the route.
+    """
+    job_details = consumer.JobDetails(labels={"label"}, url=FAKE_JOB_URL)
+    _put_in_queue(job_details.json(), queue_config.queue_name)
+    boot_times.record("large", 100)
+    runner_manager_mock = _runner_manager_mock()
+    runner_manager_mock.manager_name = "app_name-1"
+    runner_manager_mock.create_runners.return_value = ("instance",)
+    router = LabelRouter(
+        [Route(runner_manager=runner_manager_mock, supported_labels={"label"}, flavor="large")]
+    )
+    platform_mock = MagicMock(spec=PlatformProvider)
+    platform_mock.check_job_been_picked_up.side_effect = [False, True]
+
+    consumer.consume(
+        queue_config=queue_config,
+        runner_manager=runner_manager_mock,
+        platform_provider=platform_mock,
+        supported_labels={"label"},
+        pick_up_poll=PickUpPollConfig(initial_interval=10, backoff_factor=2, jitter=0),
+        router=router,
+    )
+
+    assert mock_sleep.call_args_list == [mock.call(80)]
+    _assert_queue_is_empty(queue_config.queue_name)
+
+
+def test_consume_routes_by_labels(queue_config: QueueConfig):
+    """
+    arrange: A router with a route per flavor, the route of the large flavor at capacity.
+    act: Call consume for a job of each flavor.
+    assert: Each runner is spawned by the runner manager of the flavor of its job, and the job
+        of a route at capacity is requeued.
+    """
+    small = _runner_manager_mock()
+    small.create_runners.return_value = ("instance",)
+    large = _runner_manager_mock()
+    large.manager_name = "large"
+    large.create_runners.return_value = ("instance",)
+    router = LabelRouter(
+        [
+            Route(runner_manager=small, supported_labels={"x64"}),
+            Route(runner_manager=large, supported_labels={"x64", "large"}, max_spawns=0),
+        ]
+    )
+    _put_in_queue(
+        consumer.JobDetails(labels={"x64"}, url=FAKE_JOB_URL).json(), queue_config.queue_name
+    )
+    platform_mock = MagicMock(spec=PlatformProvider)
+    platform_mock.check_job_been_picked_up.side_effect = [False, True]
+
+    consumer.consume(
+        queue_config=queue_config,
+        runner_manager=small,
+        platform_provider=platform_mock,
+        supported_labels={"x64"},
+        router=router,
+    )
+
+    small.create_runners.assert_called_once_with(1, metadata=ANY, reactive=True)
+    _assert_queue_is_empty(queue_config.queue_name)
+
+    large_job = consumer.JobDetails(labels={"x64", "large"}, url=FAKE_JOB_URL)
+    _put_in_queue(large_job.json(), queue_config.queue_name)
+    _put_in_queue(consumer.END_PROCESSING_PAYLOAD, queue_config.queue_name)
+
+    consumer.consume(
+        queue_config=queue_config,
+        runner_manager=small,
+        platform_provider=platform_mock,
+        supported_labels={"x64"},
+        router=router,
+    )
+
+    large.create_runners.assert_not_called()
+    _assert_msg_has_been_requeued(queue_config.queue_name, large_job.json(), headers=None)
+
+
+def test_process_messages_requeues_at_capacity(queue_config: QueueConfig, mock_sleep: MagicMock):
+    """
+    arrange: A job in the queue, whose only route is at capacity.
+    act: Process the message of the job more times than the retry limit.
+    assert: The message is requeued after a delay each time, without counting as a retry.
+    """
+    runner_manager_mock = _runner_manager_mock()
+    router = LabelRouter(
+        [Route(runner_manager=runner_manager_mock, supported_labels={"x64"}, max_spawns=0)]
+    )
+    job_details = consumer.JobDetails(labels={"x64"}, url=FAKE_JOB_URL)
+    _put_in_queue(job_details.json(), queue_config.queue_name)
+
+    with Connection(IN_MEMORY_URI) as conn:
+        with closing(conn.SimpleQueue(queue_config.queue_name)) as simple_queue:
+            for _ in range(consumer.RETRY_LIMIT + 1):
+                consumer.process_messages(
+                    msgs=[simple_queue.get(block=False)],
+                    runner_manager=runner_manager_mock,
+                    platform_provider=MagicMock(spec=PlatformProvider),
+                    supported_labels={"x64"},
+                    router=router,
+                )
+
+    runner_manager_mock.create_runners.assert_not_called()
+    assert mock_sleep.call_count == consumer.RETRY_LIMIT + 1
+    _assert_msg_has_been_requeued(
+        queue_config.queue_name, job_details.json(), headers={PROCESS_COUNT_HEADER_NAME: 0}
+    )
+
+
+def test_process_messages_delays_only_retried_jobs(
+    queue_config: QueueConfig, mock_sleep: MagicMock
+):
+    """
+    arrange: A new job and a retried job in the queue.
+    act: Process the messages of both jobs in a batch.
+    assert: The runner of the new job is spawned before the retry delay, the runner of the
+        retried job after it.
+    """
+    new_job = consumer.JobDetails(labels={"label"}, url=f"{FAKE_JOB_URL}0")
+    retried_job = consumer.JobDetails(labels={"label"}, url=f"{FAKE_JOB_URL}1")
+    _put_in_queue(new_job.json(), queue_config.queue_name)
+    _put_in_queue(
+        retried_job.json(), queue_config.queue_name, headers={PROCESS_COUNT_HEADER_NAME: 1}
+    )
+    calls = MagicMock()
+    runner_manager_mock = _runner_manager_mock()
+    runner_manager_mock.create_runners.return_value = ("instance",)
+    calls.attach_mock(runner_manager_mock.create_runners, "create_runners")
+    calls.attach_mock(mock_sleep, "sleep")
+    platform_mock = MagicMock(spec=PlatformProvider)
+    platform_mock.check_job_been_picked_up.side_effect = [False, False, True, True]
+
+    with Connection(IN_MEMORY_URI) as conn:
+        with closing(conn.SimpleQueue(queue_config.queue_name)) as simple_queue:
+            consumer.process_messages(
+                msgs=[simple_queue.get(block=False), simple_queue.get(block=False)],
+                runner_manager=runner_manager_mock,
+                platform_provider=platform_mock,
+                supported_labels={"label"},
+            )
+
+    assert [call[0] for call in calls.mock_calls[:3]] == [
+        "create_runners",
+        "sleep",
+        "create_runners",
+    ]
+    _assert_queue_is_empty(queue_config.queue_name)
+
+
+def _runner_manager_mock() -> MagicMock:
+    """Mock a runner manager.
+
+    Returns:
+        The mock of the runner manager.
+    """
+    runner_manager_mock = MagicMock(spec=consumer.RunnerManager)
+    runner_manager_mock.manager_name = FLAVOR
+    return runner_manager_mock
+
+
 def _put_in_queue(msg: str, queue_name: str, headers: dict[str, str | int] | None = None) -> None:
     """Put a job in the message queue.
 
@@ -0,0 +1,322 @@
+#  Copyright 2025 Canonical Ltd.
+#  See LICENSE file for licensing details.
+
+import os
+import secrets
+import signal
+import threading
+from collections import Counter
+from pathlib import Path
+from unittest.mock import ANY, MagicMock
+
+import pytest
+from kombu import Connection
+from kombu.transport import memory
+from pydantic import HttpUrl
+
+from github_runner_manager.manager.models import RunnerMetadata
+from github_runner_manager.platform.platform_provider import PlatformProvider
+from github_runner_manager.reactive import consumer, daemon
+from github_runner_manager.reactive.daemon import ReactiveDaemon
+from github_runner_manager.reactive.pick_up import BootTimes
+from github_runner_manager.reactive.types_ import QueueConfig
+
+IN_MEMORY_URI = "memory://"
+FAKE_JOB_URL = "https://api.github.com/repos/fakeuser/gh-runner-test/actions/runs/8200803099"
+
+
+@pytest.fixture(name="queue_config")
+def queue_config_fixture() -> QueueConfig:
+    """Return a QueueConfig object."""
+    queue_name = secrets.token_hex(16)
+
+    # we use construct to avoid pydantic validation as IN_MEMORY_URI is not a valid URL
+    return QueueConfig.construct(mongodb_uri=IN_MEMORY_URI, queue_name=queue_name)
+
+
+@pytest.fixture(name="mock_sleep", autouse=True)
+def mock_sleep_fixture(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Mock the sleep function and shorten the wait for messages."""
+    monkeypatch.setattr(consumer, "sleep", mock_sleep := MagicMock())
+    monkeypatch.setattr(daemon, "QUEUE_GET_TIMEOUT", 0.01)
+    return mock_sleep
+
+
+@pytest.fixture(name="boot_times", autouse=True)
+def boot_times_fixture(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Store the boot times of the runners in a temporary directory."""
+    monkeypatch.setattr(consumer, "BOOT_TIMES", BootTimes(tmp_path / "boot-times"))
+
+
+def test_daemon_handles_jobs_concurrently(
+    queue_config: QueueConfig, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    """
+    arrange: Three jobs in the queue, and a daemon with two job handlers taking one job at a time.
+    act: Run the daemon until the end payload is consumed.
+    assert: A runner is created for each job, two of them concurrently, and the queue is empty.
+    """
+    monkeypatch.setattr(daemon, "MAX_SPAWN_BATCH", 1)
+    for job_id in range(3):
+        job_details = consumer.JobDetails(labels={"label"}, url=f"{FAKE_JOB_URL}{job_id}")
+        _put_in_queue(job_details.json(), queue_config.queue_name)
+    _put_in_queue(consumer.END_PROCESSING_PAYLOAD, queue_config.queue_name)
+    daemon.write_concurrency(2, tmp_path)
+
+    # The first two runners are only created once both handlers are creating one.
+    barrier = threading.Barrier(2, timeout=10)
+    created = Counter[str]()
+
+    def _create_runners(*_args, **_kwargs) -> tuple[str]:
+        """Create a runner, waiting for the other handler for the first two runners."""
+        created["runners"] += 1
+        if created["runners"] <= 2:
+            barrier.wait()
+        return ("instance",)
+
+    runner_manager_mock = MagicMock(spec=consumer.RunnerManager)
+    runner_manager_mock.manager_name = "flavor"
+    runner_manager_mock.create_runners.side_effect = _create_runners
+    checks = Counter[str]()
+
+    def _check_job_been_picked_up(metadata: RunnerMetadata, job_url: HttpUrl) -> bool:
+        """Report each job picked up from the second check."""
+        checks[job_url] += 1
+        return checks[job_url] > 1
+
+    platform_mock = MagicMock(spec=PlatformProvider)
+    platform_mock.check_job_been_picked_up.side_effect = _check_job_been_picked_up
+    reactive_daemon = ReactiveDaemon(
+        queue_config=queue_config,
+        runner_manager=runner_manager_mock,
+        platform_provider=platform_mock,
+        supported_labels={"label"},
+    )
+
+    reactive_daemon.run(tmp_path)
+    reactive_daemon.join(timeout=10)
+
+    assert runner_manager_mock.create_runners.call_count == 3
+    _assert_queue_is_empty(queue_config.queue_name)
+
+
+def test_daemon_spawns_backlog_in_batch(queue_config: QueueConfig, tmp_path: Path):
+    """
+    arrange: Three jobs in the queue, and a daemon with one job handler.
+    act: Run the daemon until the end payload is consumed.
+    assert: The runners of the three jobs are created in one batch, and the queue is empty.
+    """
+    for job_id in range(3):
+        job_details = consumer.JobDetails(labels={"label"}, url=f"{FAKE_JOB_URL}{job_id}")
+        _put_in_queue(job_details.json(), queue_config.queue_name)
+    _put_in_queue(consumer.END_PROCESSING_PAYLOAD, queue_config.queue_name)
+    daemon.write_concurrency(1, tmp_path)
+    runner_manager_mock = MagicMock(spec=consumer.RunnerManager)
+    runner_manager_mock.manager_name = "flavor"
+    runner_manager_mock.create_runners.return_value = ("instance-0", "instance-1", "instance-2")
+    platform_mock = MagicMock(spec=PlatformProvider)
+    # Not picked up before spawning the runners, picked up after.
+    platform_mock.check_job_been_picked_up.side_effect = [False] * 3 + [True] * 3
+    reactive_daemon = ReactiveDaemon(
+        queue_config=queue_config,
+        runner_manager=runner_manager_mock,
+        platform_provider=platform_mock,
+        supported_labels={"label"},
+    )
+
+    reactive_daemon.run(tmp_path)
+    reactive_daemon.join(timeout=10)
+
+    runner_manager_mock.create_runners.assert_called_once_with(3, metadata=ANY, reactive=True)
+    _assert_queue_is_empty(queue_config.queue_name)
+
+
+def test_daemon_spawn_budget(queue_config: QueueConfig, tmp_path: Path):
+    """
+    arrange: Three jobs in the queue, and a daemon with one job handler and a spawn budget of 2.
+    act: Run the daemon until the first two jobs are handled.
+    assert: Only the runners of the first two jobs are created, the third job is left queued.
+    """
+    for job_id in range(3):
+        job_details = consumer.JobDetails(labels={"label"}, url=f"{FAKE_JOB_URL}{job_id}")
+        _put_in_queue(job_details.json(), queue_config.queue_name)
+    daemon.write_concurrency(1, tmp_path)
+    daemon.write_spawn_budget(2, tmp_path)
+    runner_manager_mock = MagicMock(spec=consumer.RunnerManager)
+    runner_manager_mock.manager_name = "flavor"
+    runner_manager_mock.create_runners.return_value = ("instance-0", "instance-1")
+    handled = threading.Event()
+    checks = Counter[str]()
+
+    def _check_job_been_picked_up(metadata: RunnerMetadata, job_url: HttpUrl) -> bool:
+        """Report each job picked up from the second check, and the batch handled."""
+        checks[job_url] += 1
+        if sum(checks.values()) == 4:
+            handled.set()
+        return checks[job_url] > 1
+
+    platform_mock = MagicMock(spec=PlatformProvider)
+    platform_mock.check_job_been_picked_up.side_effect = _check_job_been_picked_up
+    reactive_daemon = ReactiveDaemon(
+        queue_config=queue_config,
+        runner_manager=runner_manager_mock,
+        platform_provider=platform_mock,
+        supported_labels={"label"},
+    )
+    daemon_thread = threading.Thread(target=reactive_daemon.run, args=(tmp_path,), daemon=True)
+
+    daemon_thread.start()
+    assert handled.wait(timeout=10)
+    reactive_daemon.stop()
+    daemon_thread.join(timeout=10)
+    reactive_daemon.join(timeout=10)
+
+    runner_manager_mock.create_runners.assert_called_once_with(2, metadata=ANY, reactive=True)
+    _assert_queue_size(queue_config.queue_name, 1)
+
+
+def test_daemon_sigterm_requeues_jobs(
+    queue_config: QueueConfig, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    """
+    arrange: A job in the queue, and a daemon with one job handler blocked creating its runner.
+    act: Send SIGTERM to the process running the daemon.
+    assert: The daemon exits without waiting for the handler, and the job is requeued.
+    """
+    # Like the MongoDB transport, requeue the unacknowledged messages on closing the channel.
+    monkeypatch.setattr(memory.Channel, "do_restore", True)
+    job_details = consumer.JobDetails(labels={"label"}, url=FAKE_JOB_URL)
+    _put_in_queue(job_details.json(), queue_config.queue_name)
+    daemon.write_concurrency(1, tmp_path)
+    in_flight = threading.Event()
+    release = threading.Event()
+
+    def _create_runners(*_args, **_kwargs) -> tuple[str]:
+        """Block creating the runner until released, then fail as interrupted.
+
+        Raises:
+            RuntimeError: Always, once released.
+        """
+        in_flight.set()
+        release.wait(timeout=10)
+        raise RuntimeError("Interrupted")
+
+    runner_manager_mock = MagicMock(spec=consumer.RunnerManager)
+    runner_manager_mock.manager_name = "flavor"
+    runner_manager_mock.create_runners.side_effect = _create_runners
+    platform_mock = MagicMock(spec=PlatformProvider)
+    platform_mock.check_job_been_picked_up.return_value = False
+
+    def _terminate() -> None:
+        """Send SIGTERM to the process once the job is being handled."""
+        if in_flight.wait(timeout=10):
+            os.kill(os.getpid(), signal.SIGTERM)
+
+    terminator = threading.Thread(target=_terminate, daemon=True)
+    previous_sighup_handler = signal.getsignal(signal.SIGHUP)
+
+    terminator.start()
+    try:
+        with pytest.raises(SystemExit):
+            daemon.run(
+                queue_config=queue_config,
+                runner_manager=runner_manager_mock,
+                platform_provider=platform_mock,
+                supported_labels={"label"},
+                path=tmp_path,
+            )
+    finally:
+        release.set()
+        signal.signal(signal.SIGHUP, previous_sighup_handler)
+        for thread in threading.enumerate():
+            if thread.name.startswith("reactive-handler"):
+                thread.join(timeout=10)
+
+    _assert_queue_size(queue_config.queue_name, 1)
+
+
+def test_daemon_decrease_concurrency(queue_config: QueueConfig):
+    """
+    arrange: A daemon with two idle job handlers.
+    act: Set the concurrency to 0.
+    assert: The job handlers stop.
+    """
+    reactive_daemon = ReactiveDaemon(
+        queue_config=queue_config,
+        runner_manager=MagicMock(spec=consumer.RunnerManager),
+        platform_provider=MagicMock(spec=PlatformProvider),
+        supported_labels={"label"},
+    )
+    reactive_daemon.set_concurrency(2)
+    handlers = [
+        thread for thread in threading.enumerate() if thread.name.startswith("reactive-handler")
+    ]
+
+    reactive_daemon.set_concurrency(0)
+    reactive_daemon.join(timeout=10)
+
+    assert len(handlers) == 2
+    assert not any(handler.is_alive() for handler in handlers)
+
+
+def test_daemon_concurrency_file(tmp_path: Path):
+    """
+    arrange: A daemon state directory with an invalid concurrency.
+    act: Read the concurrency, write a new one and read it again.
+    assert: The invalid concurrency is read as 0, the new one is read as written.
+    """
+    (tmp_path / daemon.CONCURRENCY_FILE_NAME).write_text("invalid", encoding="utf-8")
+
+    assert daemon.read_concurrency(tmp_path) == 0
+    daemon.write_concurrency(5, tmp_path)
+    assert daemon.read_concurrency(tmp_path) == 5
+
+
+def test_daemon_spawn_budget_file(tmp_path: Path):
+    """
+    arrange: A daemon state directory without a spawn budget.
+    act: Read the spawn budget, write it twice and read it after each write.
+    assert: The budget is unset at first, then read as written with a new generation each time.
+    """
+    assert daemon.read_spawn_budget(tmp_path) is None
+    daemon.write_spawn_budget(3, tmp_path)
+    first = daemon.read_spawn_budget(tmp_path)
+    daemon.write_spawn_budget(3, tmp_path)
+    second = daemon.read_spawn_budget(tmp_path)
+
+    assert first is not None and second is not None
+    assert first[1] == second[1] == 3
+    assert first[0] != second[0]
+
+
+def _put_in_queue(msg: str, queue_name: str) -> None:
+    """Put a job in the message queue.
+
+    Args:
+        msg: The job details.
+        queue_name: The name of the queue
+    """
+    with Connection(IN_MEMORY_URI) as conn:
+        with conn.SimpleQueue(queue_name) as simple_queue:
+            simple_queue.put(msg, retry=True)
+
+
+def _assert_queue_is_empty(queue_name: str) -> None:
+    """Assert that the queue is empty.
+
+    Args:
+        queue_name: The name of the queue.
+    """
+    _assert_queue_size(queue_name, 0)
+
+
+def _assert_queue_size(queue_name: str, size: int) -> None:
+    """Assert the number of messages in the queue.
+
+    Args:
+        queue_name: The name of the queue.
+        size: The expected number of messages.
+    """
+    with Connection(IN_MEMORY_URI) as conn:
+        with conn.SimpleQueue(queue_name) as simple_queue:
+            assert simple_queue.qsize() == size
@@ -0,0 +1,83 @@
+#  Copyright 2025 Canonical Ltd.
+#  See LICENSE file for licensing details.
+
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from github_runner_manager.reactive import forkserver
+from github_runner_manager.reactive.forkserver import ForkServerError
+
+
+def _run_worker(runner_config: str, log_dir: str) -> None:
+    """Write the configuration to the log file of the forked process, then exit.
+
+    Args:
+        runner_config: The JSON of the reactive runner configuration.
+        log_dir: The directory of the log file of the process.
+    """
+    (Path(log_dir) / f"{os.getpid()}.log").write_text(runner_config, encoding="utf-8")
+    os._exit(0)
+
+
+@pytest.fixture(name="server_dir")
+def server_dir_fixture(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Start a fork server whose forked processes write their configuration and exit."""
+    monkeypatch.setattr(forkserver, "_run_worker", _run_worker)
+    monkeypatch.setattr(forkserver, "PRELOAD_MODULES", ())
+    server_dir = tmp_path / "forkserver"
+    server_dir.mkdir()
+    server = threading.Thread(target=forkserver.serve, args=(server_dir,), daemon=True)
+    server.start()
+    for _ in range(100):
+        if (server_dir / forkserver.SOCKET_FILE_NAME).exists():
+            break
+        time.sleep(0.01)
+    return server_dir
+
+
+def test_spawn_worker(server_dir: Path, tmp_path: Path):
+    """
+    arrange: A running fork server.
+    act: Request a reactive runner process.
+    assert: The process is forked with the configuration, and logs to a file named after its PID.
+    """
+    pid = forkserver.spawn_worker('{"queue": "config"}', tmp_path, server_dir)
+
+    os.waitpid(pid, 0)
+    assert (tmp_path / f"{pid}.log").read_text(encoding="utf-8") == '{"queue": "config"}'
+
+
+def test_spawn_worker_stale_server(
+    server_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    """
+    arrange: A running fork server, started from another version of the code.
+    act: Request a reactive runner process.
+    assert: No process is forked, and the server stops.
+    """
+    monkeypatch.setattr(forkserver, "get_code_stamp", lambda: "newer")
+
+    with pytest.raises(ForkServerError):
+        forkserver.spawn_worker("{}", tmp_path, server_dir)
+
+    # The server stops after replying.
+    for _ in range(100):
+        if not (server_dir / forkserver.SOCKET_FILE_NAME).exists():
+            break
+        time.sleep(0.01)
+    assert not (server_dir / forkserver.SOCKET_FILE_NAME).exists()
+    assert not list(tmp_path.glob("*.log"))
+
+
+def test_spawn_worker_no_server(tmp_path: Path):
+    """
+    arrange: No fork server running.
+    act: Request a reactive runner process.
+    assert: A ForkServerError is raised.
+    """
+    with pytest.raises(ForkServerError):
+        forkserver.spawn_worker("{}", tmp_path, tmp_path)
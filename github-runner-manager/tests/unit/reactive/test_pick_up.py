@@ -0,0 +1,63 @@
+#  Copyright 2025 Canonical Ltd.
+#  See LICENSE file for licensing details.
+
+from pathlib import Path
+
+import pytest
+
+from github_runner_manager.configuration import PickUpPollConfig
+from github_runner_manager.reactive.pick_up import BootTimes, get_poll_delays, get_retry_delay
+
+
+@pytest.mark.parametrize(
+    "boot_time, expected_delays",
+    [
+        pytest.param(None, [10, 20, 40, 60, 60, 60, 50], id="unknown boot time"),
+        pytest.param(100, [80, 10, 20, 40, 60, 60, 30], id="known boot time"),
+        pytest.param(400, [300], id="boot time over the timeout"),
+    ],
+)
+def test_poll_delays(boot_time: float | None, expected_delays: list[float]):
+    """
+    arrange: A schedule without jitter.
+    act: Get the delays between the checks.
+    assert: The first check is after most of the boot time, if known, then the delays start fast
+        and back off until the timeout.
+    """
+    config = PickUpPollConfig(
+        initial_interval=10, max_interval=60, backoff_factor=2, jitter=0, timeout=300
+    )
+
+    assert list(get_poll_delays(config, boot_time)) == expected_delays
+
+
+def test_poll_delays_jitter():
+    """
+    arrange: A schedule with a jitter of 20%.
+    act: Get the delays between the checks and the delay of a retried job.
+    assert: The delays are within 20% of the schedule, and end at the timeout.
+    """
+    config = PickUpPollConfig(initial_interval=10, jitter=0.2, timeout=300)
+
+    delays = list(get_poll_delays(config))
+
+    assert 8 <= delays[0] <= 12
+    assert 16 <= delays[1] <= 24
+    assert sum(delays) == pytest.approx(300)
+    assert 16 <= get_retry_delay(config, retries=2) <= 24
+
+
+def test_boot_times(tmp_path: Path):
+    """
+    arrange: A store of the boot times without observations.
+    act: Record two boot times of a flavor.
+    assert: The boot time is unknown at first, then follows the observations.
+    """
+    boot_times = BootTimes(tmp_path)
+
+    assert boot_times.get("flavor") is None
+    boot_times.record("flavor", 100)
+    assert boot_times.get("flavor") == 100
+    boot_times.record("flavor", 200)
+    assert 100 < (boot_times.get("flavor") or 0) < 200
+    assert boot_times.get("other") is None
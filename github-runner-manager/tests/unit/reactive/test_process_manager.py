@@ -2,26 +2,26 @@
 #  See LICENSE file for licensing details.
 import os
 import secrets
+import signal
 import subprocess
 from pathlib import Path
-from subprocess import CompletedProcess
 from unittest.mock import MagicMock
 
 import pytest
 
 from github_runner_manager.configuration import UserInfo
+from github_runner_manager.reactive import daemon, forkserver, process_manager, registry
 from github_runner_manager.reactive.process_manager import (
-    PIDS_COMMAND_LINE,
-    PYTHON_BIN,
-    REACTIVE_RUNNER_SCRIPT_MODULE,
-    ReactiveRunnerError,
+    collect_spawn_latencies,
+    get_busy_count,
     kill_reactive_processes,
     reconcile,
 )
+from github_runner_manager.reactive.registry import ReactiveWorkerRegistry
 from github_runner_manager.reactive.types_ import QueueConfig, ReactiveProcessConfig
-from github_runner_manager.utilities import secure_run_subprocess
 
 EXAMPLE_MQ_URI = "http://example.com"
+SPAWNED_PID = 1234
 
 
 @pytest.fixture(name="log_dir", autouse=True)
@@ -35,15 +35,35 @@ def log_dir_path_fixture(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Pat
     return log_file_path
 
 
-@pytest.fixture(name="secure_run_subprocess_mock")
-def secure_run_subprocess_mock_fixture(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
-    """Mock the ps command."""
-    secure_run_subprocess_mock = MagicMock(spec=secure_run_subprocess)
-    monkeypatch.setattr(
-        "github_runner_manager.reactive.process_manager.secure_run_subprocess",
-        secure_run_subprocess_mock,
-    )
-    return secure_run_subprocess_mock
+@pytest.fixture(name="worker_registry", autouse=True)
+def worker_registry_fixture(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> ReactiveWorkerRegistry:
+    """Return the registry of the reactive workers, whose processes all exist."""
+    registry_dir = tmp_path / "workers"
+    monkeypatch.setattr(registry, "REACTIVE_REGISTRY_DIR", registry_dir)
+    # The start time of the fake processes is their PID.
+    monkeypatch.setattr(registry, "get_process_start_time", lambda pid: pid)
+    return ReactiveWorkerRegistry(registry_dir)
+
+
+@pytest.fixture(name="proc_dir", autouse=True)
+def proc_dir_fixture(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Return the directory of the processes to find the legacy reactive processes in."""
+    proc_dir = tmp_path / "proc"
+    proc_dir.mkdir()
+    monkeypatch.setattr(process_manager, "PROC_DIR", proc_dir)
+    monkeypatch.setattr(process_manager, "_legacy_workers_adopted", False)
+    return proc_dir
+
+
+@pytest.fixture(name="forkserver_dir", autouse=True)
+def forkserver_dir_fixture(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Return the directory of the fork server socket, with no fork server running."""
+    forkserver_dir = tmp_path / "forkserver"
+    monkeypatch.setattr(forkserver, "REACTIVE_FORKSERVER_DIR", forkserver_dir)
+    monkeypatch.setattr(process_manager, "_forkserver_process", None)
+    return forkserver_dir
 
 
 @pytest.fixture(name="os_kill_mock", autouse=True)
@@ -57,7 +77,9 @@ def os_kill_mock_fixture(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
 @pytest.fixture(name="subprocess_popen_mock")
 def subprocess_popen_mock_fixture(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
     """Mock the subprocess.Popen function."""
-    popen_result = MagicMock(spec=subprocess.Popen, pid=1234, returncode=0)
+    popen_result = MagicMock(spec=subprocess.Popen, pid=SPAWNED_PID, returncode=0)
+    # The started fork server keeps running.
+    popen_result.poll.return_value = None
     subprocess_popen_mock = MagicMock(
         spec=subprocess.Popen,
         return_value=popen_result,
@@ -77,28 +99,81 @@ def reactive_process_config_fixture() -> ReactiveProcessConfig:
 
 
 def test_reconcile_spawns_runners(
-    secure_run_subprocess_mock: MagicMock,
+    worker_registry: ReactiveWorkerRegistry,
     subprocess_popen_mock: MagicMock,
     log_dir: Path,
     reactive_process_config: ReactiveProcessConfig,
     user_info: UserInfo,
 ):
     """
-    arrange: Mock that two reactive runner processes are active.
+    arrange: Mock that two reactive runner processes are active, and no fork server.
     act: Call reconcile with a quantity of 5.
-    assert: Three runners are spawned. Log file is setup.
+    assert: The fork server is started once, three runners are spawned and registered. Log file
+        is setup.
     """
-    _arrange_reactive_processes(secure_run_subprocess_mock, count=2)
+    _arrange_reactive_processes(worker_registry, count=2)
 
     delta = reconcile(5, reactive_process_config=reactive_process_config, user=user_info)
 
     assert delta == 3
-    assert subprocess_popen_mock.call_count == 3
+    commands = [call.args[0] for call in subprocess_popen_mock.call_args_list]
+    assert len(commands) == 4
+    assert forkserver.FORKSERVER_SCRIPT_MODULE in commands[0]
+    assert all(command.startswith("exec ") for command in commands[1:])
+    assert SPAWNED_PID in [worker.pid for worker in worker_registry.get_workers()]
     assert log_dir.exists()
 
 
+def test_reconcile_forks_runners(
+    worker_registry: ReactiveWorkerRegistry,
+    subprocess_popen_mock: MagicMock,
+    reactive_process_config: ReactiveProcessConfig,
+    user_info: UserInfo,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """
+    arrange: Mock a running fork server.
+    act: Call reconcile with a quantity of 3.
+    assert: Three runners are forked by the fork server and registered.
+    """
+    forked_pids = iter([10, 11, 12])
+    monkeypatch.setattr(forkserver, "spawn_worker", lambda *_args: next(forked_pids))
+
+    delta = reconcile(3, reactive_process_config=reactive_process_config, user=user_info)
+
+    assert delta == 3
+    assert subprocess_popen_mock.call_count == 0
+    assert [worker.pid for worker in worker_registry.get_workers()] == [10, 11, 12]
+
+
+@pytest.mark.parametrize("daemon_mode", [pytest.param(False, id="workers"), True])
+def test_reconcile_unwritable_state_dir(
+    subprocess_popen_mock: MagicMock,
+    daemon_dir: Path,
+    reactive_process_config: ReactiveProcessConfig,
+    user_info: UserInfo,
+    monkeypatch: pytest.MonkeyPatch,
+    daemon_mode: bool,
+):
+    """
+    arrange: A state directory the service user is not permitted to write to.
+    act: Call reconcile with a quantity of 3.
+    assert: No process is spawned, and the failure is reported as no change instead of raised.
+    """
+    reactive_process_config.daemon = daemon_mode
+    monkeypatch.setattr(
+        Path, "mkdir", MagicMock(side_effect=PermissionError(13, "Permission denied"))
+    )
+
+    delta = reconcile(3, reactive_process_config=reactive_process_config, user=user_info)
+
+    assert delta == 0
+    assert subprocess_popen_mock.call_count == 0
+    assert not daemon_dir.exists()
+
+
 def test_reconcile_does_not_spawn_runners(
-    secure_run_subprocess_mock: MagicMock,
+    worker_registry: ReactiveWorkerRegistry,
     subprocess_popen_mock: MagicMock,
     reactive_process_config: ReactiveProcessConfig,
     user_info: UserInfo,
@@ -108,7 +183,7 @@ def test_reconcile_does_not_spawn_runners(
     act: Call reconcile with a quantity of 2.
     assert: No runners are spawned.
     """
-    _arrange_reactive_processes(secure_run_subprocess_mock, count=2)
+    _arrange_reactive_processes(worker_registry, count=2)
 
     delta = reconcile(2, reactive_process_config=reactive_process_config, user=user_info)
 
@@ -117,27 +192,33 @@ def test_reconcile_does_not_spawn_runners(
 
 
 def test_reconcile_kills_processes_for_too_many_processes(
-    secure_run_subprocess_mock: MagicMock,
+    worker_registry: ReactiveWorkerRegistry,
     subprocess_popen_mock: MagicMock,
     os_kill_mock: MagicMock,
     reactive_process_config: ReactiveProcessConfig,
     user_info: UserInfo,
 ):
     """
-    arrange: Mock that 3 reactive runner processes are active.
+    arrange: Mock that 3 reactive runner processes are active, the newest handling a job.
     act: Call reconcile with a quantity of 1.
-    assert: 2 processes are killed.
+    assert: The 2 idle processes are killed and unregistered, newest first.
     """
-    _arrange_reactive_processes(secure_run_subprocess_mock, count=3)
+    _arrange_reactive_processes(worker_registry, count=3)
+    _arrange_handling_job(worker_registry, pid=3)
+
     delta = reconcile(1, reactive_process_config=reactive_process_config, user=user_info)
 
     assert delta == -2
     assert subprocess_popen_mock.call_count == 0
-    assert os_kill_mock.call_count == 2
+    assert [call.args for call in os_kill_mock.call_args_list] == [
+        (2, signal.SIGTERM),
+        (1, signal.SIGTERM),
+    ]
+    assert [worker.pid for worker in worker_registry.get_workers()] == [3]
 
 
 def test_reconcile_ignore_process_not_found_on_kill(
-    secure_run_subprocess_mock: MagicMock,
+    worker_registry: ReactiveWorkerRegistry,
     subprocess_popen_mock: MagicMock,
     os_kill_mock: MagicMock,
     reactive_process_config: ReactiveProcessConfig,
@@ -148,7 +229,7 @@ def test_reconcile_ignore_process_not_found_on_kill(
     act: Call reconcile with a quantity of 1.
     assert: The returned delta is still -2.
     """
-    _arrange_reactive_processes(secure_run_subprocess_mock, count=3)
+    _arrange_reactive_processes(worker_registry, count=3)
     os_kill_mock.side_effect = [None, ProcessLookupError]
     delta = reconcile(1, reactive_process_config=reactive_process_config, user=user_info)
 
@@ -157,57 +238,234 @@ def test_reconcile_ignore_process_not_found_on_kill(
     assert os_kill_mock.call_count == 2
 
 
-def test_reconcile_raises_reactive_runner_error_on_ps_failure(
-    secure_run_subprocess_mock: MagicMock,
+def test_reconcile_ignores_reused_pid(
+    worker_registry: ReactiveWorkerRegistry,
+    os_kill_mock: MagicMock,
+    subprocess_popen_mock: MagicMock,
     reactive_process_config: ReactiveProcessConfig,
     user_info: UserInfo,
+    monkeypatch: pytest.MonkeyPatch,
 ):
     """
-    arrange: Mock that the ps command fails.
-    act: Call reconcile with a quantity of 1.
-    assert: A ReactiveRunnerError is raised.
+    arrange: Mock 2 registered reactive processes, one of them exited and its PID reused.
+    act: Call reconcile with a quantity of 0.
+    assert: Only the running process is killed, and the registry is empty.
     """
-    secure_run_subprocess_mock.return_value = CompletedProcess(
-        args=PIDS_COMMAND_LINE,
-        returncode=1,
-        stdout=b"",
-        stderr=b"error",
+    _arrange_reactive_processes(worker_registry, count=2)
+    monkeypatch.setattr(
+        registry, "get_process_start_time", lambda pid: pid if pid == 1 else pid + 100
     )
 
-    with pytest.raises(ReactiveRunnerError) as err:
-        reconcile(1, reactive_process_config=reactive_process_config, user=user_info)
+    delta = reconcile(0, reactive_process_config=reactive_process_config, user=user_info)
 
-    assert "Failed to get list of processes" in str(err.value)
+    assert delta == -1
+    os_kill_mock.assert_called_once_with(1, signal.SIGTERM)
+    assert not worker_registry.get_workers()
 
 
-def _arrange_reactive_processes(secure_run_subprocess_mock: MagicMock, count: int):
+def _arrange_reactive_processes(worker_registry: ReactiveWorkerRegistry, count: int):
     """Mock reactive runner processes are active.
 
     Args:
-        secure_run_subprocess_mock: The mock to use for the ps command.
-        count: The number of processes.
+        worker_registry: The registry of the reactive workers.
+        count: The number of processes, with PIDs from 1.
     """
-    process_cmds_before = "\n".join(
-        [f"{PYTHON_BIN} -m {REACTIVE_RUNNER_SCRIPT_MODULE}\t{i}" for i in range(count)]
-    )
+    for pid in range(1, count + 1):
+        worker_registry.register(pid)
 
-    secure_run_subprocess_mock.return_value = CompletedProcess(
-        args=PIDS_COMMAND_LINE,
-        returncode=0,
-        stdout=f"CMD\n{process_cmds_before}".encode("utf-8"),
-        stderr=b"",
-    )
+
+def _arrange_handling_job(worker_registry: ReactiveWorkerRegistry, pid: int):
+    """Mock a reactive runner process is handling a job.
+
+    Args:
+        worker_registry: The registry of the reactive workers.
+        pid: The PID of the process.
+    """
+    (worker,) = [worker for worker in worker_registry.get_workers() if worker.pid == pid]
+    worker.jobs = ["https://api.github.com/repos/owner/repo/actions/jobs/1"]
+    worker_registry._write_entry(worker)
 
 
 def test_reactive_flush(
+    worker_registry: ReactiveWorkerRegistry,
     os_kill_mock: MagicMock,
-    secure_run_subprocess_mock: MagicMock,
 ):
     """
     arrange: Mock 3 reactive processes.
     act: Run flush for reactive.
     assert: Find 3 os.kill calls.
     """
-    _arrange_reactive_processes(secure_run_subprocess_mock, count=3)
+    _arrange_reactive_processes(worker_registry, count=3)
     kill_reactive_processes()
     assert os_kill_mock.call_count == 3
+
+
+def test_reactive_flush_legacy_processes(
+    worker_registry: ReactiveWorkerRegistry,
+    os_kill_mock: MagicMock,
+    proc_dir: Path,
+):
+    """
+    arrange: A reactive process registered, and two started before the registry.
+    act: Run flush for reactive.
+    assert: All three processes are killed.
+    """
+    _arrange_reactive_processes(worker_registry, count=1)
+    for pid in (2001, 2002):
+        (proc_dir / str(pid)).mkdir()
+        (proc_dir / str(pid) / "cmdline").write_bytes(
+            "\0".join([*process_manager.REACTIVE_RUNNER_CMD_LINE, ""]).encode()
+        )
+    (proc_dir / "2003").mkdir()
+    (proc_dir / "2003" / "cmdline").write_bytes(b"/usr/bin/python3\0-m\0other\0")
+
+    kill_reactive_processes()
+
+    killed = {call.args[0] for call in os_kill_mock.call_args_list}
+    assert {2001, 2002} < killed
+    assert 2003 not in killed
+    assert len(killed) == 3
+
+
+def test_reconcile_counts_legacy_processes(
+    subprocess_popen_mock: MagicMock,
+    reactive_process_config: ReactiveProcessConfig,
+    user_info: UserInfo,
+    proc_dir: Path,
+):
+    """
+    arrange: Two reactive processes started before the registry.
+    act: Call reconcile with a quantity of 2.
+    assert: The legacy processes are counted, and no process is spawned.
+    """
+    for pid in (2001, 2002):
+        (proc_dir / str(pid)).mkdir()
+        (proc_dir / str(pid) / "cmdline").write_bytes(
+            "\0".join(process_manager.REACTIVE_RUNNER_CMD_LINE).encode()
+        )
+
+    delta = reconcile(2, reactive_process_config=reactive_process_config, user=user_info)
+
+    assert delta == 0
+    assert subprocess_popen_mock.call_count == 0
+
+
+def test_registry_records_jobs(
+    worker_registry: ReactiveWorkerRegistry,
+):
+    """
+    arrange: Register the current process.
+    act: Handle a job.
+    assert: The job is recorded during its handling only.
+    """
+    job_url = "https://api.github.com/repos/owner/repo/actions/jobs/1"
+    worker_registry.register(os.getpid())
+
+    with worker_registry.handling_job(job_url):
+        (worker,) = worker_registry.get_workers()
+        assert worker.jobs == [job_url]
+
+    (worker,) = worker_registry.get_workers()
+    assert worker.jobs == []
+    assert worker.age >= 0
+
+
+def test_registry_records_spawn_latencies(
+    worker_registry: ReactiveWorkerRegistry,
+):
+    """
+    arrange: Register the current process, handling a job.
+    act: Record spawn latencies, then collect them twice.
+    assert: The latencies and the jobs being handled are reported, the latencies only once.
+    """
+    worker_registry.register(os.getpid())
+
+    with worker_registry.handling_job("https://api.github.com/repos/owner/repo/actions/jobs/1"):
+        worker_registry.record_spawn_latency(0.5)
+        worker_registry.record_spawn_latency(1.5)
+        assert get_busy_count() == 1
+
+    assert sorted(collect_spawn_latencies()) == [0.5, 1.5]
+    assert not collect_spawn_latencies()
+    assert get_busy_count() == 0
+
+
+@pytest.fixture(name="daemon_dir")
+def daemon_dir_fixture(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Return the directory of the reactive daemon state."""
+    daemon_dir = tmp_path / "daemon"
+    monkeypatch.setattr(daemon, "REACTIVE_DAEMON_DIR", daemon_dir)
+    return daemon_dir
+
+
+def test_reconcile_daemon_spawns_daemon(
+    subprocess_popen_mock: MagicMock,
+    daemon_dir: Path,
+    reactive_process_config: ReactiveProcessConfig,
+    user_info: UserInfo,
+    worker_registry: ReactiveWorkerRegistry,
+):
+    """
+    arrange: Daemon mode without a running reactive daemon.
+    act: Call reconcile with a quantity of 5.
+    assert: A single daemon process is spawned with 5 job handlers.
+    """
+    reactive_process_config.daemon = True
+
+    delta = reconcile(5, reactive_process_config=reactive_process_config, user=user_info)
+
+    assert delta == 5
+    assert subprocess_popen_mock.call_args.args[0].startswith("exec ")
+    assert [worker.daemon for worker in worker_registry.get_workers()] == [True]
+    assert daemon.read_concurrency(daemon_dir) == 5
+
+
+def test_reconcile_daemon_signals_daemon(
+    subprocess_popen_mock: MagicMock,
+    os_kill_mock: MagicMock,
+    daemon_dir: Path,
+    reactive_process_config: ReactiveProcessConfig,
+    user_info: UserInfo,
+    worker_registry: ReactiveWorkerRegistry,
+):
+    """
+    arrange: Daemon mode with a running reactive daemon with 5 job handlers.
+    act: Call reconcile with a quantity of 2.
+    assert: No process is spawned, and the daemon is signalled to run 2 job handlers.
+    """
+    reactive_process_config.daemon = True
+    daemon.write_concurrency(5, daemon_dir)
+    worker_registry.register(SPAWNED_PID, daemon=True)
+
+    delta = reconcile(2, reactive_process_config=reactive_process_config, user=user_info)
+
+    assert delta == -3
+    assert subprocess_popen_mock.call_count == 0
+    os_kill_mock.assert_called_once_with(SPAWNED_PID, signal.SIGHUP)
+    assert daemon.read_concurrency(daemon_dir) == 2
+
+
+def test_reconcile_daemon_spawn_budget(
+    os_kill_mock: MagicMock,
+    daemon_dir: Path,
+    reactive_process_config: ReactiveProcessConfig,
+    user_info: UserInfo,
+    worker_registry: ReactiveWorkerRegistry,
+):
+    """
+    arrange: Daemon mode with a running reactive daemon with 2 job handlers.
+    act: Call reconcile with the same quantity and a spawn budget of 3.
+    assert: The daemon is signalled to read the new spawn budget.
+    """
+    reactive_process_config.daemon = True
+    daemon.write_concurrency(2, daemon_dir)
+    worker_registry.register(SPAWNED_PID, daemon=True)
+
+    delta = reconcile(
+        2, reactive_process_config=reactive_process_config, user=user_info, spawn_budget=3
+    )
+
+    assert delta == 0
+    os_kill_mock.assert_called_once_with(SPAWNED_PID, signal.SIGHUP)
+    spawn_budget = daemon.read_spawn_budget(daemon_dir)
+    assert spawn_budget is not None and spawn_budget[1] == 3
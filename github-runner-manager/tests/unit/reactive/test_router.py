@@ -0,0 +1,72 @@
+#  Copyright 2025 Canonical Ltd.
+#  See LICENSE file for licensing details.
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from github_runner_manager.manager.runner_manager import RunnerManager
+from github_runner_manager.reactive.router import LabelRouter, Labels, Route
+
+
+def _route(name: str, supported_labels: Labels, max_spawns: int | None = None) -> Route:
+    """Build a route with a mocked runner manager.
+
+    Args:
+        name: The name of the runner manager.
+        supported_labels: The supported labels of the route.
+        max_spawns: The maximum number of runners of the route being spawned at once.
+
+    Returns:
+        The route.
+    """
+    runner_manager = MagicMock(spec=RunnerManager)
+    runner_manager.manager_name = name
+    return Route(
+        runner_manager=runner_manager, supported_labels=supported_labels, max_spawns=max_spawns
+    )
+
+
+@pytest.mark.parametrize(
+    "labels, expected_routes",
+    [
+        pytest.param({"self-hosted"}, ["small", "large", "arm"], id="generic label"),
+        pytest.param({"self-hosted", "X64"}, ["small", "large"], id="case insensitive"),
+        pytest.param({"x64", "large"}, ["large"], id="flavor label"),
+        pytest.param({"x64", "arm64"}, [], id="no route"),
+        pytest.param({"gpu"}, [], id="unknown label"),
+    ],
+)
+def test_get_routes(labels: Labels, expected_routes: list[str]):
+    """
+    arrange: A router with routes of several flavors.
+    act: Get the routes of the labels of a job.
+    assert: The routes supporting all the labels are returned, the fewest extra labels first.
+    """
+    router = LabelRouter(
+        [
+            _route("large", {"self-hosted", "x64", "large"}),
+            _route("small", {"self-hosted", "x64"}),
+            _route("arm", {"self-hosted", "arm64", "noble"}),
+        ]
+    )
+
+    assert [route.name for route in router.get_routes(labels)] == expected_routes
+
+
+def test_acquire_falls_back_at_capacity():
+    """
+    arrange: A router with a best fit route limited to one runner being spawned.
+    act: Acquire routes for three jobs, then release the first one and acquire again.
+    assert: The best fit is used until its capacity, then the next fit; the released capacity
+        is reused.
+    """
+    small = _route("small", {"x64"}, max_spawns=1)
+    large = _route("large", {"x64", "large"}, max_spawns=1)
+    router = LabelRouter([large, small])
+
+    assert router.acquire({"x64"}) is small
+    assert router.acquire({"x64"}) is large
+    assert router.acquire({"x64"}) is None
+    router.release(small)
+    assert router.acquire({"x64"}) is small
@@ -18,6 +18,7 @@ from github_runner_manager.manager.runner_manager import (
 from github_runner_manager.metrics.events import RunnerStart, RunnerStop
 from github_runner_manager.platform.platform_provider import PlatformRunnerState
 from github_runner_manager.reactive.runner_manager import reconcile
+from github_runner_manager.reactive.scaling import ReactiveScalingPolicy
 from github_runner_manager.reactive.types_ import QueueConfig, ReactiveProcessConfig
 
 logger = logging.getLogger(__name__)
@@ -30,6 +31,7 @@ TEST_DELETE_RUNNER_METRIC_EVENTS = {RunnerStart: 1, RunnerStop: 1}
 def runner_manager_fixture() -> MagicMock:
     """Return a mock of the RunnerManager."""
     mock = MagicMock(spec=RunnerManager)
+    mock.manager_name = "test"
     mock.cleanup.return_value = TEST_METRIC_EVENTS
     mock.delete_runners.return_value = TEST_DELETE_RUNNER_METRIC_EVENTS
     return mock
@@ -98,6 +100,7 @@ def test_reconcile_positive_runner_diff(
         reactive_process_config=reactive_process_config,
         user=user_info,
         python_path=None,
+        spawn_budget=None,
     )
 
 
@@ -138,12 +141,66 @@ def test_reconcile_negative_runner_diff(
     reconcile(desired_quantity, runner_manager, reactive_process_config, user_info)
 
     runner_manager.cleanup.assert_called_once()
-    runner_manager.delete_runners.assert_called_once_with(expected_number_of_runners_to_delete)
+    runner_manager.delete_runners.assert_called_once_with(
+        expected_number_of_runners_to_delete,
+        inventory=runner_manager.get_inventory.return_value,
+    )
     reactive_process_manager.reconcile.assert_called_once_with(
         quantity=0,
         reactive_process_config=reactive_process_config,
         user=user_info,
         python_path=None,
+        spawn_budget=None,
+    )
+
+
+@pytest.mark.parametrize(
+    "queue_size, busy, expected_process_quantity, expected_spawn_budget",
+    [
+        pytest.param(2, 1, 3, 4, id="backlog within capacity"),
+        pytest.param(10, 1, 5, 4, id="backlog over capacity"),
+        pytest.param(0, 0, 1, 5, id="empty queue keeps a consumer"),
+        pytest.param(3, 6, 5, 0, id="more jobs handled than capacity"),
+    ],
+)
+def test_reconcile_scaling_policy(  # pylint: disable=too-many-arguments
+    queue_size: int,
+    busy: int,
+    expected_process_quantity: int,
+    expected_spawn_budget: int,
+    runner_manager: MagicMock,
+    reactive_process_manager: MagicMock,
+    reactive_process_config: MagicMock,
+    user_info: UserInfo,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """
+    arrange: No runners, a queue backlog and jobs being handled by the reactive processes.
+    act: Call reconcile with a quantity of 5 and a scaling policy.
+    assert: The reactive processes follow the backlog within the quantity, and the spawn budget
+        is the quantity minus the jobs being handled.
+    """
+    runner_manager.get_runners.return_value = ()
+    monkeypatch.setattr(
+        "github_runner_manager.reactive.runner_manager.get_queue_size", lambda _: queue_size
+    )
+    reactive_process_manager.get_busy_count.return_value = busy
+    reactive_process_manager.collect_spawn_latencies.return_value = [0.5]
+
+    reconcile(
+        5,
+        runner_manager,
+        reactive_process_config,
+        user_info,
+        scaling_policy=ReactiveScalingPolicy(),
+    )
+
+    reactive_process_manager.reconcile.assert_called_once_with(
+        quantity=expected_process_quantity,
+        reactive_process_config=reactive_process_config,
+        user=user_info,
+        python_path=None,
+        spawn_budget=expected_spawn_budget,
     )
 
 
@@ -164,7 +221,9 @@ def test_reconcile_flushes_idle_runners_when_queue_is_empty(
 
     reconcile(quantity, runner_manager, reactive_process_config, user_info)
 
-    runner_manager.flush_runners.assert_called_once_with(FlushMode.FLUSH_IDLE)
+    runner_manager.flush_runners.assert_called_once_with(
+        FlushMode.FLUSH_IDLE, inventory=runner_manager.get_inventory.return_value
+    )
 
 
 @pytest.mark.usefixtures("reactive_process_manager")
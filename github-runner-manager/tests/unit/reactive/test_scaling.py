@@ -0,0 +1,29 @@
+#  Copyright 2025 Canonical Ltd.
+#  See LICENSE file for licensing details.
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from github_runner_manager.reactive import scaling
+from github_runner_manager.reactive.scaling import ReactiveScalingPolicy
+
+
+def test_scaling_policy_follows_arrival_rate(monkeypatch: pytest.MonkeyPatch):
+    """
+    arrange: A scaling policy, and a queue growing by 10 jobs in 10 seconds.
+    act: Get the consumers before and after the growth, then once the queue stops growing.
+    assert: The consumers cover the backlog, plus the jobs expected to arrive until the next
+        reconciliation while the queue grows.
+    """
+    monkeypatch.setattr(scaling.time, "monotonic", monotonic := MagicMock())
+    policy = ReactiveScalingPolicy(min_consumers=1, smoothing=1.0)
+
+    monotonic.return_value = 0
+    assert policy.get_consumers(queue_size=0, busy=0, capacity=100) == 1
+    monotonic.return_value = 10
+    assert policy.get_consumers(queue_size=10, busy=2, capacity=100) == 22
+    assert policy.arrival_rate == 1.0
+    monotonic.return_value = 20
+    assert policy.get_consumers(queue_size=10, busy=2, capacity=15) == 12
+    assert policy.arrival_rate == 0.0
@@ -0,0 +1,137 @@
+#  Copyright 2025 Canonical Ltd.
+#  See LICENSE file for licensing details.
+
+"""Unit tests for the adaptive concurrency limits."""
+
+import threading
+import time
+from email.message import Message
+from unittest.mock import MagicMock
+from urllib.error import HTTPError
+
+import pytest
+from jobmanager_client.exceptions import ApiException
+
+from github_runner_manager import concurrency
+from github_runner_manager.concurrency import AdaptiveConcurrencyLimit, is_overload_response
+from github_runner_manager.jobmanager_api import JobManagerAPIError
+from github_runner_manager.metrics.reconcile import BACKEND_CONCURRENCY_LIMIT
+
+
+def test_limit_increases_on_fast_calls():
+    """
+    arrange: Given a limit of 2.
+    act: Complete three calls under the latency target.
+    assert: The limit increased by one, also in the gauge.
+    """
+    limit = AdaptiveConcurrencyLimit("test-increase", latency_target=10, initial=2)
+
+    for _ in range(3):
+        with limit.slot():
+            pass
+
+    assert limit.limit == 3
+    assert BACKEND_CONCURRENCY_LIMIT.labels("test-increase")._value.get() == 3
+
+
+def test_limit_decreases_on_overload_error_once_per_cooldown():
+    """
+    arrange: Given a limit of 8.
+    act: Fail two calls in a row with a service unavailable response.
+    assert: The limit is halved once.
+    """
+    limit = AdaptiveConcurrencyLimit("test-error", latency_target=10, initial=8)
+
+    for _ in range(2):
+        with pytest.raises(HTTPError):
+            with limit.slot():
+                raise HTTPError("https://api.example.com", 503, "unavailable", Message(), None)
+
+    assert limit.limit == 4
+
+
+@pytest.mark.parametrize(
+    "exc",
+    [
+        pytest.param(ValueError("busy runner"), id="client error"),
+        pytest.param(ConnectionRefusedError(), id="unreachable host"),
+        pytest.param(
+            HTTPError("https://api.example.com", 404, "not found", Message(), None),
+            id="not found response",
+        ),
+    ],
+)
+def test_limit_unchanged_on_other_errors(exc: Exception):
+    """
+    arrange: Given a limit of 2.
+    act: Fail three calls with an error not caused by an overload.
+    assert: The limit is unchanged.
+    """
+    limit = AdaptiveConcurrencyLimit("test-neutral", latency_target=10, initial=2)
+
+    for _ in range(3):
+        with pytest.raises(type(exc)):
+            with limit.slot():
+                raise exc
+
+    assert limit.limit == 2
+
+
+def test_is_overload_response_of_cause():
+    """
+    arrange: Given an error wrapping a rate limit response of the jobmanager.
+    act: Check whether the error is an overload.
+    assert: The status code of the cause is used.
+    """
+    cause = ApiException(status=429)
+    try:
+        raise JobManagerAPIError("Error fetching runners health") from cause
+    except JobManagerAPIError as exc:
+        assert is_overload_response(exc)
+
+
+def test_limit_decreases_on_slow_call(monkeypatch: pytest.MonkeyPatch):
+    """
+    arrange: Given a limit of 8 and a clock advancing more than the latency target per call.
+    act: Complete a call.
+    assert: The limit is halved, but not under the minimum.
+    """
+    clock = MagicMock(side_effect=[100.0, 200.0, 200.0])
+    monkeypatch.setattr(concurrency.time, "monotonic", clock)
+    limit = AdaptiveConcurrencyLimit("test-slow", latency_target=10, initial=8, minimum=6)
+
+    with limit.slot():
+        pass
+
+    assert limit.limit == 6
+
+
+def test_limit_bounds_concurrent_calls():
+    """
+    arrange: Given a limit of 2.
+    act: Run 6 calls in parallel threads.
+    assert: No more than 2 calls run at the same time.
+    """
+    limit = AdaptiveConcurrencyLimit("test-bound", latency_target=10, initial=2, maximum=2)
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    def call():
+        """Call the backend."""
+        nonlocal in_flight, max_in_flight
+        with limit.slot():
+            with lock:
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max_in_flight == 2
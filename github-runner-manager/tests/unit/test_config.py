@@ -18,6 +18,7 @@ from src.github_runner_manager.configuration import (
     GitHubConfiguration,
     GitHubOrg,
     Image,
+    MetricEventsConfig,
     NonReactiveCombination,
     NonReactiveConfiguration,
     ProxyConfig,
@@ -99,6 +100,10 @@ openstack_configuration:
     network: test_network
     vm_prefix: test_unit
 reconcile_interval: 10
+metric_events:
+  flush_interval: 5
+  flush_size: 50
+  fsync: true
 """
 
 
@@ -185,6 +190,7 @@ def app_config_fixture() -> ApplicationConfiguration:
             ),
         ),
         reconcile_interval=10,
+        metric_events=MetricEventsConfig(flush_interval=5, flush_size=50, fsync=True),
     )
 
 
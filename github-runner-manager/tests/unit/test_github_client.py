@@ -1,12 +1,15 @@
 # Copyright 2025 Canonical Ltd.
 #  See LICENSE file for licensing details.
 import http
+import http.server
 import io
 import json
 import random
 import secrets
+import threading
 from collections import namedtuple
 from datetime import datetime, timezone
+from pathlib import Path
 from unittest.mock import MagicMock
 from urllib.error import HTTPError
 
@@ -20,10 +23,19 @@ from fastcore.net import (  # pylint: disable=no-name-in-module
 )
 from requests import HTTPError as RequestsHTTPError
 
-import github_runner_manager.github_client
+from github_runner_manager import github_client as github_client_module
 from github_runner_manager.configuration.github import GitHubOrg, GitHubRepo
-from github_runner_manager.github_client import GithubClient, GithubRunnerNotFoundError
+from github_runner_manager.github_client import (
+    RUNNERS_PER_PAGE,
+    GithubClient,
+    GithubRunnerNotFoundError,
+)
 from github_runner_manager.manager.models import InstanceID, RunnerIdentity, RunnerMetadata
+from github_runner_manager.metrics.reconcile import (
+    GITHUB_JOB_CACHE_HIT,
+    GITHUB_JOB_CACHE_LOOKUPS,
+    GITHUB_JOB_CACHE_MISS,
+)
 from github_runner_manager.platform.platform_provider import (
     DeleteRunnerBusyError,
     JobNotFoundError,
@@ -70,12 +82,19 @@ def urllib_open_mock_fixture(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
 
 @pytest.fixture(name="github_client")
 def github_client_fixture(
-    job_stats_raw: JobStatsRawData, urllib_urlopen_mock: MagicMock
+    job_stats_raw: JobStatsRawData,
+    urllib_urlopen_mock: MagicMock,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
 ) -> GithubClient:
     """Create a GithubClient object with a mocked GhApi object."""
+    monkeypatch.setattr(
+        "github_runner_manager.github_client.GITHUB_METADATA_CACHE_PATH", tmp_path / "metadata"
+    )
     gh_client = GithubClient("token")
     gh_client._client = MagicMock()
     gh_client._client.actions.list_jobs_for_workflow_run.return_value = {
+        "total_count": 1,
         "jobs": [
             {
                 "created_at": job_stats_raw.created_at,
@@ -85,7 +104,7 @@ def github_client_fixture(
                 "status": job_stats_raw.status,
                 "id": job_stats_raw.id,
             }
-        ]
+        ],
     }
     urllib_urlopen_mock.return_value.__enter__.return_value.read.return_value = json.dumps(
         TEST_URLLIB_RESPONSE_JSON
@@ -162,6 +181,7 @@ def test_get_job_info_by_runner_name_no_conclusion(
     assert: JobStats object with conclusion set to None is returned.
     """
     github_client._client.actions.list_jobs_for_workflow_run.return_value = {
+        "total_count": 1,
         "jobs": [
             {
                 "created_at": job_stats_raw.created_at,
@@ -171,7 +191,7 @@ def test_get_job_info_by_runner_name_no_conclusion(
                 "status": job_stats_raw.status,
                 "id": job_stats_raw.id,
             }
-        ]
+        ],
     }
     github_repo = GitHubRepo(owner=secrets.token_hex(16), repo=secrets.token_hex(16))
     job_stats = github_client.get_job_info_by_runner_name(
@@ -281,7 +301,7 @@ def test_github_api_http_error(github_client: GithubClient, job_stats_raw: JobSt
         )
 
 
-def test_list_runners(github_client: GithubClient, monkeypatch: pytest.MonkeyPatch):
+def test_list_runners(github_client: GithubClient):
     """
     arrange: A mocked Github Client that returns two runners, one for the requested prefix.
     act: Call list_runners with the prefix.
@@ -319,12 +339,7 @@ def test_list_runners(github_client: GithubClient, monkeypatch: pytest.MonkeyPat
         ],
     }
 
-    github_client._client.last_page.return_value = 1
-    github_client._client.actions.list_self_hosted_runners_for_repo.side_effect = response
-
-    pages = MagicMock()
-    pages.return_value = [response]
-    monkeypatch.setattr(github_runner_manager.github_client, "pages", pages)
+    github_client._client.actions.list_self_hosted_runners_for_repo.return_value = response
 
     github_repo = GitHubRepo(owner=secrets.token_hex(16), repo=secrets.token_hex(16))
     runners = github_client.list_runners(path=github_repo, prefix="current-unit-0")
@@ -337,6 +352,153 @@ def test_list_runners(github_client: GithubClient, monkeypatch: pytest.MonkeyPat
     assert runner0.status == response["runners"][0]["status"]  # type: ignore
 
 
+def test_list_runners_multiple_pages(github_client: GithubClient, monkeypatch: pytest.MonkeyPatch):
+    """
+    arrange: A mocked Github Client with five pages of runners, one in ten with the prefix.
+    act: Call list_runners with the prefix.
+    assert: The runners with the prefix are returned in order, and only these are built.
+    """
+    runners = [
+        {
+            "id": i,
+            "name": f"{'unit-0' if i % 10 == 0 else 'other-0'}-n-{i:012x}",
+            "os": "linux",
+            "status": "online",
+            "busy": False,
+            "labels": [],
+        }
+        for i in range(5 * RUNNERS_PER_PAGE)
+    ]
+    github_client._client.actions.list_self_hosted_runners_for_org.side_effect = (
+        lambda per_page, page, **_: {
+            "total_count": len(runners),
+            "runners": runners[(page - 1) * per_page : page * per_page],
+        }
+    )
+    build_mock = MagicMock(wraps=SelfHostedRunner.build_from_github)
+    monkeypatch.setattr(SelfHostedRunner, "build_from_github", build_mock)
+
+    listed = github_client.list_runners(
+        path=GitHubOrg(org=secrets.token_hex(16), group="default"), prefix="unit-0"
+    )
+
+    assert [runner.id for runner in listed] == list(range(0, len(runners), 10))
+    assert build_mock.call_count == len(listed)
+
+
+def test_list_runners_not_modified(github_client: GithubClient):
+    """
+    arrange: A mocked Github Client with two pages of runners, replying 304 to matching ETags.
+    act: Call list_runners twice.
+    assert: The first page is not requested twice in the first call, the second call sends the
+        ETags and returns the cached runners.
+    """
+    runners = [
+        {
+            "id": i,
+            "name": f"unit-0-n-{i:012x}",
+            "os": "linux",
+            "status": "online",
+            "busy": False,
+            "labels": [],
+        }
+        for i in range(RUNNERS_PER_PAGE + 1)
+    ]
+
+    def list_runners(per_page: int, page: int, headers: dict, **_) -> dict:
+        """Reply with a page of runners, or 304 if the ETag matches.
+
+        Args:
+            per_page: The size of the pages.
+            page: The number of the page.
+            headers: The headers of the request.
+
+        Raises:
+            HTTPError: 304 Not Modified.
+
+        Returns:
+            The page of runners.
+        """
+        etag = f'"etag-{page}"'
+        if headers.get("If-None-Match") == etag:
+            raise HTTPError("http://test.com", 304, "", http.client.HTTPMessage(), None)
+        github_client._client.recv_hdrs = {"etag": etag}
+        return {
+            "total_count": len(runners),
+            "runners": runners[(page - 1) * per_page : page * per_page],
+        }
+
+    list_mock = github_client._client.actions.list_self_hosted_runners_for_org
+    list_mock.side_effect = list_runners
+    github_org = GitHubOrg(org=secrets.token_hex(16), group="default")
+
+    first = github_client.list_runners(path=github_org, prefix="unit-0")
+    second = github_client.list_runners(path=github_org, prefix="unit-0")
+
+    assert [call.kwargs["page"] for call in list_mock.call_args_list] == [1, 2, 1, 2]
+    assert [call.kwargs["headers"] for call in list_mock.call_args_list[2:]] == [
+        {"If-None-Match": '"etag-1"'},
+        {"If-None-Match": '"etag-2"'},
+    ]
+    assert len(first) == len(runners)
+    assert [runner.id for runner in second] == [runner.id for runner in first]
+
+
+def _response(status_code: int, body: dict | None = None, etag: str = "") -> requests.Response:
+    """Build a response of the GitHub API.
+
+    Args:
+        status_code: The HTTP status code.
+        body: The JSON body.
+        etag: The ETag header, if any.
+
+    Returns:
+        The response.
+    """
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = "https://api.github.com/orgs/org/actions/runners"
+    response.headers["Content-Type"] = "application/json"
+    if etag:
+        response.headers["ETag"] = etag
+    response._content = json.dumps(body).encode() if body is not None else b""
+    return response
+
+
+def test_list_runners_not_modified_response(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    """
+    arrange: A GitHub client whose session replies with runners and an ETag, then with 304.
+    act: Call list_runners twice.
+    assert: The second call sends the ETag and returns the cached runners.
+    """
+    monkeypatch.setattr(
+        "github_runner_manager.github_client.GITHUB_METADATA_CACHE_PATH", tmp_path / "metadata"
+    )
+    runner = {
+        "id": 1,
+        "name": "unit-0-n-000000000001",
+        "os": "linux",
+        "status": "online",
+        "busy": False,
+        "labels": [],
+    }
+    session = MagicMock(spec=requests.Session)
+    session.request.side_effect = [
+        _response(200, {"total_count": 1, "runners": [runner]}, etag='"etag-1"'),
+        _response(304),
+    ]
+    monkeypatch.setattr(github_client_module._session, "get", lambda: session)
+    github_client = GithubClient("token")
+    github_org = GitHubOrg(org="org", group="default")
+
+    first = github_client.list_runners(path=github_org, prefix="unit-0")
+    second = github_client.list_runners(path=github_org, prefix="unit-0")
+
+    assert session.request.call_args.kwargs["headers"]["If-None-Match"] == '"etag-1"'
+    assert [runner.id for runner in first] == [1]
+    assert [runner.id for runner in second] == [1]
+
+
 def test_catch_http_errors(github_client: GithubClient):
     """
     arrange: A mocked Github Client that raises a 500 HTTPError.
@@ -421,11 +583,14 @@ def test_catch_http_errors_from_getting_runner_group_id(
     instance_id = InstanceID.build("test-runner")
     labels = ["label1", "label2"]
 
-    def _mock_get(url, headers, *args, **kwargs):
-        """Mock for requests.get."""
+    def _mock_get(session, url, headers, *args, **kwargs):
+        """Mock for requests.Session.get."""
 
         class _Response:
-            """Mocked Response for requests.get."""
+            """Mocked Response for requests.Session.get."""
+
+            status_code = 500
+            headers: dict[str, str] = {}
 
             def raise_for_status(self):
                 """Mocked raise_for_status.
@@ -438,7 +603,7 @@ def test_catch_http_errors_from_getting_runner_group_id(
 
         return _Response()
 
-    monkeypatch.setattr(requests, "get", _mock_get)
+    monkeypatch.setattr(requests.Session, "get", _mock_get)
     with pytest.raises(PlatformApiError):
         _, _ = github_client.get_runner_registration_jittoken(
             path=github_repo, instance_id=instance_id, labels=labels
@@ -456,15 +621,18 @@ def test_get_runner_context_org(github_client: GithubClient, monkeypatch: pytest
     # The code that this test executes is not covered by integration tests.
     github_repo = GitHubOrg(org="theorg", group="my group name")
 
-    def _mock_get(url, headers, *args, **kwargs):
-        """Mock for requests.get."""
+    def _mock_get(session, url, headers, *args, **kwargs):
+        """Mock for requests.Session.get."""
 
         class _Response:
-            """Mocked Response for requests.get."""
+            """Mocked Response for requests.Session.get."""
+
+            status_code = 200
+            headers: dict[str, str] = {}
 
             @staticmethod
             def json():
-                """Json response for requests.get mock.
+                """Json response for requests.Session.get mock.
 
                 Returns:
                    The JSON response from the API.
@@ -512,7 +680,7 @@ def test_get_runner_context_org(github_client: GithubClient, monkeypatch: pytest
         assert headers["Authorization"] == "Bearer token"
         return _Response()
 
-    monkeypatch.setattr(requests, "get", _mock_get)
+    monkeypatch.setattr(requests.Session, "get", _mock_get)
 
     instance_id = InstanceID.build("test-runner")
 
@@ -560,6 +728,61 @@ def test_get_runner_context_org(github_client: GithubClient, monkeypatch: pytest
     )
 
 
+def test_get_runner_context_org_cached_group_id(
+    github_client: GithubClient, monkeypatch: pytest.MonkeyPatch
+):
+    """
+    arrange: A mocked GitHub client for an org, whose jitconfig request fails once with 404.
+    act: Get a jittoken, get one from another client, fail to get one, and get one again.
+    assert: The runner group ID is fetched once for the first two jittokens, and again after
+        the 404.
+    """
+    github_org = GitHubOrg(org="theorg", group="my group name")
+    get_mock = MagicMock()
+    get_mock.return_value.status_code = 200
+    get_mock.return_value.headers = {}
+    get_mock.return_value.json.return_value = {
+        "runner_groups": [{"id": 3, "name": "my group name"}]
+    }
+    monkeypatch.setattr(requests.Session, "get", get_mock)
+    instance_id = InstanceID.build("test-runner")
+    jitconfig = {
+        "runner": {
+            "id": 18,
+            "name": instance_id.name,
+            "os": "unknown",
+            "status": "offline",
+            "busy": False,
+            "labels": [],
+        },
+        "encoded_jit_config": "token",
+    }
+    github_client._client.actions.generate_runner_jitconfig_for_org.side_effect = [
+        jitconfig,
+        HTTPError("http://test.com", 404, "", http.client.HTTPMessage(), None),
+        jitconfig,
+    ]
+    other_client = GithubClient("token")
+    other_client._client = MagicMock()
+    other_client._client.actions.generate_runner_jitconfig_for_org.return_value = jitconfig
+
+    github_client.get_runner_registration_jittoken(github_org, instance_id, [])
+    other_client.get_runner_registration_jittoken(github_org, instance_id, [])
+    lookups_before_error = get_mock.call_count
+    with pytest.raises(PlatformApiError):
+        github_client.get_runner_registration_jittoken(github_org, instance_id, [])
+    github_client.get_runner_registration_jittoken(github_org, instance_id, [])
+
+    assert lookups_before_error == 1
+    assert get_mock.call_count == 2
+    assert (
+        other_client._client.actions.generate_runner_jitconfig_for_org.call_args.kwargs[
+            "runner_group_id"
+        ]
+        == 3
+    )
+
+
 @pytest.mark.parametrize(
     "github_repo",
     [
@@ -655,3 +878,112 @@ def test_delete_runner_busy(
     )
     with pytest.raises(DeleteRunnerBusyError):
         _ = github_client.delete_runner(path, runner_id)
+
+
+def test_get_job_info_by_runner_name_cached(github_client: GithubClient):
+    """
+    arrange: A mocked Github Client that returns a workflow run with two completed jobs and \
+        one in progress.
+    act: Call get_job_info_by_runner_name for each runner of the workflow run.
+    assert: The jobs of the workflow run are listed once for the completed jobs, and again for \
+        the job in progress. The cache hits and misses are counted.
+    """
+    jobs = [
+        {
+            "created_at": "2021-10-01T00:00:00Z",
+            "started_at": "2021-10-01T01:00:00Z",
+            "runner_name": runner_name,
+            "conclusion": conclusion,
+            "status": status,
+            "id": job_id,
+        }
+        for job_id, (runner_name, conclusion, status) in enumerate(
+            [
+                ("runner-1", "success", "completed"),
+                ("runner-2", "failure", "completed"),
+                ("runner-3", None, "in_progress"),
+            ]
+        )
+    ]
+    list_jobs = github_client._client.actions.list_jobs_for_workflow_run
+    list_jobs.return_value = {"total_count": 3, "jobs": jobs}
+    github_repo = GitHubRepo(owner="owner", repo="repo")
+    hits = GITHUB_JOB_CACHE_LOOKUPS.labels(GITHUB_JOB_CACHE_HIT)._value.get()
+    misses = GITHUB_JOB_CACHE_LOOKUPS.labels(GITHUB_JOB_CACHE_MISS)._value.get()
+
+    job_infos = [
+        github_client.get_job_info_by_runner_name(
+            path=github_repo, workflow_run_id="1", runner_name=runner_name
+        )
+        for runner_name in ("runner-1", "runner-2", "runner-3")
+    ]
+
+    assert [job_info.job_id for job_info in job_infos] == [0, 1, 2]
+    assert job_infos[1].conclusion == JobConclusion.FAILURE
+    assert list_jobs.call_count == 2
+    assert GITHUB_JOB_CACHE_LOOKUPS.labels(GITHUB_JOB_CACHE_HIT)._value.get() == hits + 1
+    assert GITHUB_JOB_CACHE_LOOKUPS.labels(GITHUB_JOB_CACHE_MISS)._value.get() == misses + 2
+
+
+class _GitHubAPIHandler(http.server.BaseHTTPRequestHandler):
+    """Handler replying to the requests like the GitHub API, recording the client ports."""
+
+    protocol_version = "HTTP/1.1"
+    client_ports: list[int] = []
+
+    def do_GET(self):  # noqa: N802 pylint: disable=invalid-name
+        """Reply to a GET request."""
+        self.client_ports.append(self.client_address[1])
+        if self.path.startswith("/repos/owner/repo/actions/runners/1"):
+            body = json.dumps({"id": 1, "name": "unit-0-n-000000000001"}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("X-RateLimit-Remaining", "4999")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_DELETE(self):  # noqa: N802 pylint: disable=invalid-name
+        """Reply to a DELETE request."""
+        self.client_ports.append(self.client_address[1])
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *args):
+        """Do not log the requests.
+
+        Args:
+            args: Placeholder for positional arguments.
+        """
+
+
+def test_ghapi_keep_alive():
+    """
+    arrange: Given a local server replying like the GitHub API.
+    act: Get a runner, delete a runner and get a missing runner with the GhApi client.
+    assert: The responses are decoded, the 404 raises the GhApi error, and all the requests reuse
+        the same connection.
+    """
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _GitHubAPIHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = GithubClient("token")._client
+    client.gh_host = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        runner = client.actions.get_self_hosted_runner_for_repo("owner", "repo", 1)
+        deleted = client.actions.delete_self_hosted_runner_from_repo("owner", "repo", 1)
+        with pytest.raises(HTTP404NotFoundError):
+            client.actions.get_self_hosted_runner_for_repo("owner", "repo", 2)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert runner.name == "unit-0-n-000000000001"
+    assert client.recv_hdrs["Content-Length"] == "0"
+    assert not deleted
+    assert len(_GitHubAPIHandler.client_ports) == 3
+    assert len(set(_GitHubAPIHandler.client_ports)) == 1
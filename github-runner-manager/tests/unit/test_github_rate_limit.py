@@ -0,0 +1,113 @@
+#  Copyright 2025 Canonical Ltd.
+#  See LICENSE file for licensing details.
+
+"""Unit tests for the scheduling of the GitHub API requests within the rate limit."""
+
+import http.client
+import time
+from unittest.mock import MagicMock
+from urllib.error import HTTPError
+
+import pytest
+
+from github_runner_manager import github_rate_limit
+from github_runner_manager.configuration.github import GitHubRepo
+from github_runner_manager.github_client import GithubClient
+from github_runner_manager.github_rate_limit import (
+    Priority,
+    RateLimitExceededError,
+    RateLimitScheduler,
+)
+from github_runner_manager.metrics.reconcile import (
+    GITHUB_RATE_LIMIT_REMAINING,
+    GITHUB_RATE_LIMIT_SHED_REQUESTS,
+)
+
+
+def _rate_limit_headers(remaining: int, reset_in: float) -> dict[str, str]:
+    """Build the rate limit headers of a response.
+
+    Args:
+        remaining: The remaining requests.
+        reset_in: Seconds until the rate limit resets.
+
+    Returns:
+        The headers.
+    """
+    return {
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Limit": "100",
+        "X-RateLimit-Reset": str(int(time.time() + reset_in)),
+    }
+
+
+def test_low_budget_sheds_bookkeeping_requests():
+    """
+    arrange: Given a scheduler with 10 out of 100 requests remaining for the next hour.
+    act: Acquire a bookkeeping, a normal and a critical request.
+    assert: The bookkeeping request is shed, the others are allowed and counted.
+    """
+    scheduler = RateLimitScheduler()
+    scheduler.update(_rate_limit_headers(remaining=10, reset_in=3600))
+    shed_before = GITHUB_RATE_LIMIT_SHED_REQUESTS.labels("bookkeeping")._value.get()
+
+    with pytest.raises(RateLimitExceededError):
+        scheduler.acquire(Priority.BOOKKEEPING)
+    scheduler.acquire(Priority.NORMAL)
+    scheduler.acquire(Priority.CRITICAL)
+
+    assert GITHUB_RATE_LIMIT_REMAINING._value.get() == 10
+    assert GITHUB_RATE_LIMIT_SHED_REQUESTS.labels("bookkeeping")._value.get() == shed_before + 1
+    assert scheduler._remaining == 8
+
+
+def test_exhausted_budget_delays_critical_requests(monkeypatch: pytest.MonkeyPatch):
+    """
+    arrange: Given a scheduler without remaining requests until the reset in 30 seconds.
+    act: Acquire a critical request in the context and a normal request.
+    assert: The critical request waits for the reset, the normal request is shed.
+    """
+    sleep_mock = MagicMock()
+    monkeypatch.setattr(github_rate_limit.time, "sleep", sleep_mock)
+    scheduler = RateLimitScheduler()
+    scheduler.update(_rate_limit_headers(remaining=0, reset_in=30))
+
+    with pytest.raises(RateLimitExceededError):
+        scheduler.acquire(Priority.NORMAL)
+    sleep_mock.side_effect = lambda _: scheduler.update(_rate_limit_headers(100, reset_in=3600))
+    with github_rate_limit.priority(Priority.CRITICAL):
+        scheduler.acquire()
+
+    sleep_mock.assert_called_once()
+    assert 0 < sleep_mock.call_args.args[0] <= 30
+
+
+def test_retry_after_blocks_requests():
+    """
+    arrange: Given a scheduler updated with a secondary rate limit response.
+    act: Acquire a critical request.
+    assert: The request is shed as the wait is longer than allowed for critical requests.
+    """
+    scheduler = RateLimitScheduler()
+    scheduler.update({"Retry-After": "120"}, rate_limited=True)
+
+    with pytest.raises(RateLimitExceededError):
+        scheduler.acquire(Priority.CRITICAL)
+
+
+def test_rate_limit_response_is_not_token_error():
+    """
+    arrange: A mocked Github Client that raises a 403 HTTPError without remaining requests.
+    act: Call an API endpoint.
+    assert: A RateLimitExceededError is raised.
+    """
+    github_client = GithubClient("token")
+    github_client._client = MagicMock()
+    headers = http.client.HTTPMessage()
+    headers["X-RateLimit-Remaining"] = "0"
+    github_client._client.actions.delete_self_hosted_runner_from_repo.side_effect = HTTPError(
+        "http://test.com", 403, "", headers, None
+    )
+
+    with pytest.raises(RateLimitExceededError):
+        github_client.delete_runner(path=GitHubRepo(owner="owner", repo="repo"), runner_id=1)
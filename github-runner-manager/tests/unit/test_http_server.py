@@ -13,8 +13,18 @@ import pytest
 from flask.testing import FlaskClient
 
 from github_runner_manager.manager.runner_manager import FlushMode
-from src.github_runner_manager.http_server import APP_CONFIG_NAME, OPENSTACK_CONFIG_NAME, app
+from src.github_runner_manager.http_server import (
+    APP_CONFIG_NAME,
+    OPENSTACK_CONFIG_NAME,
+    RUNNER_METRICS_SPOOL_NAME,
+    RUNNER_SCALER_PROVIDER_NAME,
+    app,
+)
 from src.github_runner_manager.manager.runner_scaler import RunnerInfo, RunnerScaler
+from src.github_runner_manager.metrics.runner import MAX_METRICS_FILE_SIZE
+from src.github_runner_manager.metrics.spool import RunnerMetricsSpool
+from src.github_runner_manager.openstack_cloud.constants import PRE_JOB_METRICS_FILE_PATH
+from src.github_runner_manager.reconcile_service import RunnerScalerProvider
 
 
 @pytest.fixture(name="lock", scope="function")
@@ -28,6 +38,7 @@ def client_fixture(lock: Lock, monkeypatch) -> Iterator[FlaskClient]:
     app.config["TESTING"] = True
     app.config[APP_CONFIG_NAME] = MagicMock()
     app.config[OPENSTACK_CONFIG_NAME] = MagicMock()
+    app.config[RUNNER_SCALER_PROVIDER_NAME] = RunnerScalerProvider()
 
     monkeypatch.setattr("src.github_runner_manager.http_server._lock", lock)
     with app.test_client() as client:
@@ -135,3 +146,36 @@ def test_check_runner(client: FlaskClient, lock: Lock, mock_runner_scaler: Magic
         "runners": ["mock_runner"],
         "busy_runners": [],
     }
+
+
+def test_push_runner_metrics(client: FlaskClient, tmp_path) -> None:
+    """
+    arrange: Start up a test flask server with a runner metrics spool.
+    act: Push a metric file with a valid token, an invalid token and too large content.
+    assert: Only the metric file pushed with the valid token is spooled.
+    """
+    spool = RunnerMetricsSpool(tmp_path)
+    app.config[RUNNER_METRICS_SPOOL_NAME] = spool
+    token = spool.get_token("runner-1")
+
+    response = client.post(
+        "/runner/runner-1/metrics/pre-job",
+        data=b'{"timestamp": 1}',
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    unauthorized_response = client.post(
+        "/runner/runner-2/metrics/pre-job",
+        data=b'{"timestamp": 2}',
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    too_large_response = client.post(
+        "/runner/runner-1/metrics/post-job",
+        data=b"x" * (MAX_METRICS_FILE_SIZE + 1),
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 204
+    assert unauthorized_response.status_code == 401
+    assert too_large_response.status_code == 413
+    assert spool.read("runner-1") == {PRE_JOB_METRICS_FILE_PATH: '{"timestamp": 1}'}
+    assert not spool.read("runner-2")
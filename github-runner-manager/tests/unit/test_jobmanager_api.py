@@ -5,6 +5,7 @@
 import secrets
 from unittest.mock import MagicMock
 
+import jobmanager_client
 import pytest
 from jobmanager_client import (
     JobRead,
@@ -14,11 +15,13 @@ from jobmanager_client import (
 from jobmanager_client.exceptions import ApiException, NotFoundException
 from urllib3.exceptions import RequestError
 
+from github_runner_manager import utilities
 from github_runner_manager.jobmanager_api import (
     Job,
     JobManagerAPI,
     JobManagerAPIError,
     JobManagerAPINotFoundError,
+    JobManagerAPIUnsupportedError,
     JobStatus,
     RunnerHealth,
     RunnerRegistration,
@@ -67,6 +70,34 @@ def test_jobmanager_api_sets_url_in_configuration(token: str, url: str):
     assert api_client.configuration.host == url
 
 
+def test_jobmanager_api_reuses_api_client_per_process(
+    monkeypatch: pytest.MonkeyPatch, jobmanager_api: JobManagerAPI
+):
+    """
+    arrange: Create a jobmanager api object and stub the api client methods.
+    act: Fetch two jobs, then fetch another one in a process with a different pid.
+    assert: The same api client is used within a process, a new one in the other process.
+    """
+    jobs_api_mock = MagicMock()
+    jobs_api_mock.return_value.get_job_v1_jobs_job_id_get.return_value = JobRead(
+        status=JobStatus.PENDING.value,
+        architecture="arm64",
+        base_series="jammy",
+        id=1,
+        requested_by="foobar",
+    )
+    monkeypatch.setattr(jobmanager_client, "JobsApi", jobs_api_mock)
+
+    jobmanager_api.get_job(1)
+    jobmanager_api.get_job(1)
+    monkeypatch.setattr(utilities.os, "getpid", MagicMock(return_value=-1))
+    jobmanager_api.get_job(1)
+
+    api_clients = [call.kwargs["api_client"] for call in jobs_api_mock.call_args_list]
+    assert api_clients[0] is api_clients[1]
+    assert api_clients[2] is not api_clients[0]
+
+
 def test_jobmanager_api_get_runner_health(
     monkeypatch: pytest.MonkeyPatch, jobmanager_api: JobManagerAPI
 ):
@@ -256,3 +287,40 @@ def test_jobmanager_api_get_job_error(
 
     with pytest.raises(JobManagerAPIError):
         jobmanager_api.get_job(job_id=123)
+
+
+def test_jobmanager_api_get_runners_health(
+    monkeypatch: pytest.MonkeyPatch, jobmanager_api: JobManagerAPI
+):
+    """
+    arrange: Create a jobmanager api object and stub the bulk health request.
+    act: Call get_runners_health method.
+    assert: The health of the runners is returned by runner ID.
+    """
+    call_api_mock = MagicMock(
+        return_value={"runners": [{"id": 1, "status": "IN_PROGRESS", "deletable": False}]}
+    )
+    monkeypatch.setattr("jobmanager_client.ApiClient.call_api", call_api_mock)
+
+    response = jobmanager_api.get_runners_health([1, 2])
+
+    assert response == {1: RunnerHealth(status="IN_PROGRESS", deletable=False)}
+    assert call_api_mock.call_args.kwargs["body"] == {"runner_ids": [1, 2]}
+
+
+def test_jobmanager_api_get_runners_health_unsupported(
+    monkeypatch: pytest.MonkeyPatch, jobmanager_api: JobManagerAPI
+):
+    """
+    arrange: Create a jobmanager api object and stub the bulk health request to fail with 404.
+    act: Call get_runners_health method twice.
+    assert: JobManagerAPIUnsupportedError is raised, and the request is only sent once.
+    """
+    call_api_mock = MagicMock(side_effect=ApiException(status=404))
+    monkeypatch.setattr("jobmanager_client.ApiClient.call_api", call_api_mock)
+
+    for _ in range(2):
+        with pytest.raises(JobManagerAPIUnsupportedError):
+            jobmanager_api.get_runners_health([1])
+
+    call_api_mock.assert_called_once()
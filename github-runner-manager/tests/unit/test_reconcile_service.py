@@ -0,0 +1,52 @@
+#  Copyright 2025 Canonical Ltd.
+#  See LICENSE file for licensing details.
+
+"""Test for the reconcile service."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.github_runner_manager.reconcile_service import RunnerScalerProvider
+
+
+@pytest.fixture(name="runner_scaler_build_mock", scope="function")
+def runner_scaler_build_mock_fixture(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    build_mock = MagicMock(side_effect=lambda *args: MagicMock())
+    monkeypatch.setattr(
+        "src.github_runner_manager.reconcile_service.RunnerScaler.build", build_mock
+    )
+    return build_mock
+
+
+def test_runner_scaler_provider_reuses_runner_scaler(runner_scaler_build_mock: MagicMock):
+    """
+    arrange: Given a RunnerScalerProvider.
+    act: Get the RunnerScaler twice with the same configuration.
+    assert: The RunnerScaler is built once and the same object is returned.
+    """
+    provider = RunnerScalerProvider(python_path="/python/path")
+    app_config = MagicMock()
+
+    first = provider.get(app_config)
+    second = provider.get(app_config)
+
+    assert first is second
+    runner_scaler_build_mock.assert_called_once()
+    assert runner_scaler_build_mock.call_args.args[0] is app_config
+    assert runner_scaler_build_mock.call_args.args[2] == "/python/path"
+
+
+def test_runner_scaler_provider_rebuilds_on_config_change(runner_scaler_build_mock: MagicMock):
+    """
+    arrange: Given a RunnerScalerProvider with a built RunnerScaler.
+    act: Get the RunnerScaler with a different configuration.
+    assert: A new RunnerScaler is built for the new configuration.
+    """
+    provider = RunnerScalerProvider()
+    first = provider.get(MagicMock())
+
+    second = provider.get(MagicMock())
+
+    assert first is not second
+    assert runner_scaler_build_mock.call_count == 2
@@ -30,15 +30,16 @@ from github_runner_manager.configuration.github import (
     GitHubPath,
     GitHubRepo,
 )
+from github_runner_manager.github_rate_limit import RateLimitExceededError
 from github_runner_manager.manager import runner_manager as runner_manager_module
-from github_runner_manager.manager.models import InstanceID
+from github_runner_manager.manager import runner_scaler as runner_scaler_module
 from github_runner_manager.manager.runner_manager import (
     IssuedMetricEventsStats,
     RunnerInstance,
     RunnerManager,
 )
 from github_runner_manager.manager.runner_scaler import FlushMode, RunnerInfo, RunnerScaler
-from github_runner_manager.manager.vm_manager import VMState
+from github_runner_manager.manager.vm_manager import VM, VMState
 from github_runner_manager.metrics.events import RunnerStart, RunnerStop
 from github_runner_manager.openstack_cloud.configuration import (
     OpenStackConfiguration,
@@ -49,7 +50,7 @@ from github_runner_manager.openstack_cloud.openstack_runner_manager import (
     OpenStackRunnerManagerConfig,
 )
 from github_runner_manager.platform.github_provider import PlatformRunnerState
-from github_runner_manager.reactive.types_ import ReactiveProcessConfig
+from github_runner_manager.reactive.types_ import ReactiveProcessConfig, ReactiveRouteConfig
 from tests.unit.factories.runner_instance_factory import RunnerInstanceFactory
 
 logger = logging.getLogger(__name__)
@@ -57,18 +58,17 @@ logger = logging.getLogger(__name__)
 
 def mock_runner_manager_spawn_runners(
     create_runner_args: Iterable[RunnerManager._CreateRunnerArgs],
-) -> tuple[InstanceID, ...]:
+) -> tuple[VM, ...]:
     """Mock _spawn_runners method of RunnerManager.
 
-    The _spawn_runners method uses multi-process, which copies the object, e.g., the mocks.
-    There is easy way to sync the state of the mocks object across processes. Replacing the
-    _spawn_runner to remove the multi-process.pool is an easier approach.
+    The _spawn_runners method uses threads. Replacing the _spawn_runner to create the runners
+    sequentially keeps the order of the calls to the mocks deterministic.
 
     Args:
         create_runner_args: The arguments for the create_runner method.
 
     Returns:
-        The instance ids of the runner spawned.
+        The VMs of the runner spawned.
     """
     return tuple(RunnerManager._create_runner(arg) for arg in create_runner_args)
 
@@ -386,6 +386,65 @@ def test_build_runner_scaler(
     )
 
 
+def test_build_runner_scaler_reactive_routes(
+    application_configuration: ApplicationConfiguration, user_info: UserInfo
+):
+    """
+    arrange: Given an ApplicationConfiguration with three combinations, two sharing a flavor.
+    act: Call RunnerScaler.build
+    assert: The reactive configuration has a route with a distinct name for each combination,
+        the runner manager spawning the runners of the first one.
+    """
+    application_configuration.non_reactive_configuration.combinations.extend(
+        [
+            NonReactiveCombination(
+                image=Image(name="image_id", labels=["arm64", "noble"]),
+                flavor=Flavor(name="large", labels=["large"]),
+                base_virtual_machines=0,
+                max_reactive_spawns=2,
+            ),
+            NonReactiveCombination(
+                image=Image(name="jammy_image_id", labels=["arm64", "jammy"]),
+                flavor=Flavor(name="large", labels=["large"]),
+                base_virtual_machines=0,
+            ),
+        ]
+    )
+
+    runner_scaler = RunnerScaler.build(application_configuration, user_info)
+
+    assert runner_scaler._manager._labels == ["label1", "label2", "arm64", "noble", "flavorlabel"]
+    reactive_process_config = runner_scaler._reactive_config
+    assert reactive_process_config
+    assert reactive_process_config.routes == [
+        ReactiveRouteConfig(
+            manager_name="app_name",
+            server_config=OpenStackServerConfig(
+                image="image_id", flavor="flavor", network="network"
+            ),
+            supported_labels={"label1", "label2", "arm64", "noble", "flavorlabel", "x64"},
+            labels=["label1", "label2", "arm64", "noble", "flavorlabel"],
+        ),
+        ReactiveRouteConfig(
+            manager_name="app_name-1",
+            server_config=OpenStackServerConfig(
+                image="image_id", flavor="large", network="network"
+            ),
+            supported_labels={"label1", "label2", "arm64", "noble", "large", "x64"},
+            labels=["label1", "label2", "arm64", "noble", "large"],
+            max_spawns=2,
+        ),
+        ReactiveRouteConfig(
+            manager_name="app_name-2",
+            server_config=OpenStackServerConfig(
+                image="jammy_image_id", flavor="large", network="network"
+            ),
+            supported_labels={"label1", "label2", "arm64", "jammy", "large", "x64"},
+            labels=["label1", "label2", "arm64", "jammy", "large"],
+        ),
+    ]
+
+
 @pytest.mark.parametrize(
     "runners, expected_runner_info",
     [
@@ -540,7 +599,93 @@ def test_runner_scaler_flush_mode(flush_mode: FlushMode, expected_flush_mode: Fl
         max_quantity=0,
     ).flush(flush_mode=flush_mode)
 
-    runner_manager.flush_runners.assert_called_with(flush_mode=expected_flush_mode)
+    runner_manager.flush_runners.assert_called_with(
+        flush_mode=expected_flush_mode, inventory=runner_manager.get_inventory.return_value
+    )
+
+
+def test_runner_scaler_flush_reactive_before_inventory(monkeypatch: pytest.MonkeyPatch):
+    """
+    arrange: given a RunnerScaler in reactive mode.
+    act: when RunnerScaler.flush is called.
+    assert: the reactive processes are killed before the inventory is taken.
+    """
+    calls = []
+    monkeypatch.setattr(
+        runner_scaler_module.reactive_runner_manager,
+        "flush_reactive_processes",
+        lambda: calls.append("flush_reactive_processes"),
+    )
+    runner_manager = MagicMock()
+    runner_manager.get_inventory.side_effect = lambda: calls.append("get_inventory")
+
+    RunnerScaler(
+        runner_manager=runner_manager,
+        reactive_process_config=MagicMock(),
+        user=MagicMock(),
+        base_quantity=0,
+        max_quantity=0,
+    ).flush()
+
+    assert calls == ["flush_reactive_processes", "get_inventory"]
+
+
+def test_runner_scaler_reconcile_rate_limited():
+    """
+    arrange: given a RunnerScaler whose runners cannot be listed due to the GitHub rate limit.
+    act: when RunnerScaler.reconcile is called.
+    assert: the reconciliation is skipped without listing the runners again.
+    """
+    runner_manager = MagicMock()
+    runner_manager.manager_name = "app_name"
+    runner_manager.get_inventory.side_effect = RateLimitExceededError("rate limit")
+
+    delta = RunnerScaler(
+        runner_manager=runner_manager,
+        reactive_process_config=None,
+        user=MagicMock(),
+        base_quantity=1,
+        max_quantity=0,
+    ).reconcile()
+
+    assert delta == 0
+    runner_manager.get_runners.assert_not_called()
+    runner_manager.create_runners.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "daemon, expect_scaling_policy",
+    [
+        pytest.param(False, False, id="process per job"),
+        pytest.param(True, True, id="daemon"),
+    ],
+)
+def test_runner_scaler_reconcile_scaling_policy(
+    monkeypatch: pytest.MonkeyPatch, daemon: bool, expect_scaling_policy: bool
+):
+    """
+    arrange: given a RunnerScaler in reactive mode, with or without the reactive daemon.
+    act: when RunnerScaler.reconcile is called.
+    assert: the consumers are sized after the queue only with the reactive daemon.
+    """
+    reactive_reconcile_mock = MagicMock()
+    monkeypatch.setattr(
+        runner_scaler_module.reactive_runner_manager, "reconcile", reactive_reconcile_mock
+    )
+    runner_manager = MagicMock()
+    runner_manager.manager_name = "app_name"
+    runner_manager.get_runners.return_value = []
+
+    RunnerScaler(
+        runner_manager=runner_manager,
+        reactive_process_config=MagicMock(daemon=daemon),
+        user=MagicMock(),
+        base_quantity=0,
+        max_quantity=5,
+    ).reconcile()
+
+    scaling_policy = reactive_reconcile_mock.call_args.kwargs["scaling_policy"]
+    assert (scaling_policy is not None) == expect_scaling_policy
 
 
 @pytest.mark.parametrize(